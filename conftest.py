@@ -2,8 +2,179 @@
 import pytest
 import json
 import os
+import uuid
 from playwright.sync_api import sync_playwright
 from pages.login_page import LoginPage
+from utils.config_manager import load_config
+from utils.odoo_utils import OdooClient
+from utils.verification_cache import VerificationCache
+from utils.data_seeder import FixturePool
+from utils.account_pool import AccountPool
+from utils.async_runner import AsyncBrowserRunner
+from pages.aio.login_page import AsyncLoginPage
+from utils import visual_regression
+from utils.screenshot_manager import dedupe_allure_results
+from utils.trace_recorder import TraceRecorder
+from utils import browser_daemon
+from utils import impact_map
+from utils import health_gate
+from utils.error_sentinel import ErrorSentinel
+from utils.query_cache import QueryCache
+from utils.selector_preflight import SelectorPreflight, format_report, save_report, REPORT_PATH
+from utils.browser_watchdog import BrowserWatchdog, MARKER_SWITCH, browser_marker
+from utils import perf_profiles
+from utils.step_profiler import StepProfiler
+
+verification_cache_key = pytest.StashKey()
+verification_outcome_key = pytest.StashKey()
+verification_states_key = pytest.StashKey()
+visual_engine_key = pytest.StashKey()
+visual_results_key = pytest.StashKey()
+screenshot_log_key = pytest.StashKey()
+test_reports_key = pytest.StashKey()
+impact_recorder_key = pytest.StashKey()
+circuit_breaker_key = pytest.StashKey()
+product_failures_key = pytest.StashKey()
+health_base_url_key = pytest.StashKey()
+browser_launch_key = pytest.StashKey()
+browser_watchdog_key = pytest.StashKey()
+perf_timings_key = pytest.StashKey()
+
+# Fixtures that need the server: tests using them are skipped once the environment is unavailable
+SERVER_FIXTURES = {"browser", "odoo_client", "async_runner"}
+
+def pytest_addoption(parser):
+    group = parser.getgroup("nawat")
+    group.addoption("--incremental", action="store_true", default=os.getenv("INCREMENTAL") == "true",
+                    help="Only verify records/classes changed since the last green run")
+    group.addoption("--full-sweep", action="store_true", default=False,
+                    help="Verify everything and refresh the verification cache")
+    group.addoption("--full-sweep-days", type=int, default=int(os.getenv("FULL_SWEEP_DAYS", "7")),
+                    help="Force a full sweep when the last one is older than this many days")
+    group.addoption("--visual-regression", choices=["off", "report", "strict"],
+                    default=os.getenv("VISUAL_REGRESSION", "off"),
+                    help="Compare screenshots with data/visual_baselines after each test; "
+                         "strict fails the run on layout regressions")
+    group.addoption("--visual-workers", type=int, default=None,
+                    help="Processes comparing screenshots (default: CPU count - 1)")
+    group.addoption("--failure-trace", choices=["off", "on-failure"], default=os.getenv("FAILURE_TRACE", "on-failure"),
+                    help="Record a Playwright trace per test, kept only when it fails or is slow")
+    group.addoption("--failure-trace-budget", type=float, default=float(os.getenv("FAILURE_TRACE_BUDGET", "120")),
+                    help="Seconds above which a passing test keeps its trace")
+    group.addoption("--browser-daemon", action="store_true", default=os.getenv("BROWSER_DAEMON") == "true",
+                    help="Reuse a Chromium kept running between runs (python -m utils.browser_daemon)")
+    group.addoption("--impact-record", action="store_true", default=os.getenv("IMPACT_RECORD") == "true",
+                    help="Record the lines each test executes in reports/test_impact (needs coverage)")
+    group.addoption("--impact-select", action="store_true", default=os.getenv("IMPACT_SELECT") == "true",
+                    help="Only run the tests affected by the changes since the commit the impact map "
+                         "was recorded on (working tree included)")
+    group.addoption("--impact-max-age", type=float, default=float(os.getenv("IMPACT_MAX_AGE", "7")),
+                    help="Days after which the impact map forces a full (recording) run")
+    group.addoption("--health-gate", choices=["on", "off"], default=os.getenv("HEALTH_GATE", "on"),
+                    help="Probe the server before the first server test and skip everything if it is down")
+    group.addoption("--breaker-threshold", type=int, default=int(os.getenv("BREAKER_THRESHOLD", "3")),
+                    help="Consecutive infrastructure failures after which the remaining server tests are skipped")
+    group.addoption("--selector-preflight", choices=["off", "report", "skip", "fail"],
+                    default=os.getenv("SELECTOR_PREFLIGHT", "skip" if is_jenkins() else "off"),
+                    help="Resolve the page object selectors against the live views before the first browser test "
+                         "and skip or fail the tests depending on a missing one")
+    group.addoption("--browser-watchdog", choices=["on", "off"], default=os.getenv("BROWSER_WATCHDOG", "on"),
+                    help="Sample the browser's memory and CPU per test and relaunch it past a threshold")
+    group.addoption("--browser-max-rss", type=float, default=float(os.getenv("BROWSER_MAX_RSS_MB", "2500")),
+                    help="MB of RSS of the browser processes after which the browser is relaunched")
+    group.addoption("--browser-max-heap", type=float, default=float(os.getenv("BROWSER_MAX_HEAP_MB", "300")),
+                    help="MB of JS heap of a test page after which the browser is relaunched")
+    group.addoption("--leak-iterations", type=int, default=int(os.getenv("LEAK_ITERATIONS", "0")),
+                    help="Iterations of the navigation loops of tests/benchmarks/test_navigation_leaks.py "
+                         "(0 skips them)")
+    group.addoption("--perf-profile", choices=["none"] + list(perf_profiles.PROFILES),
+                    default=os.getenv("PERF_PROFILE", "none"),
+                    help="Throttle the network and CPU of every test page like a school's machine")
+    group.addoption("--step-profiling", choices=["on", "off"], default=os.getenv("STEP_PROFILING", "off"),
+                    help="Profile the JS CPU of named page object steps, keeping the profiles of the slow ones "
+                         "(the profiler's own overhead skews --perf-profile timings and leak runs)")
+    group.addoption("--dedupe-allure-screenshots", action="store_true",
+                    default=os.getenv("DEDUPE_ALLURE_SCREENSHOTS") == "true",
+                    help="After the run, drop the near-duplicate screenshots of each Allure result and share "
+                         "byte-identical ones between results")
+
+def pytest_configure(config):
+    if config.getoption("--health-gate") == "on":
+        config.stash[circuit_breaker_key] = health_gate.CircuitBreaker(config.getoption("--breaker-threshold"),
+                                                                       run_id=xdist_run_id(config))
+
+    if config.getoption("--impact-record"):
+        config.stash[impact_recorder_key] = impact_map.ImpactRecorder().start()
+
+    mode = config.getoption("--visual-regression")
+    if mode == "off":
+        return
+    if not visual_regression.available():
+        print("Visual regression disabled: numpy and Pillow are not installed")
+        return
+    config.stash[visual_engine_key] = visual_regression.VisualRegressionEngine(
+        workers=config.getoption("--visual-workers"))
+    config.stash[screenshot_log_key] = visual_regression.ScreenshotLog()
+
+def pytest_report_header(config):
+    profile = config.getoption("--perf-profile")
+    if profile != "none":
+        return f"perf profile: {perf_profiles.describe(profile)}"
+
+def perf_profile(config):
+    """Throttling profile of the run, None when unthrottled"""
+    profile = config.getoption("--perf-profile")
+    return None if profile == "none" else profile
+
+def xdist_run_id(config):
+    """Identifier shared by the controller and the workers of an xdist run, None without xdist"""
+    if hasattr(config, "workerinput"):
+        return config.workerinput["testrunuid"]
+    if hasattr(config.option, "testrunuid"):
+        # Fixed before the workers start: xdist hands this id over to them
+        config.option.testrunuid = config.option.testrunuid or uuid.uuid4().hex
+        return config.option.testrunuid
+    return None
+
+def is_xdist_worker(config):
+    """True in a pytest-xdist worker, False on the controller or without xdist"""
+    return bool(os.getenv("PYTEST_XDIST_WORKER")) or hasattr(config, "workerinput")
+
+def pytest_collection_modifyitems(config, items):
+    """Deselect the tests the changes since the impact map's commit cannot affect (--impact-select)"""
+    if not config.getoption("--impact-select"):
+        return
+    recorded = impact_map.load_map()
+    try:
+        # Diffed against the commit the map was recorded on, where its line numbers hold
+        selection = impact_map.select_tests(None, recorded, config.getoption("--impact-max-age"))
+    except Exception as e:
+        print(f"Test impact selection failed, running everything: {e}")
+        return
+    if selection["full"]:
+        print(f"Test impact: full run ({selection['reason']})")
+        # The safety-net run refreshes the map
+        if impact_recorder_key not in config.stash:
+            config.stash[impact_recorder_key] = impact_map.ImpactRecorder().start()
+        return
+
+    selected = [item for item in items if impact_map.is_selected(item.nodeid, selection, recorded)]
+    deselected = [item for item in items if item not in selected]
+    print(f"Test impact: {len(selected)} of {len(items)} tests affected by the changes since "
+          f"{recorded['commit'][:12]}, where the impact map was recorded")
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Attribute the executed lines to the running test when recording the impact map"""
+    recorder = item.config.stash.get(impact_recorder_key, None)
+    if recorder is not None:
+        recorder.switch(item.nodeid, item.fixturenames)
+    yield
+    if recorder is not None:
+        recorder.switch("")
 
 def is_jenkins():
     """Check if running in Jenkins environment"""
@@ -27,34 +198,298 @@ def is_headless_forced():
 # Load test configuration
 @pytest.fixture(scope="session")
 def config():
+    config_data = load_config()
+    
+    # Force headless in Jenkins regardless of config
+    if is_headless_forced():
+        config_data["headless"] = True
+        print("Jenkins/CI environment detected - forcing headless mode")
+    
+    return config_data
+
+@pytest.fixture(scope="session")
+def odoo_client(config, environment_health):
+    """JSON-RPC client authenticated with the configured account"""
+    return OdooClient.from_config(config)
+
+@pytest.fixture(scope="session")
+def verification_plan(request, config):
+    """
+    What this run has to verify, based on the records changed since the last green run.
+    
+    Without --incremental everything is verified and the cache is left untouched.
+    """
+    cache = VerificationCache(full_sweep_days=request.config.getoption("--full-sweep-days"))
+    if not request.config.getoption("--incremental"):
+        cache.reason = "incremental mode disabled"
+        return cache
+    
+    client = request.getfixturevalue("odoo_client")
+    class_field = cache.data.get("class_field")
+    if not class_field:
+        from utils.filter_explorer import FilterCombinationExplorer
+        class_field = FilterCombinationExplorer(client).load().panel_field
+    cache.plan(client, class_field, force_full=request.config.getoption("--full-sweep"))
+    request.config.stash[verification_cache_key] = cache
+    print(cache.summary())
+    return cache
+
+@pytest.fixture(scope="session")
+def fixture_pool(odoo_client, config):
+    """Warm pool of RPC-seeded records for destructive tests, removed at session end"""
+    pool = FixturePool(odoo_client, seed_models=config.get("seed_models")).open()
+    yield pool
+    pool.close()
+
+@pytest.fixture
+def leased_archived_student(fixture_pool, request):
+    """A fresh archived student owned by this test only (unarchive freely)"""
+    return fixture_pool.lease("archived_students", holder=request.node.nodeid)[0]
+
+def pytest_sessionfinish(session, exitstatus):
+    """Collect visual comparisons, trim Allure screenshots and advance the verification cache"""
+    # Workers share the controller's breaker state: the controller sets the exit code once they are done
+    breaker = session.config.stash.get(circuit_breaker_key, None)
+    if breaker is not None and is_xdist_worker(session.config):
+        session.config.workeroutput["product_failures"] = session.config.stash.get(product_failures_key, 0)
+    elif breaker is not None:
+        if breaker.is_open():
+            print(f"\nENVIRONMENT UNAVAILABLE: {breaker.reason}")
+            product_failures = session.config.stash.get(product_failures_key, 0)
+            # An outage must not hide real failures: 75 only when the breaker counted every one of them
+            if exitstatus in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED) and not product_failures:
+                session.exitstatus = exitstatus = health_gate.ENVIRONMENT_UNAVAILABLE_EXIT
+            else:
+                print(f"{product_failures} failure(s) not caused by the environment: exit status kept")
+        breaker.cleanup()
+
+    timings = session.config.stash.get(perf_timings_key, None)
+    if timings:
+        profile = session.config.getoption("--perf-profile")
+        path = perf_profiles.save_timings(profile, timings)
+        print(f"\n{perf_profiles.format_timings(profile, timings)}\nReport: {path}")
+
+    watchdog = session.config.stash.get(browser_watchdog_key, None)
+    if watchdog is not None and watchdog.samples:
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        path = watchdog.save(f"reports/browser_watchdog_{worker}.json" if worker else "reports/browser_watchdog.json")
+        print(f"\n{watchdog.summary()}\nReport: {path}")
+
+    recorder = session.config.stash.get(impact_recorder_key, None)
+    if recorder is not None:
+        path = recorder.save()
+        if path:
+            print(f"\nTest impact map written to {path}")
+
+    engine = session.config.stash.get(visual_engine_key, None)
+    if engine is not None:
+        engine.close()
+        if is_xdist_worker(session.config):
+            # xdist ignores a worker's exit status: the controller merges the results and decides
+            worker = os.getenv("PYTEST_XDIST_WORKER")
+            path = engine.write_report(f"reports/visual_regression_{worker}.json")
+            session.config.workeroutput["visual_results"] = engine.results
+        else:
+            engine.merge(session.config.stash.get(visual_results_key, []))
+            path = engine.write_report()
+            if engine.regressions() and session.config.getoption("--visual-regression") == "strict":
+                session.exitstatus = exitstatus = pytest.ExitCode.TESTS_FAILED
+        print(f"\n{engine.summary()}\nReport: {path}")
+    
+    # Only the controller sees the results of every worker once they are all written
+    alluredir = session.config.getoption("allure_report_dir", None)
+    if (session.config.getoption("--dedupe-allure-screenshots") and not is_xdist_worker(session.config)
+            and alluredir and os.path.isdir(alluredir)):
+        stats = dedupe_allure_results(alluredir)
+        if stats["dropped_attachments"] or stats["removed_files"]:
+            print(f"Allure screenshots: {stats['screenshots']}, {stats['dropped_attachments']} duplicate "
+                  f"attachments dropped, {stats['removed_files']} files removed")
+    
+    finish_verification_cache(session.config)
+
+def verification_outcome(config):
+    """Outcomes of the tests using verification_plan: passed, failed, skipped and deselected counts"""
+    return config.stash.setdefault(verification_outcome_key,
+                                   {"passed": 0, "failed": 0, "skipped": 0, "deselected": 0})
+
+def pytest_deselected(items):
+    """Deselected (-k, -m, impact selection) verification tests leave their records unverified"""
+    if items:
+        verification_outcome(items[0].config)["deselected"] += sum(
+            "verification_plan" in getattr(item, "fixturenames", ()) for item in items)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Controller side of pytest-xdist: collect the verification plan, outcomes, visual results and failures of a worker"""
+    output = getattr(node, "workeroutput", {})
+    outcome = verification_outcome(node.config)
+    for key, value in output.get("verification_outcome", {}).items():
+        outcome[key] += value
+    if error:
+        # A crashed worker may have been running a verification test
+        outcome["failed"] += 1
+    if output.get("verification_cache"):
+        node.config.stash.setdefault(verification_states_key, []).append(output["verification_cache"])
+    if output.get("visual_results"):
+        node.config.stash.setdefault(visual_results_key, []).extend(output["visual_results"])
+    # A crashed worker is not an outage the breaker counted
+    failures = output.get("product_failures", 0) + (1 if error else 0)
+    node.config.stash[product_failures_key] = node.config.stash.get(product_failures_key, 0) + failures
+
+def finish_verification_cache(config):
+    """
+    Advance the verification cache, from the controller only
+
+    The cache only moves on when the tests using verification_plan ran and all
+    passed: a red, partial (-k, deselected) or skipped verification leaves the
+    same changes to be picked up next time. Without changes to verify their
+    skips are expected.
+    """
+    cache = config.stash.get(verification_cache_key, None)
+    outcome = verification_outcome(config)
+    if is_xdist_worker(config):
+        config.workeroutput["verification_outcome"] = outcome
+        if cache is not None:
+            config.workeroutput["verification_cache"] = cache.pending_state()
+        return
+    states = config.stash.get(verification_states_key, [])
+    if cache is None and states:
+        cache = VerificationCache(full_sweep_days=config.getoption("--full-sweep-days"))
+        for state in states:
+            cache.merge(state)
+    if cache is None:
+        return
+    verified = outcome["passed"] > 0 and not outcome["skipped"]
+    green = not outcome["failed"] and not outcome["deselected"] and (verified or not cache.has_changes)
+    cache.mark_run(green=green)
+    if not green:
+        print(f"Verification cache not advanced: {outcome['passed']} passed, {outcome['failed']} failed, "
+              f"{outcome['skipped']} skipped, {outcome['deselected']} deselected verification tests")
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Keep the setup/call reports on the item so fixtures can tell a failed test at teardown"""
+    outcome = yield
+    report = outcome.get_result()
+    item.stash.setdefault(test_reports_key, {})[report.when] = report
+    
+    if "verification_plan" in item.fixturenames:
+        outcome = verification_outcome(item.config)
+        if report.failed:
+            outcome["failed"] += 1
+        elif report.skipped:
+            outcome["skipped"] += 1
+        elif report.when == "call":
+            outcome["passed"] += 1
+    
+    profile = perf_profile(item.config)
+    if profile and report.when == "call" and {"browser", "async_runner"}.intersection(item.fixturenames):
+        # Durations of the browser tests, labeled with the profile they ran under
+        item.config.stash.setdefault(perf_timings_key, {})[item.nodeid] = round(report.duration, 2)
+        report.user_properties.append(("perf_profile", profile))
+    
+    breaker = item.config.stash.get(circuit_breaker_key, None)
+    if breaker is None or report.skipped:
+        return
+    server_test = SERVER_FIXTURES.intersection(item.fixturenames)
+    if report.failed and server_test:
+        kind = health_gate.classify_failure(str(report.longrepr))
+        # A timeout is also what a changed DOM looks like: only count it if the server stopped answering
+        base_url = item.config.stash.get(health_base_url_key, None)
+        if kind == "network" or (kind == "timeout" and base_url and not health_gate.quick_probe(base_url)):
+            breaker.record_failure(f"{item.nodeid}: {report.longrepr.reprcrash.message[:200]}"
+                                   if hasattr(report.longrepr, "reprcrash") else item.nodeid)
+            return
+    if report.failed:
+        item.config.stash[product_failures_key] = item.config.stash.get(product_failures_key, 0) + 1
+    if server_test and (report.when == "call" or report.failed):
+        breaker.record_success()
+
+def pytest_runtest_setup(item):
+    """Skip server tests at once when the circuit breaker is open"""
+    breaker = item.config.stash.get(circuit_breaker_key, None)
+    if breaker is not None and SERVER_FIXTURES.intersection(item.fixturenames) and breaker.is_open():
+        pytest.skip(f"environment unavailable: {breaker.reason}")
+
+@pytest.fixture(scope="session")
+def environment_health(config, pytestconfig):
+    """Probe the server once before the first test that needs it"""
+    breaker = pytestconfig.stash.get(circuit_breaker_key, None)
+    if breaker is None:
+        return None
+    pytestconfig.stash[health_base_url_key] = config["base_url"]
+    result = health_gate.probe_environment(config)
+    print(health_gate.format_probe(result))
+    if not result["ok"]:
+        failed = [f"{check['name']} {check['error']}" for check in result["checks"] if not check["ok"]]
+        breaker.trip(f"health probe failed ({'; '.join(failed)})")
+        pytest.skip(f"environment unavailable: {breaker.reason}")
+    return result
+
+@pytest.fixture(scope="session")
+def selector_preflight(browser, config, pytestconfig):
+    """Resolve every page object selector once, on a page of its own"""
+    if pytestconfig.getoption("--selector-preflight") == "off":
+        return None
+    base_url = config.get("base_url", "https://dev.nawat.ma")
+
+    def login(page):
+        login_page = LoginPage(page, base_url)
+        login_page.navigate()
+        if not login_page.login(config["username"], config["password"]):
+            raise RuntimeError(login_page.get_error_message() or "login failed")
+
+    context = browser.new_context()
     try:
-        with open('data/config.json', 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-            # Convert string 'False'/'True' to boolean if needed
-            if isinstance(config_data.get("headless"), str):
-                config_data["headless"] = config_data["headless"].lower() == 'true'
-            
-            # Force headless in Jenkins regardless of config
-            if is_headless_forced():
-                config_data["headless"] = True
-                print("Jenkins/CI environment detected - forcing headless mode")
-            
-            return config_data
-    except FileNotFoundError:
-        # Default config if file not found
-        default_config = {
-            "base_url": "https://dev.nawat.ma",
-            "username": "ecole.e2a",
-            "password": "1@ayouris2",
-            "headless": True,  
-            "slow_mo": 0
-        }
-        
-        # Force headless in Jenkins
-        if is_headless_forced():
-            default_config["headless"] = True
-            
-        return default_config
+        result = SelectorPreflight(base_url).run(context.new_page(), login=login)
+    finally:
+        context.close()
+    print(format_report(result))
+    save_report(result)
+    if result["errors"] and pytestconfig.getoption("--selector-preflight") == "fail":
+        pytest.exit(f"selector preflight could not check the views: {'; '.join(result['errors'])} "
+                    f"(see {REPORT_PATH})", returncode=pytest.ExitCode.TESTS_FAILED)
+    return result
+
+@pytest.fixture(autouse=True)
+def preflight_gate(request):
+    """
+    Skip or fail the browser tests whose page objects use a selector missing on the server
+
+    Only selectors missing from a view that loaded count: a failed login or an
+    unreachable view is a preflight error, reported (or failing the session in
+    "fail" mode) without skipping anything.
+    """
+    mode = request.config.getoption("--selector-preflight")
+    if mode == "off" or not {"page", "async_runner"}.intersection(request.fixturenames):
+        return
+    result = request.getfixturevalue("selector_preflight")
+    missing = result["affected_tests"].get(request.node.nodeid.split("::", 1)[0]) if result else None
+    if not missing or mode == "report":
+        return
+    message = f"selectors missing on the server: {', '.join(missing)} (see {REPORT_PATH})"
+    if mode == "fail":
+        pytest.fail(message, pytrace=False)
+    pytest.skip(message)
+
+def request_failed(request):
+    reports = request.node.stash.get(test_reports_key, {})
+    return any(report.failed for report in reports.values())
+
+@pytest.fixture(autouse=True)
+def visual_check(request):
+    """Queue the screenshots a test took for comparison once it finishes"""
+    engine = request.config.stash.get(visual_engine_key, None)
+    log = request.config.stash.get(screenshot_log_key, None)
+    if engine is None or log is None:
+        yield
+        return
+    # Only this test's own pages: other xdist workers write to the same directory
+    log.drain()
+    yield
+    for path in log.drain():
+        if path.endswith(".png") and os.path.exists(path):
+            engine.submit(path)
 
 @pytest.fixture(scope="session")
 def browser_context_args(browser_context_args):
@@ -87,7 +522,7 @@ def browser_context_args(browser_context_args):
     return jenkins_optimized_args
 
 @pytest.fixture(scope="session")
-def browser(config):
+def browser(config, pytestconfig, environment_health):
     with sync_playwright() as playwright:
         # Ensure headless is a boolean and force in Jenkins
         headless_value = config.get("headless")
@@ -98,6 +533,17 @@ def browser(config):
         if is_jenkins():
             headless_value = True
 
+        # Local iterations: reuse the running Chromium, tests still get fresh contexts
+        if pytestconfig.getoption("--browser-daemon") and not is_jenkins():
+            browser = browser_daemon.connect(playwright, headless=headless_value)
+            print(f"Connected to browser daemon (Chromium {browser.version})")
+            yield browser
+            try:
+                browser.close()  # disconnects, the daemon keeps running
+            except:
+                pass
+            return
+
         print(f"Launching browser (headless: {headless_value}, Jenkins: {is_jenkins()})")
         
         # Try different browser configurations for Jenkins stability
@@ -125,17 +571,17 @@ def browser(config):
             }
         ]
         
+        # Lets the watchdog find this browser's processes among the other Chromiums of the process
+        marker = browser_marker()
         browser = None
         for i, config_attempt in enumerate(browser_configs):
             try:
                 # Filter out empty args
-                args = [arg for arg in config_attempt["args"] if arg]
+                args = [arg for arg in config_attempt["args"] if arg] + [marker]
                 print(f"Browser launch attempt {i+1} with args: {args}")
                 
-                browser = playwright.chromium.launch(
-                    headless=config_attempt["headless"],
-                    args=args
-                )
+                launch_args = {"headless": config_attempt["headless"], "args": args}
+                browser = playwright.chromium.launch(**launch_args)
                 print(f"Browser launched successfully on attempt {i+1}")
                 break
             except Exception as e:
@@ -151,12 +597,15 @@ def browser(config):
             # Last resort - absolute minimal config
             try:
                 print("Trying absolute minimal browser config...")
-                browser = playwright.chromium.launch(headless=True)
+                launch_args = {"headless": True, "args": [marker]}
+                browser = playwright.chromium.launch(**launch_args)
                 print("Minimal browser config successful")
             except Exception as e:
                 print(f"All browser launch attempts failed: {e}")
                 raise
         
+        # The watchdog relaunches the browser with the arguments that worked
+        pytestconfig.stash[browser_launch_key] = launch_args
         yield browser
         
         try:
@@ -164,24 +613,74 @@ def browser(config):
         except:
             pass  # Ignore close errors
 
+@pytest.fixture(scope="session")
+def browser_watchdog(browser, pytestconfig):
+    """Memory and CPU samples of the session browser, which it relaunches when it grows too big"""
+    if pytestconfig.getoption("--browser-watchdog") == "off":
+        yield None
+        return
+    launch_args = pytestconfig.stash.get(browser_launch_key, None)
+    if launch_args is None:
+        # Browser daemon: only record, closing it would only disconnect
+        state = browser_daemon.read_state()
+        watchdog = BrowserWatchdog(browser, root_pid=state["pid"] if state else None)
+    else:
+        marker = next(arg for arg in launch_args["args"] if arg.startswith(MARKER_SWITCH))
+        watchdog = BrowserWatchdog(browser, relaunch=lambda: browser.browser_type.launch(**launch_args),
+                                   max_rss_mb=pytestconfig.getoption("--browser-max-rss"),
+                                   max_heap_mb=pytestconfig.getoption("--browser-max-heap"),
+                                   marker=marker)
+    pytestconfig.stash[browser_watchdog_key] = watchdog
+    yield watchdog
+    if watchdog.browser is not browser:
+        try:
+            watchdog.browser.close()
+        except:
+            pass
+
 @pytest.fixture
-def page(browser, config):
+def page(browser, browser_watchdog, config, request):
     context = None
     page = None
+    tracer = None
+    nodeid = request.node.nodeid
     
     try:
+        if browser_watchdog:
+            # The browser may have been relaunched after an earlier test
+            browser = browser_watchdog.browser
+            browser_watchdog.start_test(nodeid)
         context = browser.new_context()
+        if request.config.getoption("--failure-trace") == "on-failure":
+            tracer = TraceRecorder(context, budget=request.config.getoption("--failure-trace-budget"))
+            tracer.start_test(request.node.nodeid)
         page = context.new_page()
+        # Page objects fail fast on RPC errors, JS exceptions and error dialogs
+        ErrorSentinel().install(page)
+        # Screenshots of this page are compared with the baselines once the test finishes
+        log = request.config.stash.get(screenshot_log_key, None)
+        if log is not None:
+            log.install(page)
+        # Repeated DOM reads of page objects are served from memory until the DOM changes
+        QueryCache().install(page)
+        # School network and CPU, when running under a performance profile
+        profile = perf_profile(request.config)
+        perf_profiles.apply_profile(page, profile)
+        # The page objects on this page scale their own timeouts by the same factor
+        factor = perf_profiles.page_timeout_factor(page)
+        # Slow named steps come with a CPU profile of the page
+        if request.config.getoption("--step-profiling") == "on":
+            StepProfiler(factor=factor).install(page)
         
         # Jenkins-specific page optimizations
         if is_jenkins():
             # Set faster timeouts for Jenkins
-            page.set_default_timeout(15000)  # 15 seconds
-            page.set_default_navigation_timeout(20000)  # 20 seconds
+            page.set_default_timeout(15000 * factor)  # 15 seconds
+            page.set_default_navigation_timeout(20000 * factor)  # 20 seconds
         else:
             # Standard timeouts for local development
-            page.set_default_timeout(30000)  # 30 seconds
-            page.set_default_navigation_timeout(60000)  # 60 seconds
+            page.set_default_timeout(30000 * factor)  # 30 seconds
+            page.set_default_navigation_timeout(60000 * factor)  # 60 seconds
 
         # Ensure screenshots directory exists
         os.makedirs("reports/screenshots", exist_ok=True)
@@ -193,18 +692,61 @@ def page(browser, config):
         raise
     finally:
         # Clean up
+        if tracer:
+            trace = tracer.finish_test(request.node.nodeid, failed=request_failed(request))
+            if trace:
+                print(f"Trace saved: {trace} (playwright show-trace {trace})")
+        if browser_watchdog and page:
+            browser_watchdog.sample_page(nodeid, page)
         try:
             if context:
                 context.close()
         except:
             pass  # Ignore cleanup errors
+        if browser_watchdog:
+            browser_watchdog.finish_test(nodeid)
+
+@pytest.fixture(scope="session")
+def account_pool(config):
+    """Pool of equivalent accounts from data/users.json (pool_users)"""
+    return AccountPool(default_user={
+        "username": config.get("username", "ecole.e2a"),
+        "password": config.get("password", "1@ayouris2"),
+    })
+
+@pytest.fixture(scope="session")
+def account(account_pool):
+    """The account this worker logs in with, returned to the pool at session end"""
+    user = account_pool.lease()
+    yield user
+    account_pool.release()
+
+def restore_session(page, config, account_pool, username):
+    """Reuse the cached storage state of an account; True if the web client opened logged in"""
+    state = account_pool.load_storage_state(username)
+    if not state:
+        return False
+    try:
+        page.context.add_cookies(state["cookies"])
+        page.goto(f"{config.get('base_url', 'https://dev.nawat.ma')}/web")
+        page.wait_for_selector(LoginPage.MAIN_NAVBAR, state="visible", timeout=10000)
+        return True
+    except Exception as e:
+        print(f"Cached session for {username} is no longer valid: {e}")
+        account_pool.forget_storage_state(username)
+        return False
 
 @pytest.fixture
-def logged_in_page(page, config):
+def logged_in_page(page, config, account, account_pool):
     """Enhanced login fixture with Jenkins optimizations"""
-    print(f"Attempting login (Jenkins mode: {is_jenkins()})...")
+    if restore_session(page, config, account_pool, account["username"]):
+        print(f"Reused cached session for {account['username']}")
+        yield page
+        return
+    
+    print(f"Attempting login as {account['username']} (Jenkins mode: {is_jenkins()})...")
     
-    login_page = LoginPage(page)
+    login_page = LoginPage(page, config.get("base_url", "https://dev.nawat.ma"))
     
     # Navigate with environment-appropriate timeout
     try:
@@ -216,10 +758,7 @@ def logged_in_page(page, config):
         pytest.fail(f"Failed to navigate to login page: {e}")
 
     # Perform login
-    success = login_page.login(
-        config.get("username", "ecole.e2a"),
-        config.get("password", "1@ayouris2")
-    )
+    success = login_page.login(account["username"], account["password"])
 
     if not success:
         # Take screenshot for debugging (but not in Jenkins to save time)
@@ -237,9 +776,57 @@ def logged_in_page(page, config):
         page.screenshot(path="reports/screenshots/successful_login.png")
         print("Successful login screenshot saved")
     
+    account_pool.save_storage_state(account["username"], page.context)
     print("Login successful")
     yield page
 
+@pytest.fixture(scope="session")
+def async_runner(config, environment_health, pytestconfig):
+    """Async Playwright browser on its own loop thread, driving the pages/aio page objects"""
+    headless = str(config.get("headless", True)).lower() == "true" or is_jenkins()
+    profile = perf_profile(pytestconfig)
+    runner = AsyncBrowserRunner(
+        headless=headless,
+        launch_args=["--disable-dev-shm-usage", "--disable-gpu"] + (["--no-sandbox"] if is_jenkins() else []),
+        context_args={"viewport": {"width": 1920, "height": 1080}, "ignore_https_errors": True},
+        timeout=(15000 if is_jenkins() else 30000) * perf_profiles.timeout_factor(profile),
+        profile=profile,
+        step_profiling=pytestconfig.getoption("--step-profiling") == "on",
+        screenshot_log=pytestconfig.stash.get(screenshot_log_key, None),
+    ).start()
+    yield runner
+    runner.stop()
+
+@pytest.fixture(scope="session")
+def async_storage_state(async_runner, config, account, account_pool):
+    """
+    Path of the worker account's storage state for async contexts.
+    
+    Shares the cache of logged_in_page; logs in once through AsyncLoginPage if empty.
+    """
+    username = account["username"]
+    path = account_pool.storage_state_path(username)
+    if account_pool.load_storage_state(username):
+        return path
+    
+    async def login():
+        context = await async_runner.new_context()
+        try:
+            login_page = AsyncLoginPage(await context.new_page(), config.get("base_url", "https://dev.nawat.ma"))
+            await login_page.navigate()
+            if not await login_page.login(username, account["password"]):
+                return await login_page.get_error_message() or "Unknown error (possible timeout)"
+            os.makedirs(account_pool.pool_dir, exist_ok=True)
+            await context.storage_state(path=path)
+            return None
+        finally:
+            await context.close()
+    
+    error = async_runner.run(login())
+    if error:
+        pytest.fail(f"Async login failed: {error}")
+    return path
+
 @pytest.fixture(autouse=True)
 def test_environment_setup():
     """Automatic test environment configuration"""
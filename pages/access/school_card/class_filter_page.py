@@ -1,11 +1,12 @@
 # pages/access/class_filter_page.py
 from ...base_page import BasePage
+from utils.error_sentinel import OdooClientError
 import time
 import os
 import allure
 
-class ClassFilterPage(BasePage):
-    """Page object for filtering students by class levels"""
+class ClassFilterLocators:
+    """Selectors of the class filter page, shared by ClassFilterPage and its async twin"""
     
     # Navigation selectors
     WORKSPACE_BUTTON = "//button[@title='Espace de travail']"
@@ -14,6 +15,7 @@ class ClassFilterPage(BasePage):
     APPRENANT_SUBMENU = "(//a[@href='#menu_id=108&action=405'])[2]"
     
     # Sidebar selectors
+    SIDEBAR_ITEM_CSS = "div.o_search_panel_label.d-flex"
     SIDEBAR_ITEM_BASE = "//div[contains(@class,'o_search_panel_label d-flex')]"
     ITEM_TITLE = "//span[contains(@class,'o_search_panel_label_title text-truncate')]"
     SIDEBAR_CONTAINER = "//div[contains(@class,'o_search_panel')]"
@@ -29,6 +31,30 @@ class ClassFilterPage(BasePage):
     LOADING_INDICATOR = "//div[contains(@class,'o_loading')]"
     KANBAN_VIEW = "//div[contains(@class,'o_kanban_view')]"
     
+    # Fallbacks when SIDEBAR_ITEM_BASE matches nothing
+    SIDEBAR_ITEM_FALLBACKS = [
+        "//div[contains(@class,'o_search_panel_label')]",
+        "//div[contains(@class,'search_panel_label')]", 
+        "//*[contains(@class,'panel_label')]",
+    ]
+    # Ranked for the selector registry, which remembers the one matching the server
+    SIDEBAR_ITEM_CANDIDATES = [SIDEBAR_ITEM_CSS, SIDEBAR_ITEM_BASE] + SIDEBAR_ITEM_FALLBACKS
+    
+    def is_class_item(self, title):
+        """
+        Check if an item is a class by looking for parentheses in the title
+        
+        Args:
+            title: The title of the item
+            
+        Returns:
+            bool: True if it's a class (has parentheses), False otherwise
+        """
+        return "(" in title and ")" in title
+
+class ClassFilterPage(ClassFilterLocators, BasePage):
+    """Page object for filtering students by class levels"""
+    
     def __init__(self, page):
         super().__init__(page)
         self.page = page
@@ -42,34 +68,18 @@ class ClassFilterPage(BasePage):
         self.click_with_retry(self.WORKSPACE_BUTTON)
         self.click_with_retry(self.ACCESS_MODULE)
         self.click_with_retry(self.CARTE_SCOLAIRE_MENU)
-        self.click_with_retry(self.APPRENANT_SUBMENU)
-        
-        # Wait for initial page load
-        self.wait_for_page_loaded()
+        with self.profiled_step("open_students"):
+            self.click_with_retry(self.APPRENANT_SUBMENU)
+            
+            # Wait for initial page load
+            self.wait_for_page_loaded()
         
         # Create screenshots directory if it doesn't exist
         os.makedirs("reports/screenshots", exist_ok=True)
     
     def wait_for_page_loaded(self):
-        """Wait for the page to be fully loaded with proper indicators - FAST VERSION"""
-        try:
-            # Quick network check
-            self.page.wait_for_load_state("domcontentloaded", timeout=self.micro_timeout)
-            
-            # Skip loading indicator check for speed
-            
-            # Quick check for kanban view
-            try:
-                self.page.wait_for_selector(self.KANBAN_VIEW, timeout=self.quick_timeout)
-            except:
-                pass  # Continue if not found quickly
-            
-            # Minimal wait for dynamic content
-            time.sleep(0.2)
-            
-        except Exception as e:
-            # Fallback: minimal wait
-            time.sleep(0.5)
+        """Wait until the kanban view renders every record its pager announces"""
+        self.wait_for_view_ready(timeout=self.wait_timeout)
     
     def expand_all_sidebar_items(self):
         """
@@ -79,27 +89,9 @@ class ClassFilterPage(BasePage):
             bool: True if expansion was successful
         """
         try:
-            print(f"🔍 Looking for sidebar items with selector: {self.SIDEBAR_ITEM_BASE}")
-            
-            # Get initial items
-            sidebar_elements = self.page.query_selector_all(self.SIDEBAR_ITEM_BASE)
-            print(f"📦 Found {len(sidebar_elements)} sidebar elements initially")
-            
-            if len(sidebar_elements) == 0:
-                # Try alternative selectors
-                alt_selectors = [
-                    "//div[contains(@class,'o_search_panel_label')]",
-                    "//div[contains(@class,'search_panel_label')]", 
-                    "//*[contains(@class,'panel_label')]",
-                    "//div[@class='o_search_panel_label d-flex']"
-                ]
-                
-                for selector in alt_selectors:
-                    elements = self.page.query_selector_all(selector)
-                    print(f"🔄 Trying {selector}: {len(elements)} elements")
-                    if len(elements) > 0:
-                        sidebar_elements = elements
-                        break
+            # Get initial items with the candidate that matched last time
+            selector, sidebar_elements = self.query_candidates("sidebar_item", self.SIDEBAR_ITEM_CANDIDATES)
+            print(f"📦 Found {len(sidebar_elements)} sidebar elements initially with {selector}")
             
             # Click on each item to expand - FAST
             clicked = 0
@@ -131,23 +123,9 @@ class ClassFilterPage(BasePage):
         """
         items = []
         try:
-            # Get all sidebar items with debugging
-            sidebar_elements = self.page.query_selector_all(self.SIDEBAR_ITEM_BASE)
-            print(f"📋 Found {len(sidebar_elements)} sidebar elements after expansion")
-            
-            if len(sidebar_elements) == 0:
-                # Try alternative selectors if main one fails
-                alt_selectors = [
-                    "//div[contains(@class,'o_search_panel_label')]",
-                    "//div[contains(@class,'search_panel_label')]", 
-                    "//*[contains(@class,'panel_label')]"
-                ]
-                
-                for selector in alt_selectors:
-                    sidebar_elements = self.page.query_selector_all(selector)
-                    print(f"🔄 Trying alternative {selector}: {len(sidebar_elements)} elements")
-                    if len(sidebar_elements) > 0:
-                        break
+            # Get all sidebar items with the candidate that matched last time
+            selector, sidebar_elements = self.query_candidates("sidebar_item", self.SIDEBAR_ITEM_CANDIDATES)
+            print(f"📋 Found {len(sidebar_elements)} sidebar elements after expansion with {selector}")
             
             # Process elements
             class_count = 0
@@ -194,31 +172,18 @@ class ClassFilterPage(BasePage):
             title: The title of the item
             
         Returns:
-            bool: True if click was successful
+            bool: True once the kanban shows the class's students, False if the click
+            failed or the view never became consistent
         """
         try:
-            # Fast click without unnecessary waits
-            element.click()
-            
-            # Minimal wait for page response
-            time.sleep(0.3)
-            
-            return True
+            # Done as soon as the kanban shows the class's students, not the previous class's
+            with self.profiled_step("search_panel_click"):
+                return self.reload_view(element.click, timeout=self.wait_timeout)
+        except OdooClientError:
+            raise
         except:
             return False
     
-    def is_class_item(self, title):
-        """
-        Check if an item is a class by looking for parentheses in the title
-        
-        Args:
-            title: The title of the item
-            
-        Returns:
-            bool: True if it's a class (has parentheses), False otherwise
-        """
-        return "(" in title and ")" in title
-    
     def has_students(self):
         """
         FAST check if there are any students displayed
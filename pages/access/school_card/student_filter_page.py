@@ -1,10 +1,13 @@
 # pages/access/school_card/student_filter_page.py
 from ...base_page import BasePage
+from utils.odoo_utils import STUDENT_MODEL
+from utils.error_sentinel import OdooClientError
 import time
 import os
+from urllib.parse import urlparse
 
-class StudentFilterPage(BasePage):
-    """Page object for the student filter functionality in Kanban view"""
+class StudentFilterLocators:
+    """Selectors of the student filter page, shared by StudentFilterPage and its async twin"""
     
     # Navigation selectors
     WORKSPACE_BUTTON = "//button[@title='Espace de travail']"
@@ -48,6 +51,31 @@ class StudentFilterPage(BasePage):
     SANS_FAMILLE_IMAGE = "//img[@alt='non affecté']"
     MISSING_DOCUMENT_BUTTON = "//button[@invisible='not sb_total_documents']"
     
+    # Pager total ("1-80 / 321" -> 321)
+    PAGER_TOTAL = "//span[contains(@class,'o_pager_limit')]"
+    
+    # Facet label -> dropdown selector, used to combine filters by name
+    FILTERS = {
+        "Non inscrit": NON_INSCRIT_FILTER,
+        "Non réinscrit": NON_REINSCRIT_FILTER,
+        "Radiée (Archivé)": RADIEE_FILTER,
+        "Annulée (Archivé)": ANNULEE_FILTER,
+        "Non-inscrit (Archivé)": NON_INSCRIT_ARCHIVE_FILTER,
+        "Sans famille": SANS_FAMILLE_FILTER,
+        "Manque document": MANQUE_DOCUMENT_FILTER,
+    }
+    
+    STUDENT_FORM_VIEW = "//div[contains(@class,'o_form_view')]"
+    
+    @staticmethod
+    def student_form_url(page_url, student_id):
+        """URL of a student's form view on the server the page is connected to"""
+        origin = "{0.scheme}://{0.netloc}".format(urlparse(page_url))
+        return f"{origin}/web#id={student_id}&model={STUDENT_MODEL}&view_type=form&action=405&menu_id=108"
+
+class StudentFilterPage(StudentFilterLocators, BasePage):
+    """Page object for the student filter functionality in Kanban view"""
+    
     def __init__(self, page):
         super().__init__(page)
         self.page = page
@@ -63,25 +91,20 @@ class StudentFilterPage(BasePage):
         # Click on Carte Scolaire menu
         self.click_with_retry(self.CARTE_SCOLAIRE_MENU)
         
-        # Click on Apprenant submenu
-        self.click_with_retry(self.APPRENANT_SUBMENU)
-        
-        # Wait for page to fully load
-        self.wait_for_page_loaded()
+        with self.profiled_step("open_students"):
+            # Click on Apprenant submenu
+            self.click_with_retry(self.APPRENANT_SUBMENU)
+            
+            # Wait for page to fully load
+            self.wait_for_page_loaded()
         
         # Create screenshots directory if it doesn't exist
         os.makedirs("reports/screenshots", exist_ok=True)
     
     def wait_for_page_loaded(self):
-        """Wait for the student page to be fully loaded"""
-        self.wait_for_loading(timeout=8000)
-        
-        # Try to wait for either student cards or list view
-        try:
-            self.page.wait_for_selector(f"{self.STUDENT_CARDS}, {self.STUDENT_LIST_VIEW}", timeout=5000)
-        except:
-            # If neither is found, just continue
-            pass
+        """Wait until the kanban or list view renders every record its pager announces"""
+        # A visible card may still belong to the previous search
+        self.wait_for_view_ready(timeout=8000)
     
     def open_filter_dropdown(self):
         """Open the filter dropdown menu"""
@@ -92,36 +115,66 @@ class StudentFilterPage(BasePage):
             pass
     
     def apply_filter(self, filter_selector):
-        """Apply a specific filter from the dropdown"""
+        """
+        Apply a specific filter from the dropdown
+        
+        Returns:
+            bool: True once the view shows the filtered records, False otherwise
+        """
         try:
             # Open the filter dropdown if it's not already open
             self.open_filter_dropdown()
             
-            # Click on the specified filter
-            self.click_with_retry(filter_selector, timeout=5000)
+            # Click on the specified filter and wait for the view to show its records
+            label = self.get_element_text(filter_selector, timeout=5000)
+            with self.profiled_step("filter_apply"):
+                ready = self.reload_view(lambda: self.click_with_retry(filter_selector, timeout=5000),
+                                         facets=[label] if label else None)
             
             # Focus on search input to close the dropdown
             try:
                 self.page.click(self.SEARCH_INPUT)
             except:
                 pass
-
-            # Wait for page to load
-            self.wait_for_page_loaded()
+            return ready
         except Exception as e:
             # Log error and continue
             print(f"Error applying filter: {str(e)}")
+            return False
     
     def remove_filter(self):
         """Remove the currently applied filter"""
         try:
             if self.is_element_visible(self.REMOVE_FILTER_BUTTON, timeout=3000):
-                self.click_with_retry(self.REMOVE_FILTER_BUTTON, timeout=3000)
-                self.wait_for_page_loaded()
+                # One remove button per facet
+                facet_count = self.snapshot(self.REMOVE_FILTER_BUTTON)[0]["count"]
+                self.reload_view(lambda: self.click_with_retry(self.REMOVE_FILTER_BUTTON, timeout=3000),
+                                 facet_count=facet_count - 1)
+        except OdooClientError:
+            raise
         except:
             # Continue even if removing filter fails
             pass
     
+    def remove_all_filters(self, max_facets=10):
+        """Remove every applied facet, one remove button at a time"""
+        for _ in range(max_facets):
+            if not self.is_element_visible(self.REMOVE_FILTER_BUTTON, timeout=1000):
+                return True
+            self.remove_filter()
+        return False
+    
+    def get_record_count(self):
+        """Get the number of records matching the current search from the pager"""
+        try:
+            if self.is_element_visible(self.PAGER_TOTAL, timeout=1000):
+                return int(self.page.text_content(self.PAGER_TOTAL).strip())
+            # Pager is hidden when every record fits on one page
+            return len(self.page.query_selector_all(self.STUDENT_CARDS))
+        except Exception as e:
+            print(f"Error getting record count: {str(e)}")
+            return -1
+    
     def get_filter_facet_text(self):
         """Get the text of the currently applied filter facet"""
         return self.get_element_text(self.FILTER_FACET_TEXT, timeout=3000)
@@ -259,6 +312,12 @@ class StudentFilterPage(BasePage):
         """Check if the missing document button is available on student details page"""
         return self.is_element_visible(self.MISSING_DOCUMENT_BUTTON, timeout=3000)
     
+    def open_student(self, student_id):
+        """Open a student's form directly by id, e.g. a record leased from the fixture pool"""
+        self.page.goto(self.student_form_url(self.page.url, student_id))
+        self.wait_for_loading()
+        return self.is_element_visible(self.STUDENT_FORM_VIEW, timeout=5000)
+    
     def go_back_to_student_list(self):
         """Go back to the student list from details page"""
         try:
@@ -2,9 +2,25 @@
 from ...base_page import BasePage
 import time
 import os
+import re
 
-class StudentInscritPage(BasePage):
-    """Page object for the student enrollment (inscrit) page in Kanban view"""
+
+def parse_pager_text(text):
+    """
+    Parse Odoo pager text such as "1-80 / 321" or "81-160/321"
+    
+    Returns:
+        tuple: (first, last, total) or None if the text can't be parsed
+    """
+    match = re.search(r"(\d+)\s*(?:-\s*(\d+))?\s*/\s*(\d+)", text or "")
+    if not match:
+        return None
+    first = int(match.group(1))
+    last = int(match.group(2) or first)
+    return first, last, int(match.group(3))
+
+class StudentInscritLocators:
+    """Selectors of the student enrollment page, shared by StudentInscritPage and its async twin"""
     
     # Navigation selectors
     WORKSPACE_BUTTON = "//button[@title='Espace de travail']"
@@ -26,9 +42,61 @@ class StudentInscritPage(BasePage):
     NEXT_PAGE_BUTTON = "(//button[contains(@class,'btn btn-secondary')])[3]"
     PREV_PAGE_BUTTON = "(//button[contains(@class,'btn btn-secondary')])[2]"
     PAGINATION_INFO = "//nav[contains(@class,'o_pager d-flex')]"
+    PAGER_VALUE = "//span[contains(@class,'o_pager_value')]"
+    PAGER_VALUE_INPUT = "//input[contains(@class,'o_pager_value')]"
+    PAGER_NEXT = "button.o_pager_next"
+    
+    # Records per page for full-roster crawls (Odoo default is 80)
+    CRAWL_PAGE_SIZE = 500
+    
+    # Extract name/class/enrolled for every card in a single evaluate
+    STUDENTS_INFO_SCRIPT = """
+    () => {
+        const studentCards = document.querySelectorAll('.o_kanban_record:not(.o_kanban_ghost)');
+        return Array.from(studentCards).map(card => {
+            // Get student name
+            const nameElement = card.querySelector('.o_kanban_record_title');
+            const name = nameElement ? nameElement.textContent.trim() : 'Unknown';
+            
+            // Get student class
+            const classElement = card.querySelector('.o_kanban_record_subtitle');
+            const classInfo = classElement ? classElement.textContent.trim() : '--';
+            
+            // Check if enrolled (has success icon)
+            const enrolledIcon = card.querySelector('.text-success') || 
+                                card.querySelector('i.fa-check-circle') ||
+                                card.querySelector('i[title="circle-success"]');
+            
+            return {
+                name: name,
+                class: classInfo,
+                enrolled: !!enrolledIcon
+            };
+        });
+    }
+    """
+    
+    # True once the pager shows a range starting after prevFirst (or a new size)
+    # and the kanban renders exactly that many records
+    PAGE_RENDERED_SCRIPT = """
+    ([prevText]) => {
+        const pager = document.querySelector('.o_pager');
+        const value = document.querySelector('.o_pager_value');
+        if (!pager || !value || document.querySelector('.o_loading')) return false;
+        const text = pager.textContent;
+        if (text === prevText) return false;
+        const match = value.textContent.match(/(\\d+)\\s*-\\s*(\\d+)/);
+        const expected = match ? Number(match[2]) - Number(match[1]) + 1 : 1;
+        const records = document.querySelectorAll('.o_kanban_record:not(.o_kanban_ghost)').length;
+        return records === expected;
+    }
+    """
     
     # Search and actions
     SEARCH_INPUT = "//input[contains(@class,'o_searchview_input o_input')]"
+
+class StudentInscritPage(StudentInscritLocators, BasePage):
+    """Page object for the student enrollment (inscrit) page in Kanban view"""
     
     def __init__(self, page):
         super().__init__(page)
@@ -37,10 +105,10 @@ class StudentInscritPage(BasePage):
     def wait_for_page_loaded(self):
         """Wait for the student page to be fully loaded"""
         # Wait for kanban view to be visible
-        self.page.wait_for_selector(self.KANBAN_VIEW, state="visible", timeout=10000)
+        self.page.wait_for_selector(self.KANBAN_VIEW, state="visible", timeout=self._scaled(10000))
         
         # Wait for at least one student card to appear
-        self.page.wait_for_selector(self.STUDENT_CARDS, state="visible", timeout=10000)
+        self.page.wait_for_selector(self.STUDENT_CARDS, state="visible", timeout=self._scaled(10000))
         
         # Additional wait for all elements to settle
         self.page.wait_for_load_state("networkidle")
@@ -71,21 +139,23 @@ class StudentInscritPage(BasePage):
     
     def is_student_page_displayed(self):
         """Verify we are on the student enrollment page"""
-        return (
-            self.page.is_visible(self.KANBAN_VIEW) and
-            self.page.is_visible(self.STUDENT_CARDS) and
-            self.page.is_visible(self.PAGINATION_INFO)
-        )
+        # One read for the three checks, free until the DOM changes
+        return all(state["visible"] for state in
+                   self.snapshot(self.KANBAN_VIEW, self.STUDENT_CARDS, self.PAGINATION_INFO))
+    
+    def _pager_text(self, timeout=None):
+        """Pager text from the query cache, waiting for the pager only when it is not rendered yet"""
+        state = self.snapshot(self.PAGINATION_INFO)[0]
+        if state["count"]:
+            return state["text"]
+        return self.page.text_content(self.PAGINATION_INFO, timeout=self._scaled(timeout))
     
     def get_total_students_count(self):
         """Get the total number of students from pagination info"""
         try:
-            pagination_text = self.page.text_content(self.PAGINATION_INFO)
             # Extract numbers from text like "1-80 / 321"
-            if "/" in pagination_text:
-                total = pagination_text.split("/")[1].strip()
-                return int(total)
-            return 0
+            state = parse_pager_text(self._pager_text())
+            return state[2] if state else 0
         except Exception as e:
             print(f"Error getting total students count: {str(e)}")
             return 0
@@ -93,80 +163,96 @@ class StudentInscritPage(BasePage):
     def get_visible_students_count(self):
         """Get the number of student cards visible on the current page"""
         try:
-            return len(self.page.query_selector_all(self.STUDENT_CARDS))
+            return self.snapshot(self.STUDENT_CARDS)[0]["count"]
         except Exception as e:
             print(f"Error getting visible students count: {str(e)}")
             return 0
     
-    def get_all_enrolled_students(self):
+    def get_pager_state(self):
+        """Get (first, last, total) from the pager, or None if there is no pager"""
+        try:
+            return parse_pager_text(self._pager_text(timeout=2000))
+        except Exception:
+            return None
+    
+    def _wait_for_page_rendered(self, previous_text, timeout=30000):
+        """Wait until the pager changed and the kanban shows every record of the new range"""
+        self.page.wait_for_function(self.PAGE_RENDERED_SCRIPT, arg=[previous_text], timeout=self._scaled(timeout))
+    
+    def set_page_size(self, page_size):
         """
-        Get all enrolled students across all pages without duplicates
+        Show up to page_size records per page by editing the pager value
+        
+        Args:
+            page_size: Number of records per page
         
         Returns:
-            tuple: (total_enrolled_count, list_of_enrolled_students)
+            bool: True if the pager now shows the requested range
         """
-        all_enrolled_students = []
-        current_page = 1
-        max_pages = 10  # Safety limit to prevent infinite loops
-        
-        # Get total students from pagination info
-        total_students = self.get_total_students_count()
-        print(f"Total students according to pagination: {total_students}")
-        
-        # Calculate expected number of pages
-        students_per_page = 80  
-        expected_pages = (total_students + students_per_page - 1) // students_per_page
-        print(f"Expected number of pages: {expected_pages}")
-        
-        # Process the first page
-        students_info = self.get_students_info()
-        enrolled_students = [s for s in students_info if s.get("enrolled", False)]
-        all_enrolled_students.extend(enrolled_students)
+        state = self.get_pager_state()
+        if not state:
+            return False
+        first, last, total = state
+        if last - first + 1 >= min(page_size, total - first + 1):
+            return True
+        try:
+            previous_text = self.page.text_content(self.PAGINATION_INFO)
+            self.page.click(self.PAGER_VALUE)
+            self.page.fill(self.PAGER_VALUE_INPUT, f"{first}-{first + page_size - 1}")
+            self.page.press(self.PAGER_VALUE_INPUT, "Enter")
+            self._wait_for_page_rendered(previous_text)
+            return True
+        except Exception as e:
+            print(f"Error setting page size to {page_size}: {str(e)}")
+            return False
+    
+    def iter_students(self, page_size=None):
+        """
+        Yield every student of the current search, page by page
         
-        print(f"Page {current_page}: Found {len(enrolled_students)} enrolled students")
+        The pager is widened to page_size records per page, each page is extracted
+        with a single evaluate, and the crawl stops when the pager range reaches the
+        total shown in "x-y / total" - there is no page cap. A page that cannot be
+        read, or renders another number of cards than its range, raises
+        RuntimeError instead of being skipped.
         
-        # Take screenshot of first page
-        os.makedirs("reports/screenshots", exist_ok=True)
-        self.page.screenshot(path=f"reports/screenshots/enrolled_students_page_{current_page}.png")
+        Args:
+            page_size: Records per page (defaults to CRAWL_PAGE_SIZE)
         
-        # Check if there are more pages
-        has_next = self.page.evaluate("""
-        () => {
-            const nextButton = document.querySelector('button.o_pager_next');
-            return nextButton && !nextButton.disabled;
-        }
-        """)
+        Yields:
+            dict: Student info with name, class and enrolled keys
+        """
+        self.set_page_size(page_size or self.CRAWL_PAGE_SIZE)
         
-        # Navigate through remaining pages
-        while has_next and current_page < expected_pages and current_page < max_pages:
-            # Go to next page
-            self.page.click('button.o_pager_next')
-            self.wait_for_loading()
-            current_page += 1
+        while True:
+            state = self.get_pager_state()
+            students = self.cached_evaluate(self.STUDENTS_INFO_SCRIPT)
+            if state and len(students) != state[1] - state[0] + 1:
+                raise RuntimeError(f"Students {state[0]}-{state[1]} / {state[2]}: "
+                                   f"{len(students)} cards rendered")
+            for student in students:
+                yield student
             
-            # Get enrolled students on this page
-            students_info = self.get_students_info()
-            enrolled_students = [s for s in students_info if s.get("enrolled", False)]
-            all_enrolled_students.extend(enrolled_students)
+            if not state or state[1] >= state[2]:
+                return
             
-            print(f"Page {current_page}: Found {len(enrolled_students)} enrolled students")
-            
-            # Take screenshot of this page
-            self.page.screenshot(path=f"reports/screenshots/enrolled_students_page_{current_page}.png")
-            
-            # Check if there's another page
-            has_next = self.page.evaluate("""
-            () => {
-                const nextButton = document.querySelector('button.o_pager_next');
-                return nextButton && !nextButton.disabled;
-            }
-            """)
+            previous_text = self.page.text_content(self.PAGINATION_INFO)
+            self.page.click(self.PAGER_NEXT)
+            self._wait_for_page_rendered(previous_text)
+    
+    def get_all_enrolled_students(self, page_size=None):
+        """
+        Get all enrolled students across all pages
         
-        # Don't attempt to go back to the first page - this is causing issues
-        # Just return the collected information
+        Args:
+            page_size: Records per page while crawling (defaults to CRAWL_PAGE_SIZE)
         
-        total_enrolled = len(all_enrolled_students)
-        return total_enrolled, all_enrolled_students
+        Returns:
+            tuple: (total_enrolled_count, list_of_enrolled_students)
+        """
+        all_enrolled_students = [s for s in self.iter_students(page_size) if s.get("enrolled", False)]
+        return len(all_enrolled_students), all_enrolled_students
+    
     def navigate_to_next_page(self):
         """Click the next page button if available"""
         try:
@@ -194,34 +280,8 @@ class StudentInscritPage(BasePage):
     def get_students_info(self):
         """Get list of visible students with their info using JavaScript evaluation"""
         try:
-            # Use JavaScript to extract all student info at once
-            students_info = self.page.evaluate("""
-            () => {
-                const studentCards = document.querySelectorAll('.o_kanban_record');
-                return Array.from(studentCards).map(card => {
-                    // Get student name
-                    const nameElement = card.querySelector('.o_kanban_record_title');
-                    const name = nameElement ? nameElement.textContent.trim() : 'Unknown';
-                    
-                    // Get student class
-                    const classElement = card.querySelector('.o_kanban_record_subtitle');
-                    const classInfo = classElement ? classElement.textContent.trim() : '--';
-                    
-                    // Check if enrolled (has success icon)
-                    const enrolledIcon = card.querySelector('.text-success') || 
-                                        card.querySelector('i.fa-check-circle') ||
-                                        card.querySelector('i[title="circle-success"]');
-                    
-                    return {
-                        name: name,
-                        class: classInfo,
-                        enrolled: !!enrolledIcon
-                    };
-                });
-            }
-            """)
-            
-            return students_info
+            # Use JavaScript to extract all student info at once, cached until the cards change
+            return self.cached_evaluate(self.STUDENTS_INFO_SCRIPT)
         except Exception as e:
             print(f"Error getting students info: {str(e)}")
             # Take a screenshot for debugging
@@ -2,10 +2,11 @@
 from ...base_page import BasePage
 import time
 import os
+import re
 import allure
 
-class StudentListActionsPage(BasePage):
-    """Page object for various actions on student list view, including export"""
+class StudentListActionsLocators:
+    """Selectors of the student list actions page, shared by StudentListActionsPage and its async twin"""
     
       # Navigation selectors
     WORKSPACE_BUTTON = "//button[@title='Espace de travail']"
@@ -38,6 +39,15 @@ class StudentListActionsPage(BasePage):
     DEFAULT_EXCEL_FILENAME = "Statut de lapprenant (acces.statut.apprenant).xlsx"
     DEFAULT_CSV_FILENAME = "Statut de lapprenant (acces.statut.apprenant).csv"
     
+    @staticmethod
+    def parse_selected_count(count_text):
+        """Extract the number from a selection text like "80 sélectionné(s)", 0 if there is none"""
+        match = re.search(r'(\d+)', count_text or "")
+        return int(match.group(1)) if match else 0
+
+class StudentListActionsPage(StudentListActionsLocators, BasePage):
+    """Page object for various actions on student list view, including export"""
+    
     def __init__(self, page):
         super().__init__(page)
         self.page = page
@@ -84,14 +94,7 @@ class StudentListActionsPage(BasePage):
     def get_selected_count(self):
         """Get the number of selected students from the UI"""
         try:
-            count_text = self.get_element_text(self.SELECTED_COUNT_TEXT)
-            if count_text:
-                # Extract number from text like "80 sélectionné(s)"
-                import re
-                match = re.search(r'(\d+)', count_text)
-                if match:
-                    return int(match.group(1))
-            return 0
+            return self.parse_selected_count(self.get_element_text(self.SELECTED_COUNT_TEXT))
         except:
             return 0
     
@@ -0,0 +1,13 @@
+# pages/aio/__init__.py
+"""
+asyncio twins of the page objects, built on playwright.async_api.
+
+Each async page inherits the same *Locators mixin as its sync counterpart, so
+selectors, labels and pure helpers live in one place and only the driving code
+differs. One event loop can run many of these pages concurrently:
+
+    pages = [AsyncStudentFilterPage(await context.new_page()) for _ in filters]
+    await asyncio.gather(*(p.apply_filter(f) for p, f in zip(pages, filters)))
+
+Sync tests reach them through the async_runner fixture (utils/async_runner.py).
+"""
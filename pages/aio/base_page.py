@@ -0,0 +1,242 @@
+# pages/aio/base_page.py
+import asyncio
+from contextlib import asynccontextmanager
+
+from utils.error_sentinel import ErrorSentinel, OdooClientError
+from utils.selector_registry import registry as selector_registry
+from utils.query_cache import QueryCache, SNAPSHOT_SCRIPT, cacheable
+from utils.perf_profiles import page_timeout_factor
+from utils.step_profiler import StepProfiler
+from utils.view_readiness import VIEW_READY_SCRIPT, VIEW_STATE_SCRIPT, expected_view, is_search_read_response
+from ..base_page import BaseLocators
+
+
+class AsyncBasePage(BaseLocators):
+    """asyncio twin of pages.base_page.BasePage"""
+    
+    def __init__(self, page):
+        """Initialize base page with a playwright.async_api Page"""
+        self.page = page
+        self.timeout_factor = page_timeout_factor(page)
+        self.default_timeout = 8000
+    
+    def _scaled(self, timeout):
+        """Milliseconds of an explicit timeout on this page (longer under a perf profile); None keeps the default"""
+        return timeout * self.timeout_factor if timeout else timeout
+    
+    async def check_client_errors(self):
+        """Raise OdooClientError if the server or the web client reported an error on this page"""
+        sentinel = ErrorSentinel.of(self.page)
+        if sentinel:
+            sentinel.check()
+    
+    async def raise_error_dialog(self):
+        """Raise the error behind the visible error dialog, with the server traceback when known"""
+        await self.check_client_errors()
+        dialog = self.page.locator(self.ERROR_DIALOG).first
+        raise OdooClientError("dialog", "error dialog shown", await dialog.inner_text(), self.page.url)
+    
+    async def wait_for_visible(self, selector, timeout=None):
+        """Wait for an element, failing at once if Odoo shows an error dialog instead"""
+        await self.page.locator(selector).or_(self.page.locator(self.ERROR_DIALOG)).first.wait_for(
+            state="visible", timeout=self._scaled(timeout or self.default_timeout))
+        if await self.page.locator(self.ERROR_DIALOG).first.is_visible():
+            await self.raise_error_dialog()
+        await self.check_client_errors()
+    
+    async def query_candidates(self, name, candidates):
+        """Elements of a logical element, trying first the candidate that matched last time"""
+        return await selector_registry.query_all_async(self.page, name, candidates)
+    
+    async def snapshot(self, *selectors):
+        """Count, visibility and text of the first match of each selector, served from the QueryCache"""
+        cache = QueryCache.of(self.page)
+        if cache:
+            return await cache.snapshot_async(self.page, list(selectors))
+        return await self.page.evaluate(SNAPSHOT_SCRIPT, list(selectors))
+    
+    async def cached_evaluate(self, script, arg=None):
+        """page.evaluate of a read-only script, served from the QueryCache until the DOM changes"""
+        cache = QueryCache.of(self.page)
+        if cache:
+            return await cache.evaluate_async(self.page, script, arg)
+        return await self.page.evaluate(script, arg)
+    
+    @asynccontextmanager
+    async def profiled_step(self, name, budget_ms=None):
+        """Named step whose JS CPU profile is kept when it runs over budget (see utils.step_profiler)"""
+        profiler = StepProfiler.of(self.page)
+        if profiler is None:
+            yield
+            return
+        async with profiler.step_async(self.page, name, budget_ms):
+            yield
+    
+    async def wait_for_loading(self, timeout=8000):
+        """Wait for the Odoo loading indicator to disappear"""
+        try:
+            await self.page.wait_for_selector(self.LOADING, state="visible", timeout=self._scaled(1000))
+            await self.page.wait_for_selector(self.LOADING, state="hidden", timeout=self._scaled(timeout))
+        except Exception:
+            # If loading indicator never appears, that's fine
+            pass
+        
+        try:
+            await self.page.wait_for_load_state("networkidle", timeout=self._scaled(timeout))
+        except Exception:
+            pass
+        
+        await self.check_client_errors()
+    
+    async def wait_for_view_ready(self, expected=None, facets=None, facet_count=None, timeout=10000):
+        """Wait until the list or kanban view shows the result of the last search"""
+        try:
+            await self.page.wait_for_function(VIEW_READY_SCRIPT, arg=[expected, facets, facet_count],
+                                               timeout=self._scaled(timeout))
+            await self.check_client_errors()
+            return True
+        except OdooClientError:
+            raise
+        except Exception:
+            await self.check_client_errors()
+            try:
+                state = await self.page.evaluate(VIEW_STATE_SCRIPT)
+            except Exception:
+                state = None
+            print(f"View not ready after {self._scaled(timeout)}ms: showing {state}, expected {expected}, "
+                  f"facets {facets}, facet count {facet_count}")
+            return False
+    
+    async def reload_view(self, action, facets=None, facet_count=None, timeout=10000):
+        """Run a coroutine function that searches again and wait until the view shows its answer"""
+        expected = None
+        acted = False
+        try:
+            async with self.page.expect_response(is_search_read_response,
+                                                 timeout=self._scaled(timeout)) as response_info:
+                await action()
+                acted = True
+            expected = expected_view(await (await response_info.value).json())
+        except OdooClientError:
+            raise
+        except Exception as e:
+            if not acted:
+                raise
+            print(f"No search answer seen ({str(e).splitlines()[0]}), checking the view against its pager")
+        return await self.wait_for_view_ready(expected, facets, facet_count, timeout)
+    
+    async def navigate_to_module(self, module_name):
+        """Navigate to a specific module from the main menu using the span selector"""
+        module_selector = self.MODULE_MENU_ITEM.format(module_name=module_name)
+        try:
+            await self.wait_for_visible(module_selector, timeout=8000)
+            await self.page.click(module_selector)
+            await self.wait_for_loading()
+            await self.wait_for_visible(self.ACTION_MANAGER, timeout=8000)
+            return True
+        except OdooClientError:
+            raise
+        except Exception as e:
+            print(f"Error navigating to module {module_name}: {str(e)}")
+            return False
+    
+    async def click_with_retry(self, selector, max_retries=3, timeout=1000):
+        """Click with retry for handling potential flakiness"""
+        for attempt in range(max_retries):
+            try:
+                await self.wait_for_visible(selector, timeout=timeout)
+                await self.page.click(selector)
+                await asyncio.sleep(0.3)
+                return True
+            except OdooClientError:
+                raise
+            except Exception as e:
+                if attempt == max_retries - 1:
+                    await self.take_screenshot(f"click_retry_failure_{self.selector_to_filename(selector)}")
+                    raise e
+                await asyncio.sleep(0.5)
+        
+        return False
+    
+    async def get_element_text(self, selector, timeout=5000):
+        """Get text content of an element"""
+        try:
+            if cacheable(selector):
+                element, dialog = await self.snapshot(selector, self.ERROR_DIALOG)
+                if dialog["visible"]:
+                    await self.raise_error_dialog()
+                if element["visible"]:
+                    await self.check_client_errors()
+                    return element["text"].strip()
+            await self.wait_for_visible(selector, timeout=timeout)
+            return (await self.page.text_content(selector)).strip()
+        except OdooClientError:
+            raise
+        except Exception:
+            return None
+    
+    async def is_element_visible(self, selector, timeout=3000):
+        """Check if element is visible - with reduced timeout"""
+        try:
+            if cacheable(selector):
+                return (await self.snapshot(selector))[0]["visible"]
+            return await self.page.is_visible(selector, timeout=self._scaled(timeout))
+        except Exception:
+            return False
+    
+    async def take_screenshot(self, name):
+        """Take a screenshot and save it with the given name"""
+        path = self.screenshot_path(name)
+        try:
+            await self.page.screenshot(path=path, mask=[self.page.locator(s) for s in self.DYNAMIC_REGIONS])
+            return path
+        except Exception:
+            print(f"Failed to take screenshot {name}")
+            return None
+    
+    async def is_enabled(self, selector):
+        """Check if element is enabled (not disabled)"""
+        try:
+            element = await self.page.query_selector(selector)
+            if element:
+                disabled = await element.get_attribute("disabled")
+                return disabled is None or disabled.lower() != "true"
+            return False
+        except Exception:
+            return False
+    
+    async def fill_field(self, selector, value, clear_first=True):
+        """Fill a form field with the given value"""
+        try:
+            await self.wait_for_visible(selector, timeout=5000)
+            if clear_first:
+                await self.page.fill(selector, "")
+            await self.page.fill(selector, value)
+            return True
+        except OdooClientError:
+            raise
+        except Exception:
+            return False
+    
+    async def select_dropdown_option(self, dropdown_selector, option_text):
+        """Select an option from a dropdown by visible text"""
+        try:
+            await self.page.click(dropdown_selector)
+            await asyncio.sleep(0.3)
+            await self.page.click(self.DROPDOWN_OPTION.format(option_text=option_text))
+            return True
+        except Exception:
+            return False
+    
+    async def wait_for_notification(self, expected_text=None, timeout=5000):
+        """Wait for notification and optionally verify its text"""
+        try:
+            await self.wait_for_visible(self.NOTIFICATION, timeout=timeout)
+            if expected_text:
+                actual_text = await self.page.text_content(self.NOTIFICATION_CONTENT)
+                return expected_text.lower() in actual_text.lower()
+            return True
+        except OdooClientError:
+            raise
+        except Exception:
+            return False
@@ -0,0 +1,120 @@
+# pages/aio/login_page.py
+import os
+import time
+
+from ..login_page import LoginLocators
+from .base_page import AsyncBasePage
+
+
+class AsyncLoginPage(LoginLocators, AsyncBasePage):
+    """asyncio twin of pages.login_page.LoginPage"""
+    
+    def __init__(self, page, base_url="https://dev.nawat.ma"):
+        super().__init__(page)
+        self.base_url = base_url.rstrip("/")
+        self.current_language = "en"
+    
+    async def navigate(self, language_code=None):
+        """Navigate to the login page, optionally directly in 'en', 'fr' or 'ar'"""
+        if language_code and language_code not in self.LANGUAGE_CODES:
+            raise ValueError(f"Unsupported language code: {language_code}")
+        await self.page.goto(self.login_url(language_code))
+        if language_code:
+            self.current_language = language_code
+        for selector in (self.USERNAME_INPUT, self.PASSWORD_INPUT, self.LOGIN_BUTTON):
+            await self.page.wait_for_selector(selector, state="visible")
+    
+    async def switch_language(self, language_code):
+        """
+        Switch the interface language
+        
+        Args:
+            language_code: 'en' for English, 'fr' for French, 'ar' for Arabic
+        
+        Returns:
+            bool: True if switch was successful, False otherwise
+        """
+        if language_code not in self.LANGUAGE_OPTIONS:
+            print(f"Unsupported language code: {language_code}")
+            return False
+        
+        os.makedirs("reports/screenshots", exist_ok=True)
+        try:
+            await self.page.click(self.LANGUAGE_DROPDOWN)
+            await self.page.click(self.LANGUAGE_OPTIONS[language_code])
+            await self.page.wait_for_load_state("networkidle")
+            await self.page.screenshot(path=f"reports/screenshots/language_switch_{language_code}.png")
+            self.current_language = language_code
+            return True
+        except Exception as e:
+            print(f"Error switching language: {str(e)}")
+            await self.page.screenshot(path=f"reports/screenshots/language_switch_failure_{language_code}.png")
+            return False
+    
+    async def verify_login_form_elements(self):
+        """
+        Verify that login form elements match the current language
+        
+        Returns:
+            dict: Results of verification for each element
+        """
+        results = {}
+        lang = self.current_language
+        os.makedirs("reports/screenshots", exist_ok=True)
+        
+        try:
+            results["username_label"] = await self.page.locator(
+                "label", has_text=self.LABELS[lang]["username_label"]).is_visible()
+            results["password_label"] = await self.page.locator(
+                "label", has_text=self.LABELS[lang]["password_label"]).is_visible()
+            button_text = await self.page.text_content(self.LOGIN_BUTTON)
+            results["submit_button"] = self.LABELS[lang]["submit_button"] in button_text
+            await self.page.screenshot(path=f"reports/screenshots/verify_elements_{lang}.png")
+            return results
+        except Exception as e:
+            print(f"Error verifying form elements: {str(e)}")
+            await self.page.screenshot(path=f"reports/screenshots/verify_elements_failure_{lang}.png")
+            return {"error": str(e)}
+    
+    async def login(self, username, password):
+        """Login with the given credentials"""
+        await self.page.fill(self.USERNAME_INPUT, "")
+        await self.page.fill(self.PASSWORD_INPUT, "")
+        await self.page.fill(self.USERNAME_INPUT, username)
+        await self.page.fill(self.PASSWORD_INPUT, password)
+        await self.page.click(self.LOGIN_BUTTON)
+        
+        os.makedirs("reports/screenshots", exist_ok=True)
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        try:
+            if await self.page.is_visible(", ".join(self.ERROR_SELECTORS), timeout=self._scaled(5000)):
+                await self.page.screenshot(path=f"reports/screenshots/login_error_{timestamp}.png")
+                return False
+            
+            await self.page.wait_for_selector(self.MAIN_NAVBAR, state="visible", timeout=self._scaled(15000))
+            await self.page.wait_for_selector(self.APP_CONTENT, state="visible", timeout=self._scaled(15000))
+            if not await self.page.is_visible(self.MAIN_NAVBAR, timeout=self._scaled(2000)):
+                return False
+            
+            await self.page.screenshot(path=f"reports/screenshots/login_success_{timestamp}.png")
+            return True
+        except Exception as e:
+            await self.page.screenshot(path=f"reports/screenshots/login_failure_{timestamp}.png")
+            print(f"Login failed with error: {str(e)}")
+            return False
+    
+    async def get_error_message(self):
+        """Get the error message text if login failed"""
+        for selector in self.ERROR_SELECTORS:
+            if await self.page.is_visible(selector):
+                return (await self.page.text_content(selector)).strip()
+        return None
+    
+    async def verify_error_message(self):
+        """
+        Verify that the error message matches the expected message in the current language
+        
+        Returns:
+            bool: True if error message matches expected text for current language
+        """
+        return self.error_matches(await self.get_error_message())
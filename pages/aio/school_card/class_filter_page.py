@@ -0,0 +1,181 @@
+# pages/aio/school_card/class_filter_page.py
+import asyncio
+import os
+
+from ...access.school_card.class_filter_page import ClassFilterLocators
+from ..base_page import AsyncBasePage
+from utils.error_sentinel import OdooClientError
+
+
+class AsyncClassFilterPage(ClassFilterLocators, AsyncBasePage):
+    """asyncio twin of ClassFilterPage"""
+    
+    def __init__(self, page):
+        super().__init__(page)
+        self.wait_timeout = 5000
+        self.quick_timeout = 1500
+        self.micro_timeout = 500
+    
+    async def navigate_from_login(self):
+        """Navigate to the student page through the menu structure after login"""
+        for selector in (self.WORKSPACE_BUTTON, self.ACCESS_MODULE, self.CARTE_SCOLAIRE_MENU):
+            await self.click_with_retry(selector)
+        async with self.profiled_step("open_students"):
+            await self.click_with_retry(self.APPRENANT_SUBMENU)
+            await self.wait_for_page_loaded()
+        os.makedirs("reports/screenshots", exist_ok=True)
+    
+    async def wait_for_page_loaded(self):
+        """Wait until the kanban view renders every record its pager announces"""
+        await self.wait_for_view_ready(timeout=self.wait_timeout)
+    
+    async def _query_sidebar_elements(self):
+        """Sidebar item handles, with the candidate selector that matched last time"""
+        _, elements = await self.query_candidates("sidebar_item", self.SIDEBAR_ITEM_CANDIDATES)
+        return elements
+    
+    async def expand_all_sidebar_items(self):
+        """
+        Expand all sidebar items
+        
+        Returns:
+            bool: True if expansion was successful
+        """
+        try:
+            clicked = 0
+            for element in await self._query_sidebar_elements():
+                try:
+                    await element.click()
+                    clicked += 1
+                except Exception:
+                    continue
+            print(f"✅ Clicked {clicked} elements")
+            await asyncio.sleep(1.5)
+            return clicked > 0
+        except Exception as e:
+            print(f"❌ Expansion error: {e}")
+            return False
+    
+    async def get_all_sidebar_items(self):
+        """
+        Get all sidebar items
+        
+        Returns:
+            list: List of (element, title, is_class) tuples
+        """
+        items = []
+        try:
+            for i, element in enumerate(await self._query_sidebar_elements()):
+                try:
+                    title_element = await element.query_selector(self.ITEM_TITLE) or await element.query_selector("span")
+                    title = (await title_element.text_content()).strip() if title_element else ""
+                    if title:
+                        items.append((element, title, self.is_class_item(title)))
+                except Exception as e:
+                    print(f"⚠️  Error processing element {i}: {e}")
+            print(f"🎓 Total classes detected: {sum(is_class for _, _, is_class in items)}")
+        except Exception as e:
+            print(f"❌ Error getting sidebar items: {e}")
+        return items
+    
+    async def click_sidebar_item_safe(self, element, title):
+        """
+        Click on a sidebar item
+        
+        Returns:
+            bool: True once the kanban shows the class's students, False if the click
+            failed or the view never became consistent
+        """
+        try:
+            async with self.profiled_step("search_panel_click"):
+                return await self.reload_view(element.click, timeout=self.wait_timeout)
+        except OdooClientError:
+            raise
+        except Exception:
+            return False
+    
+    async def has_students(self):
+        """
+        Check if there are any students displayed
+        
+        Returns:
+            bool: True if there are students, False if no students
+        """
+        try:
+            no_students = await self.page.query_selector(self.NO_STUDENTS_MESSAGE)
+            if no_students and await no_students.is_visible():
+                return False
+            return len(await self.page.query_selector_all(self.STUDENT_CARDS)) > 0
+        except Exception:
+            return False
+    
+    async def verify_students_match_class(self, class_name):
+        """
+        Verify that all students have the correct class
+        
+        Returns:
+            tuple: (success, details)
+        """
+        async def text_of(card, selector, default):
+            element = await card.query_selector(selector)
+            return (await element.text_content()).strip() if element else default
+        
+        try:
+            student_cards = await self.page.query_selector_all(self.STUDENT_CARDS)
+            matching = 0
+            mismatched_students = []
+            for i, card in enumerate(student_cards):
+                try:
+                    actual_class = await text_of(card, self.STUDENT_CLASS, None)
+                    if actual_class is None:
+                        continue
+                    if actual_class == class_name:
+                        matching += 1
+                    else:
+                        mismatched_students.append({
+                            "index": i+1,
+                            "name": await text_of(card, self.STUDENT_NAME, f"Student {i+1}"),
+                            "id": await text_of(card, self.STUDENT_ID_SELECTOR, "Unknown ID"),
+                            "expected_class": class_name,
+                            "actual_class": actual_class
+                        })
+                except Exception:
+                    continue
+            
+            return len(mismatched_students) == 0, {
+                "total": len(student_cards),
+                "matching": matching,
+                "mismatched_students": mismatched_students,
+            }
+        except Exception:
+            return False, {"error": "Verification failed"}
+    
+    async def debug_sidebar_structure(self):
+        """Print what the sidebar selectors match, with a screenshot"""
+        try:
+            await self.page.screenshot(path="reports/screenshots/debug_sidebar.png")
+        except Exception:
+            pass
+        for selector in self.SIDEBAR_ITEM_CANDIDATES:
+            try:
+                elements = await self.page.query_selector_all(selector)
+                print(f"🔎 '{selector}': {len(elements)} elements")
+                for i, element in enumerate(elements[:5]):
+                    text = ((await element.text_content()) or "").strip()[:80]
+                    print(f"   [{i+1}] {text or 'No text'}")
+            except Exception as e:
+                print(f"❌ '{selector}': Error - {e}")
+    
+    async def refresh_sidebar_items(self):
+        """
+        Refresh the sidebar to get updated items after interactions
+        
+        Returns:
+            list: Updated list of sidebar items
+        """
+        try:
+            await asyncio.sleep(0.5)
+            return await self.get_all_sidebar_items()
+        except Exception as e:
+            print(f"Error refreshing sidebar: {e}")
+            return []
@@ -0,0 +1,188 @@
+# pages/aio/school_card/student_filter_page.py
+import os
+
+from ...access.school_card.student_filter_page import StudentFilterLocators
+from ..base_page import AsyncBasePage
+from utils.error_sentinel import OdooClientError
+
+
+class AsyncStudentFilterPage(StudentFilterLocators, AsyncBasePage):
+    """asyncio twin of StudentFilterPage"""
+    
+    async def navigate_from_login(self):
+        """Navigate to the student page through the menu structure after login"""
+        for selector in (self.WORKSPACE_BUTTON, self.ACCESS_MODULE, self.CARTE_SCOLAIRE_MENU):
+            await self.click_with_retry(selector)
+        async with self.profiled_step("open_students"):
+            await self.click_with_retry(self.APPRENANT_SUBMENU)
+            await self.wait_for_page_loaded()
+        os.makedirs("reports/screenshots", exist_ok=True)
+    
+    async def wait_for_page_loaded(self):
+        """Wait until the kanban or list view renders every record its pager announces"""
+        await self.wait_for_view_ready(timeout=8000)
+    
+    async def open_filter_dropdown(self):
+        """Open the filter dropdown menu"""
+        try:
+            await self.click_with_retry(self.FILTER_DROPDOWN_BUTTON, timeout=5000)
+        except Exception:
+            pass
+    
+    async def apply_filter(self, filter_selector):
+        """
+        Apply a specific filter from the dropdown
+        
+        Returns:
+            bool: True once the view shows the filtered records, False otherwise
+        """
+        try:
+            await self.open_filter_dropdown()
+            label = await self.get_element_text(filter_selector, timeout=5000)
+            async with self.profiled_step("filter_apply"):
+                ready = await self.reload_view(lambda: self.click_with_retry(filter_selector, timeout=5000),
+                                               facets=[label] if label else None)
+            try:
+                # Focus on search input to close the dropdown
+                await self.page.click(self.SEARCH_INPUT)
+            except Exception:
+                pass
+            return ready
+        except Exception as e:
+            print(f"Error applying filter: {str(e)}")
+            return False
+    
+    async def remove_filter(self):
+        """Remove the currently applied filter"""
+        try:
+            if await self.is_element_visible(self.REMOVE_FILTER_BUTTON, timeout=3000):
+                facet_count = (await self.snapshot(self.REMOVE_FILTER_BUTTON))[0]["count"]
+                await self.reload_view(lambda: self.click_with_retry(self.REMOVE_FILTER_BUTTON, timeout=3000),
+                                       facet_count=facet_count - 1)
+        except OdooClientError:
+            raise
+        except Exception:
+            pass
+    
+    async def remove_all_filters(self, max_facets=10):
+        """Remove every applied facet, one remove button at a time"""
+        for _ in range(max_facets):
+            if not await self.is_element_visible(self.REMOVE_FILTER_BUTTON, timeout=1000):
+                return True
+            await self.remove_filter()
+        return False
+    
+    async def get_record_count(self):
+        """Get the number of records matching the current search from the pager"""
+        try:
+            if await self.is_element_visible(self.PAGER_TOTAL, timeout=1000):
+                return int((await self.page.text_content(self.PAGER_TOTAL)).strip())
+            return len(await self.page.query_selector_all(self.STUDENT_CARDS))
+        except Exception as e:
+            print(f"Error getting record count: {str(e)}")
+            return -1
+    
+    async def get_filter_facet_text(self):
+        """Get the text of the currently applied filter facet"""
+        return await self.get_element_text(self.FILTER_FACET_TEXT, timeout=3000)
+    
+    async def _count_sample_cards(self, card_selector_for):
+        """
+        Check up to 3 cards with a per-card selector
+        
+        Args:
+            card_selector_for: Callable building the selector for the 1-based card index
+        
+        Returns:
+            tuple: (cards checked, cards where the selector is visible)
+        """
+        cards_to_check = min(3, len(await self.page.query_selector_all(self.STUDENT_CARDS)))
+        matches = 0
+        for i in range(cards_to_check):
+            matches += await self.is_element_visible(card_selector_for(i + 1), timeout=1000)
+        return cards_to_check, matches
+    
+    async def check_all_students_have_label(self, label_selector):
+        """Check if a sample of visible student cards have the specified label"""
+        try:
+            checked, matches = await self._count_sample_cards(
+                lambda i: f"({self.STUDENT_CARD_CLICKABLE})[{i}] {label_selector}")
+            return checked > 0 and matches >= checked // 2
+        except Exception:
+            return False
+    
+    async def check_all_students_class_is_empty(self):
+        """Check if a sample of visible student cards have empty class information"""
+        try:
+            cards_to_check = min(3, len(await self.page.query_selector_all(self.STUDENT_CARDS)))
+            if cards_to_check == 0:
+                return False
+            empty_class_count = 0
+            for i in range(cards_to_check):
+                class_selector = f"({self.STUDENT_CARDS})[{i+1}]//i[contains(@class,'icon na-layer-group-2')]/following-sibling::span"
+                try:
+                    if await self.is_element_visible(class_selector, timeout=1000):
+                        class_text = await self.get_element_text(class_selector)
+                        if not class_text or class_text == "--":
+                            empty_class_count += 1
+                    else:
+                        empty_class_count += 1
+                except Exception:
+                    empty_class_count += 1
+            return empty_class_count >= cards_to_check // 2
+        except Exception:
+            return False
+    
+    async def check_all_students_have_sans_famille_image(self):
+        """Check if a sample of visible student cards have the 'non affecté' image"""
+        try:
+            checked, matches = await self._count_sample_cards(
+                lambda i: f"({self.STUDENT_CARDS})[{i}]{self.SANS_FAMILLE_IMAGE}")
+            return checked > 0 and matches >= checked // 2
+        except Exception:
+            return False
+    
+    async def click_first_student_card(self):
+        """Click on the first student card to open student details"""
+        first_card = f"({self.STUDENT_CARD_CLICKABLE})[1]"
+        try:
+            if await self.is_element_visible(first_card, timeout=3000):
+                await self.click_with_retry(first_card, timeout=3000)
+                await self.wait_for_loading()
+                return True
+            return False
+        except Exception:
+            return False
+    
+    async def check_settings_and_unarchive_option(self):
+        """Check if settings icon and unarchive option are available"""
+        try:
+            if not await self.is_element_visible(self.SETTINGS_ICON, timeout=3000):
+                return False
+            await self.click_with_retry(self.SETTINGS_ICON, timeout=3000)
+            return await self.is_element_visible(self.UNARCHIVE_OPTION, timeout=3000)
+        except Exception:
+            return False
+    
+    async def check_missing_document_button(self):
+        """Check if the missing document button is available on student details page"""
+        return await self.is_element_visible(self.MISSING_DOCUMENT_BUTTON, timeout=3000)
+    
+    async def open_student(self, student_id):
+        """Open a student's form directly by id, e.g. a record leased from the fixture pool"""
+        await self.page.goto(self.student_form_url(self.page.url, student_id))
+        await self.wait_for_loading()
+        return await self.is_element_visible(self.STUDENT_FORM_VIEW, timeout=5000)
+    
+    async def go_back_to_student_list(self):
+        """Go back to the student list from details page"""
+        try:
+            await self.page.go_back()
+            await self.wait_for_page_loaded()
+            return True
+        except Exception:
+            try:
+                await self.navigate_from_login()
+                return True
+            except Exception:
+                return False
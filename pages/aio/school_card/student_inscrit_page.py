@@ -0,0 +1,186 @@
+# pages/aio/school_card/student_inscrit_page.py
+import asyncio
+import os
+import time
+
+from ...access.school_card.student_inscrit_page import StudentInscritLocators, parse_pager_text
+from ..base_page import AsyncBasePage
+
+
+class AsyncStudentInscritPage(StudentInscritLocators, AsyncBasePage):
+    """asyncio twin of StudentInscritPage"""
+    
+    async def wait_for_page_loaded(self):
+        """Wait for the student page to be fully loaded"""
+        await self.page.wait_for_selector(self.KANBAN_VIEW, state="visible", timeout=self._scaled(10000))
+        await self.page.wait_for_selector(self.STUDENT_CARDS, state="visible", timeout=self._scaled(10000))
+        await self.page.wait_for_load_state("networkidle")
+        await asyncio.sleep(1)
+    
+    async def navigate_from_login(self):
+        """Navigate to the student page through the menu structure after login"""
+        for selector in (self.WORKSPACE_BUTTON, self.ACCESS_MODULE,
+                         self.CARTE_SCOLAIRE_MENU, self.APPRENANT_SUBMENU):
+            await self.click_with_retry(selector)
+        await self.wait_for_page_loaded()
+        os.makedirs("reports/screenshots", exist_ok=True)
+        await self.page.screenshot(path="reports/screenshots/navigation_to_student_page.png")
+    
+    async def is_student_page_displayed(self):
+        """Verify we are on the student enrollment page"""
+        return all(state["visible"] for state in
+                   await self.snapshot(self.KANBAN_VIEW, self.STUDENT_CARDS, self.PAGINATION_INFO))
+    
+    async def _pager_text(self, timeout=None):
+        """Pager text from the query cache, waiting for the pager only when it is not rendered yet"""
+        state = (await self.snapshot(self.PAGINATION_INFO))[0]
+        if state["count"]:
+            return state["text"]
+        return await self.page.text_content(self.PAGINATION_INFO, timeout=self._scaled(timeout))
+    
+    async def get_total_students_count(self):
+        """Get the total number of students from pagination info"""
+        try:
+            state = parse_pager_text(await self._pager_text())
+            return state[2] if state else 0
+        except Exception as e:
+            print(f"Error getting total students count: {str(e)}")
+            return 0
+    
+    async def get_visible_students_count(self):
+        """Get the number of student cards visible on the current page"""
+        try:
+            return (await self.snapshot(self.STUDENT_CARDS))[0]["count"]
+        except Exception as e:
+            print(f"Error getting visible students count: {str(e)}")
+            return 0
+    
+    async def get_pager_state(self):
+        """Get (first, last, total) from the pager, or None if there is no pager"""
+        try:
+            return parse_pager_text(await self._pager_text(timeout=2000))
+        except Exception:
+            return None
+    
+    async def _wait_for_page_rendered(self, previous_text, timeout=30000):
+        """Wait until the pager changed and the kanban shows every record of the new range"""
+        await self.page.wait_for_function(self.PAGE_RENDERED_SCRIPT, arg=[previous_text], timeout=self._scaled(timeout))
+    
+    async def set_page_size(self, page_size):
+        """
+        Show up to page_size records per page by editing the pager value
+        
+        Returns:
+            bool: True if the pager now shows the requested range
+        """
+        state = await self.get_pager_state()
+        if not state:
+            return False
+        first, last, total = state
+        if last - first + 1 >= min(page_size, total - first + 1):
+            return True
+        try:
+            previous_text = await self.page.text_content(self.PAGINATION_INFO)
+            await self.page.click(self.PAGER_VALUE)
+            await self.page.fill(self.PAGER_VALUE_INPUT, f"{first}-{first + page_size - 1}")
+            await self.page.press(self.PAGER_VALUE_INPUT, "Enter")
+            await self._wait_for_page_rendered(previous_text)
+            return True
+        except Exception as e:
+            print(f"Error setting page size to {page_size}: {str(e)}")
+            return False
+    
+    async def iter_students(self, page_size=None):
+        """
+        Yield every student of the current search, page by page (async generator)
+        
+        Raises RuntimeError on a page that renders another number of cards than its range.
+        
+        Yields:
+            dict: Student info with name, class and enrolled keys
+        """
+        await self.set_page_size(page_size or self.CRAWL_PAGE_SIZE)
+        
+        while True:
+            state = await self.get_pager_state()
+            students = await self.cached_evaluate(self.STUDENTS_INFO_SCRIPT)
+            if state and len(students) != state[1] - state[0] + 1:
+                raise RuntimeError(f"Students {state[0]}-{state[1]} / {state[2]}: "
+                                   f"{len(students)} cards rendered")
+            for student in students:
+                yield student
+            
+            if not state or state[1] >= state[2]:
+                return
+            
+            previous_text = await self.page.text_content(self.PAGINATION_INFO)
+            await self.page.click(self.PAGER_NEXT)
+            await self._wait_for_page_rendered(previous_text)
+    
+    async def get_all_enrolled_students(self, page_size=None):
+        """
+        Get all enrolled students across all pages
+        
+        Returns:
+            tuple: (total_enrolled_count, list_of_enrolled_students)
+        """
+        all_enrolled_students = [s async for s in self.iter_students(page_size) if s.get("enrolled", False)]
+        return len(all_enrolled_students), all_enrolled_students
+    
+    async def navigate_to_next_page(self):
+        """Click the next page button if available"""
+        try:
+            if await self.page.is_visible(self.NEXT_PAGE_BUTTON):
+                await self.click_with_retry(self.NEXT_PAGE_BUTTON)
+                await self.wait_for_loading()
+                await self.wait_for_page_loaded()
+                return True
+            return False
+        except Exception as e:
+            print(f"Error navigating to next page: {str(e)}")
+            return False
+    
+    async def navigate_to_previous_page(self):
+        """Click the previous page button if available"""
+        if await self.page.is_visible(self.PREV_PAGE_BUTTON) and await self.is_enabled(self.PREV_PAGE_BUTTON):
+            await self.click_with_retry(self.PREV_PAGE_BUTTON)
+            await self.wait_for_loading()
+            await self.wait_for_page_loaded()
+            return True
+        return False
+    
+    async def get_students_info(self):
+        """Get list of visible students with their info using JavaScript evaluation"""
+        try:
+            return await self.cached_evaluate(self.STUDENTS_INFO_SCRIPT)
+        except Exception as e:
+            print(f"Error getting students info: {str(e)}")
+            timestamp = time.strftime("%Y%m%d-%H%M%S")
+            await self.page.screenshot(path=f"reports/screenshots/error_getting_students_{timestamp}.png")
+            return []
+    
+    async def get_enrolled_students_count(self):
+        """Get the number of enrolled students (with success icon) on the current page"""
+        try:
+            return sum(s["enrolled"] for s in await self.page.evaluate(self.STUDENTS_INFO_SCRIPT))
+        except Exception as e:
+            print(f"Error getting enrolled students count: {str(e)}")
+            return 0
+    
+    async def search_student(self, search_text):
+        """
+        Search for a specific student
+        
+        Args:
+            search_text: Text to search for
+        """
+        await self.page.click(self.SEARCH_INPUT)
+        await self.page.fill(self.SEARCH_INPUT, "")
+        await self.page.fill(self.SEARCH_INPUT, search_text)
+        await self.page.press(self.SEARCH_INPUT, "Enter")
+        await self.wait_for_loading()
+        await self.wait_for_page_loaded()
+        
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        os.makedirs("reports/screenshots", exist_ok=True)
+        await self.page.screenshot(path=f"reports/screenshots/search_{search_text}_{timestamp}.png")
@@ -0,0 +1,149 @@
+# pages/aio/school_card/student_list_actions_page.py
+import asyncio
+import os
+import time
+
+from ...access.school_card.student_list_actions_page import StudentListActionsLocators
+from ..base_page import AsyncBasePage
+
+
+class AsyncStudentListActionsPage(StudentListActionsLocators, AsyncBasePage):
+    """asyncio twin of StudentListActionsPage"""
+    
+    def __init__(self, page):
+        super().__init__(page)
+        self.downloads_folder = os.path.join(os.path.expanduser("~"), "Downloads")
+    
+    async def navigate_to_student_list(self):
+        """Navigate to the student page and switch to list view"""
+        for selector in (self.WORKSPACE_BUTTON, self.ACCESS_MODULE,
+                         self.CARTE_SCOLAIRE_MENU, self.APPRENANT_SUBMENU):
+            await self.click_with_retry(selector)
+        await self.wait_for_loading(timeout=5000)
+        
+        if await self.is_element_visible(self.LIST_VIEW_BUTTON, timeout=3000):
+            await self.click_with_retry(self.LIST_VIEW_BUTTON)
+            await self.wait_for_loading(timeout=3000)
+            return True
+        return False
+    
+    async def select_all_students(self):
+        """Select all students in the list view"""
+        try:
+            if not await self.is_element_visible(self.SELECT_ALL_CHECKBOX, timeout=3000):
+                return False
+            await self.click_with_retry(self.SELECT_ALL_CHECKBOX)
+            await asyncio.sleep(0.5)
+            if await self.is_element_visible(self.SELECT_ALL_DOMAIN, timeout=2000):
+                await self.click_with_retry(self.SELECT_ALL_DOMAIN)
+                await asyncio.sleep(0.5)
+            return await self.is_element_visible(self.SELECTED_COUNT_TEXT, timeout=2000)
+        except Exception:
+            return False
+    
+    async def get_selected_count(self):
+        """Get the number of selected students from the UI"""
+        try:
+            return self.parse_selected_count(await self.get_element_text(self.SELECTED_COUNT_TEXT))
+        except Exception:
+            return 0
+    
+    async def open_actions_menu(self):
+        """Open the Actions dropdown menu"""
+        try:
+            if await self.is_element_visible(self.ACTIONS_DROPDOWN, timeout=3000):
+                await self.click_with_retry(self.ACTIONS_DROPDOWN)
+                return True
+            return False
+        except Exception:
+            return False
+    
+    async def select_export_option(self):
+        """Select the Export option from Actions menu"""
+        try:
+            if not await self.is_element_visible(self.EXPORT_OPTION, timeout=1000):
+                if not await self.open_actions_menu():
+                    return False
+            if await self.is_element_visible(self.EXPORT_OPTION, timeout=2000):
+                await self.click_with_retry(self.EXPORT_OPTION)
+                await asyncio.sleep(1)
+                return await self.is_element_visible(self.EXPORT_DIALOG, timeout=5000)
+            return False
+        except Exception:
+            return False
+    
+    async def _export(self, format_radio):
+        """Pick an export format and start the export"""
+        try:
+            if await self.is_element_visible(format_radio, timeout=2000):
+                await self.click_with_retry(format_radio)
+            if await self.is_element_visible(self.EXPORT_BUTTON, timeout=3000):
+                await self.click_with_retry(self.EXPORT_BUTTON)
+                await asyncio.sleep(1)
+                return True
+            return False
+        except Exception:
+            return False
+    
+    async def export_to_excel(self):
+        """Export selected students to Excel"""
+        return await self._export(self.XLSX_RADIO)
+    
+    async def export_to_csv(self):
+        """Export selected students to CSV"""
+        return await self._export(self.CSV_RADIO)
+    
+    async def verify_file_downloaded(self, file_name=None, timeout=10):
+        """Verify that a file was downloaded successfully"""
+        expected_file = os.path.join(self.downloads_folder, file_name or self.DEFAULT_EXCEL_FILENAME)
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            if os.path.exists(expected_file):
+                return {
+                    "success": True,
+                    "file_path": expected_file,
+                    "file_size": os.path.getsize(expected_file),
+                    "time_to_download": time.time() - start_time
+                }
+            await asyncio.sleep(0.2)
+        return {
+            "success": False,
+            "file_path": None,
+            "file_size": 0,
+            "time_to_download": time.time() - start_time
+        }
+    
+    async def complete_excel_export(self):
+        """Complete the entire Excel export process"""
+        result = {
+            "navigation": False,
+            "selection": False,
+            "selected_count": 0,
+            "export_dialog": False,
+            "export_started": False,
+            "file_downloaded": False,
+            "file_path": None,
+            "file_size": 0,
+            "download_time": 0
+        }
+        
+        result["navigation"] = await self.navigate_to_student_list()
+        if not result["navigation"]:
+            return result
+        result["selection"] = await self.select_all_students()
+        if not result["selection"]:
+            return result
+        result["selected_count"] = await self.get_selected_count()
+        result["export_dialog"] = await self.select_export_option()
+        if not result["export_dialog"]:
+            return result
+        result["export_started"] = await self.export_to_excel()
+        if not result["export_started"]:
+            return result
+        
+        download_result = await self.verify_file_downloaded(self.DEFAULT_EXCEL_FILENAME)
+        result["file_downloaded"] = download_result["success"]
+        result["file_path"] = download_result["file_path"]
+        result["file_size"] = download_result["file_size"]
+        result["download_time"] = download_result["time_to_download"]
+        return result
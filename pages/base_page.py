@@ -1,42 +1,221 @@
 # pages/base_page.py
 import time
 import os
+from contextlib import contextmanager
 from datetime import datetime
+from utils.error_sentinel import ErrorSentinel, OdooClientError
+from utils.selector_registry import registry as selector_registry
+from utils.query_cache import QueryCache, SNAPSHOT_SCRIPT, cacheable
+from utils.perf_profiles import page_timeout_factor
+from utils.step_profiler import StepProfiler
+from utils.view_readiness import VIEW_READY_SCRIPT, VIEW_STATE_SCRIPT, expected_view, is_search_read_response
 
-class BasePage:
+class BaseLocators:
+    """
+    Selectors and pure helpers shared by the sync page objects and their
+    asyncio twins in pages/aio, so both APIs always target the same DOM
+    """
+    LOADING = ".o_loading"
+    ACTION_MANAGER = "//div[contains(@class,'o_action_manager')]"
+    MODULE_MENU_ITEM = "//span[@class='nav-title text-truncate ms-3' and @title='{module_name}']"
+    DROPDOWN_OPTION = "//li[contains(@class, 'ui-menu-item')]/a[contains(text(), '{option_text}')]"
+    NOTIFICATION = ".o_notification"
+    NOTIFICATION_CONTENT = ".o_notification_content"
+    ERROR_DIALOG = ".o_error_dialog"
+    SCREENSHOT_DIR = "reports/screenshots"
+    
+    # Painted over in screenshots so visual regression ignores them (clock, avatars, counters)
+    DYNAMIC_REGIONS = [".o_menu_systray", ".o_notification_manager", "img.o_avatar"]
+    
+    @classmethod
+    def screenshot_path(cls, name):
+        """Return a timestamped screenshot path, creating the directory if needed"""
+        os.makedirs(cls.SCREENSHOT_DIR, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"{cls.SCREENSHOT_DIR}/{name}_{timestamp}.png"
+    
+    @staticmethod
+    def selector_to_filename(selector):
+        """Turn a selector into something usable in a file name"""
+        return selector.replace('/', '_').replace('\\', '_').replace(':', '_')
+
+class BasePage(BaseLocators):
     """Base page object with common functionality for all pages"""
     
     def __init__(self, page):
         """Initialize base page with Playwright page object"""
         self.page = page
+        # Throttled pages (--perf-profile) get proportionally longer timeouts
+        self.timeout_factor = page_timeout_factor(page)
         self.default_timeout = 8000  # Lower default timeout for faster tests
     
+    def _scaled(self, timeout):
+        """Milliseconds of an explicit timeout on this page (longer under a perf profile); None keeps the default"""
+        return timeout * self.timeout_factor if timeout else timeout
+    
+    def check_client_errors(self):
+        """Raise OdooClientError if the server or the web client reported an error on this page"""
+        sentinel = ErrorSentinel.of(self.page)
+        if sentinel:
+            sentinel.check()
+    
+    def raise_error_dialog(self):
+        """Raise the error behind the visible error dialog, with the server traceback when known"""
+        self.check_client_errors()
+        dialog = self.page.locator(self.ERROR_DIALOG).first
+        raise OdooClientError("dialog", "error dialog shown", dialog.inner_text(), self.page.url)
+    
+    def wait_for_visible(self, selector, timeout=None):
+        """
+        Wait for an element, failing at once if Odoo shows an error dialog instead
+        
+        Raises:
+            OdooClientError: The server or the web client raised
+            TimeoutError: Neither the element nor an error dialog appeared in time
+        """
+        self.page.locator(selector).or_(self.page.locator(self.ERROR_DIALOG)).first.wait_for(
+            state="visible", timeout=self._scaled(timeout or self.default_timeout))
+        if self.page.locator(self.ERROR_DIALOG).first.is_visible():
+            self.raise_error_dialog()
+        self.check_client_errors()
+    
+    def query_candidates(self, name, candidates):
+        """
+        Elements of a logical element with ranked candidate selectors
+        
+        The candidate that matched last time on this server version is tried first,
+        the others only when it finds nothing (utils.selector_registry).
+        
+        Returns:
+            tuple: (selector that matched or None, list of element handles)
+        """
+        return selector_registry.query_all(self.page, name, candidates)
+    
+    def snapshot(self, *selectors):
+        """
+        Count, visibility and text of the first match of each selector, in one round trip
+        
+        Served from the page's QueryCache until the DOM changes (utils.query_cache).
+        Selectors must be XPath or CSS.
+        
+        Returns:
+            list: {"count", "visible", "text"} per selector
+        """
+        cache = QueryCache.of(self.page)
+        if cache:
+            return cache.snapshot(self.page, list(selectors))
+        return self.page.evaluate(SNAPSHOT_SCRIPT, list(selectors))
+    
+    def cached_evaluate(self, script, arg=None):
+        """page.evaluate of a read-only script, served from the QueryCache until the DOM changes"""
+        cache = QueryCache.of(self.page)
+        if cache:
+            return cache.evaluate(self.page, script, arg)
+        return self.page.evaluate(script, arg)
+    
+    @contextmanager
+    def profiled_step(self, name, budget_ms=None):
+        """
+        Named step whose JS CPU profile is kept when it runs over budget (see utils.step_profiler)
+        
+        Args:
+            name: Step name, looked up in STEP_BUDGETS
+            budget_ms: Budget overriding the step's default
+        """
+        profiler = StepProfiler.of(self.page)
+        if profiler is None:
+            yield
+            return
+        with profiler.step(self.page, name, budget_ms):
+            yield
+    
     def wait_for_loading(self, timeout=8000):
         """Wait for the Odoo loading indicator to disappear"""
         try:
             # First try to wait for the loading indicator to appear
-            self.page.wait_for_selector(".o_loading", state="visible", timeout=1000)
+            self.page.wait_for_selector(self.LOADING, state="visible", timeout=self._scaled(1000))
             # Then wait for it to disappear
-            self.page.wait_for_selector(".o_loading", state="hidden", timeout=timeout)
+            self.page.wait_for_selector(self.LOADING, state="hidden", timeout=self._scaled(timeout))
         except:
             # If loading indicator never appears, that's fine
             pass
             
         try:
             # Wait for network requests to complete
-            self.page.wait_for_load_state("networkidle", timeout=timeout)
+            self.page.wait_for_load_state("networkidle", timeout=self._scaled(timeout))
         except:
             # If timeout occurs on networkidle, we can still continue
             pass
+        
+        # Every RPC of the action has answered by now: stop here if one of them failed
+        self.check_client_errors()
+    
+    def wait_for_view_ready(self, expected=None, facets=None, facet_count=None, timeout=10000):
+        """
+        Wait until the list or kanban view shows the result of the last search
+        
+        Args:
+            expected: {"total", "records"} of the search answer (see reload_view), None to
+                only require the rendered records to match the pager
+            facets: Labels that must appear in the search facets
+            facet_count: Exact number of facets
+            timeout: Milliseconds before giving up
+        
+        Returns:
+            bool: True as soon as the view is consistent, False on timeout
+        """
+        try:
+            self.page.wait_for_function(VIEW_READY_SCRIPT, arg=[expected, facets, facet_count],
+                                         timeout=self._scaled(timeout))
+            self.check_client_errors()
+            return True
+        except OdooClientError:
+            raise
+        except Exception:
+            # A failed search request explains the timeout better than the view state
+            self.check_client_errors()
+            try:
+                state = self.page.evaluate(VIEW_STATE_SCRIPT)
+            except Exception:
+                state = None
+            print(f"View not ready after {self._scaled(timeout)}ms: showing {state}, expected {expected}, "
+                  f"facets {facets}, facet count {facet_count}")
+            return False
+    
+    def reload_view(self, action, facets=None, facet_count=None, timeout=10000):
+        """
+        Run an action that searches again (filter, facet removal, search panel click) and
+        wait until the view shows its answer rather than the previous records
+        
+        Args:
+            action: Callable performing the click
+        
+        Returns:
+            bool: True once the view shows the new search
+        """
+        expected = None
+        acted = False
+        try:
+            with self.page.expect_response(is_search_read_response, timeout=self._scaled(timeout)) as response_info:
+                action()
+                acted = True
+            expected = expected_view(response_info.value.json())
+        except OdooClientError:
+            raise
+        except Exception as e:
+            if not acted:
+                raise
+            print(f"No search answer seen ({str(e).splitlines()[0]}), checking the view against its pager")
+        return self.wait_for_view_ready(expected, facets, facet_count, timeout)
     
     def navigate_to_module(self, module_name):
         """Navigate to a specific module from the main menu using the span selector"""
         # Click on the module in the side menu using the span with nav-title class
-        module_selector = f"//span[@class='nav-title text-truncate ms-3' and @title='{module_name}']"
+        module_selector = self.MODULE_MENU_ITEM.format(module_name=module_name)
         
         try:
             # Make sure the menu item is visible first
-            self.page.wait_for_selector(module_selector, state="visible", timeout=8000)
+            self.wait_for_visible(module_selector, timeout=8000)
             
             # Click the module
             self.page.click(module_selector)
@@ -45,10 +224,10 @@ class BasePage:
             self.wait_for_loading()
             
             # Verify module loaded by checking for content area
-            self.page.wait_for_selector("//div[contains(@class,'o_action_manager')]", 
-                                      state="visible", 
-                                      timeout=8000)
+            self.wait_for_visible(self.ACTION_MANAGER, timeout=8000)
             return True
+        except OdooClientError:
+            raise
         except Exception as e:
             print(f"Error navigating to module {module_name}: {str(e)}")
             return False
@@ -58,17 +237,19 @@ class BasePage:
         for attempt in range(max_retries):
             try:
                 # Wait for element to be visible and clickable
-                self.page.wait_for_selector(selector, state="visible", timeout=timeout)
+                self.wait_for_visible(selector, timeout=timeout)
                 self.page.click(selector)
                 
                 # Short wait after clicking
                 time.sleep(0.3)
                 return True
+            except OdooClientError:
+                # Retrying won't help once the server raised
+                raise
             except Exception as e:
                 if attempt == max_retries - 1:
                     # Only take screenshot on final failure to save time
-                    filename = selector.replace('/', '_').replace('\\', '_').replace(':', '_')
-                    self.take_screenshot(f"click_retry_failure_{filename}")
+                    self.take_screenshot(f"click_retry_failure_{self.selector_to_filename(selector)}")
                     # Re-raise the exception on the last attempt
                     raise e
                 
@@ -80,31 +261,38 @@ class BasePage:
     def get_element_text(self, selector, timeout=5000):
         """Get text content of an element"""
         try:
-            self.page.wait_for_selector(selector, state="visible", timeout=timeout)
+            if cacheable(selector):
+                # Already rendered: one read instead of a wait and a text_content
+                element, dialog = self.snapshot(selector, self.ERROR_DIALOG)
+                if dialog["visible"]:
+                    self.raise_error_dialog()
+                if element["visible"]:
+                    self.check_client_errors()
+                    return element["text"].strip()
+            self.wait_for_visible(selector, timeout=timeout)
             return self.page.text_content(selector).strip()
+        except OdooClientError:
+            raise
         except:
             return None
     
     def is_element_visible(self, selector, timeout=3000):
         """Check if element is visible - with reduced timeout"""
         try:
-            return self.page.is_visible(selector, timeout=timeout)
+            if cacheable(selector):
+                return self.snapshot(selector)[0]["visible"]
+            return self.page.is_visible(selector, timeout=self._scaled(timeout))
         except:
             return False
     
     def take_screenshot(self, name):
         """Take a screenshot and save it with the given name"""
-        # Ensure directory exists
-        os.makedirs("reports/screenshots", exist_ok=True)
-        
-        # Generate unique filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{name}_{timestamp}.png"
-        path = f"reports/screenshots/{filename}"
+        # Unique, timestamped path in the screenshots directory
+        path = self.screenshot_path(name)
         
         # Take the screenshot
         try:
-            self.page.screenshot(path=path)
+            self.page.screenshot(path=path, mask=[self.page.locator(s) for s in self.DYNAMIC_REGIONS])
             return path
         except:
             print(f"Failed to take screenshot {name}")
@@ -124,7 +312,7 @@ class BasePage:
     def fill_field(self, selector, value, clear_first=True):
         """Fill a form field with the given value"""
         try:
-            self.page.wait_for_selector(selector, state="visible", timeout=5000)
+            self.wait_for_visible(selector, timeout=5000)
             
             if clear_first:
                 # Clear the field first
@@ -133,6 +321,8 @@ class BasePage:
             # Fill with the new value
             self.page.fill(selector, value)
             return True
+        except OdooClientError:
+            raise
         except:
             return False
     
@@ -146,7 +336,7 @@ class BasePage:
             time.sleep(0.3)
             
             # Click the option with the matching text
-            option_selector = f"//li[contains(@class, 'ui-menu-item')]/a[contains(text(), '{option_text}')]"
+            option_selector = self.DROPDOWN_OPTION.format(option_text=option_text)
             self.page.click(option_selector)
             return True
         except:
@@ -156,13 +346,15 @@ class BasePage:
         """Wait for notification and optionally verify its text"""
         try:
             # Wait for notification to appear (adjust selector for Odoo notifications)
-            notification = self.page.wait_for_selector(".o_notification", state="visible", timeout=timeout)
+            self.wait_for_visible(self.NOTIFICATION, timeout=timeout)
             
             # If expected text is provided, verify the notification content
-            if expected_text and notification:
-                actual_text = self.page.text_content(".o_notification_content")
+            if expected_text:
+                actual_text = self.page.text_content(self.NOTIFICATION_CONTENT)
                 return expected_text.lower() in actual_text.lower()
             
             return True
+        except OdooClientError:
+            raise
         except:
             return False
\ No newline at end of file
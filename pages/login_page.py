@@ -3,7 +3,9 @@ from .base_page import BasePage
 import time
 import os
 
-class LoginPage(BasePage):
+class LoginLocators:
+    """Login form selectors and labels shared by LoginPage and its async twin"""
+    
     # Locators
     USERNAME_INPUT = "input[name='login']"
     PASSWORD_INPUT = "input[name='password']"
@@ -47,14 +49,50 @@ class LoginPage(BasePage):
         "ar": LANGUAGE_OPTION_AR
     }
     
-    def __init__(self, page):
+    # Odoo language codes, selected directly with /web/login?lang=
+    LANGUAGE_CODES = {
+        "en": "en_US",
+        "fr": "fr_FR",
+        "ar": "ar_001"
+    }
+    
+    def login_url(self, language_code=None):
+        """URL of the login page, optionally opened in the given language"""
+        url = f"{self.base_url}/web/login"
+        if language_code:
+            url += f"?lang={self.LANGUAGE_CODES[language_code]}"
+        return url
+    
+    # Where Odoo shows a failed login
+    ERROR_SELECTORS = [".alert-danger", ".o_error_detail"]
+    
+    def error_matches(self, error_message, language_code=None):
+        """True if an error message is the invalid-login text of the given (or current) language"""
+        expected_text = self.LABELS[language_code or self.current_language]["error_invalid"]
+        return bool(error_message) and expected_text.lower() in error_message.lower()
+
+class LoginPage(LoginLocators, BasePage):
+    """Page object for the Odoo login form"""
+    
+    def __init__(self, page, base_url="https://dev.nawat.ma"):
         super().__init__(page)
         self.page = page
+        self.base_url = base_url.rstrip("/")
         self.current_language = "en"  # Default language
     
-    def navigate(self):
-        """Navigate to the login page"""
-        self.page.goto("https://dev.nawat.ma/web/login")
+    def navigate(self, language_code=None):
+        """
+        Navigate to the login page
+        
+        Args:
+            language_code: 'en', 'fr' or 'ar' to open the page directly in that
+                language (no dropdown round trip); None keeps the session language
+        """
+        if language_code and language_code not in self.LANGUAGE_CODES:
+            raise ValueError(f"Unsupported language code: {language_code}")
+        self.page.goto(self.login_url(language_code))
+        if language_code:
+            self.current_language = language_code
         # Wait for login form to be fully loaded
         self.page.wait_for_selector(self.USERNAME_INPUT, state="visible")
         self.page.wait_for_selector(self.PASSWORD_INPUT, state="visible")
@@ -151,7 +189,7 @@ class LoginPage(BasePage):
         
         try:
             # First check if login was unsuccessful and error is shown
-            if self.page.is_visible(".alert-danger, .o_error_detail", timeout=5000):
+            if self.page.is_visible(", ".join(self.ERROR_SELECTORS), timeout=self._scaled(5000)):
                 # Take screenshot of the error
                 os.makedirs("reports/screenshots", exist_ok=True)
                 timestamp = time.strftime("%Y%m%d-%H%M%S")
@@ -159,15 +197,15 @@ class LoginPage(BasePage):
                 return False
                 
             # If no error, wait for main navbar indicating successful login
-            self.page.wait_for_selector(self.MAIN_NAVBAR, state="visible", timeout=15000)
+            self.page.wait_for_selector(self.MAIN_NAVBAR, state="visible", timeout=self._scaled(15000))
             
             # Wait for app content to be loaded
-            self.page.wait_for_selector(self.APP_CONTENT, state="visible", timeout=15000)
+            self.page.wait_for_selector(self.APP_CONTENT, state="visible", timeout=self._scaled(15000))
             
             # Give additional time for data to fully load
             
             # Check if we're really logged in by verifying user menu is accessible
-            if not self.page.is_visible(self.MAIN_NAVBAR, timeout=2000):
+            if not self.page.is_visible(self.MAIN_NAVBAR, timeout=self._scaled(2000)):
                 return False
                 
             # Take screenshot of successful login
@@ -186,7 +224,7 @@ class LoginPage(BasePage):
     
     def get_error_message(self):
         """Get the error message text if login failed"""
-        for selector in [".alert-danger", ".o_error_detail"]:
+        for selector in self.ERROR_SELECTORS:
             if self.page.is_visible(selector):
                 return self.page.text_content(selector).strip()
         return None
@@ -198,9 +236,4 @@ class LoginPage(BasePage):
         Returns:
             bool: True if error message matches expected text for current language
         """
-        error_message = self.get_error_message()
-        if not error_message:
-            return False
-            
-        expected_text = self.LABELS[self.current_language]["error_invalid"]
-        return expected_text.lower() in error_message.lower()
\ No newline at end of file
+        return self.error_matches(self.get_error_message())
\ No newline at end of file
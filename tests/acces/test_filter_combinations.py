@@ -0,0 +1,58 @@
+# tests/acces/test_filter_combinations.py
+import pytest
+import os
+import allure
+from utils.odoo_utils import OdooClient
+from utils.filter_explorer import FilterCombinationExplorer
+
+# UI checks per run - combinations beyond this are only predicted, not clicked
+MAX_UI_CHECKS = int(os.getenv("FILTER_COMBINATION_BUDGET", "40"))
+UI_WORKERS = int(os.getenv("FILTER_COMBINATION_WORKERS", "4"))
+
+@allure.feature("Student Filters")
+@allure.story("Filter Combinations")
+@pytest.mark.slow
+def test_filter_combinations(logged_in_page, config, tmp_path):
+    """Pairwise filter/class combinations: predicted over RPC, informative ones checked in the UI"""
+    base_url = config.get("base_url", "https://dev.nawat.ma")
+
+    with allure.step("Predict combination counts over RPC"):
+        client = OdooClient.from_page(logged_in_page, base_url)
+        explorer = FilterCombinationExplorer(client, max_size=int(os.getenv("FILTER_COMBINATION_SIZE", "2")))
+        combinations = explorer.plan(max_checks=MAX_UI_CHECKS)
+
+        allure.attach(
+            f"Filters: {', '.join(sorted(explorer.filters))}\n"
+            f"Classes: {len(explorer.classes)}\n"
+            f"RPC calls: {explorer.stats['rpc_calls']}\n"
+            f"Pruned (empty): {explorer.stats['pruned_empty']}\n"
+            f"Pruned (equivalent): {explorer.stats['pruned_equivalent']}\n"
+            f"Informative combinations sent to UI: {len(combinations)}",
+            name="Combination Plan",
+            attachment_type=allure.attachment_type.TEXT
+        )
+
+    if not combinations:
+        pytest.skip("No informative filter combinations for the current data")
+
+    with allure.step(f"Verify {len(combinations)} combinations in {UI_WORKERS} parallel browsers"):
+        storage_state = str(tmp_path / "storage_state.json")
+        logged_in_page.context.storage_state(path=storage_state)
+        results = explorer.run_in_ui(
+            combinations, storage_state,
+            workers=UI_WORKERS,
+            headless=config.get("headless", True)
+        )
+
+    mismatches = [r for r in results if r["status"] == "mismatch"]
+    errors = [r for r in results if r["status"] not in ("match", "mismatch")]
+
+    report = ""
+    for result in results:
+        combo = " + ".join(result["filters"] + ([result["class"]] if result["class"] else []))
+        report += f"[{result['status']}] {combo}: predicted {result['predicted']}, UI {result['actual']}\n"
+    allure.attach(report, name="Combination Results", attachment_type=allure.attachment_type.TEXT)
+    print(report)
+
+    assert len(errors) < len(results), f"No combination could be checked in the UI: {errors[:3]}"
+    assert not mismatches, f"{len(mismatches)} combinations show a different count than the server: {mismatches[:5]}"
@@ -6,8 +6,12 @@ import allure
 from pages.access.school_card.student_filter_page import StudentFilterPage
 
 @pytest.fixture
-def filter_page(logged_in_page):
+def filter_page(verification_plan, logged_in_page):
     """Setup the student filter page after login"""
+    # Incremental runs skip filter checks when no student changed
+    if not verification_plan.has_changes:
+        pytest.skip(f"No student changed since the last green run ({verification_plan.summary()})")
+    
     # Create page object
     filter_page = StudentFilterPage(logged_in_page)
     
@@ -37,11 +41,13 @@ def test_basic_filters(filter_page):
     # Test Non inscrit filter
     with allure.step("Test 'Non inscrit' filter"):
         # Apply the filter
-        filter_page.apply_filter(filter_page.NON_INSCRIT_FILTER)
+        applied = filter_page.apply_filter(filter_page.NON_INSCRIT_FILTER)
         
         # Verify the filter is applied correctly
         facet_text = filter_page.get_filter_facet_text()
         if facet_text == "Non inscrit":
+            # Labels read before the view re-rendered would be the previous search's
+            assert applied, "View still shows the records of the previous search"
             # Check if students have correct label and class info
             students_have_label = filter_page.check_all_students_have_label(filter_page.NON_INSCRIT_LABEL)
             classes_empty = filter_page.check_all_students_class_is_empty()
@@ -61,11 +67,12 @@ def test_basic_filters(filter_page):
     # Test Non réinscrit filter 
     with allure.step("Test 'Non réinscrit' filter"):
         # Apply the filter
-        filter_page.apply_filter(filter_page.NON_REINSCRIT_FILTER)
+        applied = filter_page.apply_filter(filter_page.NON_REINSCRIT_FILTER)
         
         # Verify the filter is applied correctly
         facet_text = filter_page.get_filter_facet_text()
         if facet_text == "Non réinscrit":
+            assert applied, "View still shows the records of the previous search"
             # Check if students have correct label and class info
             students_have_label = filter_page.check_all_students_have_label(filter_page.NON_REINSCRIT_LABEL)
             classes_empty = filter_page.check_all_students_class_is_empty()
@@ -90,11 +97,12 @@ def test_archive_filters(filter_page):
     # Test Radiée (Archivé) filter
     with allure.step("Test 'Radiée (Archivé)' filter"):
         # Apply the filter
-        filter_page.apply_filter(filter_page.RADIEE_FILTER)
+        applied = filter_page.apply_filter(filter_page.RADIEE_FILTER)
         
         # Verify the filter is applied correctly
         facet_text = filter_page.get_filter_facet_text()
         if facet_text == "Radiée (Archivé)":
+            assert applied, "View still shows the records of the previous search"
             # Check if students have correct label
             students_have_label = filter_page.check_all_students_have_label(filter_page.RADIEE_LABEL)
             
@@ -112,11 +120,12 @@ def test_archive_filters(filter_page):
     # Test Annulée (Archivé) filter
     with allure.step("Test 'Annulée (Archivé)' filter"):
         # Apply the filter
-        filter_page.apply_filter(filter_page.ANNULEE_FILTER)
+        applied = filter_page.apply_filter(filter_page.ANNULEE_FILTER)
         
         # Verify the filter is applied correctly
         facet_text = filter_page.get_filter_facet_text()
         if facet_text == "Annulée (Archivé)":
+            assert applied, "View still shows the records of the previous search"
             # Check if students have correct label
             students_have_label = filter_page.check_all_students_have_label(filter_page.ANNULEE_LABEL)
             
@@ -154,16 +163,6 @@ def test_non_inscrit_archived_filter(filter_page):
                         name="Non-inscrit Archived Results", 
                         attachment_type=allure.attachment_type.TEXT)
             
-            # Check student details (with better error handling)
-            if filter_page.click_first_student_card():
-                has_unarchive = filter_page.check_settings_and_unarchive_option()
-                allure.attach(f"Has unarchive option: {has_unarchive}", 
-                            name="Unarchive Option Check", 
-                            attachment_type=allure.attachment_type.TEXT)
-                
-                # Go back to student list
-                filter_page.go_back_to_student_list()
-            
             # Assert to fail the test if filter didn't work
             assert facet_text == "Non-inscrit (Archivé)", "Filter facet text doesn't match"
         else:
@@ -173,6 +172,17 @@ def test_non_inscrit_archived_filter(filter_page):
         # Remove the filter
         filter_page.remove_filter()
 
+# Runs on a record seeded for this test, not on whatever archived student exists
+@allure.feature("Student Filters")
+def test_archived_student_unarchive_option(filter_page, leased_archived_student):
+    """Test the unarchive option of an archived student"""
+    with allure.step("Open a freshly seeded archived student"):
+        assert filter_page.open_student(leased_archived_student), \
+            f"Form of archived student {leased_archived_student} did not open"
+    
+    with allure.step("Check the settings menu offers to unarchive it"):
+        assert filter_page.check_settings_and_unarchive_option(), "Unarchive option missing on an archived student"
+
 # Combined test for special filters (Sans famille and Manque document)
 @allure.feature("Student Filters")
 def test_special_filters(filter_page):
@@ -181,11 +191,12 @@ def test_special_filters(filter_page):
     # Test Sans famille filter
     with allure.step("Test 'Sans famille' filter"):
         # Apply the filter
-        filter_page.apply_filter(filter_page.SANS_FAMILLE_FILTER)
+        applied = filter_page.apply_filter(filter_page.SANS_FAMILLE_FILTER)
         
         # Verify the filter is applied correctly
         facet_text = filter_page.get_filter_facet_text()
         if facet_text == "Sans famille":
+            assert applied, "View still shows the records of the previous search"
             # Check if students have the 'non affecté' image
             students_have_image = filter_page.check_all_students_have_sans_famille_image()
             
@@ -203,11 +214,12 @@ def test_special_filters(filter_page):
     # Test Manque document filter
     with allure.step("Test 'Manque document' filter"):
         # Apply the filter
-        filter_page.apply_filter(filter_page.MANQUE_DOCUMENT_FILTER)
+        applied = filter_page.apply_filter(filter_page.MANQUE_DOCUMENT_FILTER)
         
         # Verify the filter is applied correctly
         facet_text = filter_page.get_filter_facet_text()
         if facet_text == "Manque document":
+            assert applied, "View still shows the records of the previous search"
             # Check student details for missing document button
             if filter_page.click_first_student_card():
                 has_button = filter_page.check_missing_document_button()
@@ -0,0 +1,46 @@
+# tests/acces/test_student_filters_concurrent.py
+import pytest
+import allure
+from pages.aio.school_card.student_filter_page import AsyncStudentFilterPage
+
+# Filters checked at the same time, one page each in a single logged-in context
+FILTER_LABELS = list(AsyncStudentFilterPage.FILTERS)
+
+@allure.feature("Student Filters")
+@pytest.mark.slow
+def test_all_filters_concurrently(async_runner, async_storage_state, config):
+    """Apply every student filter at once on its own page and check facet and count"""
+    base_url = config.get("base_url", "https://dev.nawat.ma")
+    
+    async def check_filter(page, label):
+        filter_page = AsyncStudentFilterPage(page)
+        await page.goto(f"{base_url}/web#action=405&menu_id=108")
+        await filter_page.wait_for_page_loaded()
+        ready = await filter_page.apply_filter(filter_page.FILTERS[label])
+        return {
+            "ready": ready,
+            "facet": await filter_page.get_filter_facet_text(),
+            "count": await filter_page.get_record_count(),
+        }
+    
+    async def scenario():
+        context = await async_runner.new_context(storage_state=async_storage_state)
+        try:
+            return await async_runner.map_pages(context, FILTER_LABELS, check_filter, concurrency=len(FILTER_LABELS))
+        finally:
+            await context.close()
+    
+    results = dict(zip(FILTER_LABELS, async_runner.run(scenario())))
+    
+    failures = []
+    for label, result in results.items():
+        if isinstance(result, Exception):
+            failures.append(f"{label}: {result}")
+        elif not result["ready"] or result["facet"] != label or result["count"] < 0:
+            failures.append(f"{label}: ready={result['ready']} facet={result['facet']!r} count={result['count']}")
+        else:
+            print(f"✅ {label}: {result['count']} students")
+    
+    allure.attach("\n".join(f"{label}: {result}" for label, result in results.items()),
+                  name="Concurrent filter results", attachment_type=allure.attachment_type.TEXT)
+    assert not failures, "Filters failed:\n" + "\n".join(failures)
@@ -115,4 +115,33 @@ def test_search_student(student_page):
     else:
         with allure.step("Skip search test - no students available"):
             allure.attach("No students available to search for", name="Search Skip Reason", attachment_type=allure.attachment_type.TEXT)
-            pytest.skip("No students available to search for")
\ No newline at end of file
+            pytest.skip("No students available to search for")
+
+@allure.feature("Student Enrollment")
+@allure.story("Full Roster")
+@pytest.mark.slow
+def test_full_roster_crawl(student_page):
+    """Test that crawling the pager yields every student exactly as counted by the pager"""
+    with allure.step("Read the total from the pager"):
+        total_students = student_page.get_total_students_count()
+        allure.attach(f"Total students: {total_students}", name="Pager Total", attachment_type=allure.attachment_type.TEXT)
+    
+    with allure.step("Stream all students with a wide pager"):
+        start_time = time.time()
+        crawled = 0
+        enrolled = 0
+        for student in student_page.iter_students():
+            crawled += 1
+            enrolled += student["enrolled"]
+        elapsed = time.time() - start_time
+        
+        allure.attach(
+            f"Crawled students: {crawled}\n"
+            f"Enrolled students: {enrolled}\n"
+            f"Crawl time: {elapsed:.1f}s",
+            name="Crawl Summary",
+            attachment_type=allure.attachment_type.TEXT
+        )
+    
+    with allure.step("Verify nothing was truncated"):
+        assert crawled == total_students, f"Crawled {crawled} students but the pager reports {total_students}"
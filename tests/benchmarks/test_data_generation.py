@@ -0,0 +1,18 @@
+# tests/benchmarks/test_data_generation.py
+import time
+
+import pytest
+from utils.data_generator import SchoolDataGenerator
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.slow]
+
+def test_a_million_students_well_under_a_minute(tmp_path):
+    """Scale test data must stay cheap to regenerate"""
+    start = time.perf_counter()
+    counts = SchoolDataGenerator(1_000_000, seed=42).write_jsonl(tmp_path)
+    elapsed = time.perf_counter() - start
+    print(f"{counts} in {elapsed:.1f}s")
+
+    assert counts["students"] == 1_000_000
+    # About 27 s on a single core: the margin is for slower agents, not for regressions
+    assert elapsed < 45, f"1M students took {elapsed:.1f}s"
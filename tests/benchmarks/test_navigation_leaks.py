@@ -0,0 +1,73 @@
+# tests/benchmarks/test_navigation_leaks.py
+import pytest
+import allure
+from pages.access.school_card.class_filter_page import ClassFilterPage
+from pages.access.school_card.student_filter_page import StudentFilterPage
+from utils.leak_detector import WARMUP, LeakDetector, format_report, save_report
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.slow]
+
+@pytest.fixture
+def iterations(request):
+    iterations = request.config.getoption("--leak-iterations")
+    if iterations <= 0:
+        pytest.skip("Leak benchmarks run with --leak-iterations N (or LEAK_ITERATIONS)")
+    # The warm-up iterations are left out of the trend, which needs a few points to fit
+    if iterations < WARMUP + 3:
+        pytest.fail(f"--leak-iterations {iterations} leaves too few iterations to measure, use at least {WARMUP + 3}")
+    return iterations
+
+@pytest.fixture
+def class_filter_page(iterations, logged_in_page):
+    class_filter_page = ClassFilterPage(logged_in_page)
+    class_filter_page.navigate_from_login()
+    return class_filter_page
+
+def class_titles(class_filter_page, count=2):
+    class_filter_page.expand_all_sidebar_items()
+    items = class_filter_page.get_all_sidebar_items()
+    titles = [title for _, title, is_class in items if is_class][:count]
+    for element, _, _ in items:
+        element.dispose()
+    return titles
+
+@allure.feature("Performance")
+@allure.story("Memory leaks")
+def test_class_and_filter_navigation_does_not_leak(class_filter_page, iterations, request):
+    """Class click, filter and facet removal, over and over, as a user does all day"""
+    filter_page = StudentFilterPage(class_filter_page.page)
+    titles = class_titles(class_filter_page)
+    if not titles:
+        pytest.skip("No class in the search panel")
+    clicks = [0]
+
+    def click_class():
+        # Alternate between two classes: clicking the selected one again does not search
+        title = titles[clicks[0] % len(titles)]
+        clicks[0] += 1
+        items = class_filter_page.refresh_sidebar_items()
+        try:
+            element = next((element for element, item_title, _ in items if item_title == title), None)
+            return element is not None and class_filter_page.click_sidebar_item_safe(element, title)
+        finally:
+            # Handles kept by the test would keep their nodes alive and look like a leak
+            for element, _, _ in items:
+                element.dispose()
+
+    steps = [
+        ("class_click", click_class),
+        ("filter_apply", lambda: filter_page.apply_filter(filter_page.NON_INSCRIT_FILTER)),
+        ("facet_remove", filter_page.remove_filter),
+    ]
+    detector = LeakDetector(class_filter_page.page, steps)
+    report = detector.run(iterations)
+    summary = format_report(report)
+    print(summary)
+    # Reports of throttled runs are kept apart
+    profile = request.config.getoption("--perf-profile")
+    report["perf_profile"] = profile
+    path = save_report(report, f"class_and_filter_navigation_{profile}")
+    allure.attach.file(path, name="leak report", attachment_type=allure.attachment_type.JSON)
+
+    assert len(report["errors"]) < iterations * len(steps) / 2, f"Most steps failed, nothing to measure:\n{summary}"
+    assert not report["leaks"], f"Retained memory grows across iterations:\n{summary}"
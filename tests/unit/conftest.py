@@ -0,0 +1,119 @@
+# tests/unit/conftest.py
+import types
+
+import pytest
+
+
+class FakeSession:
+    """CDP session recording (method, params); `responses` maps a method to its result, or to a callable returning it"""
+
+    def __init__(self, responses=None):
+        self.responses = responses or {}
+        self.sent = []
+        self.detached = False
+
+    def send(self, method, params=None):
+        self.sent.append((method, params))
+        response = self.responses.get(method, {})
+        return response() if callable(response) else response
+
+    def methods(self):
+        return [method for method, _ in self.sent]
+
+    def detach(self):
+        self.detached = True
+
+
+class AsyncFakeSession(FakeSession):
+    async def send(self, method, params=None):
+        return FakeSession.send(self, method, params)
+
+
+class FakeContext:
+    """Browser context handing out one CDP session; without cdp it fails like Firefox and WebKit"""
+
+    def __init__(self, session=None, cdp=True):
+        self.session = session or FakeSession()
+        self.cdp = cdp
+        self.sessions = 0
+
+    def new_cdp_session(self, page):
+        if not self.cdp:
+            raise RuntimeError("CDP session is only available in Chromium")
+        self.sessions += 1
+        return self.session
+
+
+class AsyncFakeContext(FakeContext):
+    async def new_cdp_session(self, page):
+        return FakeContext.new_cdp_session(self, page)
+
+
+class FakeResponseInfo:
+    def __init__(self, response):
+        self.value = response
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Like Playwright, the wait for the event happens when the block ends
+        if exc_type is None and self.value is None:
+            raise TimeoutError("Timeout 10000ms exceeded while waiting for event \"response\"")
+        return False
+
+
+class FakePage:
+    """
+    Page recording the timeout of every wait, and the arg of wait_for_function in `waits`
+
+    Args:
+        context: FakeContext (a Chromium one by default)
+        response: What expect_response() resolves to when its predicate accepts it
+        ready: False makes wait_for_function time out
+    """
+    url = "https://odoo.test/web"
+
+    def __init__(self, context=None, response=None, ready=True):
+        self.context = context or FakeContext()
+        self.response = response
+        self.ready = ready
+        self.timeouts = []
+        self.waits = []
+
+    def expect_response(self, predicate, timeout=None):
+        matched = self.response is not None and predicate(self.response)
+        return FakeResponseInfo(self.response if matched else None)
+
+    def wait_for_function(self, script, arg=None, timeout=None):
+        self.timeouts.append(timeout)
+        self.waits.append(arg)
+        if not self.ready:
+            raise TimeoutError("Timeout exceeded")
+
+    def wait_for_selector(self, selector, state=None, timeout=None):
+        self.timeouts.append(timeout)
+
+    def wait_for_load_state(self, state, timeout=None):
+        self.timeouts.append(timeout)
+
+    def evaluate(self, script, arg=None):
+        return {"loading": False, "records": 80, "pager": "1-80 / 321", "facets": []}
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fakes():
+    """Playwright doubles shared by the unit tests: fakes.FakePage(fakes.FakeContext(...)), ..."""
+    return types.SimpleNamespace(
+        FakeSession=FakeSession, AsyncFakeSession=AsyncFakeSession,
+        FakeContext=FakeContext, AsyncFakeContext=AsyncFakeContext,
+        FakePage=FakePage, FakeBrowser=FakeBrowser,
+    )
@@ -0,0 +1,28 @@
+# tests/unit/test_account_pool.py
+import json
+import pytest
+from utils.account_pool import AccountPool
+
+pytestmark = pytest.mark.unit
+
+USERS = [{"username": f"e2e.worker0{i}", "password": "secret"} for i in range(1, 3)]
+DEFAULT = {"username": "ecole.e2a", "password": "default"}
+
+def make_pool(tmp_path):
+    return AccountPool(users=USERS, default_user=DEFAULT, pool_dir=str(tmp_path))
+
+def test_each_worker_gets_its_own_account(tmp_path):
+    """Leases are exclusive until released; an exhausted pool falls back to the default account"""
+    first, second, third = make_pool(tmp_path), make_pool(tmp_path), make_pool(tmp_path)
+    leased = [first.lease("gw0"), second.lease("gw1"), third.lease("gw2")]
+    assert [user["username"] for user in leased] == ["e2e.worker01", "e2e.worker02", "ecole.e2a"]
+    
+    first.release()
+    assert third.lease("gw2")["username"] == "e2e.worker01"
+
+def test_leases_of_dead_processes_are_reclaimed(tmp_path):
+    """A crashed worker doesn't keep its account forever"""
+    (tmp_path / "leases.json").write_text(json.dumps({
+        "e2e.worker01": {"holder": "gw0", "pid": 2 ** 22 + 12345, "since": 0},
+    }))
+    assert make_pool(tmp_path).lease("gw1")["username"] == "e2e.worker01"
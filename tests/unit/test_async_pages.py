@@ -0,0 +1,57 @@
+# tests/unit/test_async_pages.py
+import importlib
+import inspect
+import pytest
+
+pytestmark = pytest.mark.unit
+
+# (sync module, sync class, async module, async class)
+PAGE_PAIRS = [
+    ("pages.base_page", "BasePage", "pages.aio.base_page", "AsyncBasePage"),
+    ("pages.login_page", "LoginPage", "pages.aio.login_page", "AsyncLoginPage"),
+    ("pages.access.school_card.student_filter_page", "StudentFilterPage",
+     "pages.aio.school_card.student_filter_page", "AsyncStudentFilterPage"),
+    ("pages.access.school_card.student_inscrit_page", "StudentInscritPage",
+     "pages.aio.school_card.student_inscrit_page", "AsyncStudentInscritPage"),
+    ("pages.access.school_card.class_filter_page", "ClassFilterPage",
+     "pages.aio.school_card.class_filter_page", "AsyncClassFilterPage"),
+    ("pages.access.school_card.student_list_actions_page", "StudentListActionsPage",
+     "pages.aio.school_card.student_list_actions_page", "AsyncStudentListActionsPage"),
+]
+
+
+def load_pair(sync_module, sync_name, async_module, async_name):
+    # Some pages import allure at module level
+    sync_cls = getattr(pytest.importorskip(sync_module), sync_name)
+    return sync_cls, getattr(importlib.import_module(async_module), async_name)
+
+
+def public_methods(cls):
+    return {name: member for name, member in inspect.getmembers(cls, inspect.isfunction)
+            if not name.startswith("_")}
+
+
+@pytest.mark.parametrize("pair", PAGE_PAIRS, ids=[pair[1] for pair in PAGE_PAIRS])
+def test_async_twin_has_the_same_api(pair):
+    sync_cls, async_cls = load_pair(*pair)
+    sync_methods = public_methods(sync_cls)
+    async_methods = public_methods(async_cls)
+
+    assert sorted(set(sync_methods) - set(async_methods)) == []
+    for name, method in sync_methods.items():
+        # @contextmanager steps have an @asynccontextmanager twin
+        if inspect.isgeneratorfunction(inspect.unwrap(method)):
+            assert inspect.isasyncgenfunction(inspect.unwrap(async_methods[name])), name
+        elif not method.__qualname__.split(".")[0].endswith("Locators"):
+            # Shared *Locators helpers are pure; everything that drives the page is awaited
+            assert inspect.iscoroutinefunction(async_methods[name]), name
+
+
+@pytest.mark.parametrize("pair", PAGE_PAIRS, ids=[pair[1] for pair in PAGE_PAIRS])
+def test_async_twin_shares_the_locators(pair):
+    sync_cls, async_cls = load_pair(*pair)
+    constants = {name for name in dir(sync_cls) if name.isupper()}
+
+    assert constants
+    for name in constants:
+        assert getattr(async_cls, name) is getattr(sync_cls, name), name
@@ -0,0 +1,68 @@
+# tests/unit/test_browser_daemon.py
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from utils import browser_daemon
+
+pytestmark = pytest.mark.unit
+
+class FakeCdp(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content = json.dumps({"Browser": "HeadlessChrome/113.0.5672.53"}).encode()
+        self.send_response(200 if self.path == "/json/version" else 404)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+def test_health_check_follows_the_state_file(tmp_path):
+    state_file = str(tmp_path / "daemon.json")
+    assert browser_daemon.healthy_endpoint(state_file) is None
+
+    server = HTTPServer(("127.0.0.1", 0), FakeCdp)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_port}"
+    with open(state_file, "w") as f:
+        json.dump({"pid": 2 ** 22 + 1, "endpoint": endpoint, "user_data_dir": str(tmp_path / "profile")}, f)
+    try:
+        assert browser_daemon.endpoint_version(endpoint)["Browser"].startswith("HeadlessChrome")
+        assert browser_daemon.healthy_endpoint(state_file) == endpoint
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Daemon gone: the state is stale and stop() clears it
+    assert browser_daemon.healthy_endpoint(state_file) is None
+    assert browser_daemon.stop_daemon(state_file)
+    assert browser_daemon.read_state(state_file) is None
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+def test_stop_only_kills_the_recorded_daemon(tmp_path):
+    """A pid reused by another process after a reboot is left running"""
+    state_file = str(tmp_path / "daemon.json")
+    profile = str(tmp_path / "nawat-browser-test")
+    daemon = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)", f"--user-data-dir={profile}"])
+    stranger = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        state = {"pid": stranger.pid, "endpoint": "http://127.0.0.1:9", "user_data_dir": profile}
+        with open(state_file, "w") as f:
+            json.dump(state, f)
+        assert browser_daemon.stop_daemon(state_file)
+        assert stranger.poll() is None
+        assert browser_daemon.read_state(state_file) is None
+
+        with open(state_file, "w") as f:
+            json.dump(dict(state, pid=daemon.pid), f)
+        assert browser_daemon.stop_daemon(state_file)
+        assert daemon.wait(timeout=5) is not None
+    finally:
+        for process in (daemon, stranger):
+            process.kill()
+            process.wait()
@@ -0,0 +1,84 @@
+# tests/unit/test_browser_watchdog.py
+import pytest
+from utils import browser_watchdog
+from utils.browser_watchdog import BrowserWatchdog, find_browser_pid, read_cmdline, read_stat, sample_processes
+
+pytestmark = pytest.mark.unit
+
+def write_process(proc, pid, ppid, name, rss_pages, ticks=0, kind=None, marker=None):
+    folder = proc / str(pid)
+    folder.mkdir()
+    fields = ["S", str(ppid)] + ["0"] * 9 + [str(ticks), str(ticks)] + ["0"] * 8 + [str(rss_pages)] + ["0"] * 20
+    (folder / "stat").write_text(f"{pid} ({name}) {' '.join(fields)}\n")
+    args = [name] + ([f"--type={kind}"] if kind else []) + ([marker] if marker else [])
+    (folder / "cmdline").write_bytes("\0".join(args).encode() + b"\0")
+
+@pytest.fixture
+def proc(tmp_path, monkeypatch):
+    """python (1) -> node driver (2) -> chrome (3) -> renderer (4), gpu (5); an unrelated chrome (9)"""
+    monkeypatch.setattr(browser_watchdog, "PAGE_SIZE", 2**20)
+    monkeypatch.setattr(browser_watchdog, "CLOCK_TICKS", 100)
+    write_process(tmp_path, 1, 0, "python", 50)
+    write_process(tmp_path, 2, 1, "node", 80)
+    write_process(tmp_path, 3, 2, "chrome", 200, ticks=100)
+    write_process(tmp_path, 4, 3, "chrome", 300, ticks=50, kind="renderer")
+    write_process(tmp_path, 5, 3, "chrome", 100, kind="gpu-process")
+    write_process(tmp_path, 9, 0, "chrome", 999)
+    return tmp_path
+
+def test_read_stat_handles_spaces_in_names(proc):
+    write_process(proc, 6, 3, "Chrome_ChildIOT hread", 7)
+    assert read_stat(6, str(proc))["ppid"] == 3
+    assert read_stat(6, str(proc))["name"] == "Chrome_ChildIOT hread"
+    assert read_stat(42, str(proc)) is None
+
+def test_samples_only_the_browser_under_this_process(proc):
+    sample = sample_processes(root_pid=1, proc=str(proc))
+    assert sample["rss_mb"] == 600
+    assert sample["processes"] == 3
+    assert sample["cpu_seconds"] == 3.0
+    assert sample["by_kind"] == {"browser": 200, "renderer": 300, "gpu-process": 100}
+
+def test_samples_only_the_marked_browser(proc, monkeypatch, fakes):
+    # The async runner's browser, under the same process: chrome (10) -> renderer (11)
+    write_process(proc, 10, 1, "chrome", 400)
+    write_process(proc, 11, 10, "chrome", 500, kind="renderer")
+    marker = "--nawat-watchdog=abc"
+    (proc / "3" / "cmdline").write_bytes(f"chrome\0{marker}\0".encode())
+    assert find_browser_pid(marker, str(proc)) == 3
+    assert find_browser_pid("--nawat-watchdog=other", str(proc)) is None
+
+    monkeypatch.setattr(browser_watchdog, "find_browser_pid", lambda marker: find_browser_pid(marker, str(proc)))
+    monkeypatch.setattr(browser_watchdog, "read_cmdline", lambda pid, _proc=None: read_cmdline(pid, str(proc)))
+    monkeypatch.setattr(browser_watchdog, "sample_processes",
+                        lambda root_pid=None: sample_processes(root_pid, str(proc)))
+    assert sample_processes(root_pid=1, proc=str(proc))["rss_mb"] == 1500
+    assert BrowserWatchdog(fakes.FakeBrowser(), marker=marker).sample()["rss_mb"] == 600
+
+def test_relaunch_past_the_threshold_and_report_the_suspects(proc, monkeypatch, fakes):
+    monkeypatch.setattr(browser_watchdog, "sample_processes",
+                        lambda root_pid=None: sample_processes(1, str(proc)))
+    first = fakes.FakeBrowser()
+    watchdog = BrowserWatchdog(first, relaunch=fakes.FakeBrowser, max_rss_mb=1000, max_heap_mb=0)
+
+    watchdog.start_test("tests/acces/test_class_filters.py::test_class_filters")
+    write_process(proc, 7, 3, "chrome", 500, kind="renderer")
+    sample = watchdog.finish_test("tests/acces/test_class_filters.py::test_class_filters")
+    assert sample["rss_delta_mb"] == 500
+    assert sample["rss_mb"] == 1100
+    assert first.closed and watchdog.browser is not first
+    assert watchdog.recycles[0]["after"] == "tests/acces/test_class_filters.py::test_class_filters"
+
+    watchdog.start_test("tests/test_login.py::test_valid_login")
+    watchdog.finish_test("tests/test_login.py::test_valid_login")
+    assert [s["test"] for s in watchdog.suspects()] == ["tests/acces/test_class_filters.py::test_class_filters"]
+
+def test_without_relaunch_only_records(proc, monkeypatch, fakes):
+    monkeypatch.setattr(browser_watchdog, "sample_processes",
+                        lambda root_pid=None: sample_processes(1, str(proc)))
+    browser = fakes.FakeBrowser()
+    watchdog = BrowserWatchdog(browser, max_rss_mb=100)
+    watchdog.start_test("t")
+    watchdog.finish_test("t")
+    assert watchdog.browser is browser and not browser.closed
+    assert watchdog.recycles == []
@@ -0,0 +1,63 @@
+# tests/unit/test_data_generator.py
+import json
+import pytest
+from utils.data_generator import SchoolDataGenerator, LEVELS, family_line, invoice_line, student_line
+
+pytestmark = pytest.mark.unit
+
+def read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_same_seed_same_data(tmp_path):
+    """Generation is deterministic for a given seed"""
+    first = SchoolDataGenerator(500, seed=7).write_jsonl(tmp_path / "a")
+    second = SchoolDataGenerator(500, seed=7).write_jsonl(tmp_path / "b")
+    assert first == second
+    for name in first:
+        assert (tmp_path / "a" / f"{name}.jsonl").read_bytes() == (tmp_path / "b" / f"{name}.jsonl").read_bytes()
+
+def test_records_are_referentially_consistent(tmp_path):
+    """Students, families, classes, employees and invoices reference each other correctly"""
+    counts = SchoolDataGenerator(2000, seed=3).write_jsonl(tmp_path)
+    classes = {c["id"]: c for c in read_jsonl(tmp_path / "classes.jsonl")}
+    families = {f["id"]: f for f in read_jsonl(tmp_path / "families.jsonl")}
+    students = {s["id"]: s for s in read_jsonl(tmp_path / "students.jsonl")}
+
+    assert counts["students"] == len(students) == 2000
+    for student in students.values():
+        family = families[student["family_id"]]
+        assert student["id"] in family["student_ids"]
+        assert student["last_name"] == family["father"]["last_name"]
+        if student["status"] == "inscrit":
+            assert classes[student["class_id"]]["level"] == student["level"]
+        else:
+            assert student["class_id"] is None
+
+    # Siblings are in distinct levels
+    for family in families.values():
+        levels = [students[student_id]["level"] for student_id in family["student_ids"]]
+        assert len(levels) == len(set(levels))
+    assert {level for _, level, _ in LEVELS} >= {s["level"] for s in students.values()}
+
+    for invoice in read_jsonl(tmp_path / "invoices.jsonl"):
+        assert invoice["family_id"] in families
+        assert all(students[s]["status"] == "inscrit" for s in invoice["student_ids"])
+    for employee in read_jsonl(tmp_path / "employees.jsonl"):
+        assert set(employee["class_ids"]) <= set(classes)
+
+def test_line_formatters_match_json_encoding():
+    """The fixed-schema formatters write what json.dumps would, byte for byte"""
+    encode = json.JSONEncoder(ensure_ascii=False, check_circular=False, separators=(",", ":")).encode
+    generator = SchoolDataGenerator(300, seed=5)
+    next_id = 1
+    for family, students in generator.iter_families():
+        assert family_line(family) == encode(family)
+        for student in students:
+            assert student_line(student) == encode(student)
+        for invoice in generator.iter_invoices(family, students, next_id):
+            assert invoice_line(invoice) == encode(invoice)
+            next_id += 1
+    # Values needing escapes go through the JSON string encoder too
+    family["name"] = 'Famille "Tazi"\n'
+    assert json.loads(family_line(family))["name"] == family["name"]
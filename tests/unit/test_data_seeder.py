@@ -0,0 +1,92 @@
+# tests/unit/test_data_seeder.py
+import itertools
+import pytest
+from utils import data_seeder
+from utils.data_seeder import FixturePool
+
+pytestmark = pytest.mark.unit
+
+class FakeClient:
+    """Records create/unlink calls instead of talking to Odoo"""
+    context = {}
+    
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.created = {}
+        self.unlinked = []
+        self.calls = []
+    
+    def call_kw(self, model, method, args=None, kwargs=None):
+        self.calls.append((model, method))
+        if method == "create":
+            ids = [next(self.ids) for _ in args[0]]
+            for record_id, vals in zip(ids, args[0]):
+                self.created[record_id] = (model, vals)
+            return ids
+        if method == "search":
+            prefix = args[0][0][2].rstrip("%")
+            return [i for i, (m, vals) in self.created.items() if m == model and vals["name"].startswith(prefix)]
+        if method == "unlink":
+            self.unlinked.extend(args[0])
+            return True
+        return True
+
+@pytest.fixture(autouse=True)
+def pool_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_seeder, "POOL_DIR", str(tmp_path))
+
+def test_leases_are_unique_across_workers():
+    """Two workers sharing a run never receive the same record"""
+    client = FakeClient()
+    worker_a = FixturePool(client, run_id="run1", refill_size=5).open()
+    worker_b = FixturePool(client, run_id="run1", refill_size=5).open()
+    
+    leased = worker_a.lease("students", 3) + worker_b.lease("students", 4) + worker_a.lease("students", 2)
+    assert len(leased) == len(set(leased)) == 9
+    # Records come from batched create() calls, not one call per lease
+    assert client.calls.count((data_seeder.STUDENT_MODEL, "create")) == 2
+    assert all(vals["name"].startswith("[e2e-run1] ") for _, vals in client.created.values())
+
+def test_last_worker_cleans_up():
+    """Records are only removed when the last worker closes the pool"""
+    client = FakeClient()
+    worker_a = FixturePool(client, run_id="run2", refill_size=2).open()
+    worker_b = FixturePool(client, run_id="run2", refill_size=2).open()
+    worker_a.warm_up("families")
+    worker_b.lease("archived_students")
+    
+    worker_a.close()
+    assert client.unlinked == []
+    worker_b.close()
+    assert sorted(client.unlinked) == sorted(client.created)
+    assert ("res.partner", "unlink") in client.calls
+
+def test_lease_returns_the_requested_count_of_every_kind():
+    """Families are fewer than students: the generator is grown until enough exist"""
+    client = FakeClient()
+    pool = FixturePool(client, run_id="run3", refill_size=5).open()
+    assert len(pool.lease("students", 30)) == 30
+    families = pool.lease("families", 15)
+    assert len(families) == 15
+    # Each kind keeps its own offset in the generator stream
+    more = pool.lease("families", 20)
+    assert len(more) == 20
+    assert len(set(families + more)) == 35
+    assert sum(model == "res.partner" for model, _ in client.created.values()) == 35
+
+def test_refills_only_generate_their_own_slice(monkeypatch):
+    """A late refill costs the same as the first one"""
+    sizes = []
+    generator_class = data_seeder.SchoolDataGenerator
+
+    def sized_generator(students, seed):
+        sizes.append(students)
+        return generator_class(students, seed=seed)
+
+    monkeypatch.setattr(data_seeder, "SchoolDataGenerator", sized_generator)
+    pool = FixturePool(FakeClient(), run_id="run4", refill_size=5).open()
+    first = pool._generate_values("students", 5, 0)
+    late = pool._generate_values("students", 5, 100000)
+    assert len(first) == len(late) == 5
+    assert sizes[0] == sizes[1]
+    assert first != late
@@ -0,0 +1,78 @@
+# tests/unit/test_error_sentinel.py
+import pytest
+from pages.base_page import BasePage
+from utils.error_sentinel import ErrorSentinel, OdooClientError
+
+pytestmark = pytest.mark.unit
+
+SERVER_ERROR = {"jsonrpc": "2.0", "id": 4, "error": {
+    "code": 200, "message": "Odoo Server Error",
+    "data": {"name": "builtins.KeyError", "message": "'classe_id'",
+             "debug": "Traceback (most recent call last):\n  ...\nKeyError: 'classe_id'\n"}}}
+
+class FakeRequest:
+    method = "POST"
+
+class FakeResponse:
+    def __init__(self, path, payload, content_type="application/json"):
+        self.url = f"https://dev.nawat.ma{path}"
+        self.request = FakeRequest()
+        self.headers = {"content-type": content_type}
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+class FakeConsoleMessage:
+    def __init__(self, type, text):
+        self.type = type
+        self.text = text
+
+class FakePage:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+def test_rpc_error_is_raised_with_the_server_traceback():
+    page = FakePage()
+    sentinel = ErrorSentinel().install(page)
+    page.handlers["response"](FakeResponse("/web/dataset/call_kw/acces.statut.apprenant/web_search_read",
+                                           {"jsonrpc": "2.0", "id": 3, "result": {"records": []}}))
+    page.handlers["console"](FakeConsoleMessage("warning", "deprecated"))
+    BasePage(page).check_client_errors()
+
+    page.handlers["console"](FakeConsoleMessage("error", "Failed to load resource: 500"))
+    page.handlers["response"](FakeResponse("/web/dataset/call_kw/acces.statut.apprenant/web_search_read",
+                                           SERVER_ERROR))
+    with pytest.raises(OdooClientError) as error:
+        BasePage(page).check_client_errors()
+    assert error.value.kind == "rpc"
+    assert "builtins.KeyError: 'classe_id'" in str(error.value)
+    assert "KeyError: 'classe_id'\n" in error.value.traceback
+    assert error.value.console == ["Failed to load resource: 500"]
+
+    # Sticky until cleared, so a swallowed error still stops the next step
+    with pytest.raises(OdooClientError):
+        sentinel.check()
+    sentinel.clear()
+    sentinel.check()
+
+def test_business_errors_and_other_responses_are_ignored():
+    page = FakePage()
+    sentinel = ErrorSentinel().install(page)
+    user_error = {"error": {"message": "Odoo Server Error",
+                            "data": {"name": "odoo.exceptions.ValidationError", "message": "Champ requis"}}}
+    page.handlers["response"](FakeResponse("/web/dataset/call_kw/res.partner/create", user_error))
+    page.handlers["response"](FakeResponse("/web/static/lib/error.json", SERVER_ERROR))
+    page.handlers["response"](FakeResponse("/web/dataset/call_kw/res.partner/read", SERVER_ERROR, "text/html"))
+    sentinel.check()
+
+def test_page_error():
+    page = FakePage()
+    ErrorSentinel().install(page)
+    page.handlers["pageerror"](type("Error", (), {"message": "TypeError: x is undefined",
+                                                  "stack": "at ListRenderer (web.assets_backend.js:1)"})())
+    with pytest.raises(OdooClientError, match="page error: TypeError"):
+        ErrorSentinel.of(page).check()
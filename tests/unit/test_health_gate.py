@@ -0,0 +1,33 @@
+# tests/unit/test_health_gate.py
+import pytest
+from utils.health_gate import CircuitBreaker, classify_failure
+
+pytestmark = pytest.mark.unit
+
+def test_classify_failure():
+    assert classify_failure("Error: net::ERR_CONNECTION_REFUSED at https://dev.nawat.ma/web/login") == "network"
+    assert classify_failure("urllib.error.HTTPError: HTTP Error 502: Bad Gateway") == "network"
+    assert classify_failure("TimeoutError: Timeout 30000ms exceeded.") == "timeout"
+    assert classify_failure("AssertionError: Expected 12 students, found 11") is None
+
+def test_breaker_trips_after_consecutive_failures_across_workers(tmp_path):
+    workers = [CircuitBreaker(threshold=3, run_id="run1", state_dir=str(tmp_path)) for _ in range(2)]
+    workers[0].record_failure("gw0: net::ERR_CONNECTION_RESET")
+    workers[1].record_failure("gw1: HTTP Error 503")
+    workers[0].record_success()
+    assert not workers[1].is_open()
+
+    for worker in (workers[0], workers[1], workers[0]):
+        worker.record_failure("net::ERR_CONNECTION_REFUSED")
+    assert workers[1].is_open()
+    assert workers[1].reason.startswith("3 consecutive infrastructure failures")
+    assert not CircuitBreaker(run_id="run2", state_dir=str(tmp_path)).is_open()
+
+    workers[0].cleanup()
+    assert not list(tmp_path.iterdir())
+
+def test_trip(tmp_path):
+    breaker = CircuitBreaker(run_id="run1", state_dir=str(tmp_path))
+    breaker.trip("health probe failed (version_info timed out)")
+    assert breaker.is_open()
+    assert breaker.reason == "health probe failed (version_info timed out)"
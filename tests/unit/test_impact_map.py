@@ -0,0 +1,101 @@
+# tests/unit/test_impact_map.py
+import subprocess
+import time
+
+import pytest
+from utils import impact_map
+
+pytestmark = pytest.mark.unit
+
+PAGE = '''class FilterLocators:
+    SEARCH_INPUT = "input.o_searchview_input"
+    SIDEBAR_ITEMS = [
+        ".o_search_panel_category_value",
+    ]
+
+
+class FilterPage(FilterLocators):
+    def search(self, text):
+        self.page.fill(self.SEARCH_INPUT, text)
+
+    def unused(self):
+        return None
+'''
+
+def test_selector_uses_point_to_their_definitions(tmp_path):
+    page = tmp_path / "filter_page.py"
+    page.write_text(PAGE)
+    assert impact_map.selector_definitions([str(page)]) == {
+        "SEARCH_INPUT": [(str(page), [2])], "SIDEBAR_ITEMS": [(str(page), [3, 4, 5])]}
+    assert impact_map.constants_by_line(str(page)) == {10: {"SEARCH_INPUT"}}
+    assert impact_map.function_lines(str(page)) == {10, 13}
+
+def head():
+    return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+
+def test_select_tests():
+    recorded = {
+        "created_at": time.time(),
+        "commit": head(),
+        "dirty": False,
+        "tests": {"tests/acces/test_filters.py::test_search", "tests/acces/test_filters.py::test_sidebar",
+                  "tests/test_login.py::test_login"},
+        "files": {"pages/filter_page.py": {2: {"tests/acces/test_filters.py::test_search"},
+                                           10: {"tests/acces/test_filters.py::test_search"}}},
+    }
+    selection = impact_map.select_tests({"pages/filter_page.py": {2, 13}, "README.md": {1}}, recorded)
+    assert not selection["full"]
+    assert selection["nodeids"] == {"tests/acces/test_filters.py::test_search"}
+    assert impact_map.is_selected("tests/acces/test_filters.py::test_search", selection, recorded)
+    assert not impact_map.is_selected("tests/test_login.py::test_login", selection, recorded)
+    # Tests the map has never seen always run
+    assert impact_map.is_selected("tests/test_login.py::test_new", selection, recorded)
+
+    selection = impact_map.select_tests({"tests/test_login.py": {5}}, recorded)
+    assert impact_map.is_selected("tests/test_login.py::test_login", selection, recorded)
+
+    assert impact_map.select_tests({"data/students.json": {3}}, recorded)["full"]
+    assert impact_map.select_tests({}, None)["full"]
+    recorded["created_at"] -= 8 * 86400
+    assert impact_map.select_tests({}, recorded)["reason"] == "impact map is 8 days old"
+
+def test_changed_lines_use_base_numbering(tmp_path):
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=tmp_path,
+                       check=True, capture_output=True)
+    git("init", "-q")
+    (tmp_path / "page.py").write_text("a = 1\nb = 2\nc = 3\nd = 4\n")
+    (tmp_path / "old.py").write_text("x = 1\n")
+    git("add", "-A")
+    git("commit", "-qm", "base")
+    (tmp_path / "page.py").write_text("a = 1\nc = 30\nd = 4\ne = 5\n")
+    (tmp_path / "old.py").unlink()
+    (tmp_path / "new.py").write_text("y = 1\n")
+    git("add", "-A")
+    assert impact_map.changed_lines("HEAD", cwd=str(tmp_path)) == {
+        "page.py": {2, 3, 4, 5}, "old.py": {1}, "new.py": {0, 1}}
+
+def test_maps_of_other_revisions_mean_a_full_run():
+    recorded = {"created_at": time.time(), "commit": head(), "dirty": True, "tests": set(), "files": {}}
+    assert impact_map.select_tests({}, recorded)["reason"] == "impact map was recorded on a modified working tree"
+    recorded.update(dirty=False, commit="0" * 40)
+    assert "is not in this repository" in impact_map.select_tests({}, recorded)["reason"]
+    recorded.update(commit=None)
+    assert impact_map.select_tests({}, recorded)["full"]
+
+CONFTEST = '''import pytest
+
+@pytest.fixture(scope="session")
+def browser(config):
+    launched = True
+    return launched
+
+@pytest.fixture
+def page(browser):
+    return browser
+'''
+
+def test_shared_fixture_lines(tmp_path):
+    conftest = tmp_path / "conftest.py"
+    conftest.write_text(CONFTEST)
+    assert impact_map.shared_fixture_lines(str(conftest)) == {"browser": {5, 6}}
@@ -0,0 +1,55 @@
+# tests/unit/test_import_graph.py
+import pytest
+from utils.import_graph import ImportGraph
+from utils.watch import changed_files
+
+pytestmark = pytest.mark.unit
+
+def write(root, path, content=""):
+    target = root / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content)
+
+@pytest.fixture
+def tree(tmp_path):
+    write(tmp_path, "conftest.py", "from pages.login_page import LoginPage\n"
+                                   "def fixture():\n    from utils.explorer import Explorer\n")
+    write(tmp_path, "pages/__init__.py")
+    write(tmp_path, "pages/login_page.py", "from .base_page import BasePage\n")
+    write(tmp_path, "pages/base_page.py")
+    write(tmp_path, "pages/access/__init__.py")
+    write(tmp_path, "pages/access/filter_page.py", "from ..base_page import BasePage\n")
+    write(tmp_path, "pages/aio/__init__.py")
+    write(tmp_path, "pages/aio/filter_page.py", "from ..access.filter_page import FilterLocators\n")
+    write(tmp_path, "utils/__init__.py")
+    write(tmp_path, "utils/explorer.py", "from pages.access import filter_page\n")
+    write(tmp_path, "tests/__init__.py")
+    write(tmp_path, "tests/test_login.py", "import pytest\n")
+    write(tmp_path, "tests/acces/test_filters.py", "from pages.access.filter_page import FilterPage\n")
+    write(tmp_path, "tests/acces/test_concurrent.py", "from pages.aio.filter_page import AsyncFilterPage\n")
+    write(tmp_path, "tests/unit/test_explorer.py", "from utils.explorer import Explorer\n")
+    return ImportGraph(str(tmp_path))
+
+def test_page_object_maps_to_the_tests_importing_it(tree):
+    assert tree.affected_tests(["pages/access/filter_page.py"]) == [
+        "tests/acces/test_concurrent.py", "tests/acces/test_filters.py", "tests/unit/test_explorer.py"]
+    assert tree.affected_tests(["tests/acces/test_filters.py"]) == ["tests/acces/test_filters.py"]
+
+def test_conftest_dependencies_affect_every_test(tree):
+    assert len(tree.affected_tests(["pages/login_page.py"])) == 4
+    assert len(tree.affected_tests(["pages/base_page.py"])) == 4
+
+def test_refresh_follows_edited_imports(tree, tmp_path):
+    write(tmp_path, "tests/test_login.py", "from pages.access.filter_page import FilterPage\n")
+    tree.refresh(["tests/test_login.py"])
+    assert "tests/test_login.py" in tree.affected_tests(["pages/access/filter_page.py"])
+
+def test_repository_graph():
+    graph = ImportGraph()
+    affected = graph.affected_tests(["pages/access/school_card/student_filter_page.py"])
+    assert "tests/acces/test_student_filters.py" in affected
+    assert "tests/acces/test_student_filters_concurrent.py" in affected
+    assert "tests/test_login.py" not in affected
+
+def test_changed_files():
+    assert changed_files({"a.py": 1, "b.py": 1}, {"a.py": 2, "c.py": 1}) == ["a.py", "b.py", "c.py"]
@@ -0,0 +1,55 @@
+# tests/unit/test_leak_detector.py
+import pytest
+from utils.leak_detector import LeakDetector, analyze, linear_fit
+
+pytestmark = pytest.mark.unit
+
+def test_linear_fit():
+    assert linear_fit([0, 1, 2, 3], [10, 12, 14, 16]) == (2.0, 10.0, 1.0)
+    slope, _, r2 = linear_fit([0, 1, 2, 3], [5, 5, 5, 5])
+    assert slope == 0 and r2 == 1.0
+
+def heap_page(fakes):
+    """Page whose heap the steps change; the DOM and listeners keep level"""
+    page = fakes.FakePage()
+    page.heap = 10 * 2**20
+    page.context.session.responses["Performance.getMetrics"] = lambda: {"metrics": [
+        {"name": "JSHeapUsedSize", "value": page.heap},
+        {"name": "Nodes", "value": 5000},
+        {"name": "JSEventListeners", "value": 300}]}
+    return page
+
+def run(fakes, leak, iterations=10):
+    """The `filter_apply` step grows the heap by `leak` bytes, other steps keep level"""
+    page = heap_page(fakes)
+
+    def apply_filter():
+        # Cards of the filter, of which `leak` bytes are never released
+        page.heap += 2**20 + leak
+
+    def remove_facet():
+        page.heap -= 2**20
+
+    steps = [("class_click", lambda: None), ("filter_apply", apply_filter), ("facet_remove", remove_facet)]
+    return page, LeakDetector(page, steps, warmup=2).run(iterations)
+
+def test_steady_navigation_does_not_leak(fakes):
+    page, report = run(fakes, leak=0)
+    assert report["leaks"] == {}
+    assert not report["trends"]["JSHeapUsedSize"]["leaking"]
+    # Two garbage collections before every measure
+    assert page.context.session.methods().count("HeapProfiler.collectGarbage") == 2 * 3 * 10
+
+def test_growing_heap_points_at_the_retaining_step(fakes):
+    _, report = run(fakes, leak=400 * 1024)
+    assert report["trends"]["JSHeapUsedSize"]["leaking"]
+    assert report["trends"]["JSHeapUsedSize"]["slope"] == 400 * 1024
+    assert report["leaks"] == {"JSHeapUsedSize": ["filter_apply"]}
+    assert report["steps"]["filter_apply"]["JSHeapUsedSize"] == 2**20 + 400 * 1024
+
+def test_failed_steps_are_recorded(fakes):
+    samples = [{"iteration": i, "step": "only", "metrics": {"JSHeapUsedSize": 1000 * i}} for i in range(6)]
+    # 1000 bytes per iteration is below the threshold
+    assert analyze(samples, warmup=1)["leaks"] == {}
+    report = LeakDetector(heap_page(fakes), [("broken", lambda: False)], warmup=0).run(2)
+    assert [error["step"] for error in report["errors"]] == ["broken", "broken"]
@@ -0,0 +1,37 @@
+# tests/unit/test_load_harness.py
+import pytest
+from utils.load_harness import LoadStats, parse_journeys, percentile
+
+pytestmark = pytest.mark.unit
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+def test_step_summary_and_timeline():
+    stats = LoadStats(bucket_seconds=10)
+    for second in range(20):
+        stats.record(1000 + second, "apply_filter", 100 + second * 10, ok=second % 5 != 0,
+                     error=None if second % 5 else "StepFailed: wrong facet")
+    stats.record(1000, "login", 800, ok=True)
+    
+    summary = stats.step_summary()
+    assert summary["apply_filter"]["count"] == 20
+    assert summary["apply_filter"]["errors"] == 4
+    assert summary["apply_filter"]["error_rate"] == 0.2
+    assert summary["apply_filter"]["p50"] == 190
+    assert summary["apply_filter"]["max"] == 290
+    assert summary["login"]["count"] == 1
+    
+    timeline = stats.timeline()
+    assert [bucket["t"] for bucket in timeline] == [0, 10]
+    assert timeline[0]["steps"]["apply_filter"]["count"] == 10
+    assert timeline[1]["steps"]["apply_filter"]["p95"] == 290
+    assert stats.top_errors() == [("apply_filter: StepFailed: wrong facet", 4)]
+
+def test_parse_journeys():
+    assert parse_journeys("filter_students:3, class_filter") == {"filter_students": 3.0, "class_filter": 1.0}
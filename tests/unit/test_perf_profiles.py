@@ -0,0 +1,53 @@
+# tests/unit/test_perf_profiles.py
+import json
+
+import pytest
+from pages.base_page import BasePage
+from utils import perf_profiles
+from utils.perf_profiles import apply_profile, network_conditions, save_timings, timeout_factor
+
+pytestmark = pytest.mark.unit
+
+def test_network_conditions_in_bytes_per_second():
+    assert network_conditions(perf_profiles.PROFILES["mobile-4g"]) == {
+        "offline": False, "latency": 150, "downloadThroughput": 200000, "uploadThroughput": 93750}
+    unthrottled = network_conditions(perf_profiles.PROFILES["old-pc-4x-cpu"])
+    assert unthrottled["downloadThroughput"] == unthrottled["uploadThroughput"] == -1
+
+def test_profile_applied_through_cdp(fakes):
+    page = fakes.FakePage()
+    assert apply_profile(page, "old-pc-4x-cpu")
+    assert [method for method, _ in page.context.session.sent] == [
+        "Network.enable", "Network.emulateNetworkConditions", "Emulation.setCPUThrottlingRate"]
+    assert page.context.session.sent[-1][1] == {"rate": 4}
+    # The session holding the overrides lives as long as the page
+    assert perf_profiles._sessions[page] is page.context.session
+
+def test_no_profile_or_no_cdp_leaves_the_page_alone(fakes):
+    assert not apply_profile(fakes.FakePage(), None)
+    assert not apply_profile(fakes.FakePage(fakes.FakeContext(cdp=False)), "school-adsl")
+    assert timeout_factor(None) == 1
+    assert timeout_factor("mobile-4g") == 3
+
+def test_timings_saved_per_profile(tmp_path):
+    path = save_timings("school-adsl", {"tests/test_login.py::test_valid_login": 4.2}, str(tmp_path))
+    assert path.endswith("school-adsl.json")
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["settings"]["latency"] == 60
+    assert report["durations"] == {"tests/test_login.py::test_valid_login": 4.2}
+
+def test_page_object_timeouts_scale_with_the_profile(fakes):
+    page = fakes.FakePage()
+    apply_profile(page, "school-adsl")
+    base_page = BasePage(page)
+    assert base_page.timeout_factor == 2
+    # ClassFilterPage.wait_timeout and the helpers' own defaults alike
+    assert base_page.wait_for_view_ready(timeout=5000)
+    base_page.wait_for_loading()
+    assert page.timeouts == [10000, 2000, 16000, 16000]
+
+    unthrottled = fakes.FakePage(fakes.FakeContext(cdp=False))
+    apply_profile(unthrottled, "school-adsl")
+    BasePage(unthrottled).wait_for_view_ready(timeout=5000)
+    assert unthrottled.timeouts == [5000]
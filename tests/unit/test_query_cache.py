@@ -0,0 +1,113 @@
+# tests/unit/test_query_cache.py
+import pytest
+from pages.base_page import BasePage
+from utils.query_cache import BINDING, TOKEN_SCRIPT, QueryCache, cacheable
+
+pytestmark = pytest.mark.unit
+
+class FakeFrame:
+    parent_frame = None
+
+class FakePage:
+    """Answers snapshot reads from a dict; `mutate` plays the browser's mutation report"""
+
+    def __init__(self, dom):
+        self.dom = dom
+        self.bindings = {}
+        self.handlers = {}
+        self.evaluations = 0
+        self.token_reads = 0
+        self.render_epoch = 0
+        self.mutate_during_next_read = False
+
+    def expose_binding(self, name, callback):
+        self.bindings[name] = callback
+
+    def add_init_script(self, script):
+        pass
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def mutate(self, report=True, **changes):
+        self.dom.update(changes)
+        self.render_epoch += 1
+        if report:
+            self.bindings[BINDING]({}, self.render_epoch)
+
+    def token(self):
+        return f"doc:{self.render_epoch}"
+
+    def evaluate(self, script, arg=None):
+        if "MutationObserver" in script:
+            return None
+        if script == TOKEN_SCRIPT:
+            self.token_reads += 1
+            return self.token()
+        self.evaluations += 1
+        if self.mutate_during_next_read:
+            # The report of a mutation made before this read arrives before its answer
+            self.mutate_during_next_read = False
+            self.mutate()
+        if isinstance(arg, list):
+            return [self.token(), [{"count": self.dom.get(selector, 0), "visible": selector in self.dom, "text": "1-80 / 321"}
+                        for selector in arg]]
+        return [self.token(), dict(self.dom)]
+
+@pytest.fixture
+def page():
+    page = FakePage({"//div[contains(@class,'o_kanban_view')]": 1, ".o_pager": 1})
+    QueryCache().install(page)
+    return page
+
+def test_repeated_reads_are_served_from_memory(page):
+    base_page = BasePage(page)
+    assert base_page.is_element_visible("//div[contains(@class,'o_kanban_view')]")
+    assert base_page.get_element_text(".o_pager") == "1-80 / 321"
+    assert base_page.is_element_visible(".o_pager")
+    assert base_page.snapshot(".o_pager", "//div[contains(@class,'o_kanban_view')]")[0]["count"] == 1
+    # The text read also fetched the error dialog state; nothing else needed the browser
+    assert page.evaluations == 2
+    assert QueryCache.of(page).hits == 2
+
+def test_mutation_drops_the_cached_reads(page):
+    base_page = BasePage(page)
+    assert not base_page.is_element_visible(".o_nocontent_help")
+    page.mutate(**{".o_nocontent_help": 1})
+    assert base_page.is_element_visible(".o_nocontent_help")
+    assert base_page.cached_evaluate("() => 1") == base_page.cached_evaluate("() => 1")
+    page.mutate()
+    base_page.cached_evaluate("() => 1")
+    assert page.evaluations == 4
+
+def test_partial_hit_rereads_after_a_concurrent_mutation(page):
+    cache = QueryCache.of(page)
+    cache.snapshot(page, [".o_pager"])
+    page.mutate_during_next_read = True
+    page.dom[".o_pager"] = 2
+    states = cache.snapshot(page, [".o_pager", ".o_kanban_record"])
+    assert states[0]["count"] == 2
+    assert page.evaluations == 3
+
+def test_hit_checks_the_dom_did_not_change_since_the_read(page):
+    """A render whose report did not reach Python yet still makes the next read fresh"""
+    base_page = BasePage(page)
+    assert not base_page.is_element_visible(".o_export_option")
+    page.mutate(report=False, **{".o_export_option": 1})
+    assert base_page.is_element_visible(".o_export_option")
+    assert base_page.is_element_visible(".o_export_option")
+    assert page.evaluations == 2
+    assert page.token_reads == 2
+
+def test_navigation_drops_the_cached_reads(page):
+    cache = QueryCache.of(page)
+    cache.snapshot(page, [".o_pager"])
+    page.handlers["framenavigated"](FakeFrame())
+    assert cache.entries == {}
+
+def test_playwright_only_selectors_are_not_cached():
+    assert cacheable("//span[text()='Non inscrit']")
+    assert cacheable("input[name='login']")
+    assert not cacheable("text=Apprenant")
+    assert not cacheable("button:has-text('Filtres')")
+    assert not cacheable("#search >> input")
@@ -0,0 +1,118 @@
+# tests/unit/test_rpc_replay.py
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from utils.rpc_replay import (HttpTransport, LatencyHistogram, RowPicker, RpcLoadGenerator, call_label,
+                              render, templatize)
+
+pytestmark = pytest.mark.unit
+
+DATA = {
+    "students": [{"id": 7, "name": "Youssef Alami", "parent": {"phone": "0611"}}],
+    "classes": [{"id": 3, "name": "CE1-A"}],
+}
+
+def test_render_keeps_types_and_shares_the_row():
+    params = {
+        "model": "acces.statut.apprenant",
+        "method": "web_search_read",
+        "args": [[["id", "=", "{{students.id}}"], ["name", "ilike", "{{ students.name }}"]]],
+        "kwargs": {"context": {"label": "Élève {{students.name}} ({{students.parent.phone}})"}},
+    }
+    rendered = render(params, RowPicker(DATA, random.Random(0)))
+    assert rendered["args"][0][0][2] == 7
+    assert rendered["args"][0][1][2] == "Youssef Alami"
+    assert rendered["kwargs"]["context"]["label"] == "Élève Youssef Alami (0611)"
+
+def test_templatize_replaces_recorded_search_terms():
+    data = dict(DATA, classes=[{"id": 3, "name": "CE1-A", "level": "inscrit"}])
+    calls = [
+        {"route": "/web/dataset/call_kw", "params": {
+            "model": "acces.statut.apprenant", "method": "web_search_read", "args": [],
+            "kwargs": {"domain": ["&", ["name", "ilike", "Youssef Alami"], ["state", "=", "inscrit"]],
+                       "context": {"default_name": "Youssef Alami"}}}},
+        {"route": "/web/dataset/call_kw", "params": {
+            "model": "acces.classe", "method": "name_search", "args": [], "kwargs": {"name": "CE1-A"}}},
+        {"route": "/web/dataset/call_kw", "params": {"args": ["Youssef Alami", "CE1-A", 7]}},
+    ]
+    templated = templatize(calls, data)
+    assert templated[0]["params"]["kwargs"]["domain"] == \
+        ["&", ["name", "ilike", "{{students.name}}"], ["state", "=", "inscrit"]]
+    assert templated[1]["params"]["kwargs"]["name"] == "{{classes.name}}"
+    # Outside search positions recorded values are kept
+    assert templated[0]["params"]["kwargs"]["context"] == {"default_name": "Youssef Alami"}
+    assert templated[2]["params"]["args"] == ["Youssef Alami", "CE1-A", 7]
+
+def test_histogram_percentiles_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(value, ok=value % 100 != 0)
+    assert histogram.count == 1000
+    assert histogram.errors == 10
+    for pct, exact in ((50, 500), (95, 950), (99, 990)):
+        assert exact <= histogram.percentile(pct) <= exact * 1.1
+    assert histogram.percentile(100) == 1000
+
+    other = LatencyHistogram()
+    other.record(5000)
+    histogram.merge(other)
+    assert histogram.count == 1001
+    assert histogram.max == 5000
+
+def test_call_label():
+    assert call_label({"route": "/web/dataset/call_kw/acces.statut.apprenant/web_search_read",
+                       "params": {"model": "acces.statut.apprenant", "method": "web_search_read"}}) \
+        == "acces.statut.apprenant.web_search_read"
+    assert call_label({"route": "/web/action/load", "params": {"action_id": 405}}) == "/web/action/load"
+
+class FakeOdoo(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    received = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.received.append((self.path, self.headers["Cookie"], body["params"]))
+        if self.path == "/web/action/load":
+            payload = {"jsonrpc": "2.0", "id": body["id"],
+                       "error": {"message": "Odoo Server Error", "data": {"name": "odoo.exceptions.AccessError",
+                                                                          "message": "denied"}}}
+        else:
+            payload = {"jsonrpc": "2.0", "id": body["id"], "result": []}
+        content = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+def test_replay_against_local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOdoo)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    journey = {"name": "filter_students", "calls": [
+        {"route": "/web/dataset/call_kw/acces.statut.apprenant/web_search_read", "think": 0.01,
+         "params": {"model": "acces.statut.apprenant", "method": "web_search_read",
+                    "args": [[["id", "=", "{{students.id}}"]]]}},
+        {"route": "/web/action/load", "think": 0.01, "params": {"action_id": 405}},
+    ]}
+    try:
+        generator = RpcLoadGenerator(journey, HttpTransport(f"http://127.0.0.1:{server.server_port}"),
+                                     ["s1", "s2"], DATA, users=4, duration=0.5, ramp_up=0.1, threads=4)
+        report = generator.run()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    search = report["calls"]["acces.statut.apprenant.web_search_read"]
+    assert search["count"] > 4
+    assert search["errors"] == 0
+    assert report["calls"]["/web/action/load"]["error_rate"] == 1.0
+    assert report["top_errors"][0][0] == "/web/action/load: odoo.exceptions.AccessError: denied"
+    assert report["iterations"]["count"] == search["count"]
+    assert {cookie for _, cookie, _ in FakeOdoo.received} == {"session_id=s1", "session_id=s2"}
+    assert FakeOdoo.received[0][2]["args"] == [[["id", "=", 7]]]
@@ -0,0 +1,119 @@
+# tests/unit/test_selector_preflight.py
+import pytest
+from utils.import_graph import ImportGraph
+from utils.selector_preflight import SelectorPreflight, analyze, collect_selectors, selector_kind
+
+pytestmark = pytest.mark.unit
+
+def test_selector_kind():
+    assert selector_kind("(//a[@data-menu-xmlid='acces.acces'])[3]") == "xpath"
+    assert selector_kind("input[name='login']") == "css"
+    assert selector_kind("button.o_pager_next") == "css"
+    assert selector_kind("reports/screenshots") is None
+    assert selector_kind("//span[@title='{module_name}']") is None
+    assert selector_kind("Statut de lapprenant (acces.statut.apprenant).xlsx") is None
+
+def test_collects_the_page_class_selectors():
+    selectors = {(entry["name"], entry["value"]): entry for entry in collect_selectors()}
+    names = {name for name, _ in selectors}
+    assert {"APPRENANT_SUBMENU", "PAGER_NEXT", "USERNAME_INPUT", "SIDEBAR_ITEM_FALLBACKS[0]"} <= names
+    assert not names & {"SCREENSHOT_DIR", "STUDENTS_INFO_SCRIPT", "MODULE_MENU_ITEM", "LABELS"}
+    # Divergent copies of the same constant are checked separately
+    assert len([name for name in names if name == "CARTE_SCOLAIRE_MENU"]) == 1
+    assert len([key for key in selectors if key[0] == "CARTE_SCOLAIRE_MENU"]) == 2
+
+SELECTORS = [
+    {"name": "WORKSPACE_BUTTON", "value": "//button[@title='Espace de travail']", "kind": "xpath",
+     "paths": {"pages/access/school_card/student_filter_page.py"}},
+    {"name": "NON_INSCRIT_FILTER", "value": "//span[text()='Non inscrit']", "kind": "xpath",
+     "paths": {"pages/access/school_card/student_filter_page.py"}},
+    {"name": "SEARCH_INPUT", "value": "//input", "kind": "xpath",
+     "paths": {"pages/access/school_card/student_inscrit_page.py"}},
+    {"name": "STUDENT_CARDS", "value": "//div", "kind": "xpath",
+     "paths": {"pages/access/school_card/student_inscrit_page.py"}},
+    {"name": "EXPORT_DIALOG", "value": "//div[@class='modal']", "kind": "xpath",
+     "paths": {"pages/access/school_card/student_list_actions_page.py"}},
+]
+VIEWS = [
+    {"name": "home", "url": "/web", "expect": ["WORKSPACE_BUTTON"]},
+    {"name": "kanban", "url": "/web#action=405", "expect": ["SEARCH_INPUT", "STUDENT_CARDS"]},
+    {"name": "filters", "url": "/web#action=405", "click": ["FILTER_DROPDOWN_BUTTON"],
+     "expect": ["NON_INSCRIT_FILTER"]},
+]
+
+def test_missing_selectors_affect_the_tests_importing_them():
+    visits = [{"name": "home", "error": None, "counts": [1, 0, 0, 0, 0]},
+              {"name": "kanban", "error": None, "counts": [1, 0, 2, 80, 0]},
+              {"name": "filters", "error": None, "counts": [1, 0, 2, 80, 0]}]
+    result = analyze(SELECTORS, VIEWS, visits, graph=ImportGraph())
+    statuses = {selector["name"]: selector["status"] for selector in result["selectors"]}
+    assert statuses == {"WORKSPACE_BUTTON": "ok", "NON_INSCRIT_FILTER": "missing", "SEARCH_INPUT": "ambiguous",
+                        "STUDENT_CARDS": "ok", "EXPORT_DIALOG": "unchecked"}
+    assert not result["ok"]
+    assert result["affected_tests"]["tests/acces/test_student_filters.py"] == ["NON_INSCRIT_FILTER"]
+    assert "tests/test_login.py" not in result["affected_tests"]
+
+class FakePage:
+    """Answers the batch counts of the current URL; clicking makes the filter menu render"""
+
+    def __init__(self):
+        self.url = None
+        self.menu_open = False
+        self.evaluations = 0
+
+    def goto(self, url):
+        self.url = url
+        self.menu_open = False
+
+    def evaluate(self, script, selectors):
+        self.evaluations += 1
+        rendered = {"//button[@title='Espace de travail']": 1}
+        if self.menu_open:
+            rendered["//span[text()='Non inscrit']"] = 1
+        return [rendered.get(selector, 0) for _, selector in selectors]
+
+    def wait_for_function(self, script, arg, timeout):
+        pass
+
+    def wait_for_load_state(self, state, timeout):
+        pass
+
+    def locator(self, selector):
+        page = self
+
+        class Locator:
+            first = None
+
+            def click(self, timeout):
+                page.menu_open = True
+        locator = Locator()
+        locator.first = locator
+        return locator
+
+def test_unreachable_view_marks_its_selectors():
+    page = FakePage()
+    selectors = [dict(entry, paths=set(entry["paths"])) for entry in SELECTORS]
+    result = SelectorPreflight("https://odoo.test", views=VIEWS, selectors=selectors).run(page)
+    statuses = {selector["name"]: selector["status"] for selector in result["selectors"]}
+    # FILTER_DROPDOWN_BUTTON is not declared: the filters view cannot be opened
+    assert statuses["NON_INSCRIT_FILTER"] == "unreachable"
+    assert statuses["SEARCH_INPUT"] == "missing"
+    assert result["views"][2]["error"].startswith("RuntimeError: FILTER_DROPDOWN_BUTTON")
+    # An unreachable view is a preflight error, not a reason to skip the tests using its selectors
+    assert result["errors"] == ["view filters: RuntimeError: FILTER_DROPDOWN_BUTTON matches nothing"]
+    assert not any("NON_INSCRIT_FILTER" in names for names in result["affected_tests"].values())
+
+def test_failed_login_is_an_error_not_missing_selectors():
+    page = FakePage()
+    selectors = [dict(entry, paths=set(entry["paths"])) for entry in SELECTORS]
+
+    def login(page):
+        raise RuntimeError("Identifiant/mot de passe incorrect")
+
+    result = SelectorPreflight("https://odoo.test", views=VIEWS, selectors=selectors).run(page, login=login)
+    assert result["errors"] == ["login: RuntimeError: Identifiant/mot de passe incorrect"]
+    assert not result["ok"]
+    # The login page says nothing about the logged-in views: they are not visited
+    assert page.url is None
+    assert {selector["status"] for selector in result["selectors"]} == {"unreachable", "unchecked"}
+    assert result["affected_tests"] == {}
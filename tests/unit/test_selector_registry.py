@@ -0,0 +1,71 @@
+# tests/unit/test_selector_registry.py
+import json
+import pytest
+from utils.selector_registry import SelectorRegistry, suggest_css
+
+pytestmark = pytest.mark.unit
+
+SIDEBAR_ITEM_BASE = "//div[contains(@class,'o_search_panel_label d-flex')]"
+CANDIDATES = ["div.o_search_panel_label.d-flex", SIDEBAR_ITEM_BASE, "//div[contains(@class,'o_search_panel_label')]"]
+
+class FakePage:
+    """Page whose DOM only renders the given selectors"""
+
+    def __init__(self, rendered, version="17.0+e"):
+        self.rendered = rendered
+        self.version = version
+        self.url = "https://odoo.test/web"
+        self.queries = []
+
+    def evaluate(self, script, arg=None):
+        if arg is None:
+            return self.version
+        return [len(self.rendered.get(selector, [])) for selector in arg]
+
+    def query_selector_all(self, selector):
+        self.queries.append(selector)
+        return self.rendered.get(selector, [])
+
+def test_learns_the_matching_candidate(tmp_path):
+    path = str(tmp_path / "registry.json")
+    candidates = CANDIDATES
+    page = FakePage({candidates[2]: ["item"] * 3})
+
+    assert SelectorRegistry(path).query_all(page, "sidebar_item", candidates) == (candidates[2], ["item"] * 3)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"17.0+e": {"sidebar_item": candidates[2]}}
+
+    # Next run: the remembered candidate is the only query once checked against the ones above it
+    page.queries.clear()
+    registry = SelectorRegistry(path)
+    registry.query_all(page, "sidebar_item", candidates)
+    registry.query_all(page, "sidebar_item", candidates)
+    assert page.queries == [candidates[2], candidates[2]]
+
+def test_preferred_candidate_takes_over_a_learned_fallback(tmp_path):
+    path = str(tmp_path / "registry.json")
+    SelectorRegistry(path).remember("17.0+e", "sidebar_item", CANDIDATES[2])
+    # The preferred candidate matches again (e.g. the fallback was learned on a half-rendered panel)
+    page = FakePage({CANDIDATES[0]: ["item"] * 3, CANDIDATES[2]: ["item"] * 3})
+
+    registry = SelectorRegistry(path)
+    assert registry.query_all(page, "sidebar_item", CANDIDATES)[0] == CANDIDATES[0]
+    assert registry.winners["17.0+e"]["sidebar_item"] == CANDIDATES[0]
+    page.queries.clear()
+    registry.query_all(page, "sidebar_item", CANDIDATES)
+    assert page.queries == [CANDIDATES[0]]
+
+def test_winners_are_per_server_version(tmp_path):
+    registry = SelectorRegistry(str(tmp_path / "registry.json"))
+    registry.remember("16.0", "sidebar_item", "//b")
+    assert registry.ranked("16.0", "sidebar_item", ["//a", "//b"]) == ["//b", "//a"]
+    assert registry.ranked("17.0", "sidebar_item", ["//a", "//b"]) == ["//a", "//b"]
+    assert registry.query_all(FakePage({}, version="17.0"), "sidebar_item", ["//a", "//b"]) == (None, [])
+
+def test_suggest_css():
+    assert suggest_css(SIDEBAR_ITEM_BASE) == CANDIDATES[0]
+    assert suggest_css("//button[@data-tooltip='List']") == "button[data-tooltip='List']"
+    assert suggest_css("//ol[contains(@class,'breadcrumb')]/li") == "ol.breadcrumb > li"
+    assert suggest_css("(//a[@data-menu-xmlid='acces.acces'])[3]") is None
+    assert suggest_css("//span[text()='Non inscrit']") is None
+    assert suggest_css("//i[contains(@class,'icon')]/following-sibling::span") is None
@@ -0,0 +1,82 @@
+# tests/unit/test_step_profiler.py
+import asyncio
+import os
+
+import pytest
+from pages.base_page import BasePage
+from pages.aio.base_page import AsyncBasePage
+from utils import step_profiler
+from utils.step_profiler import StepProfiler, self_times
+
+pytestmark = pytest.mark.unit
+
+# render() calls layout() twice; 6 ms in layout, 2 ms in render itself, 1 ms idle
+PROFILE = {
+    "nodes": [
+        {"id": 1, "callFrame": {"functionName": "(root)", "url": "", "lineNumber": -1}},
+        {"id": 2, "callFrame": {"functionName": "render", "url": "https://odoo.test/web/assets/web.js", "lineNumber": 41}},
+        {"id": 3, "callFrame": {"functionName": "layout", "url": "https://odoo.test/web/assets/web.js", "lineNumber": 99}},
+        {"id": 4, "callFrame": {"functionName": "(idle)", "url": "", "lineNumber": -1}},
+    ],
+    "samples": [2, 3, 3, 4, 2],
+    "timeDeltas": [1000, 3000, 3000, 1000, 1000],
+}
+
+STOP = {"Profiler.stop": {"profile": PROFILE}}
+
+@pytest.fixture(autouse=True)
+def no_allure(monkeypatch):
+    monkeypatch.setattr(step_profiler, "allure", None)
+
+def test_self_times_ranks_functions():
+    rows = self_times(PROFILE)
+    assert [(row["function"], row["line"], row["self_ms"]) for row in rows] == [
+        ("layout", 100, 6.0), ("render", 42, 2.0), ("(idle)", 0, 1.0)]
+    assert rows[0]["percent"] == 66.7
+
+def test_fast_steps_drop_their_profile(tmp_path, fakes):
+    page = fakes.FakePage(fakes.FakeContext(fakes.FakeSession(STOP)))
+    profiler = StepProfiler(profile_dir=str(tmp_path)).install(page)
+    base_page = BasePage(page)
+    with base_page.profiled_step("filter_apply"):
+        pass
+    with base_page.profiled_step("search_panel_click"):
+        # Nested steps run inside the outer profile
+        with base_page.profiled_step("filter_apply"):
+            pass
+    assert profiler.saved == [] and os.listdir(tmp_path) == []
+    assert page.context.sessions == 1
+    assert page.context.session.methods().count("Profiler.start") == 2
+
+def test_slow_step_keeps_its_profile(tmp_path, fakes):
+    page = fakes.FakePage(fakes.FakeContext(fakes.FakeSession(STOP)))
+    profiler = StepProfiler(profile_dir=str(tmp_path)).install(page)
+    with pytest.raises(TimeoutError):
+        with BasePage(page).profiled_step("open_students", budget_ms=-1):
+            raise TimeoutError("kanban did not render")
+    assert len(profiler.saved) == 1
+    assert profiler.saved[0].endswith(".cpuprofile")
+    assert os.path.basename(profiler.saved[0]).startswith("open_students_")
+    assert page.context.session.methods()[-1] == "Profiler.stop"
+
+def test_async_slow_step(tmp_path, fakes):
+    page = fakes.FakePage(fakes.AsyncFakeContext(fakes.AsyncFakeSession(STOP)))
+    profiler = StepProfiler(profile_dir=str(tmp_path)).install(page)
+
+    async def scenario():
+        async with AsyncBasePage(page).profiled_step("search_panel_click", budget_ms=-1):
+            pass
+
+    asyncio.run(scenario())
+    assert len(profiler.saved) == 1
+
+def test_without_profiler_steps_only_run(fakes):
+    ran = []
+    with BasePage(fakes.FakePage()).profiled_step("open_students"):
+        ran.append(1)
+    assert ran == [1]
+
+def test_budgets_scale_with_the_profile():
+    assert StepProfiler(factor=2).budget("open_students") == 8000
+    assert StepProfiler(budgets={"open_students": 100}).budget("open_students") == 100
+    assert StepProfiler().budget("unknown") == step_profiler.DEFAULT_BUDGET
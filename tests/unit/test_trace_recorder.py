@@ -0,0 +1,59 @@
+# tests/unit/test_trace_recorder.py
+import os
+
+import pytest
+from utils.trace_recorder import TraceRecorder, prune_traces, trace_filename
+
+pytestmark = pytest.mark.unit
+
+class FakeTracing:
+    def __init__(self):
+        self.calls = []
+
+    def start(self, **kwargs):
+        self.calls.append(("start", kwargs["title"]))
+
+    def start_chunk(self, title=None):
+        self.calls.append(("start_chunk", title))
+
+    def stop_chunk(self, path=None):
+        self.calls.append(("stop_chunk", path))
+        if path:
+            with open(path, "wb") as f:
+                f.write(b"zip")
+
+class FakeContext:
+    def __init__(self):
+        self.tracing = FakeTracing()
+
+def test_trace_written_only_for_failed_or_slow_tests(tmp_path):
+    context = FakeContext()
+    recorder = TraceRecorder(context, trace_dir=str(tmp_path), budget=60)
+
+    recorder.start_test("tests/test_login.py::test_valid_login")
+    assert recorder.finish_test("tests/test_login.py::test_valid_login") is None
+
+    recorder.start_test("tests/test_login.py::test_invalid_login[fr]")
+    path = recorder.finish_test("tests/test_login.py::test_invalid_login[fr]", failed=True)
+    assert os.path.basename(path).startswith("test_invalid_login_fr_failed_")
+
+    recorder.start_test("slow")
+    recorder._chunk_start -= 61
+    assert "_slow_" in recorder.finish_test("slow")
+
+    assert [call[0] for call in context.tracing.calls] == \
+        ["start", "stop_chunk", "start_chunk", "stop_chunk", "start_chunk", "stop_chunk"]
+    assert context.tracing.calls[1] == ("stop_chunk", None)
+
+def test_prune_keeps_the_newest_traces(tmp_path):
+    for index in range(5):
+        path = tmp_path / f"trace_{index}.zip"
+        path.write_bytes(b"zip")
+        os.utime(path, (1000 + index, 1000 + index))
+    removed = prune_traces(str(tmp_path), keep=2)
+    assert [os.path.basename(path) for path in removed] == ["trace_0.zip", "trace_1.zip", "trace_2.zip"]
+    assert sorted(os.listdir(tmp_path)) == ["trace_3.zip", "trace_4.zip"]
+
+def test_trace_filename():
+    assert trace_filename("tests/acces/test_x.py::test_filter[Non inscrit]", "failed").startswith(
+        "test_filter_Non_inscrit_failed_")
@@ -0,0 +1,48 @@
+# tests/unit/test_verification_cache.py
+import json
+
+import pytest
+from utils.verification_cache import VerificationCache
+
+pytestmark = pytest.mark.unit
+
+class FakeClient:
+    context = {}
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def version_info(self):
+        return {"server_version": "17.0"}
+
+    def call_kw(self, model, method, args=None, kwargs=None):
+        return self.rows
+
+ROWS = [{"id": 1, "write_date": "2025-09-01 10:00:00", "classe_id": [3, "CE1-A"]},
+        {"id": 2, "write_date": "2025-09-02 10:00:00", "classe_id": [4, "CE2-B"]}]
+
+def test_workers_plans_are_written_by_the_controller(tmp_path):
+    path = str(tmp_path / "cache.json")
+    workers = [VerificationCache(path).plan(FakeClient(ROWS), "classe_id") for _ in range(2)]
+    # Workers only hand over their plan, as plain data
+    states = [json.loads(json.dumps(worker.pending_state())) for worker in workers]
+    assert not (tmp_path / "cache.json").exists()
+
+    controller = VerificationCache(path)
+    for state in states:
+        controller.merge(state)
+    assert controller.full and controller.has_changes
+    assert controller.run_started == min(worker.run_started for worker in workers).replace(microsecond=0)
+    controller.mark_run(green=True)
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert sorted(data["records"]) == ["1", "2"]
+    assert data["records"]["2"]["class"] == "CE2-B"
+    assert data["last_full_sweep"] == data["last_green_run"]
+
+def test_red_run_leaves_the_cache(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = VerificationCache(path).plan(FakeClient(ROWS), "classe_id")
+    cache.mark_run(green=False)
+    assert not (tmp_path / "cache.json").exists()
@@ -0,0 +1,55 @@
+# tests/unit/test_view_readiness.py
+import pytest
+from pages.base_page import BasePage
+from utils.view_readiness import expected_view, is_search_read_response
+
+pytestmark = pytest.mark.unit
+
+class FakeRequest:
+    def __init__(self, method):
+        self.method = method
+
+class FakeResponse:
+    def __init__(self, url, payload=None, method="POST"):
+        self.url = url
+        self.request = FakeRequest(method)
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+SEARCH_READ = "https://odoo.test/web/dataset/call_kw/school.student/web_search_read"
+
+def test_expected_view_of_a_search_answer():
+    payload = {"jsonrpc": "2.0", "result": {"length": 321, "records": [{"id": i} for i in range(80)]}}
+    assert expected_view(payload) == {"total": 321, "records": 80}
+    assert expected_view({"result": {"records": []}}) == {"total": 0, "records": 0}
+    assert expected_view({"error": {"message": "Odoo Server Error"}}) is None
+
+def test_only_search_reads_answer_a_view():
+    assert is_search_read_response(FakeResponse(SEARCH_READ))
+    assert not is_search_read_response(FakeResponse(SEARCH_READ, method="GET"))
+    assert not is_search_read_response(FakeResponse("https://odoo.test/web/dataset/call_kw/school.student/search_panel_select_range"))
+
+def test_reload_view_waits_for_the_search_answer(fakes):
+    page = fakes.FakePage(response=FakeResponse(SEARCH_READ, {"result": {"length": 12, "records": [{}] * 12}}))
+    clicks = []
+    assert BasePage(page).reload_view(lambda: clicks.append(1), facets=["Classe"])
+    assert clicks == [1]
+    assert page.waits == [[{"total": 12, "records": 12}, ["Classe"], None]]
+
+def test_reload_view_without_search_answer_checks_the_pager(fakes):
+    page = fakes.FakePage()
+    assert BasePage(page).reload_view(lambda: None, facet_count=0)
+    assert page.waits == [[None, None, 0]]
+
+def test_reload_view_raises_when_the_action_fails(fakes):
+    def click():
+        raise RuntimeError("Element is not attached to the DOM")
+    page = fakes.FakePage(response=FakeResponse(SEARCH_READ, {"result": {"length": 0, "records": []}}))
+    with pytest.raises(RuntimeError):
+        BasePage(page).reload_view(click)
+    assert page.waits == []
+
+def test_view_not_ready_returns_false(fakes):
+    assert not BasePage(fakes.FakePage(ready=False)).wait_for_view_ready(timeout=10)
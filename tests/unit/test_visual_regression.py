@@ -0,0 +1,116 @@
+# tests/unit/test_visual_regression.py
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from utils.visual_regression import ScreenshotLog, VisualRegressionEngine, compare_screenshot, screenshot_key
+from utils.screenshot_manager import dedupe_allure_results
+
+pytestmark = pytest.mark.unit
+
+def page_image(path, blocks=(), size=(1280, 720)):
+    """Grey page with dark blocks at (x, y, width, height)"""
+    pixels = np.full((size[1], size[0], 3), 230, dtype=np.uint8)
+    for x, y, width, height in blocks:
+        pixels[y:y + height, x:x + width] = 40
+    Image.fromarray(pixels).save(path)
+    return str(path)
+
+LAYOUT = [(40, 40, 1200, 120), (40, 240, 560, 440), (680, 240, 560, 440)]
+
+@pytest.fixture
+def baselines(tmp_path):
+    directory = tmp_path / "baselines"
+    directory.mkdir()
+    page_image(directory / "students.png", LAYOUT)
+    return str(directory)
+
+def compare(path, baselines, tmp_path, masks=None):
+    return compare_screenshot(path, baselines, masks, diff_dir=str(tmp_path / "diffs"))
+
+def test_screenshot_key_drops_timestamps():
+    assert screenshot_key("reports/screenshots/login_error_20250516-154159.png") == "login_error"
+    assert screenshot_key("click_retry_failure_x_20250519_154006.png") == "click_retry_failure_x"
+    assert screenshot_key("language_fr.png") == "language_fr"
+
+def test_statuses(tmp_path, baselines):
+    same = page_image(tmp_path / "students_20250101_120000.png", LAYOUT)
+    assert compare(same, baselines, tmp_path)["status"] == "match"
+    
+    # A small block appears: content changed, layout did not
+    small = page_image(tmp_path / "students_20250101_120001.png", LAYOUT + [(600, 180, 40, 40)])
+    result = compare(small, baselines, tmp_path)
+    assert result["status"] == "changed"
+    assert result["bbox"] == [600, 180, 40, 40]
+    
+    # The same change inside a masked region is ignored
+    assert compare(small, baselines, tmp_path, {"students": [[590, 170, 60, 60]]})["status"] == "match"
+    
+    moved = page_image(tmp_path / "students_20250101_120002.png", [(40, 40, 1200, 120), (40, 240, 1200, 160)])
+    assert compare(moved, baselines, tmp_path)["status"] == "layout"
+    
+    resized = page_image(tmp_path / "students_20250101_120003.png", LAYOUT, size=(1200, 720))
+    assert compare(resized, baselines, tmp_path)["status"] == "layout"
+    
+    assert compare(page_image(tmp_path / "other.png"), baselines, tmp_path)["status"] == "new"
+
+def test_screenshot_log_only_returns_the_pages_own_screenshots():
+    class FakePage:
+        def screenshot(self, path=None, **kwargs):
+            return b"png"
+
+    log = ScreenshotLog()
+    page = FakePage()
+    log.install(page)
+    log.paths.append("stale.png")
+    log.drain()
+    assert page.screenshot(path="reports/screenshots/login_error.png") == b"png"
+    page.screenshot()
+    assert log.drain() == ["reports/screenshots/login_error.png"]
+    assert log.drain() == []
+
+def test_worker_results_are_merged_on_the_controller(tmp_path, baselines):
+    same = page_image(tmp_path / "students_20250101_120000.png", LAYOUT)
+    moved = page_image(tmp_path / "students_20250101_120001.png", [(40, 40, 1200, 120), (40, 240, 1200, 160)])
+    worker = VisualRegressionEngine(baseline_dir=baselines, diff_dir=str(tmp_path / "diffs"), workers=1)
+    worker.submit(moved)
+    worker.close()
+    # Worker results travel through xdist's workeroutput as plain data
+    shipped = json.loads(json.dumps(worker.results))
+
+    controller = VisualRegressionEngine(baseline_dir=baselines, diff_dir=str(tmp_path / "diffs"), workers=1)
+    controller.submit(same)
+    controller.close()
+    controller.merge(shipped)
+    assert [result["status"] for result in controller.results] == ["match", "layout"]
+    assert len(controller.regressions()) == 1
+
+def test_dedupe_allure_results(tmp_path):
+    page_image(tmp_path / "a-attachment.png", LAYOUT)
+    page_image(tmp_path / "b-attachment.png", LAYOUT)
+    page_image(tmp_path / "c-attachment.png", [(40, 40, 1200, 120)])
+    page_image(tmp_path / "d-attachment.png", LAYOUT)
+    page_image(tmp_path / "e-attachment.png", LAYOUT + [(600, 180, 40, 40)])
+    # Not referenced by any result yet (e.g. written by a worker still running)
+    page_image(tmp_path / "f-attachment.png", LAYOUT)
+    shot = lambda source: {"name": source, "source": source, "type": "image/png"}
+    (tmp_path / "1-result.json").write_text(json.dumps({
+        "steps": [{"attachments": [shot("a-attachment.png")]},
+                  {"attachments": [shot("b-attachment.png"), shot("c-attachment.png")]}],
+    }))
+    (tmp_path / "2-result.json").write_text(json.dumps({"attachments": [shot("d-attachment.png")]}))
+    (tmp_path / "3-result.json").write_text(json.dumps({"attachments": [shot("e-attachment.png")]}))
+    
+    stats = dedupe_allure_results(str(tmp_path), workers=1)
+    
+    assert stats == {"screenshots": 6, "dropped_attachments": 1, "removed_files": 2}
+    first = json.loads((tmp_path / "1-result.json").read_text())
+    assert [a["source"] for step in first["steps"] for a in step["attachments"]] == \
+        ["a-attachment.png", "c-attachment.png"]
+    # Identical screenshots of other results point to the shared file, similar ones are kept
+    assert json.loads((tmp_path / "2-result.json").read_text())["attachments"][0]["source"] == "a-attachment.png"
+    assert json.loads((tmp_path / "3-result.json").read_text())["attachments"][0]["source"] == "e-attachment.png"
+    assert sorted(p.name for p in tmp_path.glob("*.png")) == \
+        ["a-attachment.png", "c-attachment.png", "e-attachment.png", "f-attachment.png"]
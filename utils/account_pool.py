@@ -0,0 +1,194 @@
+# utils/account_pool.py
+"""
+Pool of equivalent Odoo accounts so parallel workers don't share one session.
+
+Accounts come from the "pool_users" list of data/users.json. They can be created
+over RPC as copies of the configured account (same groups, same school):
+
+    python -m utils.account_pool --provision 8
+"""
+import argparse
+import json
+import os
+import time
+
+from utils.file_lock import FileLock
+
+POOL_DIR = ".cache/account_pool"
+USERS_FILE = "data/users.json"
+
+
+def _pid_alive(pid):
+    """True if a process with this pid exists on this machine"""
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows; never reclaim there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class AccountPool:
+    """
+    Lease one account per process (one per xdist worker) through a file lock.
+
+    Each account keeps its own cached storage state, so a worker logs in once and
+    later tests reuse the session instead of going through the login form.
+    """
+
+    def __init__(self, users=None, default_user=None, users_file=USERS_FILE, pool_dir=POOL_DIR):
+        """
+        Args:
+            users: List of {"username", "password"} dicts (defaults to pool_users in users.json)
+            default_user: Account used when the pool is empty or exhausted
+            users_file: JSON file holding the pool_users list
+            pool_dir: Directory for the lease file and cached storage states
+        """
+        self.pool_dir = pool_dir
+        self.users = users if users is not None else self.load_users(users_file)
+        self.default_user = default_user
+        self.state_path = os.path.join(pool_dir, "leases.json")
+        self.lock = FileLock(f"{self.state_path}.lock")
+        self.account = None
+
+    @staticmethod
+    def load_users(users_file=USERS_FILE):
+        try:
+            with open(users_file, "r", encoding="utf-8") as f:
+                return json.load(f).get("pool_users", [])
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+    def _read_leases(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_leases(self, leases):
+        os.makedirs(self.pool_dir, exist_ok=True)
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(leases, f, indent=1)
+        os.replace(temp_path, self.state_path)
+
+    def lease(self, holder=None):
+        """
+        Take a free account for this process
+
+        Leases held by processes that no longer exist are reclaimed.
+
+        Returns:
+            dict: The account ({"username", "password", ...}), or default_user if none is free
+        """
+        holder = holder or os.getenv("PYTEST_XDIST_WORKER", "main")
+        with self.lock:
+            leases = self._read_leases()
+            for username, lease in list(leases.items()):
+                if not _pid_alive(lease["pid"]):
+                    del leases[username]
+            for user in self.users:
+                if user["username"] not in leases:
+                    leases[user["username"]] = {"holder": holder, "pid": os.getpid(), "since": time.time()}
+                    self._write_leases(leases)
+                    self.account = user
+                    print(f"Worker {holder} leased account {user['username']}")
+                    return user
+        if self.users:
+            print(f"Account pool exhausted ({len(self.users)} accounts) - {holder} shares the default account")
+        return self.default_user
+
+    def release(self):
+        """Return the leased account to the pool"""
+        if not self.account:
+            return
+        with self.lock:
+            leases = self._read_leases()
+            leases.pop(self.account["username"], None)
+            self._write_leases(leases)
+        self.account = None
+
+    def storage_state_path(self, username):
+        """Where the logged-in storage state of an account is cached"""
+        safe_name = "".join(c if c.isalnum() else "_" for c in username)
+        return os.path.join(self.pool_dir, f"state_{safe_name}.json")
+
+    def load_storage_state(self, username):
+        """Return the cached storage state of an account, or None"""
+        try:
+            with open(self.storage_state_path(username), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save_storage_state(self, username, context):
+        """Cache the storage state of a logged-in browser context"""
+        os.makedirs(self.pool_dir, exist_ok=True)
+        context.storage_state(path=self.storage_state_path(username))
+
+    def forget_storage_state(self, username):
+        """Drop a cached storage state that no longer logs in"""
+        try:
+            os.remove(self.storage_state_path(username))
+        except FileNotFoundError:
+            pass
+
+
+def provision(client, count, password, prefix="e2e.worker", users_file=USERS_FILE):
+    """
+    Create `count` copies of the client's user over RPC and save them to users.json
+
+    Copies keep the groups and companies of the template account, so every pooled
+    account sees the same data. Existing logins are reused.
+
+    Returns:
+        list: The pool_users entries
+    """
+    template = client.call_kw("res.users", "read", [[client.uid], ["name"]])[0]
+    existing = client.call_kw("res.users", "search_read", [[("login", "=like", f"{prefix}%")]], {
+        "fields": ["login"],
+        "context": dict(client.context, active_test=False),
+    })
+    existing_logins = {user["login"]: user["id"] for user in existing}
+
+    users = []
+    for index in range(1, count + 1):
+        login = f"{prefix}{index:02d}"
+        user_id = existing_logins.get(login)
+        if not user_id:
+            user_id = client.call_kw("res.users", "copy", [client.uid], {
+                "default": {"login": login, "name": f"{template['name']} (E2E {index:02d})"},
+            })
+        client.call_kw("res.users", "write", [[user_id], {"password": password, "active": True}])
+        users.append({"username": login, "password": password, "description": f"Pooled E2E account {index:02d}"})
+
+    with open(users_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["pool_users"] = users
+    with open(users_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    return users
+
+
+def main():
+    from utils.odoo_utils import OdooClient
+    parser = argparse.ArgumentParser(description="Provision pooled test accounts")
+    parser.add_argument("--provision", type=int, required=True, help="Number of accounts")
+    parser.add_argument("--config", default="data/config.json", help="Config with the template account")
+    parser.add_argument("--password", help="Password for the pooled accounts (defaults to the template's)")
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    client = OdooClient.from_config(config)
+    users = provision(client, args.provision, args.password or config["password"])
+    print(f"{len(users)} pooled accounts saved to {USERS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
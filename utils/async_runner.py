@@ -0,0 +1,133 @@
+# utils/async_runner.py
+import asyncio
+import threading
+
+from playwright.async_api import async_playwright
+
+from utils.error_sentinel import ErrorSentinel
+from utils.query_cache import QueryCache
+from utils.perf_profiles import apply_profile_async, page_timeout_factor
+from utils.step_profiler import StepProfiler
+
+
+class AsyncBrowserRunner:
+    """
+    Event loop thread owning an async Playwright browser.
+
+    The sync suite keeps its sync_playwright browser on the main thread; this
+    runner drives the pages/aio page objects on its own loop, so a plain pytest
+    test can run many pages concurrently without pytest-asyncio:
+
+        async def scenario(runner):
+            context = await runner.new_context(storage_state=state)
+            return await runner.map_pages(context, labels, check_filter)
+
+        results = async_runner.run(scenario(async_runner))
+    """
+
+    def __init__(self, headless=True, launch_args=None, context_args=None, timeout=30000, profile=None,
+                 step_profiling=False, screenshot_log=None):
+        """
+        Args:
+            headless: Launch chromium headless
+            launch_args: Extra chromium command line arguments
+            context_args: Default new_context() keyword arguments
+            timeout: Default timeout of every page, in milliseconds
+            profile: Network and CPU throttling profile of every page (utils.perf_profiles)
+            step_profiling: Keep JS CPU profiles of the slow named steps (utils.step_profiler)
+            screenshot_log: utils.visual_regression.ScreenshotLog recording the pages' screenshots
+        """
+        self.headless = headless
+        self.launch_args = launch_args or []
+        self.context_args = context_args or {}
+        self.timeout = timeout
+        self.profile = profile
+        self.step_profiling = step_profiling
+        self.screenshot_log = screenshot_log
+        self.loop = None
+        self.playwright = None
+        self.browser = None
+        self._thread = None
+
+    def start(self):
+        """Start the loop thread and launch the browser"""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-playwright", daemon=True)
+        self._thread.start()
+        self.run(self._launch())
+        return self
+
+    async def _launch(self):
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=self.headless, args=self.launch_args)
+
+    def run(self, coroutine, timeout=None):
+        """
+        Run a coroutine on the runner loop and wait for its result
+
+        Args:
+            coroutine: Awaitable to run
+            timeout: Seconds to wait before giving up (None waits forever)
+
+        Returns:
+            The coroutine's result; its exception is re-raised here
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    async def new_context(self, **kwargs):
+        """Open a browser context with the runner defaults (storage_state, locale, ...)"""
+        context = await self.browser.new_context(**{**self.context_args, **kwargs})
+        context.set_default_timeout(self.timeout)
+        return context
+
+    async def map_pages(self, context, items, scenario, concurrency=8):
+        """
+        Run scenario(page, item) for each item, each on its own page of the context
+
+        Args:
+            context: Browser context shared by the pages (one login for all of them)
+            items: Values handed to the scenario, one page per value
+            scenario: Coroutine function taking (page, item)
+            concurrency: Maximum number of pages open at the same time
+
+        Returns:
+            list: Results in the order of items; a failed scenario yields its exception
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(item):
+            async with semaphore:
+                page = await context.new_page()
+                ErrorSentinel().install_async(page)
+                await QueryCache().install_async(page)
+                await apply_profile_async(page, self.profile)
+                if self.step_profiling:
+                    StepProfiler(factor=page_timeout_factor(page)).install(page)
+                if self.screenshot_log is not None:
+                    self.screenshot_log.install_async(page)
+                try:
+                    return await scenario(page, item)
+                finally:
+                    await page.close()
+
+        return await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+
+    def stop(self):
+        """Close the browser and stop the loop thread"""
+        if not self.loop:
+            return
+
+        async def shutdown():
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+
+        try:
+            self.run(shutdown(), timeout=30)
+        except Exception as e:
+            print(f"Error stopping async browser: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=10)
+        self.loop.close()
+        self.loop = None
@@ -0,0 +1,202 @@
+# utils/browser_daemon.py
+"""
+Long-lived Chromium reused across pytest runs.
+
+Launching Chromium dominates the startup of a single local test. With
+--browser-daemon (or BROWSER_DAEMON=true) the browser fixture connects over CDP
+to a Chromium left running by a previous run, starting one if needed. Every test
+still gets a fresh browser context, so runs stay isolated; closing the fixture
+only disconnects.
+
+    python -m utils.browser_daemon start [--headed]
+    python -m utils.browser_daemon status
+    python -m utils.browser_daemon stop
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+STATE_FILE = "reports/.browser_daemon.json"
+DEFAULT_PORT = int(os.getenv("BROWSER_DAEMON_PORT", "9222"))
+START_TIMEOUT = 15
+USER_DATA_PREFIX = "nawat-browser-"
+
+
+def read_state(state_file=STATE_FILE):
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def endpoint_version(endpoint, timeout=1):
+    """
+    Health check of a CDP endpoint
+
+    Returns:
+        dict: /json/version of the browser, or None when it does not answer
+    """
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except Exception:
+        return None
+
+
+def healthy_endpoint(state_file=STATE_FILE):
+    """CDP endpoint of the running daemon, or None"""
+    state = read_state(state_file)
+    if state and endpoint_version(state["endpoint"]):
+        return state["endpoint"]
+    return None
+
+
+def start_daemon(executable_path, headless=True, port=DEFAULT_PORT, state_file=STATE_FILE):
+    """
+    Start Chromium with remote debugging, detached from the current process
+
+    Args:
+        executable_path: Chromium binary (playwright.chromium.executable_path)
+        headless: Run without window
+        port: Remote debugging port
+
+    Returns:
+        str: CDP endpoint
+    """
+    endpoint = healthy_endpoint(state_file)
+    if endpoint:
+        return endpoint
+
+    endpoint = f"http://127.0.0.1:{port}"
+    user_data_dir = tempfile.mkdtemp(prefix=USER_DATA_PREFIX)
+    args = [
+        executable_path,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={user_data_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-dev-shm-usage",
+        "--disable-extensions",
+    ]
+    if headless:
+        args.append("--headless=new")
+    args.append("about:blank")
+
+    if sys.platform == "win32":
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **detach)
+
+    deadline = time.time() + START_TIMEOUT
+    while not endpoint_version(endpoint):
+        if process.poll() is not None or time.time() > deadline:
+            process.kill()
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+            raise RuntimeError(f"Browser daemon did not answer on {endpoint}")
+        time.sleep(0.1)
+
+    os.makedirs(os.path.dirname(state_file) or ".", exist_ok=True)
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump({"pid": process.pid, "endpoint": endpoint, "headless": headless,
+                   "user_data_dir": user_data_dir, "started_at": time.time()}, f, indent=2)
+    print(f"Browser daemon started on {endpoint} (pid {process.pid})")
+    return endpoint
+
+
+def is_daemon_process(state):
+    """
+    Whether the recorded pid is still the daemon, not a process that reused it
+
+    Checks /proc/<pid>/cmdline for the daemon's --user-data-dir. Without /proc
+    (macOS, Windows) only a daemon whose endpoint answers is trusted.
+    """
+    try:
+        with open(f"/proc/{state['pid']}/cmdline", "rb") as f:
+            arguments = f.read().decode("utf-8", "replace").split("\0")
+    except FileNotFoundError:
+        if os.path.isdir("/proc"):
+            return False
+        return endpoint_version(state["endpoint"]) is not None
+    except OSError:
+        return False
+    return f"--user-data-dir={state.get('user_data_dir')}" in arguments
+
+
+def stop_daemon(state_file=STATE_FILE):
+    """
+    Stop the daemon; returns False if none was running
+
+    A stale state whose pid now belongs to another process is only removed.
+    """
+    state = read_state(state_file)
+    if not state:
+        return False
+    if state.get("pid") and is_daemon_process(state):
+        try:
+            os.kill(state["pid"], signal.SIGTERM)
+        except OSError:
+            pass
+    user_data_dir = state.get("user_data_dir") or ""
+    if os.path.basename(user_data_dir).startswith(USER_DATA_PREFIX):
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+    os.remove(state_file)
+    return True
+
+
+def connect(playwright, headless=True, port=DEFAULT_PORT, state_file=STATE_FILE):
+    """
+    Connect to the daemon, starting or restarting it when it does not answer
+
+    Returns:
+        Browser: Connected over CDP; close() disconnects and keeps the daemon running
+    """
+    for attempt in range(2):
+        endpoint = healthy_endpoint(state_file)
+        if endpoint is None:
+            # Stale state (daemon killed, machine rebooted...): start over
+            stop_daemon(state_file)
+            endpoint = start_daemon(playwright.chromium.executable_path, headless, port, state_file)
+        try:
+            return playwright.chromium.connect_over_cdp(endpoint)
+        except Exception as e:
+            print(f"Connecting to the browser daemon failed: {e}")
+            if attempt:
+                raise
+            stop_daemon(state_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chromium kept running between pytest runs")
+    parser.add_argument("command", choices=["start", "stop", "restart", "status"])
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    if args.command in ("stop", "restart"):
+        print("Browser daemon stopped" if stop_daemon() else "No browser daemon running")
+    if args.command in ("start", "restart"):
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as playwright:
+            executable_path = playwright.chromium.executable_path
+        start_daemon(executable_path, headless=not args.headed, port=args.port)
+    if args.command == "status":
+        state = read_state()
+        version = endpoint_version(state["endpoint"]) if state else None
+        if version:
+            print(f"{version.get('Browser')} on {state['endpoint']} (pid {state['pid']})")
+        else:
+            print("No browser daemon running")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+# utils/browser_watchdog.py
+"""
+Memory and CPU watchdog of the session browser.
+
+The session browser lives for the whole run while every test opens and closes
+a context: renderer and GPU processes that keep memory after their context is
+gone slow down the end of long runs. Around each test the watchdog samples
+
+- RSS and CPU time of the Chromium process tree, from /proc (Linux only),
+  rooted at the browser process launched with browser_marker() so other
+  browsers of the process (the async runner's) are left out
+- the JS heap, DOM node and listener counts of the test's page, through CDP
+
+records them per test (what the test left behind is the RSS after its context
+closed minus the RSS before it started) and relaunches the browser between two
+tests once the tree or the heap crosses its threshold:
+
+    watchdog = BrowserWatchdog(browser, relaunch, max_rss_mb=2500)
+    watchdog.start_test(nodeid)
+    ...                                   # test runs on watchdog.browser
+    watchdog.sample_page(nodeid, page)    # before the context closes
+    watchdog.finish_test(nodeid)          # after; may relaunch
+    watchdog.save()                       # reports/browser_watchdog.json
+"""
+import json
+import os
+import time
+import uuid
+
+REPORT_PATH = "reports/browser_watchdog.json"
+# Processes of the tree that belong to the browser (the Playwright driver is node)
+BROWSER_NAMES = ("chrom", "headless_shell")
+SUSPECTS_SHOWN = 10
+# Switch Chromium ignores, added to the command line of the watched browser to find its process
+MARKER_SWITCH = "--nawat-watchdog"
+
+try:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS, PAGE_SIZE = 100, 4096
+
+
+def read_stat(pid, proc="/proc"):
+    """
+    Parent, CPU time and RSS of a process
+
+    Returns:
+        dict: pid, ppid, name, cpu (seconds), rss (bytes), or None when the process is gone
+    """
+    try:
+        with open(f"{proc}/{pid}/stat", encoding="utf-8") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The name is in parentheses and may contain spaces
+    name = stat[stat.index("(") + 1:stat.rindex(")")]
+    fields = stat[stat.rindex(")") + 2:].split()
+    return {
+        "pid": int(pid),
+        "ppid": int(fields[1]),
+        "name": name,
+        "cpu": (int(fields[11]) + int(fields[12])) / CLOCK_TICKS,
+        "rss": int(fields[21]) * PAGE_SIZE,
+    }
+
+
+def read_cmdline(pid, proc="/proc"):
+    """Command line arguments of a process, None when the process is gone"""
+    try:
+        with open(f"{proc}/{pid}/cmdline", "rb") as f:
+            return f.read().decode("utf-8", "replace").split("\0")
+    except OSError:
+        return None
+
+
+def process_kind(pid, proc="/proc"):
+    """Chromium process type from its command line: browser, renderer, gpu-process, utility..."""
+    args = read_cmdline(pid, proc)
+    if args is None:
+        return "unknown"
+    for arg in args:
+        if arg.startswith("--type="):
+            return arg[len("--type="):]
+    return "browser"
+
+
+def browser_marker():
+    """Unique switch to launch the watched browser with (see find_browser_pid)"""
+    return f"{MARKER_SWITCH}={uuid.uuid4().hex}"
+
+
+def find_browser_pid(marker, proc="/proc"):
+    """Pid of the browser process launched with the marker switch, None if it is not running"""
+    if not os.path.isdir(proc):
+        return None
+    for entry in os.listdir(proc):
+        if entry.isdigit():
+            args = read_cmdline(entry, proc)
+            if args and marker in args and not any(arg.startswith("--type=") for arg in args):
+                return int(entry)
+    return None
+
+
+def process_tree(root_pid, proc="/proc"):
+    """Stats of root_pid and all its descendants"""
+    stats = {}
+    for entry in os.listdir(proc):
+        if entry.isdigit():
+            stat = read_stat(entry, proc)
+            if stat:
+                stats[stat["pid"]] = stat
+    tree, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        if pid in stats:
+            tree.append(stats[pid])
+        pending.extend(child["pid"] for child in stats.values() if child["ppid"] == pid)
+    return tree
+
+
+def sample_processes(root_pid=None, proc="/proc"):
+    """
+    RSS and CPU time of the browser processes under root_pid (this process by default)
+
+    Returns:
+        dict: rss_mb, cpu_seconds, processes and rss_mb per process kind; None without /proc
+    """
+    if not os.path.isdir(proc):
+        return None
+    browser = [stat for stat in process_tree(root_pid or os.getpid(), proc)
+               if any(name in stat["name"].lower() for name in BROWSER_NAMES)]
+    by_kind = {}
+    for stat in browser:
+        kind = process_kind(stat["pid"], proc)
+        by_kind[kind] = round(by_kind.get(kind, 0) + stat["rss"] / 2**20, 1)
+    return {
+        "rss_mb": round(sum(stat["rss"] for stat in browser) / 2**20, 1),
+        "cpu_seconds": round(sum(stat["cpu"] for stat in browser), 2),
+        "processes": len(browser),
+        "by_kind": by_kind,
+    }
+
+
+def page_metrics(page):
+    """
+    Performance.getMetrics of a Chromium page (JSHeapUsedSize, Nodes, JSEventListeners...)
+
+    Returns:
+        dict: Metric name -> value, empty when CDP is not available
+    """
+    try:
+        session = page.context.new_cdp_session(page)
+    except Exception:
+        return {}
+    try:
+        session.send("Performance.enable")
+        return {metric["name"]: metric["value"] for metric in session.send("Performance.getMetrics")["metrics"]}
+    except Exception:
+        return {}
+    finally:
+        try:
+            session.detach()
+        except Exception:
+            pass
+
+
+class BrowserWatchdog:
+    """Per-test resource samples of a browser, relaunched past a threshold"""
+
+    def __init__(self, browser, relaunch=None, max_rss_mb=2500, max_heap_mb=300, root_pid=None, marker=None):
+        """
+        Args:
+            browser: The browser the tests use
+            relaunch: Callable returning a new browser, None to only record (browser daemon)
+            max_rss_mb: RSS of the browser process tree above which it is relaunched
+            max_heap_mb: JS heap of a test page above which the browser is relaunched
+            root_pid: Process the browser runs under (this process by default)
+            marker: browser_marker() switch the browser, and its relaunches, were launched with
+        """
+        self.browser = browser
+        self.relaunch = relaunch
+        self.max_rss_mb = max_rss_mb
+        self.max_heap_mb = max_heap_mb
+        self.root_pid = root_pid
+        self.marker = marker
+        self._browser_pid = None
+        self.samples = []
+        self.recycles = []
+        self._running = {}
+
+    def sample(self):
+        """sample_processes() of the watched browser, None when its process cannot be found"""
+        if not self.marker:
+            return sample_processes(self.root_pid)
+        # The pid changes when the browser is relaunched, and may be reused once it exited
+        args = read_cmdline(self._browser_pid) if self._browser_pid else None
+        if not args or self.marker not in args:
+            self._browser_pid = find_browser_pid(self.marker)
+        return sample_processes(self._browser_pid) if self._browser_pid else None
+
+    def start_test(self, nodeid):
+        self._running[nodeid] = {"started": time.time(), "before": self.sample(), "page": {}}
+
+    def sample_page(self, nodeid, page):
+        """Heap and DOM size of the test's page, read before its context closes"""
+        metrics = page_metrics(page)
+        if nodeid in self._running and metrics:
+            self._running[nodeid]["page"] = {
+                "heap_mb": round(metrics.get("JSHeapUsedSize", 0) / 2**20, 1),
+                "nodes": int(metrics.get("Nodes", 0)),
+                "listeners": int(metrics.get("JSEventListeners", 0)),
+            }
+
+    def finish_test(self, nodeid):
+        """
+        Record what the test left behind and relaunch the browser when it is over a threshold
+
+        Returns:
+            dict: The sample of the test, None if start_test was not called
+        """
+        running = self._running.pop(nodeid, None)
+        if running is None:
+            return None
+        after = self.sample()
+        before = running["before"]
+        elapsed = max(time.time() - running["started"], 1e-3)
+        sample = {"test": nodeid, "duration": round(elapsed, 2), **running["page"]}
+        if after:
+            sample.update(rss_mb=after["rss_mb"], processes=after["processes"], by_kind=after["by_kind"])
+        if after and before:
+            sample["rss_delta_mb"] = round(after["rss_mb"] - before["rss_mb"], 1)
+            sample["cpu_percent"] = round(100 * (after["cpu_seconds"] - before["cpu_seconds"]) / elapsed, 1)
+        self.samples.append(sample)
+
+        reason = self.over_threshold(sample)
+        if reason:
+            self.recycle(reason, after=nodeid)
+        return sample
+
+    def over_threshold(self, sample):
+        """Why the browser must be relaunched after this sample, or None"""
+        if self.max_rss_mb and sample.get("rss_mb", 0) > self.max_rss_mb:
+            return f"browser RSS {sample['rss_mb']} MB > {self.max_rss_mb} MB"
+        if self.max_heap_mb and sample.get("heap_mb", 0) > self.max_heap_mb:
+            return f"JS heap {sample['heap_mb']} MB > {self.max_heap_mb} MB"
+        return None
+
+    def recycle(self, reason, after=None):
+        """
+        Close the browser and launch a new one for the next tests
+
+        Returns:
+            bool: True if the browser was relaunched
+        """
+        if self.relaunch is None:
+            return False
+        print(f"♻️  Relaunching the browser: {reason}")
+        try:
+            self.browser.close()
+        except Exception:
+            pass
+        self.browser = self.relaunch()
+        self.recycles.append({"after": after, "reason": reason, "time": time.time()})
+        return True
+
+    def suspects(self, count=SUSPECTS_SHOWN):
+        """Tests that left the most browser memory behind"""
+        grown = [sample for sample in self.samples if sample.get("rss_delta_mb", 0) > 0]
+        return sorted(grown, key=lambda sample: sample["rss_delta_mb"], reverse=True)[:count]
+
+    def report(self):
+        return {"max_rss_mb": self.max_rss_mb, "max_heap_mb": self.max_heap_mb,
+                "samples": self.samples, "recycles": self.recycles, "suspects": self.suspects()}
+
+    def save(self, path=REPORT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def summary(self):
+        peak = max((sample.get("rss_mb", 0) for sample in self.samples), default=0)
+        lines = [f"Browser watchdog: {len(self.samples)} tests, peak RSS {peak} MB, "
+                 f"{len(self.recycles)} relaunch(es)"]
+        for sample in self.suspects(5):
+            lines.append(f"  +{sample['rss_delta_mb']} MB  {sample['test']}")
+        return "\n".join(lines)
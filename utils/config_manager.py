@@ -0,0 +1,41 @@
+# utils/config_manager.py
+import json
+import os
+
+CONFIG_FILE = "data/config.json"
+
+DEFAULT_CONFIG = {
+    "base_url": "https://dev.nawat.ma",
+    "username": "ecole.e2a",
+    "password": "1@ayouris2",
+    "headless": True,
+    "slow_mo": 0
+}
+
+
+def load_config(path=CONFIG_FILE, base_url=None):
+    """
+    Load the test configuration shared by the suite and the standalone tools
+    
+    The server can be switched without editing the file, e.g. to a local
+    stand-in: BASE_URL=http://localhost:8069 pytest ...
+    
+    Args:
+        path: JSON config file (defaults are used if it doesn't exist)
+        base_url: Server to target, overriding BASE_URL and the file
+    
+    Returns:
+        dict: Configuration with headless as a boolean
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = {**DEFAULT_CONFIG, **json.load(f)}
+    except FileNotFoundError:
+        config = dict(DEFAULT_CONFIG)
+    
+    # Convert string 'False'/'True' to boolean if needed
+    if isinstance(config.get("headless"), str):
+        config["headless"] = config["headless"].lower() == "true"
+    
+    config["base_url"] = (base_url or os.getenv("BASE_URL") or config["base_url"]).rstrip("/")
+    return config
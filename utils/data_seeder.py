@@ -0,0 +1,212 @@
+# utils/data_seeder.py
+import itertools
+import json
+import os
+import uuid
+
+from utils.data_generator import SIBLING_COUNTS, SchoolDataGenerator
+from utils.file_lock import FileLock
+from utils.odoo_utils import STUDENT_MODEL
+
+POOL_DIR = ".cache/fixture_pool"
+
+# Records per create() call
+CREATE_BATCH_SIZE = 200
+
+# Pool kind -> model, generator entity and {odoo_field: generated_record_key}.
+# Override per server with a "seed_models" section in data/config.json.
+DEFAULT_SEED_MODELS = {
+    "students": {
+        "model": STUDENT_MODEL,
+        "entity": "students",
+        "fields": {"name": "name"},
+    },
+    "archived_students": {
+        "model": STUDENT_MODEL,
+        "entity": "students",
+        "fields": {"name": "name"},
+        "archived": True,
+    },
+    "families": {
+        "model": "res.partner",
+        "entity": "families",
+        "fields": {"name": "name", "email": "email", "phone": "phone"},
+    },
+}
+
+
+class FixturePool:
+    """
+    Warm pool of RPC-created records leased to destructive tests.
+
+    Records are created in batches with create() and named "[<run tag>] ..." so a
+    whole run can be cleaned up with one search + unlink per model. Pool state lives
+    in a JSON file guarded by a file lock, so pytest-xdist workers lease records
+    atomically and never receive the same id. The last worker to close the pool
+    removes every record of the run.
+    """
+
+    def __init__(self, client, run_id=None, seed_models=None, refill_size=20, seed=0):
+        """
+        Args:
+            client: Authenticated utils.odoo_utils.OdooClient
+            run_id: Identifier shared by all workers of a run (xdist's testrunuid by default)
+            seed_models: Overrides for DEFAULT_SEED_MODELS
+            refill_size: Records created each time a pool runs low
+            seed: Seed for the generated record values
+        """
+        self.client = client
+        self.run_id = run_id or os.getenv("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex[:12]
+        self.tag = f"e2e-{self.run_id[:12]}"
+        self.seed_models = {**DEFAULT_SEED_MODELS, **(seed_models or {})}
+        self.refill_size = refill_size
+        self.seed = seed
+        self.state_path = os.path.join(POOL_DIR, f"{self.run_id}.json")
+        self.lock = FileLock(f"{self.state_path}.lock")
+        self._registered = False
+
+    def _read_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"workers": 0, "generated": {}, "pools": {}}
+
+    def _write_state(self, state):
+        os.makedirs(POOL_DIR, exist_ok=True)
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=1)
+        os.replace(temp_path, self.state_path)
+
+    def open(self):
+        """Register this process as a user of the pool"""
+        with self.lock:
+            state = self._read_state()
+            state["workers"] += 1
+            self._write_state(state)
+        self._registered = True
+        return self
+
+    def _generate_values(self, kind, count, offset):
+        """
+        Build create() values for records offset..offset+count of the kind's generator entity
+
+        Each slice has a generator seeded from (seed, offset) of its own, so a refill
+        only generates its `count` records whatever was leased before it.
+        """
+        spec = self.seed_models[kind]
+        # Sized in students: enough for `count` families of the largest size
+        generator = SchoolDataGenerator(count * max(SIBLING_COUNTS), seed=self.seed * 1_000_003 + offset)
+        if spec["entity"] == "families":
+            records = (family for family, _ in generator.iter_families())
+        else:
+            records = (student for _, students in generator.iter_families() for student in students)
+
+        values = []
+        for record in itertools.islice(records, count):
+            vals = {field: record[key] for field, key in spec["fields"].items()}
+            vals["name"] = f"[{self.tag}] {vals.get('name', kind)}"
+            values.append(vals)
+        return values
+
+    @staticmethod
+    def _offset(state, kind, count):
+        """Reserve the next `count` generator records of a kind; returns the first one"""
+        generated = state.setdefault("generated", {})
+        offset = generated.get(kind, 0)
+        generated[kind] = offset + count
+        return offset
+
+    def create(self, kind, count, offset=0):
+        """
+        Create records for a pool kind in batched create() calls
+
+        Returns:
+            list: New record ids
+        """
+        spec = self.seed_models[kind]
+        values = self._generate_values(kind, count, offset)
+        ids = []
+        for start in range(0, len(values), CREATE_BATCH_SIZE):
+            batch = values[start:start + CREATE_BATCH_SIZE]
+            created = self.client.call_kw(spec["model"], "create", [batch])
+            ids.extend(created if isinstance(created, list) else [created])
+        if spec.get("archived") and ids:
+            self.client.call_kw(spec["model"], "action_archive", [ids])
+        print(f"Seeded {len(ids)} {kind} for run {self.tag}")
+        return ids
+
+    def warm_up(self, kind, minimum=None):
+        """Make sure at least `minimum` records of a kind are ready to lease"""
+        minimum = self.refill_size if minimum is None else minimum
+        with self.lock:
+            state = self._read_state()
+            pool = state["pools"].setdefault(kind, {"available": [], "leased": {}})
+            missing = minimum - len(pool["available"])
+            if missing > 0:
+                count = max(missing, self.refill_size)
+                pool["available"].extend(self.create(kind, count, offset=self._offset(state, kind, count)))
+                self._write_state(state)
+        return self
+
+    def lease(self, kind, count=1, holder=None):
+        """
+        Atomically take records out of the pool, refilling it when it runs low
+
+        Args:
+            kind: Pool kind, e.g. 'students' or 'archived_students'
+            count: Number of records
+            holder: Label recorded with the lease (test node id)
+
+        Returns:
+            list: Record ids owned by the caller from now on
+        """
+        with self.lock:
+            state = self._read_state()
+            pool = state["pools"].setdefault(kind, {"available": [], "leased": {}})
+            if len(pool["available"]) < count:
+                needed = max(count - len(pool["available"]), self.refill_size)
+                pool["available"].extend(self.create(kind, needed, offset=self._offset(state, kind, needed)))
+            ids, pool["available"] = pool["available"][:count], pool["available"][count:]
+            assert len(ids) == count, f"Pool {kind} holds {len(ids)} records, {count} requested"
+            for record_id in ids:
+                pool["leased"][str(record_id)] = holder or os.getenv("PYTEST_XDIST_WORKER", "main")
+            self._write_state(state)
+        return ids
+
+    def release(self, kind, ids):
+        """Give back leased records that were not modified"""
+        with self.lock:
+            state = self._read_state()
+            pool = state["pools"].setdefault(kind, {"available": [], "leased": {}})
+            for record_id in ids:
+                if pool["leased"].pop(str(record_id), None) is not None:
+                    pool["available"].append(record_id)
+            self._write_state(state)
+
+    def cleanup(self):
+        """Delete every record tagged with this run, one search + unlink per model"""
+        for model in sorted({spec["model"] for spec in self.seed_models.values()}):
+            ids = self.client.call_kw(model, "search", [[("name", "=like", f"[{self.tag}]%")]], {
+                "context": dict(self.client.context, active_test=False),
+            })
+            if ids:
+                self.client.call_kw(model, "unlink", [ids])
+                print(f"Removed {len(ids)} seeded {model} records for run {self.tag}")
+
+    def close(self):
+        """Unregister this process; the last one out cleans up the run"""
+        if not self._registered:
+            return
+        self._registered = False
+        with self.lock:
+            state = self._read_state()
+            state["workers"] -= 1
+            last = state["workers"] <= 0
+            self._write_state(state)
+            if last:
+                try:
+                    self.cleanup()
+                finally:
+                    os.remove(self.state_path)
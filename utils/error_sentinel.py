@@ -0,0 +1,160 @@
+# utils/error_sentinel.py
+"""
+Fail fast when Odoo reports an error instead of waiting out selector timeouts.
+
+An ErrorSentinel installed on a page listens to:
+- JSON-RPC responses carrying an "error" payload (server exceptions, with the
+  server traceback from error.data.debug)
+- uncaught JavaScript exceptions of the web client (pageerror)
+- console errors, kept as context for the report only: Odoo logs harmless ones
+
+BasePage.wait_for_visible races its selector against the .o_error_dialog and
+BasePage.check_client_errors raises the first error the sentinel saw, so a page
+object step stops with an OdooClientError as soon as the server raised. Errors
+are sticky: a page object method that swallows the exception with a bare
+except does not hide it from the next check. Tests expecting a server error
+call ErrorSentinel.of(page).clear().
+
+Business errors (UserError, ValidationError...) are part of normal flows and
+are ignored.
+"""
+import collections
+import weakref
+from urllib.parse import urlparse
+
+RPC_ROUTES = ("/web/dataset/", "/web/action/", "/web/webclient/", "/web/session/", "/mail/")
+
+# Server exceptions shown to users on purpose (form validation, access warnings)
+EXPECTED_ERRORS = (
+    "odoo.exceptions.UserError",
+    "odoo.exceptions.ValidationError",
+    "odoo.exceptions.RedirectWarning",
+)
+
+
+class OdooClientError(Exception):
+    """Raised when the server or the web client reported an error during a page object step"""
+
+    def __init__(self, kind, message, traceback=None, url=None):
+        """
+        Args:
+            kind: 'rpc', 'page' (JavaScript exception) or 'dialog' (error dialog shown)
+            message: Error message
+            traceback: Server (rpc) or JavaScript (page) stack, or the dialog text
+            url: RPC route or page URL
+        """
+        self.kind = kind
+        self.message = message
+        self.traceback = traceback
+        self.url = url
+        self.console = []
+        super().__init__(message)
+
+    def __str__(self):
+        lines = [f"Odoo {self.kind} error: {self.message}" + (f" ({self.url})" if self.url else "")]
+        if self.traceback:
+            lines.append(self.traceback.rstrip())
+        if self.console:
+            lines.append("Console errors:")
+            lines.extend(f"  {text}" for text in self.console)
+        return "\n".join(lines)
+
+
+def rpc_error(payload, url=None):
+    """
+    OdooClientError for a JSON-RPC response payload
+
+    Returns:
+        OdooClientError: None when the call succeeded or raised an expected business error
+    """
+    error = payload.get("error") if isinstance(payload, dict) else None
+    if not error:
+        return None
+    data = error.get("data") or {}
+    if data.get("name") in EXPECTED_ERRORS:
+        return None
+    name = data.get("name") or "RPC error"
+    return OdooClientError("rpc", f"{name}: {data.get('message') or error.get('message')}",
+                           data.get("debug"), url)
+
+
+def is_rpc_response(response):
+    request = response.request
+    return (request.method == "POST" and urlparse(response.url).path.startswith(RPC_ROUTES)
+            and "json" in (response.headers.get("content-type") or ""))
+
+
+class ErrorSentinel:
+    """
+    Collect the errors of one page
+
+        ErrorSentinel().install(page)        # sync page (conftest.page)
+        ErrorSentinel().install_async(page)  # playwright.async_api page
+        ...
+        ErrorSentinel.of(page).check()       # raises the first recorded error
+    """
+
+    _pages = weakref.WeakKeyDictionary()
+
+    def __init__(self, console_size=20):
+        self.errors = []
+        self.console = collections.deque(maxlen=console_size)
+
+    @classmethod
+    def of(cls, page):
+        """Sentinel installed on a page, or None"""
+        return cls._pages.get(page)
+
+    def install(self, page):
+        page.on("response", self._on_response)
+        page.on("pageerror", self._on_page_error)
+        page.on("console", self._on_console)
+        self._pages[page] = self
+        return self
+
+    def install_async(self, page):
+        page.on("response", self._on_response_async)
+        page.on("pageerror", self._on_page_error)
+        page.on("console", self._on_console)
+        self._pages[page] = self
+        return self
+
+    def _on_response(self, response):
+        if not is_rpc_response(response):
+            return
+        try:
+            self.record(rpc_error(response.json(), urlparse(response.url).path))
+        except Exception:
+            # Body not available (page navigated away): nothing to report
+            pass
+
+    async def _on_response_async(self, response):
+        if not is_rpc_response(response):
+            return
+        try:
+            self.record(rpc_error(await response.json(), urlparse(response.url).path))
+        except Exception:
+            pass
+
+    def _on_page_error(self, error):
+        self.record(OdooClientError("page", getattr(error, "message", str(error)), getattr(error, "stack", None)))
+
+    def _on_console(self, message):
+        if message.type == "error":
+            self.console.append(message.text)
+
+    def record(self, error):
+        if error is not None:
+            self.errors.append(error)
+
+    def check(self):
+        """Raise the first recorded error, with the recent console errors attached"""
+        if self.errors:
+            error = self.errors[0]
+            error.console = list(self.console)
+            raise error
+
+    def clear(self):
+        """Forget the recorded errors (after an expected failure)"""
+        self.errors.clear()
+        self.console.clear()
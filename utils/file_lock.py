@@ -0,0 +1,68 @@
+# utils/file_lock.py
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLockTimeout(Exception):
+    """Raised when a file lock can't be acquired in time"""
+
+
+class FileLock:
+    """
+    Exclusive inter-process lock backed by a lock file.
+
+    Used to share state files between pytest-xdist workers:
+
+        with FileLock(".cache/pool.json.lock"):
+            ...read, modify and write the state file...
+    """
+
+    def __init__(self, path, timeout=60, poll_interval=0.05):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a+")
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                return self
+            except OSError:
+                if time.time() >= deadline:
+                    self._file.close()
+                    self._file = None
+                    raise FileLockTimeout(f"Could not lock {self.path} within {self.timeout}s")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        if not self._file:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,297 @@
+# utils/filter_explorer.py
+import ast
+import itertools
+import multiprocessing
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from pages.access.school_card.student_filter_page import StudentFilterPage
+from utils.odoo_utils import STUDENT_MODEL
+
+# Window action opened by the Apprenant submenu (#menu_id=108&action=405)
+STUDENT_ACTION_ID = 405
+
+
+def _parse_domain(value):
+    """Turn a domain attribute/field into a list, or None if it needs evaluation context"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    try:
+        domain = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        # Domains using uid, context_today() etc. can't be predicted client-side
+        return None
+    return [list(leaf) if isinstance(leaf, tuple) else leaf for leaf in domain]
+
+
+def or_domains(domains):
+    """Combine domains with OR (prefix notation)"""
+    domains = [d for d in domains if d is not None]
+    if any(not d for d in domains):
+        return []
+    if len(domains) <= 1:
+        return list(domains[0]) if domains else []
+    combined = ["|"] * (len(domains) - 1)
+    for domain in domains:
+        combined.extend(domain)
+    return combined
+
+
+def and_domains(domains):
+    """Combine domains with AND (implicit conjunction of normalized domains)"""
+    combined = []
+    for domain in domains:
+        combined.extend(domain)
+    return combined
+
+
+class FilterCombinationExplorer:
+    """
+    Explore combinations of the Apprenant search filters and search panel classes.
+
+    Result counts are predicted over RPC (one read_group per filter subset gives the
+    count for every class at once), empty or equivalent combinations are pruned, and
+    only the informative ones are checked in the UI, spread over parallel browsers.
+    """
+
+    def __init__(self, client, action_id=STUDENT_ACTION_ID, labels=None, max_size=2, min_size=2):
+        """
+        Args:
+            client: Authenticated utils.odoo_utils.OdooClient
+            action_id: Window action whose search view and domain are explored
+            labels: Filter labels to combine (defaults to StudentFilterPage.FILTERS)
+            max_size: Largest combination size (filters + class)
+            min_size: Smallest combination size reported (2 = pairwise)
+        """
+        self.client = client
+        self.action_id = action_id
+        self.labels = list(labels) if labels is not None else list(StudentFilterPage.FILTERS)
+        self.max_size = max_size
+        self.min_size = min_size
+        self.model = STUDENT_MODEL
+        self.base_domain = []
+        self.filters = {}
+        self.panel_field = None
+        self.classes = {}
+        self.stats = {"rpc_calls": 0, "pruned_empty": 0, "pruned_equivalent": 0, "unpredictable": 0}
+
+    def load(self):
+        """Read the action, its search view filters and the search panel classes"""
+        action = self.client.call("/web/action/load", {"action_id": self.action_id})
+        self.model = action.get("res_model") or self.model
+        self.base_domain = _parse_domain(action.get("domain")) or []
+
+        views = self.client.call_kw(self.model, "get_views", [[[False, "search"]]])
+        arch = views["views"]["search"]["arch"]
+        self._parse_search_arch(arch)
+
+        if self.panel_field:
+            values = self.client.call_kw(self.model, "search_panel_select_range", [self.panel_field])
+            self.classes = {
+                value["id"]: value["display_name"]
+                for value in values.get("values", [])
+                if "(" in value["display_name"] and ")" in value["display_name"]
+            }
+        self.stats["rpc_calls"] += 3
+        return self
+
+    def _parse_search_arch(self, arch):
+        """Collect filters (label, group, domain) and the search panel category field"""
+        root = ET.fromstring(arch)
+        group = 0
+        for node in root.iter():
+            if node.tag == "separator":
+                group += 1
+            elif node.tag == "filter":
+                label = node.get("string")
+                if not label or "group_by" in (node.get("context") or ""):
+                    continue
+                if label not in self.labels:
+                    continue
+                domain = _parse_domain(node.get("domain"))
+                if domain is None:
+                    self.stats["unpredictable"] += 1
+                    continue
+                self.filters[label] = {"group": group, "domain": domain}
+            elif node.tag == "searchpanel":
+                for field in node.findall("field"):
+                    if field.get("select", "one") == "one":
+                        self.panel_field = field.get("name")
+                        break
+
+    def domain_for(self, labels):
+        """Build the domain the web client sends for a set of filters"""
+        groups = {}
+        for label in labels:
+            filter_info = self.filters[label]
+            groups.setdefault(filter_info["group"], []).append(filter_info["domain"])
+        return and_domains([self.base_domain] + [or_domains(domains) for domains in groups.values()])
+
+    def _count_by_class(self, labels):
+        """Return (total, {class_id: count}) for a filter subset in a single RPC"""
+        domain = self.domain_for(labels)
+        self.stats["rpc_calls"] += 1
+        if not self.panel_field:
+            return self.client.search_count(self.model, domain), {}
+        rows = self.client.read_group(self.model, domain, [self.panel_field], [self.panel_field])
+        per_class = {}
+        total = 0
+        for row in rows:
+            count = row.get(f"{self.panel_field}_count", row.get("__count", 0))
+            total += count
+            if row.get(self.panel_field):
+                per_class[row[self.panel_field][0]] = count
+        return total, per_class
+
+    def _implied_empty(self, subset, counts):
+        """A subset is empty if removing a filter from a new group leaves an empty parent"""
+        for label in subset:
+            parent = subset - {label}
+            parent_groups = {self.filters[other]["group"] for other in parent}
+            if counts.get(parent) == 0 and self.filters[label]["group"] not in parent_groups:
+                return True
+        return False
+
+    def plan(self, max_checks=None):
+        """
+        Enumerate combinations and keep only the informative ones
+
+        Args:
+            max_checks: Optional cap on the number of combinations returned
+
+        Returns:
+            list: Dicts with 'filters', 'class', 'class_id' and 'predicted' count
+        """
+        if not self.filters and not self.classes:
+            self.load()
+
+        labels = sorted(self.filters)
+        totals = {}
+        per_class = {}
+        informative = []
+
+        for size in range(0, self.max_size + 1):
+            for combo in itertools.combinations(labels, size):
+                subset = frozenset(combo)
+                if self._implied_empty(subset, totals):
+                    totals[subset], per_class[subset] = 0, {}
+                    self.stats["pruned_empty"] += 1
+                    continue
+                totals[subset], per_class[subset] = self._count_by_class(subset)
+                parents = [subset - {label} for label in subset]
+
+                if size >= self.min_size:
+                    self._keep_if_informative(informative, combo, None, None, totals[subset],
+                                              [totals[parent] for parent in parents])
+
+                # Adding a class makes the combination one item larger
+                if size + 1 < self.min_size or size + 1 > self.max_size:
+                    continue
+                for class_id, class_name in self.classes.items():
+                    count = per_class[subset].get(class_id, 0)
+                    references = [totals[subset]] + [per_class[parent].get(class_id, 0) for parent in parents]
+                    self._keep_if_informative(informative, combo, class_id, class_name, count, references)
+
+        informative.sort(key=lambda item: (len(item["filters"]) + bool(item["class"]), item["predicted"]))
+        if max_checks is not None:
+            informative = informative[:max_checks]
+        return informative
+
+    def _keep_if_informative(self, informative, labels, class_id, class_name, count, references):
+        """Skip empty combinations and those matching the same records as a sub-combination"""
+        if count == 0:
+            self.stats["pruned_empty"] += 1
+        elif count in references:
+            # Sub-combination already selects a superset; equal counts mean equal sets
+            self.stats["pruned_equivalent"] += 1
+        else:
+            informative.append({
+                "filters": list(labels),
+                "class": class_name,
+                "class_id": class_id,
+                "predicted": count,
+            })
+
+    def run_in_ui(self, combinations, storage_state, workers=4, headless=True):
+        """
+        Verify combinations in the UI, spread over parallel browser processes
+
+        Args:
+            combinations: Output of plan()
+            storage_state: Path of a logged-in storage state (context.storage_state)
+            workers: Number of parallel browsers
+            headless: Run the browsers headless
+
+        Returns:
+            list: One result dict per combination with 'actual' and 'status'
+        """
+        if not combinations:
+            return []
+        workers = max(1, min(workers, len(combinations)))
+        chunks = [combinations[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(verify_combinations, chunk, storage_state, self.client.base_url, headless) for chunk in chunks]
+            results = []
+            for future in futures:
+                results.extend(future.result())
+        return results
+
+
+def verify_combinations(combinations, storage_state, base_url, headless=True):
+    """
+    Apply each combination in one browser and compare the pager count to the prediction.
+
+    Runs in a separate process (see FilterCombinationExplorer.run_in_ui).
+    """
+    from playwright.sync_api import sync_playwright
+    from pages.access.school_card.class_filter_page import ClassFilterPage
+
+    # Combinations without a class first: the search panel stays on "All" until expanded
+    combinations = sorted(combinations, key=lambda item: (item["class"] is not None, item["class"] or ""))
+    results = []
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=headless)
+        context = browser.new_context(storage_state=storage_state, viewport={"width": 1920, "height": 1080})
+        page = context.new_page()
+        page.goto(f"{base_url}/web")
+
+        filter_page = StudentFilterPage(page)
+        class_page = ClassFilterPage(page)
+        filter_page.navigate_from_login()
+        panel_expanded = False
+
+        for combo in combinations:
+            start = time.time()
+            result = dict(combo, actual=None, status="error")
+            try:
+                filter_page.remove_all_filters()
+                if combo["class"]:
+                    if not panel_expanded:
+                        class_page.expand_all_sidebar_items()
+                        panel_expanded = True
+                    items = {title: element for element, title, _ in class_page.refresh_sidebar_items()}
+                    if combo["class"] not in items:
+                        result["status"] = "class_not_found"
+                        results.append(result)
+                        continue
+                    class_page.click_sidebar_item_safe(items[combo["class"]], combo["class"])
+
+                for label in combo["filters"]:
+                    filter_page.apply_filter(filter_page.FILTERS.get(label, f"//span[text()='{label}']"))
+
+                result["actual"] = filter_page.get_record_count()
+                result["status"] = "match" if result["actual"] == combo["predicted"] else "mismatch"
+            except Exception as e:
+                result["error"] = str(e)
+            result["duration"] = round(time.time() - start, 2)
+            results.append(result)
+
+        context.close()
+        browser.close()
+
+    return results
+
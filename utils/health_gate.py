@@ -0,0 +1,186 @@
+# utils/health_gate.py
+"""
+Health gate and circuit breaker for runs against an unavailable server.
+
+Before the first browser or RPC test, probe_environment() checks the server the
+way a user session would need it: /web/webclient/version_info, the login RPC and
+one web client asset. If it fails, every test needing the server is skipped as
+"environment unavailable" instead of waiting out navigation timeouts.
+
+During the run, CircuitBreaker counts consecutive infrastructure failures
+(connection errors, 5xx, timeouts confirmed by a failed probe) in a state file
+shared by the xdist workers of the run. Once it trips, the remaining
+server tests are skipped and, unless other tests failed for other reasons, the
+run exits with ENVIRONMENT_UNAVAILABLE_EXIT so CI can tell an outage from
+product failures.
+"""
+import json
+import os
+import re
+import time
+import urllib.request
+import uuid
+from urllib.parse import urljoin
+
+from utils.file_lock import FileLock
+from utils.odoo_utils import OdooClient
+
+STATE_DIR = ".cache/circuit_breaker"
+
+# EX_TEMPFAIL: the environment, not the product, failed
+ENVIRONMENT_UNAVAILABLE_EXIT = 75
+
+PROBE_TIMEOUT = 10
+MAX_LATENCY = 15.0
+
+NETWORK_ERROR = re.compile(
+    r"net::ERR_|ECONNREFUSED|ECONNRESET|Connection (refused|reset|aborted)|Name or service not known|"
+    r"Temporary failure in name resolution|RemoteDisconnected|HTTP Error 5\d\d|"
+    r"\b50[234]\b.{0,3}(Bad Gateway|Service Unavailable|Gateway Time-?out)", re.IGNORECASE)
+TIMEOUT_ERROR = re.compile(r"Timeout \d+ms exceeded|timed out", re.IGNORECASE)
+ASSET_PATTERN = re.compile(r"""(?:src|href)=["'](/web/assets/[^"']+)["']""")
+
+
+def _timed(check, name):
+    start = time.perf_counter()
+    try:
+        detail = check()
+        latency = time.perf_counter() - start
+        ok = latency <= MAX_LATENCY
+        return {"name": name, "ok": ok, "latency": round(latency, 3),
+                "error": None if ok else f"{latency:.1f}s (max {MAX_LATENCY:.0f}s)", "detail": detail}
+    except Exception as e:
+        return {"name": name, "ok": False, "latency": round(time.perf_counter() - start, 3),
+                "error": f"{type(e).__name__}: {e}", "detail": None}
+
+
+def fetch_asset(base_url, timeout=PROBE_TIMEOUT):
+    """Download the first /web/assets bundle referenced by the login page"""
+    with urllib.request.urlopen(urljoin(base_url, "/web/login"), timeout=timeout) as response:
+        html = response.read().decode("utf-8", errors="replace")
+    match = ASSET_PATTERN.search(html)
+    if not match:
+        raise RuntimeError("no /web/assets bundle on the login page")
+    with urllib.request.urlopen(urljoin(base_url, match.group(1)), timeout=timeout) as response:
+        size = len(response.read())
+    return f"{match.group(1)} ({size} bytes)"
+
+
+def quick_probe(base_url, timeout=5):
+    """True if the server answers version_info in time"""
+    return _timed(lambda: OdooClient(base_url, timeout=timeout).version_info(), "version_info")["ok"]
+
+
+def probe_environment(config, timeout=PROBE_TIMEOUT):
+    """
+    Check that the server can serve a test session
+
+    Args:
+        config: Test configuration (base_url, username, password, optional db)
+
+    Returns:
+        dict: ok and the list of checks (name, ok, latency, error, detail)
+    """
+    base_url = config["base_url"]
+    checks = [_timed(lambda: OdooClient(base_url, timeout=timeout).version_info().get("server_version"),
+                     "version_info")]
+    # Nothing else can work when the server does not answer at all
+    if checks[0]["ok"]:
+        client = OdooClient(base_url, db=config.get("db"), timeout=timeout)
+        checks.append(_timed(lambda: client.authenticate(config["username"], config["password"]), "login_rpc"))
+        checks.append(_timed(lambda: fetch_asset(base_url, timeout), "assets"))
+    return {"ok": all(check["ok"] for check in checks), "checks": checks}
+
+
+def format_probe(result):
+    lines = [f"Environment health: {'OK' if result['ok'] else 'UNAVAILABLE'}"]
+    for check in result["checks"]:
+        lines.append(f"  {check['name']:13} {'ok' if check['ok'] else 'FAILED':6} {check['latency']:.2f}s"
+                     + (f"  {check['error']}" if check["error"] else ""))
+    return "\n".join(lines)
+
+
+def classify_failure(text):
+    """'network' for connection errors and 5xx, 'timeout' for timeouts, None otherwise"""
+    if NETWORK_ERROR.search(text):
+        return "network"
+    if TIMEOUT_ERROR.search(text):
+        return "timeout"
+    return None
+
+
+class CircuitBreaker:
+    """
+    Consecutive infrastructure failures shared by all workers of a run
+
+        breaker = CircuitBreaker(threshold=3)
+        breaker.record_failure("net::ERR_CONNECTION_REFUSED")  # from a failed test
+        breaker.record_success()                                # from a passed test
+        if breaker.is_open(): pytest.skip(...)
+    """
+
+    def __init__(self, threshold=3, run_id=None, state_dir=STATE_DIR):
+        """
+        Args:
+            threshold: Consecutive infrastructure failures that trip the breaker
+            run_id: Identifier shared by all workers of a run (xdist's testrunuid by default)
+            state_dir: Directory of the shared state files
+        """
+        self.threshold = threshold
+        self.run_id = run_id or os.getenv("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex[:12]
+        self.state_path = os.path.join(state_dir, f"{self.run_id}.json")
+        self.lock = FileLock(f"{self.state_path}.lock")
+        self._open = None
+
+    def _read(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"consecutive": 0, "open": False, "reason": None}
+
+    def _update(self, change):
+        with self.lock:
+            state = self._read()
+            change(state)
+            temp_path = f"{self.state_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(temp_path, self.state_path)
+        if state["open"]:
+            self._open = state
+        return state
+
+    def record_failure(self, reason):
+        def change(state):
+            state["consecutive"] += 1
+            state["last_reason"] = reason
+            if state["consecutive"] >= self.threshold and not state["open"]:
+                state.update(open=True, reason=f"{state['consecutive']} consecutive infrastructure failures, "
+                                               f"last: {reason}", opened_at=time.time())
+        return self._update(change)
+
+    def record_success(self):
+        if self._read()["consecutive"]:
+            self._update(lambda state: state.update(consecutive=0))
+
+    def trip(self, reason):
+        """Open the breaker at once (failed health probe)"""
+        return self._update(lambda state: state.update(open=True, reason=reason, opened_at=time.time()))
+
+    def is_open(self):
+        # Once open it stays open: no need to read the file again
+        if self._open is None and self._read()["open"]:
+            self._open = self._read()
+        return self._open is not None
+
+    @property
+    def reason(self):
+        return (self._open or self._read()).get("reason")
+
+    def cleanup(self):
+        for path in (self.state_path, f"{self.state_path}.lock"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,408 @@
+# utils/impact_map.py
+"""
+Test impact selection: run only the tests a change can affect.
+
+Recording (any run with --impact-record, e.g. the nightly full run) uses
+coverage.py with one context per test and stores, for every test, the lines of
+pages/, utils/ and conftest.py it executed. Lines of a page method that use a
+selector constant (self.NON_INSCRIT_FILTER...) also make the test depend on the
+line(s) defining that selector, even when it lives in a Locators mixin of
+another module.
+
+The map stores the commit it was recorded on. Line numbers only mean something
+in that revision, so selection (--impact-select) reads `git diff` between that
+commit and the working tree, and keeps:
+- the tests whose recorded lines were changed
+- every test of a changed test file, and tests missing from the map (new ones)
+- for changed module-level code no test context covers (imports, constants),
+  the tests importing the file (utils.import_graph)
+
+Lines of session-scoped conftest fixtures (browser, odoo_client...) only run
+for the first test that sets them up; they are credited to every test using
+the fixture.
+
+Anything the map cannot reason about (data files, pytest.ini,
+requirements.txt...), a missing map, one older than --impact-max-age days, one
+recorded on a modified working tree or on a commit this clone does not have
+means a full run, which also refreshes the map.
+
+coverage is optional (pip install coverage); without it recording is skipped.
+
+    python -m utils.impact_map     # explain the selection for the working tree
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import re
+import subprocess
+import time
+
+from utils.import_graph import ImportGraph, is_test_file
+
+try:
+    import coverage
+except ImportError:
+    coverage = None
+
+MAP_DIR = "reports/test_impact"
+TRACKED = ("pages/*", "utils/*", "conftest.py")
+MAX_AGE_DAYS = 7
+
+# Changes that never affect a test run
+IGNORED = re.compile(r"(\.md$|^reports/|^venv/|^requests\.jsonl$|\.gitignore$)")
+CONSTANT_NAME = re.compile(r"^[A-Z][A-Z0-9_]+$")
+
+
+def available():
+    return coverage is not None
+
+
+def _source(path, text=None):
+    try:
+        if text is None:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        return ast.parse(text, path)
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return None
+
+
+def selector_definitions(paths):
+    """
+    Selector constants defined in page classes
+
+    Returns:
+        dict: constant name -> list of (path, [definition lines])
+    """
+    definitions = {}
+    for path in paths:
+        tree = _source(path)
+        if tree is None:
+            continue
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ClassDef):
+                continue
+            for statement in node.body:
+                if isinstance(statement, ast.Assign):
+                    for target in statement.targets:
+                        if isinstance(target, ast.Name) and CONSTANT_NAME.match(target.id):
+                            lines = list(range(statement.lineno, statement.end_lineno + 1))
+                            definitions.setdefault(target.id, []).append((path, lines))
+    return definitions
+
+
+def constants_by_line(path):
+    """Line -> upper-case attribute names read on that line (self.SEARCH_INPUT...)"""
+    tree = _source(path)
+    uses = {}
+    if tree is None:
+        return uses
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and CONSTANT_NAME.match(node.attr):
+            uses.setdefault(node.lineno, set()).add(node.attr)
+    return uses
+
+
+def function_lines(path, text=None):
+    """Lines that belong to a function body (only executed when the function is called)"""
+    tree = _source(path, text)
+    lines = set()
+    if tree is None:
+        return lines
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            lines.update(range(node.body[0].lineno, node.end_lineno + 1))
+    return lines
+
+
+SHARED_SCOPES = ("session", "package", "module")
+
+
+def shared_fixture_lines(path="conftest.py"):
+    """
+    Body lines of the fixtures set up once for many tests
+
+    Returns:
+        dict: fixture name -> set of lines
+    """
+    tree = _source(path)
+    fixtures = {}
+    if tree is None:
+        return fixtures
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            scopes = [keyword.value.value for keyword in getattr(decorator, "keywords", ())
+                      if keyword.arg == "scope" and isinstance(keyword.value, ast.Constant)]
+            if scopes and scopes[0] in SHARED_SCOPES:
+                fixtures[node.name] = set(range(node.body[0].lineno, node.end_lineno + 1))
+    return fixtures
+
+
+def git_revision(cwd="."):
+    """
+    Commit checked out and whether tracked Python files differ from it
+
+    Returns:
+        tuple: (commit or None, dirty)
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no", "--", "*.py"], cwd=cwd,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, True
+    return commit, bool(status.strip())
+
+
+def commit_exists(commit, cwd="."):
+    if not commit:
+        return False
+    result = subprocess.run(["git", "cat-file", "-e", f"{commit}^{{commit}}"], cwd=cwd, capture_output=True)
+    return result.returncode == 0
+
+
+class ImpactRecorder:
+    """
+    Record the lines each test executes
+
+        recorder = ImpactRecorder().start()
+        recorder.switch(item.nodeid, item.fixturenames)   # before each test
+        recorder.switch("")            # after it
+        recorder.save()
+    """
+
+    def __init__(self, map_dir=MAP_DIR, worker=None):
+        self.map_dir = map_dir
+        self.worker = worker or os.getenv("PYTEST_XDIST_WORKER", "main")
+        self._coverage = None
+        self.fixtures = {}
+
+    def start(self):
+        if not available():
+            print("Test impact recording skipped: coverage is not installed")
+            return self
+        self._coverage = coverage.Coverage(data_file=None, include=list(TRACKED), branch=False)
+        self._coverage.start()
+        return self
+
+    def switch(self, context, fixturenames=()):
+        if self._coverage is not None:
+            self._coverage.switch_context(context)
+            if context:
+                self.fixtures[context] = set(fixturenames)
+
+    def build_map(self):
+        """Stop measuring and return {"created_at", "tests", "files": {path: {line: [test index]}}}"""
+        self._coverage.stop()
+        data = self._coverage.get_data()
+        tests = {}
+        files = {}
+        root = os.getcwd()
+        for measured in data.measured_files():
+            path = os.path.relpath(measured, root).replace(os.sep, "/")
+            for line, contexts in data.contexts_by_lineno(measured).items():
+                for context in contexts:
+                    if context:
+                        index = tests.setdefault(context, len(tests))
+                        files.setdefault(path, {}).setdefault(line, set()).add(index)
+
+        # Lines reading a selector constant make the test depend on its definition
+        definitions = selector_definitions(glob.glob("pages/**/*.py", recursive=True))
+        for path in [path for path in files if path.startswith("pages/")]:
+            uses = constants_by_line(path)
+            for line, indexes in list(files[path].items()):
+                for name in uses.get(line, ()):
+                    for definition_path, lines in definitions.get(name, ()):
+                        definition_lines = files.setdefault(definition_path, {})
+                        for definition_line in lines:
+                            definition_lines.setdefault(definition_line, set()).update(indexes)
+
+        # Shared fixtures only run for the first test using them: credit every user
+        for name, lines in shared_fixture_lines().items():
+            users = [tests.setdefault(nodeid, len(tests))
+                     for nodeid, fixturenames in self.fixtures.items() if name in fixturenames]
+            if users:
+                conftest_lines = files.setdefault("conftest.py", {})
+                for line in lines:
+                    conftest_lines.setdefault(line, set()).update(users)
+
+        commit, dirty = git_revision()
+        return {
+            "created_at": time.time(),
+            "commit": commit,
+            "dirty": dirty,
+            "worker": self.worker,
+            "tests": sorted(tests, key=tests.get),
+            "files": {path: {str(line): sorted(indexes) for line, indexes in sorted(lines.items())}
+                      for path, lines in sorted(files.items())},
+        }
+
+    def save(self):
+        if self._coverage is None:
+            return None
+        impact_map = self.build_map()
+        os.makedirs(self.map_dir, exist_ok=True)
+        path = os.path.join(self.map_dir, f"map.{self.worker}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(impact_map, f)
+        return path
+
+
+def load_map(map_dir=MAP_DIR):
+    """
+    Merge the per-worker maps of the latest recording
+
+    Returns:
+        dict: {"created_at", "tests": set of nodeids, "files": {path: {line: set of nodeids}}} or None
+    """
+    parts = []
+    for path in glob.glob(os.path.join(map_dir, "map.*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                parts.append(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            continue
+    if not parts:
+        return None
+    # Parts written by the workers of an older recording are stale
+    newest = max(part["created_at"] for part in parts)
+    current = [part for part in parts if newest - part["created_at"] <= 3600]
+    commits = {part.get("commit") for part in current}
+    merged = {"created_at": newest, "commit": commits.pop() if len(commits) == 1 else None,
+              "dirty": any(part.get("dirty", True) for part in current), "tests": set(), "files": {}}
+    for part in current:
+        for path, lines in part["files"].items():
+            for line, indexes in lines.items():
+                nodeids = merged["files"].setdefault(path, {}).setdefault(int(line), set())
+                nodeids.update(part["tests"][index] for index in indexes)
+        merged["tests"].update(part["tests"])
+    return merged
+
+
+def changed_lines(base, cwd="."):
+    """
+    Lines changed since `base`, numbered as in that revision (the commit the map was recorded on)
+
+    Returns:
+        dict: path -> set of line numbers (empty set: file added)
+    """
+    diff = subprocess.run(["git", "diff", "-U0", "--no-color", "--no-renames", base, "--"], cwd=cwd,
+                          capture_output=True, text=True, check=True).stdout
+    changes = {}
+    path = None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            path = None if line == "--- /dev/null" else line[6:]
+        elif line.startswith("+++ ") and path is None:
+            path = line[6:]
+            changes.setdefault(path, set())
+        elif line.startswith("@@") and path:
+            start, _, count = re.match(r"@@ -(\d+)(,(\d+))?", line).groups()
+            start, count = int(start), 1 if count is None else int(count)
+            # A pure insertion touches the lines around it
+            lines = range(start, start + count) if count else (start, start + 1)
+            changes.setdefault(path, set()).update(lines)
+    return changes
+
+
+def base_source(base, path, cwd="."):
+    """Content of a file in the base revision, None if it did not exist"""
+    result = subprocess.run(["git", "show", f"{base}:{path}"], cwd=cwd, capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def revision_problem(impact_map, cwd="."):
+    """Why the map's line numbers cannot be matched to a diff, or None"""
+    if impact_map.get("dirty", True):
+        return "impact map was recorded on a modified working tree"
+    if not commit_exists(impact_map.get("commit"), cwd):
+        return f"impact map commit {str(impact_map.get('commit'))[:12]} is not in this repository"
+    return None
+
+
+def select_tests(changes, impact_map, max_age_days=MAX_AGE_DAYS, graph=None, cwd="."):
+    """
+    Tests affected by the changes since the map was recorded
+
+    Args:
+        changes: changed_lines() output against the map's commit, None to compute it
+        impact_map: load_map() output
+        max_age_days: Older maps mean a full run
+
+    Returns:
+        dict: full (bool), reason, nodeids (set) and test_files (set: every test of these files)
+    """
+    selection = {"full": False, "reason": None, "nodeids": set(), "test_files": set()}
+    if impact_map is None:
+        selection.update(full=True, reason="no impact map recorded yet")
+        return selection
+    age_days = (time.time() - impact_map["created_at"]) / 86400
+    if age_days > max_age_days:
+        selection.update(full=True, reason=f"impact map is {age_days:.0f} days old")
+        return selection
+    problem = revision_problem(impact_map, cwd)
+    if problem:
+        selection.update(full=True, reason=problem)
+        return selection
+    base = impact_map["commit"]
+    if changes is None:
+        changes = changed_lines(base, cwd)
+
+    for path, lines in sorted(changes.items()):
+        if IGNORED.search(path):
+            continue
+        if is_test_file(path):
+            selection["test_files"].add(path)
+            continue
+        if not path.endswith(".py"):
+            selection.update(full=True, reason=f"{path} changed")
+            return selection
+
+        covered = impact_map["files"].get(path, {})
+        uncovered = set()
+        for line in lines:
+            if line in covered:
+                selection["nodeids"].update(covered[line])
+            else:
+                uncovered.add(line)
+        # Changed lines no test executed: function bodies are dead code for the
+        # suite, module-level code runs at import for every importer
+        text = base_source(base, path, cwd)
+        if not lines or uncovered - function_lines(path, text):
+            graph = graph or ImportGraph()
+            selection["test_files"].update(graph.affected_tests([path]))
+    return selection
+
+
+def is_selected(nodeid, selection, impact_map):
+    """Whether a collected test runs under the selection"""
+    if selection["full"] or nodeid not in impact_map["tests"]:
+        return True
+    return nodeid in selection["nodeids"] or nodeid.split("::", 1)[0] in selection["test_files"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Explain which tests a change selects")
+    parser.add_argument("--max-age", type=float, default=MAX_AGE_DAYS, help="Days before a full run")
+    args = parser.parse_args()
+
+    impact_map = load_map()
+    selection = select_tests(None, impact_map, args.max_age)
+    if selection["full"]:
+        print(f"Full run: {selection['reason']}")
+        return
+    nodeids = sorted(nodeid for nodeid in impact_map["tests"] if is_selected(nodeid, selection, impact_map))
+    print(f"{len(nodeids)} of {len(impact_map['tests'])} recorded tests selected")
+    for nodeid in nodeids:
+        print(f"  {nodeid}")
+    for path in sorted(selection["test_files"]):
+        print(f"  {path} (whole file)")
+
+
+if __name__ == "__main__":
+    main()
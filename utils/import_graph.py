@@ -0,0 +1,138 @@
+# utils/import_graph.py
+"""
+Static import graph of the repository: which tests depend on which modules.
+
+Imports are read with ast (nothing is executed), so the graph can be built in
+a few milliseconds and refreshed file by file:
+
+    graph = ImportGraph()
+    graph.affected_tests(["pages/access/school_card/student_filter_page.py"])
+    # ['tests/acces/test_student_filters.py', 'tests/acces/test_student_filters_concurrent.py', ...]
+
+Only modules of the repository are tracked. A change to a conftest.py affects
+every test below its directory. Imports made inside conftest fixtures are left
+out: they only matter to the tests using the fixture, which the graph cannot
+see, and would otherwise make every page object affect every test.
+"""
+import ast
+import glob
+import os
+
+PACKAGES = ("pages", "utils", "tests")
+
+
+def _to_path(path, root):
+    return os.path.relpath(os.path.abspath(path), root).replace(os.sep, "/")
+
+
+def module_name(path):
+    """'pages/aio/login_page.py' -> 'pages.aio.login_page', packages without __init__"""
+    name = path[:-3].replace("/", ".")
+    return name[:-len(".__init__")] if name.endswith(".__init__") else name
+
+
+def is_test_file(path):
+    return path.startswith("tests/") and os.path.basename(path).startswith("test_") and path.endswith(".py")
+
+
+class ImportGraph:
+    """Imports between the Python files of the repository"""
+
+    def __init__(self, root=".", packages=PACKAGES):
+        self.root = os.path.abspath(root)
+        self.packages = packages
+        self.imports = {}
+        self.build()
+
+    def files(self):
+        paths = glob.glob(os.path.join(self.root, "*.py"))
+        for package in self.packages:
+            paths += glob.glob(os.path.join(self.root, package, "**", "*.py"), recursive=True)
+        return sorted(_to_path(path, self.root) for path in paths)
+
+    def build(self):
+        self.imports = {path: self._parse(path) for path in self.files()}
+        return self
+
+    def refresh(self, paths):
+        """Re-read changed files (and drop deleted ones)"""
+        for path in paths:
+            if os.path.exists(os.path.join(self.root, path)):
+                self.imports[path] = self._parse(path)
+            else:
+                self.imports.pop(path, None)
+
+    def _resolve(self, name):
+        """Repository file of a dotted module name, with the __init__ of its parent packages"""
+        parts = name.split(".")
+        found = []
+        for depth in range(1, len(parts) + 1):
+            base = "/".join(parts[:depth])
+            for candidate in (f"{base}.py", f"{base}/__init__.py"):
+                if os.path.exists(os.path.join(self.root, candidate)):
+                    found.append(candidate)
+                    break
+        return found
+
+    def _parse(self, path):
+        try:
+            with open(os.path.join(self.root, path), "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read(), path)
+        except (SyntaxError, UnicodeDecodeError, OSError):
+            return set()
+
+        package = module_name(path)
+        if not path.endswith("__init__.py"):
+            package = package.rpartition(".")[0]
+        nodes = tree.body if os.path.basename(path) == "conftest.py" else ast.walk(tree)
+        dependencies = set()
+        for node in nodes:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    dependencies.update(self._resolve(alias.name))
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    base = package.split(".")[:len(package.split(".")) - node.level + 1] if package else []
+                    module = ".".join(base + ([node.module] if node.module else []))
+                else:
+                    module = node.module
+                if not module:
+                    continue
+                dependencies.update(self._resolve(module))
+                # "from package import module" imports a submodule
+                for alias in node.names:
+                    dependencies.update(self._resolve(f"{module}.{alias.name}")[-1:])
+        dependencies.discard(path)
+        return dependencies
+
+    def importers(self):
+        """Reverse graph: file -> files importing it"""
+        reverse = {}
+        for path, dependencies in self.imports.items():
+            for dependency in dependencies:
+                reverse.setdefault(dependency, set()).add(path)
+        return reverse
+
+    def dependents(self, paths):
+        """The given files and every file importing them, directly or not"""
+        reverse = self.importers()
+        seen = set(paths)
+        stack = list(paths)
+        while stack:
+            for importer in reverse.get(stack.pop(), ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    stack.append(importer)
+        return seen
+
+    def affected_tests(self, paths):
+        """Sorted test files to rerun after the given files changed"""
+        affected = set()
+        for path in self.dependents(paths):
+            if is_test_file(path):
+                affected.add(path)
+            elif os.path.basename(path) == "conftest.py":
+                directory = os.path.dirname(path)
+                affected.update(test for test in self.imports
+                                if is_test_file(test) and (not directory or test.startswith(f"{directory}/")))
+        return sorted(affected)
@@ -0,0 +1,180 @@
+# utils/leak_detector.py
+"""
+Client-side memory leak detection for repeated navigations.
+
+Users keep the web client open all day: a view that leaves a few hundred
+kilobytes, detached nodes or listeners behind on every visit slows the tab
+down by the afternoon. The detector runs a loop of named steps (class click,
+filter, facet removal...) many times on one page. After every step it forces a
+garbage collection through CDP and reads what is still alive:
+
+- JSHeapUsedSize: retained JS heap
+- Nodes: DOM nodes, detached ones included
+- JSEventListeners: registered listeners
+
+The first iterations fill caches and are left out. On the others it fits a
+least squares line per metric: a slope above its threshold with a good fit is
+a leak, and the steps whose retained growth explains it are reported.
+
+    detector = LeakDetector(page, [("class_click", click), ("filter", apply), ("remove_facet", remove)])
+    report = detector.run(iterations=30)
+    print(format_report(report))
+"""
+import json
+import os
+import time
+
+REPORT_DIR = "reports/leaks"
+METRICS = ("JSHeapUsedSize", "Nodes", "JSEventListeners")
+# Growth per iteration above which a metric leaks
+THRESHOLDS = {"JSHeapUsedSize": 100 * 1024, "Nodes": 50, "JSEventListeners": 10}
+# Minimum r² of the trend: a noisy heap is not a leak
+MIN_FIT = 0.6
+WARMUP = 3
+
+
+def linear_fit(xs, ys):
+    """
+    Least squares line through the points
+
+    Returns:
+        tuple: (slope, intercept, r2); r2 is 1.0 for a flat series
+    """
+    n = len(xs)
+    if n < 2:
+        return 0.0, (ys[0] if ys else 0.0), 0.0
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    slope = sxy / sxx if sxx else 0.0
+    if not syy:
+        return slope, mean_y, 1.0
+    return slope, mean_y - slope * mean_x, (sxy * sxy) / (sxx * syy) if sxx else 0.0
+
+
+def analyze(samples, warmup=WARMUP, thresholds=THRESHOLDS, min_fit=MIN_FIT):
+    """
+    Trends of the samples of a run
+
+    Args:
+        samples: {"iteration", "step", "metrics"} after every step, in order
+        warmup: Iterations left out of the trend
+
+    Returns:
+        dict: trends (per metric: slope per iteration, r2, leaking), steps (per step and
+            metric: mean growth across that step), leaks (metric -> steps that retain it)
+    """
+    measured = [sample for sample in samples if sample["iteration"] >= warmup]
+    steps = list(dict.fromkeys(sample["step"] for sample in measured))
+    last_step = steps[-1] if steps else None
+
+    trends = {}
+    for metric in METRICS:
+        # One point per iteration: what is left once the whole loop ran
+        points = [(sample["iteration"], sample["metrics"].get(metric, 0))
+                  for sample in measured if sample["step"] == last_step]
+        slope, _, r2 = linear_fit([x for x, _ in points], [y for _, y in points])
+        trends[metric] = {"slope": round(slope, 1), "r2": round(r2, 3),
+                          "leaking": slope > thresholds[metric] and r2 >= min_fit}
+
+    # Growth of each step: its sample minus the sample before it
+    growth = {step: {metric: [] for metric in METRICS} for step in steps}
+    previous = None
+    for sample in samples:
+        if previous is not None and sample["iteration"] >= warmup:
+            for metric in METRICS:
+                growth[sample["step"]][metric].append(
+                    sample["metrics"].get(metric, 0) - previous["metrics"].get(metric, 0))
+        previous = sample
+    per_step = {step: {metric: round(sum(values) / len(values), 1) if values else 0.0
+                       for metric, values in metrics.items()}
+                for step, metrics in growth.items()}
+
+    leaks = {}
+    for metric, trend in trends.items():
+        if trend["leaking"]:
+            # Steps that keep a significant share of the growth per iteration
+            leaks[metric] = [step for step in steps
+                             if per_step[step][metric] > trend["slope"] / (2 * len(steps))]
+    return {"trends": trends, "steps": per_step, "leaks": leaks}
+
+
+class LeakDetector:
+    """Runs navigation steps in a loop and measures what stays alive after each"""
+
+    def __init__(self, page, steps, warmup=WARMUP):
+        """
+        Args:
+            page: Chromium page already showing the view the steps start from
+            steps: (name, callable) pairs, run in order every iteration
+            warmup: Iterations left out of the trend
+        """
+        self.page = page
+        self.steps = steps
+        self.warmup = warmup
+        self.samples = []
+        self.errors = []
+        self.session = None
+
+    def _send(self, method, params=None):
+        if self.session is None:
+            self.session = self.page.context.new_cdp_session(self.page)
+            self.session.send("Performance.enable")
+        return self.session.send(method, params or {})
+
+    def measure(self):
+        """
+        Metrics after a forced garbage collection
+
+        Returns:
+            dict: METRICS values, plus Documents
+        """
+        # Twice: the first pass runs finalizers that release more objects
+        self._send("HeapProfiler.collectGarbage")
+        self._send("HeapProfiler.collectGarbage")
+        values = {metric["name"]: metric["value"] for metric in self._send("Performance.getMetrics")["metrics"]}
+        return {name: values.get(name, 0) for name in METRICS + ("Documents",)}
+
+    def run(self, iterations):
+        """
+        Returns:
+            dict: samples, errors and the analyze() result
+        """
+        started = time.time()
+        for iteration in range(iterations):
+            for name, step in self.steps:
+                try:
+                    if step() is False:
+                        self.errors.append({"iteration": iteration, "step": name, "error": "returned False"})
+                except Exception as e:
+                    self.errors.append({"iteration": iteration, "step": name, "error": str(e).splitlines()[0]})
+                self.samples.append({"iteration": iteration, "step": name, "metrics": self.measure()})
+        if self.session is not None:
+            try:
+                self.session.detach()
+            except Exception:
+                pass
+            self.session = None
+        return {"iterations": iterations, "warmup": self.warmup, "duration": round(time.time() - started, 1),
+                "samples": self.samples, "errors": self.errors,
+                **analyze(self.samples, self.warmup)}
+
+
+def format_report(report):
+    lines = [f"Leak detection: {report['iterations']} iterations ({report['warmup']} warm-up), "
+             f"{len(report['errors'])} step errors"]
+    for metric, trend in report["trends"].items():
+        flag = "LEAK" if trend["leaking"] else "ok"
+        lines.append(f"  {metric:<18} {trend['slope']:>12}/iteration  r2={trend['r2']:<6} {flag}")
+    for metric, steps in report["leaks"].items():
+        lines.append(f"  {metric} retained by: {', '.join(steps) or 'no single step'}")
+    return "\n".join(lines)
+
+
+def save_report(report, name="navigation", report_dir=REPORT_DIR):
+    os.makedirs(report_dir, exist_ok=True)
+    path = os.path.join(report_dir, f"{name}_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
@@ -0,0 +1,356 @@
+# utils/load_harness.py
+"""
+Browser load harness: virtual users replaying the page-object journeys.
+
+Each virtual user (VU) owns a browser context, logs in once and then loops
+over weighted journeys (utils/load_journeys.py) until the test duration is
+over. Users are spread over worker processes, each driving one browser and
+many contexts on an asyncio loop. They start one by one over the ramp-up
+period, wait a random think time after every step, and start a new iteration
+no sooner than `pacing` seconds after the previous one.
+
+Every step is timed, and the run reports throughput, error rate and latency
+percentiles per step, both overall and per time bucket:
+
+    python -m utils.load_harness --users 200 --processes 4 --ramp-up 120 --duration 600
+    python -m utils.load_harness --users 20 --base-url http://localhost:8069 --journeys filter_students:3,class_filter
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from utils.config_manager import load_config
+from utils.error_sentinel import ErrorSentinel
+
+REPORT_DIR = "reports/load"
+
+
+class StepFailed(Exception):
+    """A step completed but the page object reported a failure (False, None, wrong facet...)"""
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (None if empty)"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(durations, errors, elapsed):
+    """Count, error rate, throughput and latency percentiles (ms) of one step"""
+    durations = sorted(durations)
+    count = len(durations)
+    return {
+        "count": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput": round(count / elapsed, 3) if elapsed else 0.0,
+        "p50": percentile(durations, 50),
+        "p90": percentile(durations, 90),
+        "p95": percentile(durations, 95),
+        "p99": percentile(durations, 99),
+        "max": durations[-1] if durations else None,
+    }
+
+
+class LoadStats:
+    """
+    Step samples of a load run.
+
+    A sample is [started_at, step, duration_ms, ok, error]; samples from every
+    worker process are merged into one LoadStats before reporting.
+    """
+
+    def __init__(self, samples=None, bucket_seconds=10):
+        self.samples = list(samples or [])
+        self.bucket_seconds = bucket_seconds
+
+    def record(self, started_at, step, duration_ms, ok, error=None):
+        self.samples.append([started_at, step, round(duration_ms, 1), ok, error])
+
+    def extend(self, samples):
+        self.samples.extend(samples)
+
+    def _bounds(self):
+        start = min(sample[0] for sample in self.samples)
+        end = max(sample[0] + sample[2] / 1000 for sample in self.samples)
+        return start, end
+
+    def step_summary(self):
+        """
+        Returns:
+            dict: step -> count, errors, error_rate, throughput (per s), p50/p90/p95/p99/max (ms)
+        """
+        if not self.samples:
+            return {}
+        start, end = self._bounds()
+        by_step = {}
+        for _, step, duration, ok, _ in self.samples:
+            durations, errors = by_step.setdefault(step, ([], [0]))
+            durations.append(duration)
+            errors[0] += not ok
+        return {step: summarize(durations, errors[0], end - start)
+                for step, (durations, errors) in sorted(by_step.items())}
+
+    def timeline(self):
+        """
+        Per-bucket step summaries, to see latency and errors evolve with the ramp-up
+
+        Returns:
+            list: {"t": seconds since start, "steps": {step: summary}} per bucket
+        """
+        if not self.samples:
+            return []
+        start, _ = self._bounds()
+        buckets = {}
+        for started_at, step, duration, ok, _ in self.samples:
+            bucket = int((started_at - start) // self.bucket_seconds)
+            durations, errors = buckets.setdefault(bucket, {}).setdefault(step, ([], [0]))
+            durations.append(duration)
+            errors[0] += not ok
+        return [{"t": bucket * self.bucket_seconds,
+                 "steps": {step: summarize(durations, errors[0], self.bucket_seconds)
+                           for step, (durations, errors) in sorted(steps.items())}}
+                for bucket, steps in sorted(buckets.items())]
+
+    def top_errors(self, limit=10):
+        counts = {}
+        for _, step, _, ok, error in self.samples:
+            if not ok:
+                key = f"{step}: {(error or 'unknown')[:200]}"
+                counts[key] = counts.get(key, 0) + 1
+        return sorted(counts.items(), key=lambda item: -item[1])[:limit]
+
+    def report(self, profile=None):
+        return {
+            "profile": profile,
+            "steps": self.step_summary(),
+            "timeline": self.timeline(),
+            "top_errors": self.top_errors(),
+        }
+
+    def format_table(self):
+        """Return the per-step summary as a text table"""
+        lines = [f"{'step':24} {'count':>7} {'err%':>6} {'req/s':>7} {'p50':>7} {'p90':>7} {'p95':>7} {'p99':>7} {'max':>7}"]
+        for step, summary in self.step_summary().items():
+            lines.append(f"{step:24} {summary['count']:>7} {summary['error_rate']:>6.1%} {summary['throughput']:>7.2f} "
+                         + " ".join(f"{summary[key] or 0:>7.0f}" for key in ("p50", "p90", "p95", "p99", "max")))
+        return "\n".join(lines)
+
+
+class LoadProfile:
+    """Shape of a load run (picklable, handed to every worker process)"""
+
+    def __init__(self, users=10, processes=1, ramp_up=60, duration=300, think_time=(2, 6), pacing=0,
+                 journeys=None, base_url=None, accounts=None, headless=True, seed=0, bucket_seconds=10):
+        """
+        Args:
+            users: Number of concurrent virtual users
+            processes: Worker processes (each runs one browser)
+            ramp_up: Seconds over which users are started
+            duration: Seconds during which users start new iterations (ramp-up included)
+            think_time: (min, max) seconds waited after every step
+            pacing: Minimum seconds between the starts of two iterations of one user
+            journeys: {journey name: weight}
+            base_url: Server under test
+            accounts: [{"username", "password"}] used round-robin by the users
+            headless: Run the browsers headless
+            seed: Seed of the journey/think-time random generators
+            bucket_seconds: Width of the timeline buckets
+        """
+        self.users = users
+        self.processes = max(1, min(processes, users))
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.think_time = tuple(think_time)
+        self.pacing = pacing
+        self.journeys = journeys or {"filter_students": 1}
+        self.base_url = base_url
+        self.accounts = accounts or []
+        self.headless = headless
+        self.seed = seed
+        self.bucket_seconds = bucket_seconds
+
+    def to_dict(self):
+        data = dict(vars(self))
+        data["accounts"] = [account["username"] for account in self.accounts]
+        return data
+
+
+class VirtualUser:
+    """One simulated user: a browser context, a page and a random generator"""
+
+    def __init__(self, user_id, profile, stats, deadline):
+        self.user_id = user_id
+        self.profile = profile
+        self.stats = stats
+        self.deadline = deadline
+        self.base_url = profile.base_url
+        self.account = profile.accounts[user_id % len(profile.accounts)]
+        self.rng = random.Random(f"{profile.seed}-{user_id}")
+        self.context = None
+        self.page = None
+
+    @asynccontextmanager
+    async def step(self, name):
+        """Time a step; failures are recorded and re-raised to abort the iteration"""
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            # First line only: OdooClientError carries the whole server traceback
+            message = str(e).split("\n", 1)[0]
+            self.stats.record(started_at, name, (time.perf_counter() - start) * 1000, False,
+                              f"{type(e).__name__}: {message}")
+            raise
+        self.stats.record(started_at, name, (time.perf_counter() - start) * 1000, True)
+        await self.think()
+
+    async def think(self):
+        await asyncio.sleep(self.rng.uniform(*self.profile.think_time))
+
+    def pick_journey(self):
+        names = list(self.profile.journeys)
+        return self.rng.choices(names, weights=[self.profile.journeys[name] for name in names])[0]
+
+    async def run(self, browser, start_delay):
+        """Start after start_delay, log in, then loop over journeys until the deadline"""
+        # Imported here: the journeys pull in every page object
+        from utils.load_journeys import JOURNEYS, login
+
+        await asyncio.sleep(start_delay)
+        self.context = await browser.new_context(ignore_https_errors=True, viewport={"width": 1920, "height": 1080})
+        self.context.set_default_timeout(30000)
+        self.page = await self.context.new_page()
+        ErrorSentinel().install_async(self.page)
+        try:
+            logged_in = False
+            while time.time() < self.deadline:
+                iteration_start = time.time()
+                try:
+                    if not logged_in:
+                        await login(self)
+                        logged_in = True
+                    await JOURNEYS[self.pick_journey()](self)
+                except Exception:
+                    # Recorded by step(); a fresh page recovers from a broken UI state
+                    await self.page.close()
+                    self.page = await self.context.new_page()
+                    ErrorSentinel().install_async(self.page)
+                    await self.think()
+                remaining = self.profile.pacing - (time.time() - iteration_start)
+                if remaining > 0:
+                    await asyncio.sleep(min(remaining, max(0, self.deadline - time.time())))
+        finally:
+            await self.context.close()
+
+
+async def _run_users(user_ids, profile, run_start):
+    from playwright.async_api import async_playwright
+
+    stats = LoadStats(bucket_seconds=profile.bucket_seconds)
+    deadline = run_start + profile.duration
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=profile.headless, args=["--disable-dev-shm-usage", "--disable-gpu"])
+        try:
+            users = [VirtualUser(user_id, profile, stats, deadline) for user_id in user_ids]
+            # User k of N starts k/N of the way through the ramp-up, whatever its process
+            delays = [max(0, run_start + profile.ramp_up * user.user_id / profile.users - time.time())
+                      for user in users]
+            results = await asyncio.gather(*(user.run(browser, delay) for user, delay in zip(users, delays)),
+                                           return_exceptions=True)
+            for user, result in zip(users, results):
+                if isinstance(result, Exception):
+                    stats.record(time.time(), "virtual_user", 0, False, f"user {user.user_id}: {result}")
+        finally:
+            await browser.close()
+    return stats.samples
+
+
+def run_worker(user_ids, profile, run_start):
+    """Entry point of a worker process: run its users and return their samples"""
+    return asyncio.run(_run_users(user_ids, profile, run_start))
+
+
+def run_load(profile):
+    """
+    Run a load profile across worker processes
+
+    Returns:
+        LoadStats: Samples of every virtual user
+    """
+    run_start = time.time() + 5  # leave the workers time to launch their browsers
+    user_groups = [list(range(index, profile.users, profile.processes)) for index in range(profile.processes)]
+    stats = LoadStats(bucket_seconds=profile.bucket_seconds)
+    with ProcessPoolExecutor(max_workers=profile.processes,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(run_worker, user_ids, profile, run_start) for user_ids in user_groups]
+        for future in futures:
+            stats.extend(future.result())
+    return stats
+
+
+def parse_journeys(text):
+    """Parse "filter_students:3,class_filter" into {"filter_students": 3, "class_filter": 1}"""
+    journeys = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = item.partition(":")
+        journeys[name] = float(weight or 1)
+    return journeys
+
+
+def main():
+    from utils.account_pool import AccountPool
+
+    parser = argparse.ArgumentParser(description="Run virtual users through the page-object journeys")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--ramp-up", type=float, default=60, help="Seconds to start every user")
+    parser.add_argument("--duration", type=float, default=300, help="Seconds of load, ramp-up included")
+    parser.add_argument("--think-time", type=float, nargs=2, default=(2, 6), metavar=("MIN", "MAX"))
+    parser.add_argument("--pacing", type=float, default=0, help="Minimum seconds per iteration")
+    parser.add_argument("--journeys", default="filter_students:3,class_filter:1,enrolled_roster:1",
+                        help="Weighted journeys, name[:weight] separated by commas")
+    parser.add_argument("--base-url", help="Server under test (defaults to BASE_URL / data/config.json)")
+    parser.add_argument("--config", default="data/config.json")
+    parser.add_argument("--headed", action="store_true", help="Show the browsers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bucket", type=int, default=10, help="Timeline bucket in seconds")
+    args = parser.parse_args()
+
+    from utils.load_journeys import JOURNEYS
+    journeys = parse_journeys(args.journeys)
+    unknown = set(journeys) - set(JOURNEYS)
+    if unknown:
+        parser.error(f"Unknown journeys: {', '.join(sorted(unknown))} (available: {', '.join(JOURNEYS)})")
+
+    config = load_config(args.config, base_url=args.base_url)
+    accounts = AccountPool.load_users() or [{"username": config["username"], "password": config["password"]}]
+    profile = LoadProfile(users=args.users, processes=args.processes, ramp_up=args.ramp_up,
+                          duration=args.duration, think_time=args.think_time, pacing=args.pacing,
+                          journeys=journeys, base_url=config["base_url"], accounts=accounts,
+                          headless=not args.headed, seed=args.seed, bucket_seconds=args.bucket)
+
+    print(f"Running {profile.users} virtual users on {profile.processes} processes against {profile.base_url}")
+    stats = run_load(profile)
+    print(stats.format_table())
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(stats.report(profile.to_dict()), f, ensure_ascii=False, indent=1)
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# utils/load_journeys.py
+"""
+Scripted user journeys for utils.load_harness, built on the pages/aio page objects.
+
+A journey is a coroutine taking a VirtualUser. Each user action is wrapped in
+user.step(name), which times it and adds think time. Page objects report
+problems with False/None instead of raising, so journeys turn those return
+values into StepFailed to have them counted as errors.
+"""
+from pages.aio.login_page import AsyncLoginPage
+from pages.aio.school_card.class_filter_page import AsyncClassFilterPage
+from pages.aio.school_card.student_filter_page import AsyncStudentFilterPage
+from pages.aio.school_card.student_inscrit_page import AsyncStudentInscritPage
+from utils.load_harness import StepFailed
+
+# Apprenant kanban (action 405 / menu 108), opened directly instead of through the menus
+STUDENT_VIEW = "/web#action=405&menu_id=108"
+
+
+async def login(user):
+    login_page = AsyncLoginPage(user.page, user.base_url)
+    async with user.step("login_page"):
+        await login_page.navigate()
+    async with user.step("login"):
+        if not await login_page.login(user.account["username"], user.account["password"]):
+            raise StepFailed(await login_page.get_error_message() or "login did not reach the web client")
+
+
+async def open_students(user, page_object):
+    async with user.step("open_students"):
+        await user.page.goto(f"{user.base_url}{STUDENT_VIEW}")
+        await page_object.wait_for_page_loaded()
+
+
+async def filter_students(user):
+    """Apply a random student filter, read the record count and clear the search"""
+    filter_page = AsyncStudentFilterPage(user.page)
+    await open_students(user, filter_page)
+
+    label = user.rng.choice(list(filter_page.FILTERS))
+    async with user.step("apply_filter"):
+        await filter_page.apply_filter(filter_page.FILTERS[label])
+        facet = await filter_page.get_filter_facet_text()
+        if facet != label:
+            raise StepFailed(f"expected facet {label!r}, got {facet!r}")
+    async with user.step("read_count"):
+        if await filter_page.get_record_count() < 0:
+            raise StepFailed("record count unavailable")
+    async with user.step("remove_filter"):
+        if not await filter_page.remove_all_filters():
+            raise StepFailed("facets left after removing filters")
+
+
+async def class_filter(user):
+    """Open a random class in the search panel and check its students"""
+    class_page = AsyncClassFilterPage(user.page)
+    await open_students(user, class_page)
+
+    async with user.step("expand_sidebar"):
+        await class_page.expand_all_sidebar_items()
+        classes = [(element, title) for element, title, is_class in await class_page.get_all_sidebar_items()
+                   if is_class]
+        if not classes:
+            raise StepFailed("no class in the search panel")
+    element, title = user.rng.choice(classes)
+    async with user.step("select_class"):
+        if not await class_page.click_sidebar_item_safe(element, title):
+            raise StepFailed(f"could not click {title}")
+        await class_page.wait_for_page_loaded()
+    async with user.step("verify_class"):
+        if await class_page.has_students():
+            success, details = await class_page.verify_students_match_class(title)
+            if not success:
+                raise StepFailed(f"{len(details.get('mismatched_students', []))} students outside {title}")
+
+
+async def enrolled_roster(user):
+    """Read the first pages of the enrolled roster"""
+    inscrit_page = AsyncStudentInscritPage(user.page)
+    await open_students(user, inscrit_page)
+
+    async with user.step("read_roster"):
+        if not await inscrit_page.get_students_info():
+            raise StepFailed("no student card rendered")
+    async with user.step("next_page"):
+        if await inscrit_page.get_total_students_count() > await inscrit_page.get_visible_students_count() \
+                and not await inscrit_page.navigate_to_next_page():
+            raise StepFailed("could not open the next page")
+
+
+JOURNEYS = {
+    "filter_students": filter_students,
+    "class_filter": class_filter,
+    "enrolled_roster": enrolled_roster,
+}
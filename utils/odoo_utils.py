@@ -0,0 +1,170 @@
+# utils/odoo_utils.py
+import json
+import itertools
+import urllib.request
+from http.cookiejar import CookieJar, Cookie
+from urllib.parse import urlparse
+
+# Model behind the Carte Scolaire > Apprenant kanban (action 405)
+STUDENT_MODEL = "acces.statut.apprenant"
+
+
+class OdooRPCError(Exception):
+    """Raised when the server answers a JSON-RPC call with an error payload"""
+
+    def __init__(self, error):
+        self.error = error or {}
+        data = self.error.get("data") or {}
+        self.name = data.get("name", "")
+        self.debug = data.get("debug", "")
+        message = data.get("message") or self.error.get("message") or "Unknown RPC error"
+        super().__init__(f"{self.name}: {message}" if self.name else message)
+
+
+class OdooClient:
+    """Minimal JSON-RPC client for the Odoo web endpoints used by the tests"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, base_url, db=None, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.db = db
+        self.timeout = timeout
+        self.uid = None
+        self.context = {}
+        self.cookies = CookieJar()
+        self._opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a client and authenticate with the credentials from config.json"""
+        client = cls(config.get("base_url", "https://dev.nawat.ma"), db=config.get("db"))
+        client.authenticate(
+            config.get("username", "ecole.e2a"),
+            config.get("password", "1@ayouris2")
+        )
+        return client
+
+    @classmethod
+    def from_page(cls, page, base_url="https://dev.nawat.ma"):
+        """
+        Create a client that reuses the session of a logged-in Playwright page
+
+        Args:
+            page: Playwright page that went through LoginPage.login
+            base_url: Server the page is logged in to
+
+        Returns:
+            OdooClient: Client sharing the browser's session_id cookie
+        """
+        client = cls(base_url)
+        host = urlparse(client.base_url).hostname
+        for cookie in page.context.cookies(client.base_url):
+            if cookie["name"] == "session_id":
+                client.set_session_id(cookie["value"], domain=cookie.get("domain") or host)
+        info = client.call("/web/session/get_session_info")
+        client.uid = info.get("uid")
+        client.db = info.get("db")
+        client.context = info.get("user_context", {})
+        return client
+
+    def set_session_id(self, session_id, domain=None):
+        """Inject an existing session_id cookie into the client"""
+        domain = domain or urlparse(self.base_url).hostname
+        self.cookies.set_cookie(Cookie(
+            0, "session_id", session_id, None, False, domain, True, domain.startswith("."),
+            "/", True, False, None, False, None, None, {}
+        ))
+
+    @property
+    def session_id(self):
+        """Return the current session_id cookie value, if any"""
+        for cookie in self.cookies:
+            if cookie.name == "session_id":
+                return cookie.value
+        return None
+
+    def call(self, route, params=None):
+        """
+        POST a JSON-RPC request to a web route
+
+        Args:
+            route: Path such as '/web/dataset/call_kw'
+            params: JSON-RPC params dict
+
+        Returns:
+            The 'result' member of the response
+
+        Raises:
+            OdooRPCError: If the server returned an error payload
+        """
+        payload = json.dumps({
+            "jsonrpc": "2.0",
+            "method": "call",
+            "params": params or {},
+            "id": next(self._ids),
+        }).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.base_url}{route}",
+            data=payload,
+            headers={"Content-Type": "application/json"},
+        )
+        with self._opener.open(request, timeout=self.timeout) as response:
+            body = json.loads(response.read().decode("utf-8"))
+        if body.get("error"):
+            raise OdooRPCError(body["error"])
+        return body.get("result")
+
+    def authenticate(self, username, password):
+        """Open a session for the given user and return its uid"""
+        if not self.db:
+            self.db = self._get_database()
+        result = self.call("/web/session/authenticate", {
+            "db": self.db,
+            "login": username,
+            "password": password,
+        })
+        self.uid = result.get("uid")
+        self.context = result.get("user_context", {})
+        if not self.uid:
+            raise OdooRPCError({"message": f"Authentication failed for {username}"})
+        return self.uid
+
+    def _get_database(self):
+        """Find the database name when config.json does not provide one"""
+        databases = self.call("/web/database/list")
+        if not databases:
+            raise OdooRPCError({"message": "No database available, set 'db' in config.json"})
+        return databases[0]
+
+    def version_info(self):
+        """Return the server version information (no authentication needed)"""
+        return self.call("/web/webclient/version_info")
+
+    def call_kw(self, model, method, args=None, kwargs=None):
+        """Call a model method through /web/dataset/call_kw"""
+        kwargs = dict(kwargs or {})
+        kwargs.setdefault("context", self.context)
+        return self.call(f"/web/dataset/call_kw/{model}/{method}", {
+            "model": model,
+            "method": method,
+            "args": args or [],
+            "kwargs": kwargs,
+        })
+
+    def search_count(self, model, domain):
+        """Count the records matching a domain"""
+        return self.call_kw(model, "search_count", [domain])
+
+    def search_read(self, model, domain, fields, limit=None, order=None):
+        """Read the given fields of the records matching a domain"""
+        kwargs = {"fields": fields}
+        if limit:
+            kwargs["limit"] = limit
+        if order:
+            kwargs["order"] = order
+        return self.call_kw(model, "search_read", [domain], kwargs)
+
+    def read_group(self, model, domain, fields, groupby, lazy=True):
+        """Aggregate records matching a domain, e.g. counts per class"""
+        return self.call_kw(model, "read_group", [domain, fields, groupby], {"lazy": lazy})
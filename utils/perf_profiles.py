@@ -0,0 +1,135 @@
+# utils/perf_profiles.py
+"""
+Network and CPU throttling profiles of the schools' machines.
+
+CI runs on a fast agent next to the server; many schools reach it over ADSL
+or 4G from old PCs. With --perf-profile (or PERF_PROFILE) every test page is
+throttled through CDP before the test starts:
+
+- Network.emulateNetworkConditions: latency and throughput of the link
+- Emulation.setCPUThrottlingRate: CPU slowdown factor of the renderer
+
+    apply_profile(page, "school-adsl")
+    await apply_profile_async(page, "mobile-4g")
+
+Overrides last as long as the CDP session that set them, so the session is
+kept alive with the page. Timeouts are scaled by the profile's timeout_factor:
+the page defaults in conftest, and the explicit timeouts of the page objects
+through page_timeout_factor(page). Test durations are reported per profile
+(reports/perf).
+"""
+import json
+import os
+import weakref
+
+REPORT_DIR = "reports/perf"
+
+PROFILES = {
+    # ~8 Mbit/s down, 800 kbit/s up, shared school line
+    "school-adsl": {"latency": 60, "download_kbps": 8000, "upload_kbps": 800, "cpu_rate": 1,
+                    "timeout_factor": 2},
+    # Lighthouse "slow 4G": 150 ms RTT, 1.6 Mbit/s down, 750 kbit/s up
+    "mobile-4g": {"latency": 150, "download_kbps": 1600, "upload_kbps": 750, "cpu_rate": 1,
+                  "timeout_factor": 3},
+    # Unthrottled network, renderer 4x slower
+    "old-pc-4x-cpu": {"latency": 0, "download_kbps": None, "upload_kbps": None, "cpu_rate": 4,
+                      "timeout_factor": 2},
+}
+
+# CDP sessions holding the overrides of each page
+_sessions = weakref.WeakKeyDictionary()
+# Timeout factor of each throttled page
+_factors = weakref.WeakKeyDictionary()
+
+
+def network_conditions(profile):
+    """Network.emulateNetworkConditions parameters (throughput in bytes/s, -1 = unthrottled)"""
+    def throughput(kbps):
+        return kbps * 1000 / 8 if kbps else -1
+    return {"offline": False, "latency": profile["latency"],
+            "downloadThroughput": throughput(profile["download_kbps"]),
+            "uploadThroughput": throughput(profile["upload_kbps"])}
+
+
+def describe(name):
+    """One line summary of a profile, for headers and reports"""
+    profile = PROFILES[name]
+    network = (f"{profile['latency']} ms, {profile['download_kbps']}/{profile['upload_kbps']} kbit/s"
+               if profile["download_kbps"] else "network unthrottled")
+    return f"{name} ({network}, CPU x{profile['cpu_rate']})"
+
+
+def apply_profile(page, name):
+    """
+    Throttle a Chromium page
+
+    Returns:
+        bool: True if the profile is applied, False without a profile or without CDP
+    """
+    if not name or name not in PROFILES:
+        return False
+    profile = PROFILES[name]
+    try:
+        session = page.context.new_cdp_session(page)
+        session.send("Network.enable")
+        session.send("Network.emulateNetworkConditions", network_conditions(profile))
+        session.send("Emulation.setCPUThrottlingRate", {"rate": profile["cpu_rate"]})
+    except Exception as e:
+        print(f"Performance profile {name} not applied: {e}")
+        return False
+    _sessions[page] = session
+    _factors[page] = profile["timeout_factor"]
+    return True
+
+
+async def apply_profile_async(page, name):
+    if not name or name not in PROFILES:
+        return False
+    profile = PROFILES[name]
+    try:
+        session = await page.context.new_cdp_session(page)
+        await session.send("Network.enable")
+        await session.send("Network.emulateNetworkConditions", network_conditions(profile))
+        await session.send("Emulation.setCPUThrottlingRate", {"rate": profile["cpu_rate"]})
+    except Exception as e:
+        print(f"Performance profile {name} not applied: {e}")
+        return False
+    _sessions[page] = session
+    _factors[page] = profile["timeout_factor"]
+    return True
+
+
+def timeout_factor(name):
+    return PROFILES[name]["timeout_factor"] if name in PROFILES else 1
+
+
+def page_timeout_factor(page):
+    """Multiplier of the page objects' timeouts on a page: 1 unless a profile throttles it"""
+    try:
+        return _factors.get(page, 1)
+    except TypeError:
+        return 1
+
+
+def save_timings(name, durations, report_dir=REPORT_DIR):
+    """
+    Durations of the tests run under a profile, in reports/perf/<profile>.json
+
+    Args:
+        name: Profile name, "none" for an unthrottled run
+        durations: {nodeid: seconds of the test call}
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    path = os.path.join(report_dir, f"{name}_{worker}.json" if worker else f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"profile": name, "settings": PROFILES.get(name), "durations": durations}, f, indent=2)
+    return path
+
+
+def format_timings(name, durations, count=10):
+    label = describe(name) if name in PROFILES else "no throttling"
+    lines = [f"Slowest tests under {label}:"]
+    for nodeid, seconds in sorted(durations.items(), key=lambda item: item[1], reverse=True)[:count]:
+        lines.append(f"  [{name}] {seconds:7.2f}s  {nodeid}")
+    return "\n".join(lines)
@@ -0,0 +1,220 @@
+# utils/query_cache.py
+"""
+Render-epoch query cache: repeated DOM reads resolved once per render.
+
+A QueryCache installed on a page runs a MutationObserver in every document of
+the page, counting mutations. Every read through the cache (snapshot of
+selectors, evaluate of a read-only script) returns a render token with its
+value: the document's id and its mutation count. A later read of the same
+selectors or script first fetches the current token, a single tiny evaluate,
+and is served from memory only when no mutation happened since: a hit is as
+fresh as a live read, while the selectors are not resolved again. The first
+mutation after a read also drops the entries through an exposed binding, and
+navigations drop them too.
+
+    QueryCache().install(page)                            # conftest.page
+    QueryCache.of(page).snapshot(page, [KANBAN_VIEW])     # [{"count", "visible", "text"}]
+
+BasePage.snapshot and BasePage.cached_evaluate use the cache when the page has
+one and fall back to a single uncached evaluate otherwise.
+"""
+import json
+import weakref
+
+BINDING = "__renderEpochChanged"
+
+# Counts mutations; reports the first one after each cached read
+OBSERVER_SCRIPT = f"""
+(() => {{
+    if (window.__renderEpoch !== undefined) return;
+    window.__renderDocument = Math.random().toString(36).slice(2);
+    window.__renderEpoch = 0;
+    window.__renderEpochReported = false;
+    new MutationObserver(() => {{
+        window.__renderEpoch++;
+        if (!window.__renderEpochReported && window.{BINDING}) {{
+            window.__renderEpochReported = true;
+            window.{BINDING}(window.__renderEpoch);
+        }}
+    }}).observe(document, {{subtree: true, childList: true, attributes: true, characterData: true}});
+}})()
+"""
+
+# Render token of the document: changes with every mutation and every navigation
+TOKEN_EXPRESSION = ("(window.__renderEpoch === undefined ? null"
+                    " : window.__renderDocument + ':' + window.__renderEpoch)")
+TOKEN_SCRIPT = f"() => {TOKEN_EXPRESSION}"
+
+# Count, visibility (Playwright's definition) and text of the first match of each selector
+SNAPSHOT_SCRIPT = """
+(selectors) => selectors.map((selector) => {
+    let nodes;
+    if (selector.startsWith('/') || selector.startsWith('(')) {
+        const result = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        nodes = [];
+        for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    } else {
+        nodes = Array.from(document.querySelectorAll(selector));
+    }
+    const first = nodes[0];
+    let visible = false;
+    if (first && first.nodeType === Node.ELEMENT_NODE) {
+        const rect = first.getBoundingClientRect();
+        visible = rect.width > 0 && rect.height > 0 && getComputedStyle(first).visibility !== 'hidden';
+    }
+    return {count: nodes.length, visible, text: first ? first.textContent : null};
+})
+"""
+
+
+def cacheable(selector):
+    """XPath and plain CSS selectors; Playwright-only syntax (text=, >>, :has-text) goes to Playwright"""
+    if selector.startswith(("//", "(/")):
+        return True
+    return "=" not in selector.split("[")[0] and ">>" not in selector and ":has" not in selector \
+        and ":text" not in selector and ":visible" not in selector
+
+
+def with_epoch(script):
+    """
+    Wrap a function expression taking at most one argument so that the same
+    evaluate also returns the render token and re-arms the mutation report
+    """
+    return (f"(arg) => {{ const value = ({script.strip()})(arg);"
+            f" const token = {TOKEN_EXPRESSION};"
+            f" window.__renderEpochReported = false;"
+            f" return [token, value]; }}")
+
+
+class QueryCache:
+    """Cached DOM reads of one page, dropped at the first mutation"""
+
+    _pages = weakref.WeakKeyDictionary()
+
+    def __init__(self):
+        self.entries = {}
+        self.token = None
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def of(cls, page):
+        """Cache installed on a page, or None"""
+        return cls._pages.get(page)
+
+    def install(self, page):
+        if self.of(page):
+            return self.of(page)
+        page.expose_binding(BINDING, self._on_render)
+        page.add_init_script(OBSERVER_SCRIPT)
+        page.on("framenavigated", self._on_navigated)
+        try:
+            # Documents loaded before the init script was registered
+            page.evaluate(OBSERVER_SCRIPT)
+        except Exception:
+            pass
+        self._pages[page] = self
+        return self
+
+    async def install_async(self, page):
+        if self.of(page):
+            return self.of(page)
+        await page.expose_binding(BINDING, self._on_render)
+        await page.add_init_script(OBSERVER_SCRIPT)
+        page.on("framenavigated", self._on_navigated)
+        try:
+            await page.evaluate(OBSERVER_SCRIPT)
+        except Exception:
+            pass
+        self._pages[page] = self
+        return self
+
+    def _on_render(self, source, epoch):
+        self.invalidate()
+
+    def _on_navigated(self, frame):
+        if frame.parent_frame is None:
+            self.invalidate()
+
+    def invalidate(self):
+        self.entries.clear()
+        self.token = None
+        self.epoch += 1
+
+    def _fresh(self, token):
+        """Whether the entries were read in the DOM the browser shows now"""
+        if token is None or token != self.token:
+            self.invalidate()
+            return False
+        return True
+
+    def _store(self, key, token, value):
+        # Without an observer in the document nothing tells when the entry goes stale
+        if token is None:
+            return value
+        if token != self.token:
+            # Entries read in an older DOM go
+            self.entries.clear()
+            self.token = token
+        self.entries[key] = value
+        return value
+
+    def _missing(self, selectors):
+        return [selector for selector in dict.fromkeys(selectors) if ("snapshot", selector) not in self.entries]
+
+    def _combine(self, selectors, fresh, token):
+        for selector, value in fresh.items():
+            self._store(("snapshot", selector), token, value)
+        return [fresh[selector] if selector in fresh else self.entries[("snapshot", selector)]
+                for selector in selectors]
+
+    def snapshot(self, page, selectors):
+        """
+        count, visible and text (first match) of each selector
+
+        Returns:
+            list: one dict per selector, in order
+        """
+        if self.entries and not self._missing(selectors) and self._fresh(page.evaluate(TOKEN_SCRIPT)):
+            self.hits += 1
+            return [self.entries[("snapshot", selector)] for selector in selectors]
+        self.misses += 1
+        missing = self._missing(selectors)
+        token, values = page.evaluate(with_epoch(SNAPSHOT_SCRIPT), missing)
+        if token != self.token and len(missing) < len(set(selectors)):
+            # The DOM changed since the cached part was read: read everything again
+            missing = list(dict.fromkeys(selectors))
+            token, values = page.evaluate(with_epoch(SNAPSHOT_SCRIPT), missing)
+        return self._combine(selectors, dict(zip(missing, values)), token)
+
+    async def snapshot_async(self, page, selectors):
+        if self.entries and not self._missing(selectors) and self._fresh(await page.evaluate(TOKEN_SCRIPT)):
+            self.hits += 1
+            return [self.entries[("snapshot", selector)] for selector in selectors]
+        self.misses += 1
+        missing = self._missing(selectors)
+        token, values = await page.evaluate(with_epoch(SNAPSHOT_SCRIPT), missing)
+        if token != self.token and len(missing) < len(set(selectors)):
+            missing = list(dict.fromkeys(selectors))
+            token, values = await page.evaluate(with_epoch(SNAPSHOT_SCRIPT), missing)
+        return self._combine(selectors, dict(zip(missing, values)), token)
+
+    def evaluate(self, page, script, arg=None):
+        """page.evaluate of a read-only script, cached until the DOM changes"""
+        key = ("evaluate", script, json.dumps(arg, sort_keys=True))
+        if key in self.entries and self._fresh(page.evaluate(TOKEN_SCRIPT)):
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        token, value = page.evaluate(with_epoch(script), arg)
+        return self._store(key, token, value)
+
+    async def evaluate_async(self, page, script, arg=None):
+        key = ("evaluate", script, json.dumps(arg, sort_keys=True))
+        if key in self.entries and self._fresh(await page.evaluate(TOKEN_SCRIPT)):
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        token, value = await page.evaluate(with_epoch(script), arg)
+        return self._store(key, token, value)
@@ -0,0 +1,540 @@
+# utils/rpc_replay.py
+"""
+Browserless load: record the JSON-RPC calls behind a journey, replay them at scale.
+
+Recording runs a journey once in a real browser (after login) and saves every
+JSON-RPC request the web client sent, with the pause before it:
+
+    python -m utils.rpc_replay record --journey filter_students
+
+Recorded search terms that match an identifying field of data/*.json (a
+student or class name typed in the search input: a domain value or the
+name_search term) become placeholders such as "{{students.name}}". Any
+parameter can also be edited by hand into a placeholder; a placeholder that
+makes up a whole value keeps the type of the data (ids stay integers). Each
+iteration of a virtual user draws one row per data source, so
+"{{students.id}}" and "{{students.name}}" in the same iteration come from the
+same student.
+
+Replay needs no browser. Virtual users are asyncio tasks sharing a pool of
+authenticated sessions, and the HTTP calls run on a thread pool with one
+keep-alive connection per thread. One box can simulate thousands of users:
+
+    python -m utils.rpc_replay replay data/rpc_journeys/filter_students.json --users 2000 --threads 128
+"""
+import argparse
+import asyncio
+import glob
+import http.client
+import itertools
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+
+from utils.config_manager import load_config
+from utils.odoo_utils import OdooClient
+
+JOURNEY_DIR = "data/rpc_journeys"
+REPORT_DIR = "reports/load"
+
+# Background traffic that is not part of a user journey
+EXCLUDED_ROUTES = ("/longpolling/", "/websocket", "/bus/", "/web/session/authenticate")
+
+# data/*.json files that are not template sources
+EXCLUDED_DATA_FILES = ("config.json", "users.json")
+
+# Fields identifying a record: only their values are turned into placeholders
+TEMPLATE_FIELDS = ("name", "name_ar", "massar_code", "ref")
+# Operators of a domain leaf [field, operator, value]
+DOMAIN_OPERATORS = ("=", "!=", "like", "ilike", "not like", "not ilike", "=like", "=ilike", "in", "not in")
+
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\.([\w.]+)\s*\}\}")
+
+
+class RpcRecorder:
+    """
+    Collect the JSON-RPC requests a Playwright page sends
+
+        recorder = RpcRecorder(page).start()
+        ...drive the page objects...
+        recorder.stop().save("data/rpc_journeys/filter_students.json", "filter_students")
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.origin = None
+        self.calls = []
+
+    def start(self):
+        parsed = urlparse(self.page.url)
+        self.origin = f"{parsed.scheme}://{parsed.netloc}"
+        self.page.on("request", self._on_request)
+        return self
+
+    def stop(self):
+        self.page.remove_listener("request", self._on_request)
+        return self
+
+    def _on_request(self, request):
+        if request.method != "POST" or not request.url.startswith(self.origin):
+            return
+        route = urlparse(request.url).path
+        if any(excluded in route for excluded in EXCLUDED_ROUTES):
+            return
+        try:
+            body = request.post_data_json
+        except Exception:
+            return
+        if isinstance(body, dict) and body.get("jsonrpc"):
+            self.calls.append({"route": route, "params": body.get("params", {}), "at": time.time()})
+
+    def journey(self, name):
+        """Return the recording as a journey: calls with the pause (think) before each"""
+        calls = []
+        previous = self.calls[0]["at"] if self.calls else 0
+        for call in self.calls:
+            calls.append({"route": call["route"], "params": call["params"], "think": round(call["at"] - previous, 3)})
+            previous = call["at"]
+        return {"name": name, "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                "origin": self.origin, "calls": calls}
+
+    def save(self, path, name, data=None):
+        """Write the journey, turning values found in the template data into placeholders"""
+        journey = self.journey(name)
+        if data:
+            journey["calls"] = templatize(journey["calls"], data)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(journey, f, ensure_ascii=False, indent=1)
+        return path
+
+
+def load_template_data(data_dir="data"):
+    """
+    Collect the template sources: every list in data/*.json, by its key
+
+    Returns:
+        dict: source name (e.g. 'students', 'classes', 'invoices') -> list of records
+    """
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        if os.path.basename(path) in EXCLUDED_DATA_FILES:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            content = json.load(f)
+        if isinstance(content, dict):
+            sources.update({key: value for key, value in content.items() if isinstance(value, list) and value})
+    return sources
+
+
+def _field(record, field):
+    for part in field.split("."):
+        record = record[part]
+    return record
+
+
+def templatize(value, data, fields=TEMPLATE_FIELDS):
+    """
+    Replace search terms equal to a data value (student name, class name...) by its placeholder
+
+    Only the values of identifying fields are looked up, and only where the
+    user typed them: the value of a domain leaf and the name_search term.
+    Other strings equal to a data value ("inscrit", a level label, an invoice
+    state) are left as recorded.
+    """
+    index = {}
+    for source, records in data.items():
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            for field in fields:
+                if isinstance(record.get(field), str) and record[field]:
+                    index.setdefault(record[field], f"{{{{{source}.{field}}}}}")
+
+    def term(item):
+        return index.get(item, item) if isinstance(item, str) else item
+
+    def replace(node):
+        if isinstance(node, dict):
+            node = {key: replace(item) for key, item in node.items()}
+            if node.get("method") == "name_search":
+                if isinstance(node.get("kwargs"), dict) and "name" in node["kwargs"]:
+                    node["kwargs"] = dict(node["kwargs"], name=term(node["kwargs"]["name"]))
+                elif node.get("args"):
+                    node["args"] = [term(node["args"][0])] + node["args"][1:]
+            return node
+        if isinstance(node, list):
+            if len(node) == 3 and isinstance(node[0], str) and node[1] in DOMAIN_OPERATORS:
+                value = [term(item) for item in node[2]] if isinstance(node[2], list) else term(node[2])
+                return [node[0], node[1], value]
+            return [replace(item) for item in node]
+        return node
+
+    return replace(value)
+
+
+class RowPicker:
+    """Draw one record per data source and keep it for the rest of the iteration"""
+
+    def __init__(self, data, rng):
+        self.data = data
+        self.rng = rng
+        self.rows = {}
+
+    def value(self, source, field):
+        if source not in self.rows:
+            self.rows[source] = self.rng.choice(self.data[source])
+        return _field(self.rows[source], field)
+
+
+def render(value, picker):
+    """Fill the {{source.field}} placeholders of a params structure"""
+    if isinstance(value, dict):
+        return {key: render(item, picker) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render(item, picker) for item in value]
+    if isinstance(value, str) and "{{" in value:
+        whole = PLACEHOLDER.fullmatch(value)
+        if whole:
+            return picker.value(*whole.groups())
+        return PLACEHOLDER.sub(lambda match: str(picker.value(*match.groups())), value)
+    return value
+
+
+def call_label(call):
+    """Name used in reports: model.method for call_kw, the route otherwise"""
+    params = call.get("params") or {}
+    if "/call_kw" in call["route"] and params.get("model"):
+        return f"{params['model']}.{params.get('method')}"
+    return call["route"]
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram: constant memory whatever the number of calls
+
+    Bucket bounds grow by 10%, so percentiles are exact to within 10%.
+    """
+
+    GROWTH = 1.1
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, duration_ms, ok=True):
+        index = max(0, math.ceil(math.log(max(duration_ms, 1.0), self.GROWTH)))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.errors += not ok
+        self.total += duration_ms
+        self.min = duration_ms if self.min is None else min(self.min, duration_ms)
+        self.max = duration_ms if self.max is None else max(self.max, duration_ms)
+
+    def merge(self, other):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+        return self
+
+    def percentile(self, pct):
+        """Upper bound (ms) of the bucket holding the pct-th percentile"""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= target:
+                return round(min(self.GROWTH ** index, self.max), 1)
+        return self.max
+
+    def summary(self, elapsed=None):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.count, 4) if self.count else 0.0,
+            "throughput": round(self.count / elapsed, 2) if elapsed else None,
+            "mean": round(self.total / self.count, 1) if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": round(self.max, 1) if self.max is not None else None,
+            "buckets": {str(round(self.GROWTH ** index, 1)): count for index, count in sorted(self.buckets.items())},
+        }
+
+
+class HttpTransport:
+    """JSON-RPC POSTs over one keep-alive connection per thread"""
+
+    def __init__(self, base_url, timeout=60):
+        parsed = urlparse(base_url)
+        self.https = parsed.scheme == "https"
+        self.host = parsed.netloc
+        self.prefix = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            connection = self._local.connection = connection_class(self.host, timeout=self.timeout)
+        return connection
+
+    def _reset(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+        self._local.connection = None
+
+    def post(self, route, params, session_id):
+        """
+        Send one call
+
+        Returns:
+            tuple: (ok, error message or None)
+        """
+        body = json.dumps({"jsonrpc": "2.0", "method": "call", "params": params, "id": next(self._ids)})
+        headers = {"Content-Type": "application/json", "Cookie": f"session_id={session_id}"}
+        for attempt in range(2):
+            try:
+                connection = self._connection()
+                connection.request("POST", f"{self.prefix}{route}", body=body, headers=headers)
+                response = connection.getresponse()
+                payload = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError, OSError) as e:
+                # A kept-alive connection closed by the server: reconnect once
+                self._reset()
+                if attempt:
+                    return False, f"{type(e).__name__}: {e}"
+        if response.status != 200:
+            return False, f"HTTP {response.status}"
+        try:
+            error = json.loads(payload).get("error")
+        except ValueError:
+            return False, "invalid JSON response"
+        if error:
+            data = error.get("data") or {}
+            return False, f"{data.get('name', 'RPC error')}: {data.get('message') or error.get('message')}"
+        return True, None
+
+
+def authenticate_sessions(base_url, accounts, size, db=None):
+    """
+    Open `size` server sessions, cycling through the accounts
+
+    Returns:
+        list: session_id values
+    """
+    sessions = []
+    for account in itertools.islice(itertools.cycle(accounts), size):
+        client = OdooClient(base_url, db=db)
+        client.authenticate(account["username"], account["password"])
+        sessions.append(client.session_id)
+    return sessions
+
+
+class RpcLoadGenerator:
+    """Replay a recorded journey with many virtual users and measure every call"""
+
+    def __init__(self, journey, transport, sessions, data=None, users=100, duration=60, ramp_up=10,
+                 think_scale=1.0, threads=64, seed=0):
+        """
+        Args:
+            journey: Recorded journey dict ({"calls": [...]})
+            transport: HttpTransport to the server under test
+            sessions: Authenticated session ids shared round-robin by the users
+            data: Template sources (load_template_data())
+            users: Concurrent virtual users
+            duration: Seconds during which users start new iterations
+            ramp_up: Seconds over which users are started
+            think_scale: Multiplier of the recorded pauses (0 replays back to back)
+            threads: Maximum number of calls in flight
+            seed: Seed of the template row draws
+        """
+        self.journey = journey
+        self.transport = transport
+        self.sessions = sessions
+        self.data = data or {}
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.think_scale = think_scale
+        self.threads = threads
+        self.seed = seed
+        self.histograms = {}
+        self.iterations = LatencyHistogram()
+        self.errors = {}
+        self.elapsed = 0
+
+    def _record(self, label, duration_ms, ok, error):
+        self.histograms.setdefault(label, LatencyHistogram()).record(duration_ms, ok)
+        if not ok:
+            key = f"{label}: {error}"
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    async def _user(self, user_id, executor, deadline):
+        loop = asyncio.get_running_loop()
+        rng = random.Random(f"{self.seed}-{user_id}")
+        session_id = self.sessions[user_id % len(self.sessions)]
+        await asyncio.sleep(self.ramp_up * user_id / self.users)
+        while time.time() < deadline:
+            picker = RowPicker(self.data, rng)
+            iteration_start = time.perf_counter()
+            iteration_ok = True
+            for call in self.journey["calls"]:
+                await asyncio.sleep(call.get("think", 0) * self.think_scale)
+                try:
+                    params = render(call["params"], picker)
+                except (KeyError, IndexError) as e:
+                    self._record(call_label(call), 0, False, f"template: {e}")
+                    iteration_ok = False
+                    break
+                start = time.perf_counter()
+                ok, error = await loop.run_in_executor(executor, self.transport.post, call["route"], params, session_id)
+                self._record(call_label(call), (time.perf_counter() - start) * 1000, ok, error)
+                iteration_ok = iteration_ok and ok
+            self.iterations.record((time.perf_counter() - iteration_start) * 1000, iteration_ok)
+
+    async def _run(self):
+        deadline = time.time() + self.duration
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="rpc") as executor:
+            await asyncio.gather(*(self._user(user_id, executor, deadline) for user_id in range(self.users)))
+
+    def run(self):
+        """Run the load and return the report"""
+        start = time.time()
+        asyncio.run(self._run())
+        self.elapsed = time.time() - start
+        return self.report()
+
+    def report(self):
+        return {
+            "journey": self.journey.get("name"),
+            "users": self.users,
+            "elapsed": round(self.elapsed, 1),
+            "iterations": self.iterations.summary(self.elapsed),
+            "calls": {label: histogram.summary(self.elapsed) for label, histogram in sorted(self.histograms.items())},
+            "top_errors": sorted(self.errors.items(), key=lambda item: -item[1])[:10],
+        }
+
+    def format_table(self):
+        lines = [f"{'call':52} {'count':>8} {'err%':>6} {'req/s':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}"]
+        rows = [(label, histogram) for label, histogram in sorted(self.histograms.items())]
+        rows.append(("= journey iteration", self.iterations))
+        for label, histogram in rows:
+            summary = histogram.summary(self.elapsed)
+            lines.append(f"{label[:52]:52} {summary['count']:>8} {summary['error_rate']:>6.1%} "
+                         f"{summary['throughput'] or 0:>8.1f} "
+                         + " ".join(f"{summary[key] or 0:>7.0f}" for key in ("p50", "p95", "p99", "max")))
+        return "\n".join(lines)
+
+
+def record_journey(journey, config, out=None, headless=True):
+    """Log in with a browser, run one journey through the page objects and save its RPC calls"""
+    from playwright.sync_api import sync_playwright
+    from pages.login_page import LoginPage
+    from pages.access.school_card.student_filter_page import StudentFilterPage
+    from pages.access.school_card.student_inscrit_page import StudentInscritPage
+
+    def filter_students(page):
+        filter_page = StudentFilterPage(page)
+        filter_page.navigate_from_login()
+        for selector in (filter_page.NON_INSCRIT_FILTER, filter_page.SANS_FAMILLE_FILTER):
+            filter_page.apply_filter(selector)
+            filter_page.get_record_count()
+            filter_page.remove_filter()
+
+    def enrolled_roster(page):
+        inscrit_page = StudentInscritPage(page)
+        inscrit_page.navigate_from_login()
+        inscrit_page.navigate_to_next_page()
+
+    journeys = {"filter_students": filter_students, "enrolled_roster": enrolled_roster}
+    out = out or os.path.join(JOURNEY_DIR, f"{journey}.json")
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=headless)
+        page = browser.new_context(ignore_https_errors=True).new_page()
+        login_page = LoginPage(page, config["base_url"])
+        login_page.navigate()
+        if not login_page.login(config["username"], config["password"]):
+            raise SystemExit(f"Login failed: {login_page.get_error_message()}")
+        recorder = RpcRecorder(page).start()
+        journeys[journey](page)
+        recorder.stop()
+        browser.close()
+    path = recorder.save(out, journey, load_template_data())
+    print(f"Recorded {len(recorder.calls)} calls to {path}")
+    return path
+
+
+def main():
+    from utils.account_pool import AccountPool
+
+    parser = argparse.ArgumentParser(description="Record and replay JSON-RPC journeys")
+    parser.add_argument("--config", default="data/config.json")
+    parser.add_argument("--base-url", help="Server (defaults to BASE_URL / data/config.json)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record a journey in a browser")
+    record.add_argument("--journey", default="filter_students", choices=["filter_students", "enrolled_roster"])
+    record.add_argument("--out", help="Journey file (default: data/rpc_journeys/<journey>.json)")
+    record.add_argument("--headed", action="store_true")
+
+    replay = commands.add_parser("replay", help="Replay a journey without browser")
+    replay.add_argument("journey_file")
+    replay.add_argument("--users", type=int, default=100)
+    replay.add_argument("--duration", type=float, default=60)
+    replay.add_argument("--ramp-up", type=float, default=10)
+    replay.add_argument("--think-scale", type=float, default=1.0, help="Multiplier of the recorded pauses")
+    replay.add_argument("--threads", type=int, default=64, help="Maximum calls in flight")
+    replay.add_argument("--sessions", type=int, default=10, help="Authenticated sessions shared by the users")
+    replay.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = load_config(args.config, base_url=args.base_url)
+    if args.command == "record":
+        record_journey(args.journey, config, args.out, headless=not args.headed)
+        return
+
+    with open(args.journey_file, "r", encoding="utf-8") as f:
+        journey = json.load(f)
+    accounts = AccountPool.load_users() or [{"username": config["username"], "password": config["password"]}]
+    sessions = authenticate_sessions(config["base_url"], accounts, args.sessions, db=config.get("db"))
+    generator = RpcLoadGenerator(journey, HttpTransport(config["base_url"]), sessions, load_template_data(),
+                                 users=args.users, duration=args.duration, ramp_up=args.ramp_up,
+                                 think_scale=args.think_scale, threads=args.threads, seed=args.seed)
+    print(f"Replaying {journey['name']} ({len(journey['calls'])} calls) with {args.users} users "
+          f"against {config['base_url']}")
+    report = generator.run()
+    print(generator.format_table())
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"rpc_{journey['name']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# utils/screenshot_manager.py
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.visual_regression import available, hash_distance, phash_file
+
+# pHash bits under which two screenshots are considered the same picture
+DUPLICATE_DISTANCE = 2
+
+
+def _iter_attachment_lists(node):
+    """Yield every "attachments" list of an Allure result/container, steps included"""
+    if isinstance(node, dict):
+        if isinstance(node.get("attachments"), list):
+            yield node["attachments"]
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                yield from _iter_attachment_lists(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _iter_attachment_lists(item)
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _identical_files(paths):
+    """Map each file to the first file with exactly the same bytes"""
+    canonical = {}
+    first_by_digest = {}
+    for path in paths:
+        name = os.path.basename(path)
+        canonical[name] = first_by_digest.setdefault(_file_digest(path), name)
+    return canonical
+
+
+def dedupe_allure_results(results_dir, max_distance=DUPLICATE_DISTANCE, workers=None):
+    """
+    Drop near-duplicate PNG attachments from an Allure results directory
+
+    Within one test result only the first of several near-identical screenshots
+    is kept. Across results, only byte-identical screenshots point to a single
+    shared file: a similar picture of another test may show a different record.
+    Files whose last reference was dropped are deleted; files no result refers
+    to are left alone.
+
+    Args:
+        results_dir: Directory written by allure-pytest (--alluredir)
+        max_distance: pHash bits under which two screenshots are duplicates
+        workers: Processes used to hash the screenshots
+
+    Returns:
+        dict: Counts of screenshots, dropped attachments and removed files
+    """
+    stats = {"screenshots": 0, "dropped_attachments": 0, "removed_files": 0}
+    if not available():
+        print("Screenshot dedupe skipped: numpy and Pillow are not installed")
+        return stats
+
+    paths = sorted(glob.glob(os.path.join(results_dir, "*-attachment.png")))
+    stats["screenshots"] = len(paths)
+    if len(paths) < 2:
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers or max(1, (os.cpu_count() or 2) - 1),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        hashes = dict(zip((os.path.basename(path) for path in paths),
+                          pool.map(phash_file, paths, chunksize=16)))
+    identical = _identical_files(paths)
+
+    referenced = set()
+    unreferenced = set()
+    for json_path in glob.glob(os.path.join(results_dir, "*-result.json")) + \
+            glob.glob(os.path.join(results_dir, "*-container.json")):
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        changed = False
+        seen = []
+        for attachments in _iter_attachment_lists(data):
+            kept = []
+            for attachment in attachments:
+                name = attachment.get("source")
+                if name not in hashes:
+                    kept.append(attachment)
+                    continue
+                if any(hash_distance(hashes[name], hashes[other]) <= max_distance for other in seen):
+                    stats["dropped_attachments"] += 1
+                    unreferenced.add(name)
+                    changed = True
+                    continue
+                seen.append(name)
+                source = identical[name]
+                if source != name:
+                    attachment["source"] = source
+                    unreferenced.add(name)
+                    changed = True
+                referenced.add(source)
+                kept.append(attachment)
+            attachments[:] = kept
+        if changed:
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+
+    for name in sorted(unreferenced - referenced):
+        os.remove(os.path.join(results_dir, name))
+        stats["removed_files"] += 1
+    return stats
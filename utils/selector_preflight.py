@@ -0,0 +1,365 @@
+# utils/selector_preflight.py
+"""
+Preflight selector validation: catch renamed Odoo classes before the suite runs.
+
+At session start one browser page visits each view the page objects target
+(login form, apps menu, student kanban and list, filter dropdown...) and
+resolves every selector constant declared in the page classes with a single
+evaluate per view. A selector a view is expected to render that matches
+nothing is "missing"; one that matches several elements where the page object
+clicks or reads a single one is "ambiguous" (reported only, Playwright uses the
+first match).
+
+Tests importing a page module with a missing selector (utils.import_graph) are
+skipped or failed up front, with the selector named, instead of each waiting out
+its timeouts. Selectors no preflight view expects (dialogs, notifications,
+form views) are resolved too but only reported: their state cannot be reached
+without test data.
+
+    python -m utils.selector_preflight     # print the report
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import re
+
+from utils.import_graph import ImportGraph
+
+REPORT_PATH = "reports/selector_preflight.json"
+STUDENT_VIEW = "/web#action=405&menu_id=108"
+
+CONSTANT_NAME = re.compile(r"^[A-Z][A-Z0-9_]+$")
+# Optional tag name followed by a class, id or attribute: ".o_loading", "input[name='login']"
+CSS_SELECTOR = re.compile(r"^[a-z]*[.#\[]")
+
+# Views visited in order. "click" lists the constants clicked after loading
+# the URL (first value that resolves), "expect" the constants the resulting
+# state must render.
+PREFLIGHT_VIEWS = [
+    {"name": "login", "url": "/web/login", "logged_in": False,
+     "expect": ["USERNAME_INPUT", "PASSWORD_INPUT", "LOGIN_BUTTON", "LANGUAGE_DROPDOWN"]},
+    {"name": "home", "url": "/web",
+     "expect": ["MAIN_NAVBAR", "ACTION_MANAGER", "APP_CONTENT", "WORKSPACE_BUTTON"]},
+    {"name": "apps_menu", "url": "/web", "click": ["WORKSPACE_BUTTON"],
+     "expect": ["ACCESS_MODULE"]},
+    {"name": "access_menu", "url": "/web", "click": ["WORKSPACE_BUTTON", "ACCESS_MODULE"],
+     "expect": ["CARTE_SCOLAIRE_MENU"]},
+    {"name": "carte_scolaire_menu", "url": "/web",
+     "click": ["WORKSPACE_BUTTON", "ACCESS_MODULE", "CARTE_SCOLAIRE_MENU"],
+     "expect": ["APPRENANT_SUBMENU"]},
+    {"name": "students_kanban", "url": STUDENT_VIEW,
+     "expect": ["KANBAN_VIEW", "STUDENT_CARDS", "STUDENT_CARD_CLICKABLE", "STUDENT_NAME", "SEARCH_INPUT",
+                "FILTER_DROPDOWN_BUTTON", "SIDEBAR_CONTAINER", "SIDEBAR_ITEM_BASE", "ITEM_TITLE",
+                "PAGINATION_INFO", "PAGER_VALUE", "PAGER_TOTAL", "PAGER_NEXT", "LIST_VIEW_BUTTON"]},
+    {"name": "filter_dropdown", "url": STUDENT_VIEW, "click": ["FILTER_DROPDOWN_BUTTON"],
+     "expect": ["NON_INSCRIT_FILTER", "NON_REINSCRIT_FILTER", "RADIEE_FILTER", "ANNULEE_FILTER",
+                "NON_INSCRIT_ARCHIVE_FILTER", "SANS_FAMILLE_FILTER", "MANQUE_DOCUMENT_FILTER"]},
+    {"name": "students_list", "url": f"{STUDENT_VIEW}&view_type=list",
+     "expect": ["STUDENT_LIST_VIEW", "SELECT_ALL_CHECKBOX", "KANBAN_VIEW_BUTTON"]},
+]
+
+# Counts every selector of the batch: XPath through document.evaluate, CSS through querySelectorAll
+COUNT_SCRIPT = """
+(selectors) => selectors.map(([kind, selector]) => {
+    try {
+        if (kind === 'xpath') {
+            return document.evaluate(selector, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+        }
+        return document.querySelectorAll(selector).length;
+    } catch (e) {
+        return -1;
+    }
+})
+"""
+
+# True once every expected selector matches (the web client renders asynchronously)
+READY_SCRIPT = f"(selectors) => ({COUNT_SCRIPT.strip()})(selectors).every((count) => count > 0)"
+
+
+def selector_kind(value):
+    """'xpath', 'css' or None for constants that are not selectors (paths, scripts, templates)"""
+    if not isinstance(value, str) or "{" in value or "\n" in value:
+        return None
+    if value.startswith(("//", "(/", "xpath=")):
+        return "xpath"
+    if CSS_SELECTOR.match(value):
+        return "css"
+    return None
+
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def collect_selectors(paths=None):
+    """
+    Selector constants declared in the page classes
+
+    Read with ast, so page modules with unavailable imports (allure) are covered.
+    Lists of selectors (fallbacks) give one entry per item, named NAME[index].
+
+    Args:
+        paths: Page modules (defaults to pages/**/*.py)
+
+    Returns:
+        list: dicts with name, value, kind and paths (modules declaring it), one per distinct (name, value)
+    """
+    if paths is None:
+        paths = sorted(glob.glob("pages/**/*.py", recursive=True))
+    selectors = {}
+    for path in paths:
+        path = path.replace(os.sep, "/")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read(), path)
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            continue
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ClassDef):
+                continue
+            for statement in node.body:
+                if not isinstance(statement, ast.Assign):
+                    continue
+                value = _literal(statement.value)
+                for target in statement.targets:
+                    if not (isinstance(target, ast.Name) and CONSTANT_NAME.match(target.id)):
+                        continue
+                    items = ([(f"{target.id}[{index}]", item) for index, item in enumerate(value)]
+                             if isinstance(value, list) else [(target.id, value)])
+                    for name, item in items:
+                        kind = selector_kind(item)
+                        if kind:
+                            entry = selectors.setdefault((name, item), {"name": name, "value": item,
+                                                                        "kind": kind, "paths": set()})
+                            entry["paths"].add(path)
+    return list(selectors.values())
+
+
+def is_collection(name):
+    """Constants naming several elements (STUDENT_CARDS, ERROR_SELECTORS...) may match many"""
+    return name.split("[")[0].endswith("S")
+
+
+def is_indexed(value):
+    """XPath picking one match itself: (//button)[2]"""
+    return bool(re.search(r"\)\[\d+\]$", value))
+
+
+class SelectorPreflight:
+    """
+    Resolve the selectors of the page objects against the live views
+
+        preflight = SelectorPreflight(base_url)
+        result = preflight.run(page, login=lambda page: LoginPage(page, base_url).login(user, password))
+        print(format_report(result))
+        result["affected_tests"]   # test files to skip
+    """
+
+    def __init__(self, base_url, views=None, selectors=None, timeout=10000):
+        """
+        Args:
+            base_url: Server URL
+            views: View definitions (PREFLIGHT_VIEWS by default)
+            selectors: collect_selectors() output (collected from pages/ by default)
+            timeout: Milliseconds to wait for a view to render its expected selectors
+        """
+        self.base_url = base_url.rstrip("/")
+        self.views = views or PREFLIGHT_VIEWS
+        self.selectors = selectors if selectors is not None else collect_selectors()
+        self.timeout = timeout
+        self._batch = [[entry["kind"], entry["value"][len("xpath="):] if entry["value"].startswith("xpath=")
+                        else entry["value"]] for entry in self.selectors]
+
+    def values_of(self, name):
+        return [index for index, entry in enumerate(self.selectors) if entry["name"] == name]
+
+    def count_all(self, page):
+        """Match counts of every selector in the current DOM, in one evaluate"""
+        return page.evaluate(COUNT_SCRIPT, self._batch)
+
+    def _click(self, page, name):
+        counts = self.count_all(page)
+        for index in self.values_of(name):
+            if counts[index] > 0:
+                page.locator(self.selectors[index]["value"]).first.click(timeout=self.timeout)
+                try:
+                    page.wait_for_load_state("networkidle", timeout=self.timeout)
+                except Exception:
+                    pass
+                return
+        raise RuntimeError(f"{name} matches nothing")
+
+    def _wait_for(self, page, indexes):
+        """Wait for the expected selectors to render; the final counts tell what is missing"""
+        try:
+            page.wait_for_function(READY_SCRIPT, arg=[self._batch[index] for index in indexes],
+                                   timeout=self.timeout)
+        except Exception:
+            pass
+
+    def visit(self, page, view):
+        """
+        Load one view and count every selector
+
+        Returns:
+            dict: name, error (the view could not be reached) and counts (None on error)
+        """
+        try:
+            page.goto(f"{self.base_url}{view['url']}")
+            for name in view.get("click", ()):
+                # Each click opens the menu level the next one is in
+                self._wait_for(page, self.values_of(name))
+                self._click(page, name)
+            self._wait_for(page, [index for name in view["expect"] for index in self.values_of(name)])
+            return {"name": view["name"], "error": None, "counts": self.count_all(page)}
+        except Exception as e:
+            return {"name": view["name"], "error": f"{type(e).__name__}: {(str(e).splitlines() or [''])[0]}",
+                    "counts": None}
+
+    def run(self, page, login=None):
+        """
+        Visit every view, logging in with `login(page)` before the first logged-in one
+
+        When the login fails the logged-in views are not visited: the login page
+        they would show does not tell whether their selectors exist.
+
+        Returns:
+            dict: views (visit results), errors (login and views that could not be checked),
+            selectors (each with counts per view and status) and affected_tests (test files
+            depending on a module with a missing selector)
+        """
+        visits = []
+        login_error = None
+        logged_in = False
+        for view in self.views:
+            if view.get("logged_in", True) and not logged_in:
+                logged_in = True
+                if login is not None:
+                    try:
+                        login(page)
+                    except Exception as e:
+                        login_error = f"{type(e).__name__}: {(str(e).splitlines() or [''])[0]}"
+                        print(f"Preflight login failed: {login_error}")
+            if login_error and view.get("logged_in", True):
+                visits.append({"name": view["name"], "error": f"not logged in ({login_error})", "counts": None})
+                continue
+            visits.append(self.visit(page, view))
+        return analyze(self.selectors, self.views, visits, login_error=login_error)
+
+
+def analyze(selectors, views, visits, graph=None, login_error=None):
+    """
+    Statuses of the selectors from the counts of each view
+
+    Statuses: ok, missing (expected by a view, matches nothing), unreachable
+    (its view could not be loaded), invalid (the browser rejected the
+    selector), ambiguous (expected to match one element, matches several) and
+    unchecked (no view expects it)
+
+    Only missing and invalid selectors affect tests: an unreachable view says
+    nothing about its selectors and is reported in errors instead.
+    """
+    expected = {name: view["name"] for view in views for name in view["expect"]}
+    results = []
+    for index, entry in enumerate(selectors):
+        counts = {visit["name"]: visit["counts"][index] for visit in visits if visit["counts"] is not None}
+        view = expected.get(entry["name"].split("[")[0])
+        count = counts.get(view)
+        if any(value < 0 for value in counts.values()):
+            status = "invalid"
+        elif view is None:
+            status = "unchecked"
+        elif count is None:
+            status = "unreachable"
+        elif count == 0:
+            status = "missing"
+        elif count > 1 and not is_collection(entry["name"]) and not is_indexed(entry["value"]):
+            status = "ambiguous"
+        else:
+            status = "ok"
+        results.append({"name": entry["name"], "value": entry["value"], "paths": sorted(entry["paths"]),
+                        "view": view, "count": count, "seen_in": sorted(name for name, value in counts.items()
+                                                                        if value > 0),
+                        "status": status})
+
+    broken = [result for result in results if result["status"] in ("missing", "invalid")]
+    broken_paths = sorted({path for result in broken for path in result["paths"]})
+    affected = {}
+    if broken_paths:
+        graph = graph or ImportGraph()
+        for result in broken:
+            for test in graph.affected_tests(result["paths"]):
+                affected.setdefault(test, []).append(result["name"])
+    # Views not visited because of the login are covered by the login error
+    errors = ([f"login: {login_error}"] if login_error else []) + \
+        [f"view {visit['name']}: {visit['error']}" for visit in visits
+         if visit["error"] and not visit["error"].startswith("not logged in")]
+    return {
+        "ok": not broken and not errors,
+        "errors": errors,
+        "views": [{"name": visit["name"], "error": visit["error"]} for visit in visits],
+        "selectors": results,
+        "affected_tests": {test: sorted(set(names)) for test, names in sorted(affected.items())},
+    }
+
+
+def format_report(result):
+    counts = {}
+    for selector in result["selectors"]:
+        counts[selector["status"]] = counts.get(selector["status"], 0) + 1
+    status = "OK" if result["ok"] else "BROKEN SELECTORS" if not result["errors"] else "VIEWS NOT CHECKED"
+    lines = [f"Selector preflight: {status} "
+             f"({', '.join(f'{count} {status}' for status, count in sorted(counts.items()))})"]
+    for error in result["errors"]:
+        lines.append(f"  error {error}")
+    for selector in result["selectors"]:
+        if selector["status"] in ("missing", "unreachable", "invalid", "ambiguous"):
+            lines.append(f"  {selector['status']:11} {selector['name']} = {selector['value']} "
+                         f"({selector['view'] or '-'}, {selector['count']} matches) in {', '.join(selector['paths'])}")
+    if result["affected_tests"]:
+        lines.append(f"  {len(result['affected_tests'])} test files depend on broken selectors")
+    return "\n".join(lines)
+
+
+def save_report(result, path=REPORT_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def main():
+    from playwright.sync_api import sync_playwright
+    from pages.login_page import LoginPage
+    from utils.config_manager import load_config
+
+    parser = argparse.ArgumentParser(description="Resolve the page object selectors against the live views")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    args = parser.parse_args()
+
+    config = load_config()
+    base_url = config.get("base_url", "https://dev.nawat.ma")
+
+    def login(page):
+        login_page = LoginPage(page, base_url)
+        login_page.navigate()
+        if not login_page.login(config["username"], config["password"]):
+            raise RuntimeError(login_page.get_error_message() or "login failed")
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=not args.headed)
+        page = browser.new_page()
+        result = SelectorPreflight(base_url).run(page, login=login)
+        browser.close()
+    print(format_report(result))
+    print(f"Report: {save_report(result)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+# utils/selector_registry.py
+"""
+Selector registry: ranked candidates per logical element, learned per server version.
+
+A page object asks for a logical element ("sidebar_item") with its ranked
+candidate selectors. The first lookup on a server version counts every
+candidate in one evaluate and remembers the one that matched; later lookups,
+in this run and the next ones, query that candidate directly. The search
+through the fallbacks only happens again when the remembered candidate stops
+matching (new Odoo release, changed module), instead of on every call. A
+remembered fallback is counted against the candidates ranked above it once per
+session, so the preferred selector takes over again as soon as it matches.
+
+Winners are stored in .cache/selector_registry.json, keyed by server version
+(odoo.info.server_version), so a run against another server relearns instead of
+trusting candidates of another DOM.
+
+profile() times selectors in the browser on the current DOM and checks the
+faster CSS equivalents suggest_css() derives from the slow contains(@class,...)
+XPaths match the same elements:
+
+    python -m utils.selector_registry profile      # cost of every page object selector on the student kanban
+"""
+import argparse
+import json
+import os
+import re
+import weakref
+from urllib.parse import urlparse
+
+from utils.file_lock import FileLock
+
+REGISTRY_PATH = ".cache/selector_registry.json"
+COST_REPORT = "reports/selector_costs.json"
+
+SERVER_VERSION_SCRIPT = """
+() => {
+    const odoo = window.odoo || {};
+    const info = odoo.info || odoo.__session_info__ || {};
+    return info.server_version || null;
+}
+"""
+
+# Match counts of several selectors in one round trip, -1 for a selector the browser rejects
+COUNT_SCRIPT = """
+(selectors) => selectors.map((selector) => {
+    try {
+        if (selector.startsWith('/') || selector.startsWith('(')) {
+            return document.evaluate(selector, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+        }
+        return document.querySelectorAll(selector).length;
+    } catch (e) {
+        return -1;
+    }
+})
+"""
+
+# Milliseconds per evaluation of each selector, and whether each alternative finds the same nodes
+PROFILE_SCRIPT = """
+([pairs, runs]) => {
+    const find = (selector) => {
+        if (selector.startsWith('/') || selector.startsWith('(')) {
+            const result = document.evaluate(selector, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const nodes = [];
+            for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+            return nodes;
+        }
+        return Array.from(document.querySelectorAll(selector));
+    };
+    const time = (selector) => {
+        const start = performance.now();
+        for (let i = 0; i < runs; i++) find(selector);
+        return (performance.now() - start) / runs;
+    };
+    return pairs.map(([selector, alternative]) => {
+        try {
+            const nodes = find(selector);
+            const entry = {selector, count: nodes.length, ms: time(selector)};
+            if (alternative) {
+                const other = find(alternative);
+                entry.alternative = {
+                    selector: alternative, ms: time(alternative),
+                    equivalent: other.length === nodes.length && other.every((node) => nodes.includes(node)),
+                };
+            }
+            return entry;
+        } catch (e) {
+            return {selector, count: -1, ms: null, error: String(e)};
+        }
+    });
+}
+"""
+
+XPATH_STEP = re.compile(r"^([a-z][a-z0-9]*|\*)((?:\[[^\[\]]+\])*)$")
+PREDICATE = re.compile(r"\[([^\[\]]+)\]")
+CONTAINS_CLASS = re.compile(r"^contains\(@class,\s*'([^']+)'\)$")
+ATTRIBUTE_EQUALS = re.compile(r"^@([a-zA-Z_:-][\w:.-]*)\s*=\s*'([^']*)'$")
+
+
+def suggest_css(xpath):
+    """
+    CSS equivalent of a simple XPath, None when it has no direct one
+
+    Handles chains of element steps (// descendant, / child) whose predicates
+    are contains(@class,'...') or @attribute='...'. contains(@class,'a b') becomes
+    .a.b: profile() checks the suggestion finds the same elements before it is
+    worth switching.
+    """
+    if not xpath.startswith("//"):
+        return None
+    parts = re.split(r"(//|/)", xpath)[1:]
+    css = []
+    for separator, step in zip(parts[::2], parts[1::2]):
+        match = XPATH_STEP.match(step)
+        if not match:
+            return None
+        tag, predicates = match.groups()
+        selector = "" if tag == "*" else tag
+        for predicate in PREDICATE.findall(predicates):
+            contains = CONTAINS_CLASS.match(predicate)
+            equals = ATTRIBUTE_EQUALS.match(predicate)
+            if contains:
+                selector += "".join(f".{name}" for name in contains.group(1).split())
+            elif equals:
+                selector += f"[{equals.group(1)}='{equals.group(2)}']"
+            else:
+                return None
+        if css:
+            css.append(" > " if separator == "/" else " ")
+        elif separator == "/":
+            return None
+        css.append(selector or "*")
+    return "".join(css)
+
+
+class SelectorRegistry:
+    """
+    Remember which candidate of each logical element matches on each server version
+
+        registry = SelectorRegistry()
+        selector, elements = registry.query_all(page, "sidebar_item", candidates)
+    """
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+        self.lock = FileLock(f"{path}.lock")
+        self._winners = None
+        self._versions = weakref.WeakKeyDictionary()
+        self._rechecked = set()
+
+    @property
+    def winners(self):
+        """{server version: {element: selector}}"""
+        if self._winners is None:
+            self._winners = self._read()
+        return self._winners
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def ranked(self, version, name, candidates):
+        """Candidates with the one that matched last time on this version first"""
+        winner = self.winners.get(version, {}).get(name)
+        if winner in candidates:
+            return [winner] + [candidate for candidate in candidates if candidate != winner]
+        return list(candidates)
+
+    def remember(self, version, name, selector):
+        if self.winners.get(version, {}).get(name) == selector:
+            return
+        self.winners.setdefault(version, {})[name] = selector
+        # Other workers may have learned other elements meanwhile
+        with self.lock:
+            stored = self._read()
+            stored.setdefault(version, {})[name] = selector
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(stored, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        self._winners = stored
+
+    def search_order(self, version, name, candidates):
+        """
+        Selector to query directly (None to count every candidate) and the candidates to count if it finds nothing
+
+        A learned fallback is only trusted once the candidates ranked above it were
+        counted in this session, and a winner is only stored from a count that
+        included every candidate ranked above it.
+        """
+        ranked = self.ranked(version, name, candidates)
+        if ranked[0] != candidates[0] and (version, name) not in self._rechecked:
+            self._rechecked.add((version, name))
+            return None, list(candidates)
+        return ranked[0], ranked[1:]
+
+    @staticmethod
+    def pick(candidates, counts):
+        """First candidate that matches, None if none does"""
+        for candidate, count in zip(candidates, counts):
+            if count > 0:
+                return candidate
+        return None
+
+    def server_version(self, page):
+        if page not in self._versions:
+            try:
+                version = page.evaluate(SERVER_VERSION_SCRIPT)
+            except Exception:
+                version = None
+            self._versions[page] = version or urlparse(page.url).netloc or "unknown"
+        return self._versions[page]
+
+    def query_all(self, page, name, candidates):
+        """
+        Elements of a logical element
+
+        Args:
+            page: Playwright page
+            name: Logical element name, the key the winner is remembered under
+            candidates: Selectors in order of preference
+
+        Returns:
+            tuple: (selector that matched or None, list of element handles)
+        """
+        version = self.server_version(page)
+        first, rest = self.search_order(version, name, candidates)
+        if first is not None:
+            elements = page.query_selector_all(first)
+            if elements:
+                return first, elements
+        selector = self.pick(rest, page.evaluate(COUNT_SCRIPT, rest))
+        if selector is None:
+            return None, []
+        self.remember(version, name, selector)
+        return selector, page.query_selector_all(selector)
+
+    async def query_all_async(self, page, name, candidates):
+        """query_all for a playwright.async_api page"""
+        if page not in self._versions:
+            try:
+                version = await page.evaluate(SERVER_VERSION_SCRIPT)
+            except Exception:
+                version = None
+            self._versions[page] = version or urlparse(page.url).netloc or "unknown"
+        version = self._versions[page]
+        first, rest = self.search_order(version, name, candidates)
+        if first is not None:
+            elements = await page.query_selector_all(first)
+            if elements:
+                return first, elements
+        selector = self.pick(rest, await page.evaluate(COUNT_SCRIPT, rest))
+        if selector is None:
+            return None, []
+        self.remember(version, name, selector)
+        return selector, await page.query_selector_all(selector)
+
+
+# Shared by every page object of the process
+registry = SelectorRegistry()
+
+
+def profile(page, selectors, runs=20):
+    """
+    Evaluation cost of selectors on the current DOM, with the CSS suggestion for each XPath
+
+    Returns:
+        list: dicts with selector, count, ms and alternative (selector, ms, equivalent), slowest first
+    """
+    pairs = [[selector, suggest_css(selector)] for selector in selectors]
+    results = page.evaluate(PROFILE_SCRIPT, [pairs, runs])
+    return sorted(results, key=lambda entry: -(entry["ms"] or 0))
+
+
+def format_profile(results, names=None):
+    names = names or {}
+    lines = [f"{'ms':>8} {'matches':>7}  selector"]
+    for entry in results:
+        if entry["count"] < 0:
+            lines.append(f"{'-':>8} {'error':>7}  {names.get(entry['selector'], entry['selector'])}")
+            continue
+        lines.append(f"{entry['ms']:8.3f} {entry['count']:7}  {names.get(entry['selector'], entry['selector'])}")
+        alternative = entry.get("alternative")
+        if alternative and alternative["equivalent"] and alternative["ms"] < entry["ms"]:
+            lines.append(f"{alternative['ms']:8.3f} {'':7}    -> {alternative['selector']} "
+                         f"({entry['ms'] / max(alternative['ms'], 0.001):.1f}x faster, same elements)")
+    return "\n".join(lines)
+
+
+def main():
+    from playwright.sync_api import sync_playwright
+    from pages.login_page import LoginPage
+    from utils.config_manager import load_config
+    from utils.selector_preflight import STUDENT_VIEW, collect_selectors
+
+    parser = argparse.ArgumentParser(description="Selector registry tools")
+    parser.add_argument("command", choices=["profile", "show"])
+    parser.add_argument("--url", default=STUDENT_VIEW, help="View to profile (the student kanban by default)")
+    parser.add_argument("--runs", type=int, default=20, help="Evaluations per selector")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        print(json.dumps(registry.winners, indent=2, sort_keys=True))
+        return
+
+    config = load_config()
+    base_url = config.get("base_url", "https://dev.nawat.ma").rstrip("/")
+    selectors = {}
+    for entry in collect_selectors():
+        if not entry["value"].startswith("xpath="):
+            selectors.setdefault(entry["value"], entry["name"])
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        page = browser.new_page()
+        login_page = LoginPage(page, base_url)
+        login_page.navigate()
+        login_page.login(config["username"], config["password"])
+        page.goto(f"{base_url}{args.url}")
+        page.wait_for_load_state("networkidle")
+        results = profile(page, list(selectors), runs=args.runs)
+        browser.close()
+
+    print(format_profile(results, {value: f"{name}  {value}" for value, name in selectors.items()}))
+    os.makedirs(os.path.dirname(COST_REPORT), exist_ok=True)
+    with open(COST_REPORT, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Report: {COST_REPORT}")
+
+
+if __name__ == "__main__":
+    main()
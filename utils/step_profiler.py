@@ -0,0 +1,198 @@
+# utils/step_profiler.py
+"""
+JS CPU profiles of the page object steps that go over their budget.
+
+When opening the Apprenant kanban or a search panel click gets slow, the
+duration alone does not tell which JS is responsible. A StepProfiler installed
+on a page starts the CDP Profiler when a named step begins and stops it when
+the step ends:
+
+- within budget: the profile is dropped, nothing is written
+- over budget: the .cpuprofile (opens as a flame chart in the Performance
+  panel of Chrome DevTools, or in speedscope) and a top-N self-time summary
+  are written to reports/profiles and attached to the Allure report
+
+    StepProfiler().install(page)                      # conftest.page
+    with base_page.profiled_step("open_students"):    # page objects
+        ...
+
+The CDP session is opened once per page; a fast step costs the Profiler.start
+and Profiler.stop round trips. Steps inside a profiled step are not profiled
+on their own.
+"""
+import json
+import os
+import re
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+try:
+    import allure
+except ImportError:
+    allure = None
+
+PROFILE_DIR = "reports/profiles"
+# Budgets of the named steps, in milliseconds, on an unthrottled CI agent
+STEP_BUDGETS = {
+    "open_students": 4000,
+    "search_panel_click": 2000,
+    "filter_apply": 2000,
+}
+DEFAULT_BUDGET = 3000
+TOP_FUNCTIONS = 15
+SAMPLING_INTERVAL_US = 500
+
+
+def self_times(profile, top=TOP_FUNCTIONS):
+    """
+    Functions of a .cpuprofile sorted by self time
+
+    Returns:
+        list: {"function", "url", "line", "self_ms", "percent"} of the top functions
+    """
+    nodes = {node["id"]: node for node in profile.get("nodes", [])}
+    by_frame = {}
+    total = 0
+    for node_id, delta in zip(profile.get("samples", []), profile.get("timeDeltas", [])):
+        frame = nodes.get(node_id, {}).get("callFrame", {})
+        key = (frame.get("functionName") or "(anonymous)", frame.get("url", ""), frame.get("lineNumber", -1) + 1)
+        by_frame[key] = by_frame.get(key, 0) + delta
+        total += delta
+    rows = sorted(by_frame.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"function": function, "url": url, "line": line, "self_ms": round(micros / 1000, 1),
+             "percent": round(100 * micros / total, 1) if total else 0.0}
+            for (function, url, line), micros in rows]
+
+
+def format_summary(name, elapsed_ms, budget_ms, rows):
+    lines = [f"Step '{name}' took {elapsed_ms:.0f} ms (budget {budget_ms} ms). Top self time:"]
+    for row in rows:
+        location = f"{row['url'].rsplit('/', 1)[-1]}:{row['line']}" if row["url"] else ""
+        lines.append(f"  {row['self_ms']:>8} ms {row['percent']:>5}%  {row['function']}  {location}")
+    return "\n".join(lines)
+
+
+class StepProfiler:
+    """CPU profiles of the named steps of one page, kept only for slow steps"""
+
+    _pages = weakref.WeakKeyDictionary()
+
+    def __init__(self, budgets=None, factor=1, profile_dir=PROFILE_DIR, top=TOP_FUNCTIONS):
+        """
+        Args:
+            budgets: Step name -> budget in ms (STEP_BUDGETS by default)
+            factor: Multiplier of every budget (throttled runs are slower)
+        """
+        self.budgets = {**STEP_BUDGETS, **(budgets or {})}
+        self.factor = factor
+        self.profile_dir = profile_dir
+        self.top = top
+        self.session = None
+        self.running = None
+        self.saved = []
+
+    @classmethod
+    def of(cls, page):
+        """Profiler installed on a page, or None"""
+        return cls._pages.get(page)
+
+    def install(self, page):
+        if self.of(page):
+            return self.of(page)
+        self._pages[page] = self
+        return self
+
+    def budget(self, name, budget_ms=None):
+        return (budget_ms or self.budgets.get(name, DEFAULT_BUDGET)) * self.factor
+
+    def _session(self, page):
+        if self.session is None:
+            self.session = page.context.new_cdp_session(page)
+            self.session.send("Profiler.enable")
+            self.session.send("Profiler.setSamplingInterval", {"interval": SAMPLING_INTERVAL_US})
+        return self.session
+
+    async def _session_async(self, page):
+        if self.session is None:
+            self.session = await page.context.new_cdp_session(page)
+            await self.session.send("Profiler.enable")
+            await self.session.send("Profiler.setSamplingInterval", {"interval": SAMPLING_INTERVAL_US})
+        return self.session
+
+    @contextmanager
+    def step(self, page, name, budget_ms=None):
+        """Profile the block; keep the profile if it runs longer than the step's budget"""
+        if self.running:
+            yield
+            return
+        try:
+            session = self._session(page)
+            session.send("Profiler.start")
+        except Exception as e:
+            print(f"CPU profiling of '{name}' unavailable: {e}")
+            yield
+            return
+        self.running = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.running = None
+            try:
+                profile = session.send("Profiler.stop")["profile"]
+            except Exception:
+                profile = None
+            self.finish(name, elapsed_ms, self.budget(name, budget_ms), profile)
+
+    @asynccontextmanager
+    async def step_async(self, page, name, budget_ms=None):
+        if self.running:
+            yield
+            return
+        try:
+            session = await self._session_async(page)
+            await session.send("Profiler.start")
+        except Exception as e:
+            print(f"CPU profiling of '{name}' unavailable: {e}")
+            yield
+            return
+        self.running = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.running = None
+            try:
+                profile = (await session.send("Profiler.stop"))["profile"]
+            except Exception:
+                profile = None
+            self.finish(name, elapsed_ms, self.budget(name, budget_ms), profile)
+
+    def finish(self, name, elapsed_ms, budget_ms, profile):
+        """
+        Keep the profile of a slow step
+
+        Returns:
+            str: Path of the saved .cpuprofile, None when the step was within budget
+        """
+        if profile is None or elapsed_ms <= budget_ms:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        safe_name = re.sub(r"[^\w.-]+", "_", name)
+        stem = f"{safe_name}_{time.strftime('%Y%m%d_%H%M%S')}_{int(elapsed_ms)}ms"
+        path = os.path.join(self.profile_dir, f"{stem}.cpuprofile")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        summary = format_summary(name, elapsed_ms, budget_ms, self_times(profile, self.top))
+        print(f"🐢 {summary}\nCPU profile: {path}")
+        if allure is not None:
+            try:
+                allure.attach(summary, name=f"{name} CPU summary", attachment_type=allure.attachment_type.TEXT)
+                allure.attach.file(path, name=f"{name}.cpuprofile", extension="cpuprofile")
+            except Exception:
+                pass
+        self.saved.append(path)
+        return path
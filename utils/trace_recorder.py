@@ -0,0 +1,124 @@
+# utils/trace_recorder.py
+"""
+Playwright traces kept only for failed or slow tests.
+
+Tracing (DOM snapshots and network) is started once per browser context, and
+each test records into its own trace chunk. The chunk stays in the Playwright
+driver's memory: a green test within its duration budget drops it without
+writing anything, while a failed or slow test writes it as a zip that opens
+with `playwright show-trace <zip>`.
+
+reports/traces keeps the last TRACE_KEEP zips, older ones are deleted.
+"""
+import glob
+import os
+import re
+import time
+
+TRACE_DIR = "reports/traces"
+TRACE_KEEP = 20
+
+
+def trace_filename(nodeid, reason):
+    """File name of a trace: the test id made file-safe, the reason and a timestamp"""
+    name = re.sub(r"[^\w.-]+", "_", nodeid.split("::", 1)[-1]).strip("_")[:100]
+    return f"{name}_{reason}_{time.strftime('%Y%m%d_%H%M%S')}.zip"
+
+
+def prune_traces(trace_dir=TRACE_DIR, keep=TRACE_KEEP):
+    """
+    Delete the oldest trace zips beyond `keep`
+
+    Returns:
+        list: Removed paths
+    """
+    paths = sorted(glob.glob(os.path.join(trace_dir, "*.zip")), key=os.path.getmtime)
+    removed = paths[:-keep] if keep else paths
+    for path in removed:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return removed
+
+
+class TraceRecorder:
+    """
+    One trace chunk per test on a browser context
+
+        recorder = TraceRecorder(context, budget=120)
+        recorder.start_test(request.node.nodeid)
+        ...test...
+        recorder.finish_test(request.node.nodeid, failed=True)  # -> zip path
+    """
+
+    def __init__(self, context, trace_dir=TRACE_DIR, budget=None, screenshots=False, keep=TRACE_KEEP):
+        """
+        Args:
+            context: Playwright BrowserContext
+            trace_dir: Where kept traces are written
+            budget: Seconds above which a passing test keeps its trace (None: never)
+            screenshots: Also record screencast frames (larger and slower traces)
+            keep: Number of trace zips kept in trace_dir
+        """
+        self.context = context
+        self.trace_dir = trace_dir
+        self.budget = budget
+        self.screenshots = screenshots
+        self.keep = keep
+        self.started = False
+        self._chunk_start = None
+
+    def start_test(self, title=None):
+        """Open the test's chunk, starting tracing on the context the first time"""
+        try:
+            if self.started:
+                self.context.tracing.start_chunk(title=title)
+            else:
+                # tracing.start() opens the first chunk itself
+                self.context.tracing.start(title=title, screenshots=self.screenshots, snapshots=True,
+                                           sources=False)
+                self.started = True
+            self._chunk_start = time.time()
+        except Exception as e:
+            print(f"Tracing unavailable: {e}")
+
+    def keep_reason(self, failed, duration):
+        """'failed', 'slow' or None when the chunk can be dropped"""
+        if failed:
+            return "failed"
+        if self.budget is not None and duration > self.budget:
+            return "slow"
+        return None
+
+    def finish_test(self, nodeid, failed=False):
+        """
+        Close the test's chunk, writing it only for failed or slow tests
+
+        Returns:
+            str: Path of the kept trace, or None
+        """
+        if not self.started or self._chunk_start is None:
+            return None
+        reason = self.keep_reason(failed, time.time() - self._chunk_start)
+        self._chunk_start = None
+        try:
+            if reason is None:
+                self.context.tracing.stop_chunk()
+                return None
+            os.makedirs(self.trace_dir, exist_ok=True)
+            path = os.path.join(self.trace_dir, trace_filename(nodeid, reason))
+            self.context.tracing.stop_chunk(path=path)
+            prune_traces(self.trace_dir, self.keep)
+            return path
+        except Exception as e:
+            print(f"Could not save trace for {nodeid}: {e}")
+            return None
+
+    def stop(self):
+        if self.started:
+            try:
+                self.context.tracing.stop()
+            except Exception:
+                pass
+            self.started = False
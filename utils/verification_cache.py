@@ -0,0 +1,205 @@
+# utils/verification_cache.py
+import json
+import os
+from datetime import datetime, timedelta
+
+from utils.odoo_utils import STUDENT_MODEL
+
+DEFAULT_CACHE_PATH = ".cache/verification_cache.json"
+
+# Odoo stores write_date as naive UTC "YYYY-MM-DD HH:MM:SS"
+ODOO_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class VerificationCache:
+    """
+    Persistent record of what the last green run verified.
+
+    Each record id keeps its write_date, class and the server version it was verified
+    on. A run asks the server once for records written since the last green run and
+    only the classes those records belong to (before or after the change) need a UI
+    check. A full sweep is forced when there is no green run yet, when the server
+    version changed, or when the last full sweep is older than full_sweep_days.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, full_sweep_days=7, clock_skew_minutes=5):
+        self.path = path
+        self.full_sweep_days = full_sweep_days
+        self.clock_skew = timedelta(minutes=clock_skew_minutes)
+        self.data = {
+            "server_version": None,
+            "class_field": None,
+            "last_green_run": None,
+            "last_full_sweep": None,
+            "records": {},
+        }
+        self.run_started = datetime.utcnow()
+        self.full = True
+        self.reason = "not planned"
+        self.changed_ids = set()
+        self.changed_classes = set()
+        self._pending = []
+        self._merged = False
+        self.load()
+
+    def load(self):
+        """Load the cache file if it exists"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.data.update(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return self
+
+    def save(self):
+        """Write the cache file atomically"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+
+    def _full_sweep_reason(self, server_version, force_full):
+        """Return why this run must verify everything, or None for an incremental run"""
+        if force_full:
+            return "full sweep requested"
+        if not self.data["last_green_run"]:
+            return "no previous green run"
+        if self.data["server_version"] != server_version:
+            return f"server version changed ({self.data['server_version']} -> {server_version})"
+        last_full = self.data["last_full_sweep"]
+        if not last_full or self.run_started - datetime.strptime(last_full, ODOO_DATETIME_FORMAT) \
+                >= timedelta(days=self.full_sweep_days):
+            return f"last full sweep older than {self.full_sweep_days} days"
+        return None
+
+    def plan(self, client, class_field, model=STUDENT_MODEL, force_full=False):
+        """
+        Find what this run has to verify
+
+        Args:
+            client: Authenticated utils.odoo_utils.OdooClient
+            class_field: Name of the class field shown in the search panel
+            model: Model whose records are tracked
+            force_full: Ignore the cache and verify everything
+
+        Returns:
+            VerificationCache: self, with full, reason, changed_ids and changed_classes set
+        """
+        server_version = client.version_info().get("server_version")
+        if self.data["class_field"] not in (None, class_field):
+            force_full = True
+        self.reason = self._full_sweep_reason(server_version, force_full)
+        self.full = self.reason is not None
+
+        domain = []
+        if not self.full:
+            since = datetime.strptime(self.data["last_green_run"], ODOO_DATETIME_FORMAT) - self.clock_skew
+            domain = [("write_date", ">", since.strftime(ODOO_DATETIME_FORMAT))]
+            self.reason = f"records written since {since.strftime(ODOO_DATETIME_FORMAT)}"
+
+        # Single RPC: archived records count as changes too
+        rows = client.call_kw(model, "search_read", [domain], {
+            "fields": ["write_date", class_field],
+            "context": dict(client.context, active_test=False),
+        })
+
+        self.changed_ids = set()
+        self.changed_classes = set()
+        self._pending = []
+        for row in rows:
+            record_id = str(row["id"])
+            class_name = row[class_field][1] if row.get(class_field) else None
+            previous = self.data["records"].get(record_id, {})
+            if not self.full and previous.get("write_date") == row["write_date"]:
+                continue
+            self.changed_ids.add(row["id"])
+            # A student moving class affects both the old and the new class
+            self.changed_classes.update(c for c in (class_name, previous.get("class")) if c)
+            self._pending.append((record_id, {
+                "write_date": row["write_date"],
+                "class": class_name,
+                "server_version": server_version,
+            }))
+
+        self.data["server_version"] = server_version
+        self.data["class_field"] = class_field
+        return self
+
+    @property
+    def has_changes(self):
+        """True if anything has to be verified in the UI"""
+        return self.full or bool(self.changed_ids)
+
+    def should_verify_class(self, class_name):
+        """True if the class has to be re-checked in the UI"""
+        return self.full or class_name in self.changed_classes
+
+    def mark_run(self, green):
+        """
+        Persist the outcome of the run
+
+        Only a green run advances the cache; after a red run the same changes are
+        picked up again next time.
+        """
+        if not green:
+            return
+        run_started = self.run_started.strftime(ODOO_DATETIME_FORMAT)
+        if self.full:
+            # A full sweep saw every record, which also drops deleted ones
+            self.data["records"] = {}
+        for record_id, record in self._pending:
+            record["verified_at"] = run_started
+            self.data["records"][record_id] = record
+        self.data["last_green_run"] = run_started
+        if self.full:
+            self.data["last_full_sweep"] = run_started
+        self._pending = []
+        self.save()
+
+    def pending_state(self):
+        """
+        What mark_run would write, as plain data
+
+        pytest-xdist workers each plan their own copy; the controller merges their
+        states and is the only one writing the cache file.
+        """
+        return {
+            "run_started": self.run_started.strftime(ODOO_DATETIME_FORMAT),
+            "full": self.full,
+            "changed_ids": sorted(self.changed_ids),
+            "pending": [[record_id, record] for record_id, record in self._pending],
+            "server_version": self.data["server_version"],
+            "class_field": self.data["class_field"],
+        }
+
+    def merge(self, state):
+        """
+        Add the plan of a worker (pending_state()) to this cache
+
+        The earliest start wins so no change written during the run is skipped,
+        and the run only counts as a full sweep if every worker swept everything.
+        """
+        run_started = datetime.strptime(state["run_started"], ODOO_DATETIME_FORMAT)
+        if not self._merged:
+            self.run_started = run_started
+            self.full = state["full"]
+            self._pending = []
+        else:
+            self.run_started = min(self.run_started, run_started)
+            self.full = self.full and state["full"]
+        self._merged = True
+        self.changed_ids.update(state["changed_ids"])
+        pending = dict(self._pending)
+        pending.update({record_id: record for record_id, record in state["pending"]})
+        self._pending = list(pending.items())
+        self.data["server_version"] = state["server_version"]
+        self.data["class_field"] = state["class_field"]
+        return self
+
+    def summary(self):
+        """Return a short text description of the plan for reports"""
+        if self.full:
+            return f"Full sweep: {self.reason}"
+        return (f"Incremental run ({self.reason}): {len(self.changed_ids)} changed records, "
+                f"{len(self.changed_classes)} classes to verify")
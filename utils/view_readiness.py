@@ -0,0 +1,80 @@
+# utils/view_readiness.py
+"""
+Semantic readiness of Odoo list and kanban views.
+
+"A card is visible" is true long before a new search is shown: the cards of
+the previous query stay on screen until the web client re-renders. A view is
+ready when what it shows is the answer to the last search:
+
+- no loading indicator
+- the search facets are the requested ones (labels present, facet count)
+- when the web_search_read answer of the search is known (BasePage.reload_view),
+  the pager total is its `length` and the rendered records are its records
+- otherwise the rendered records match the pager range ("1-80 / 321" -> 80)
+
+BasePage.wait_for_view_ready polls VIEW_READY_SCRIPT in the browser
+(requestAnimationFrame), so it returns on the first consistent frame.
+"""
+from urllib.parse import urlparse
+
+SEARCH_READ_METHODS = ("/web_search_read",)
+
+VIEW_READY_SCRIPT = """
+([expected, facets, facetCount]) => {
+    if (document.querySelector('.o_loading, .o_loading_indicator')) return false;
+    const view = document.querySelector('.o_kanban_view, .o_list_view');
+    if (!view) return false;
+    const records = view.querySelectorAll('.o_kanban_record:not(.o_kanban_ghost), .o_data_row').length;
+
+    const facetTexts = Array.from(document.querySelectorAll('.o_searchview_facet'))
+        .map((facet) => facet.textContent.trim());
+    if (facetCount !== null && facetTexts.length !== facetCount) return false;
+    if (facets && !facets.every((label) => facetTexts.some((text) => text.includes(label)))) return false;
+
+    const value = document.querySelector('.o_pager_value');
+    const limit = document.querySelector('.o_pager_limit');
+    let total = null;
+    let pageSize = null;
+    if (value && limit) {
+        total = Number(limit.textContent.trim());
+        const match = value.textContent.match(/(\\d+)\\s*(?:-\\s*(\\d+))?/);
+        pageSize = match ? Number(match[2] || match[1]) - Number(match[1]) + 1 : null;
+    }
+    if (expected) {
+        return (total === null || total === expected.total) && records === expected.records;
+    }
+    // Without the search answer, the pager and the rendered records must agree
+    if (pageSize !== null) return records === pageSize;
+    return records > 0 || !!document.querySelector('.o_view_nocontent');
+}
+"""
+
+# What the view shows, for the message of a readiness timeout
+VIEW_STATE_SCRIPT = """
+() => ({
+    loading: !!document.querySelector('.o_loading, .o_loading_indicator'),
+    records: document.querySelectorAll('.o_kanban_record:not(.o_kanban_ghost), .o_data_row').length,
+    pager: (document.querySelector('.o_pager') || {}).textContent || null,
+    facets: Array.from(document.querySelectorAll('.o_searchview_facet')).map((facet) => facet.textContent.trim()),
+})
+"""
+
+
+def is_search_read_response(response):
+    """The RPC answering the records of a list or kanban view"""
+    return (response.request.method == "POST"
+            and urlparse(response.url).path.endswith(SEARCH_READ_METHODS))
+
+
+def expected_view(payload):
+    """
+    What the view must show once it rendered a web_search_read answer
+
+    Returns:
+        dict: total (records matching the search) and records (records of the page), None if unknown
+    """
+    result = payload.get("result") if isinstance(payload, dict) else None
+    if not isinstance(result, dict) or "records" not in result:
+        return None
+    records = len(result["records"])
+    return {"total": result.get("length", records), "records": records}
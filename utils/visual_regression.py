@@ -0,0 +1,373 @@
+# utils/visual_regression.py
+"""
+Visual regression over the screenshots the suite already takes.
+
+Screenshots are grouped by page key (file name without its timestamp, e.g.
+"login_error_20250516-154159.png" -> "login_error") and compared with the
+baseline of that key in data/visual_baselines:
+
+- a perceptual hash (DCT pHash) catches layout changes: a large Hamming
+  distance, or a different image size, is reported as a layout regression
+- a vectorized NumPy pixel diff catches smaller content changes and writes a
+  highlighted diff image to reports/visual_diffs
+
+Dynamic regions are masked on both images before comparing. BasePage already
+paints DYNAMIC_REGIONS over at capture time; fixed rectangles can be added per
+key (or "*" for every key) in data/visual_masks.json as [x, y, width, height]:
+
+    {"*": [[1700, 0, 220, 46]], "login_success": [[0, 900, 400, 40]]}
+
+NumPy and Pillow are optional (pip install numpy Pillow); without them the
+engine reports itself unavailable and the suite runs as before.
+
+    python -m utils.visual_regression reports/screenshots            # compare
+    python -m utils.visual_regression reports/screenshots --update   # accept as baselines
+
+Under pytest only the screenshots a test took through its own pages are
+compared (ScreenshotLog), so xdist workers sharing reports/screenshots do not
+pick up each other's files.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = None
+    Image = None
+
+BASELINE_DIR = "data/visual_baselines"
+MASKS_FILE = "data/visual_masks.json"
+DIFF_DIR = "reports/visual_diffs"
+REPORT_PATH = "reports/visual_regression.json"
+
+# "_20250519_154028" / "_20250516-154159" suffixes added by take_screenshot and the tests
+TIMESTAMP_PATTERN = re.compile(r"[_-]\d{8}[_-]\d{6}$")
+
+HASH_SIZE = 8          # 8x8 low frequencies -> 64-bit hash
+HASH_SAMPLE = 32       # images are reduced to 32x32 before the DCT
+PIXEL_TOLERANCE = 24   # per-channel difference ignored (antialiasing, JPEG-like noise)
+CHANGED_RATIO = 0.001  # share of differing pixels above which a screenshot changed
+LAYOUT_DISTANCE = 10   # pHash bits above which the layout changed
+
+
+def available():
+    """True if NumPy and Pillow are installed"""
+    return np is not None
+
+
+def screenshot_key(path):
+    """Page key of a screenshot: its file name without extension and timestamp"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return TIMESTAMP_PATTERN.sub("", name)
+
+
+def load_masks(masks_file=MASKS_FILE):
+    try:
+        with open(masks_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def load_pixels(path, regions=()):
+    """
+    Load a screenshot as an (height, width, 3) uint8 array with regions blanked
+
+    Args:
+        path: Image file
+        regions: [x, y, width, height] rectangles to mask
+    """
+    with Image.open(path) as image:
+        pixels = np.array(image.convert("RGB"))
+    for x, y, width, height in regions:
+        pixels[y:y + height, x:x + width] = 0
+    return pixels
+
+
+def _dct_matrix(size):
+    """Orthonormal DCT-II matrix, so dct(block) == M @ block @ M.T"""
+    k = np.arange(size)[:, None]
+    i = np.arange(size)[None, :]
+    matrix = np.sqrt(2.0 / size) * np.cos(np.pi * (2 * i + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+def phash(pixels):
+    """
+    64-bit perceptual hash of an RGB array
+
+    The image is reduced to 32x32 grayscale and each bit says whether one of the
+    8x8 lowest DCT frequencies is above their median, so the hash follows the
+    overall layout and ignores small pixel noise.
+    """
+    gray = Image.fromarray(pixels).convert("L")
+    small = np.asarray(gray.resize((HASH_SAMPLE, HASH_SAMPLE), Image.LANCZOS), dtype=np.float64)
+    matrix = _dct_matrix(HASH_SAMPLE)
+    low = (matrix @ small @ matrix.T)[:HASH_SIZE, :HASH_SIZE].ravel()
+    # The DC term only carries the average brightness. Terms within 1% of the
+    # largest one from the median count as "below": symmetric layouts have many
+    # near-zero terms that would otherwise flip on a single changed pixel.
+    dead_zone = 0.01 * np.abs(low[1:]).max()
+    bits = low > np.median(low[1:]) + dead_zone
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hash_distance(first, second):
+    """Number of differing bits between two hashes"""
+    return bin(first ^ second).count("1")
+
+
+def phash_file(path):
+    """pHash of an image file (picklable for process pools)"""
+    return phash(load_pixels(path))
+
+
+def changed_pixels(actual, expected, tolerance=PIXEL_TOLERANCE):
+    """Boolean (height, width) mask of pixels where any channel differs by more than tolerance"""
+    # uint8 |a - b| without widening, then the max over channels as two elementwise maximums
+    delta = np.maximum(actual, expected)
+    delta -= np.minimum(actual, expected)
+    channels = delta.reshape(-1, 3)
+    largest = np.maximum(np.maximum(channels[:, 0], channels[:, 1]), channels[:, 2])
+    return (largest > tolerance).reshape(actual.shape[:2])
+
+
+def write_diff_image(pixels, changed, path):
+    """Save the screenshot dimmed, with changed pixels in red"""
+    overlay = pixels // 3
+    overlay[changed] = (255, 0, 0)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.fromarray(overlay).save(path, compress_level=1)
+
+
+def compare_screenshot(path, baseline_dir=BASELINE_DIR, masks=None, diff_dir=DIFF_DIR):
+    """
+    Compare one screenshot with the baseline of its page key
+
+    Returns:
+        dict: screenshot, key, status ('new', 'match', 'changed' or 'layout'),
+              distance, changed_ratio, bbox [x, y, width, height] and diff path
+    """
+    key = screenshot_key(path)
+    result = {"screenshot": path, "key": key, "status": "new", "distance": None,
+              "changed_ratio": None, "bbox": None, "diff": None}
+    baseline_path = os.path.join(baseline_dir, f"{key}.png")
+    if not os.path.exists(baseline_path):
+        return result
+
+    masks = masks or {}
+    regions = masks.get("*", []) + masks.get(key, [])
+    actual = load_pixels(path, regions)
+    expected = load_pixels(baseline_path, regions)
+
+    if actual.shape != expected.shape:
+        result.update(status="layout", changed_ratio=1.0,
+                      bbox=[0, 0, actual.shape[1], actual.shape[0]])
+        return result
+
+    if np.array_equal(actual, expected):
+        result.update(status="match", distance=0, changed_ratio=0.0)
+        return result
+
+    result["distance"] = hash_distance(phash(actual), phash(expected))
+    changed = changed_pixels(actual, expected)
+    result["changed_ratio"] = round(float(np.count_nonzero(changed)) / changed.size, 6)
+
+    if result["distance"] > LAYOUT_DISTANCE:
+        result["status"] = "layout"
+    elif result["changed_ratio"] > CHANGED_RATIO:
+        result["status"] = "changed"
+    else:
+        result["status"] = "match"
+        return result
+
+    rows = np.flatnonzero(changed.any(axis=1))
+    columns = np.flatnonzero(changed.any(axis=0))
+    if rows.size:
+        result["bbox"] = [int(columns[0]), int(rows[0]),
+                          int(columns[-1] - columns[0] + 1), int(rows[-1] - rows[0] + 1)]
+    result["diff"] = os.path.join(diff_dir, os.path.basename(path))
+    write_diff_image(actual, changed, result["diff"])
+    return result
+
+
+class ScreenshotLog:
+    """
+    Paths of the screenshots written through the pages it is installed on
+
+        log = ScreenshotLog()
+        log.install(page)          # conftest.page; install_async for async pages
+        ...
+        log.drain()                # screenshots since the last drain
+    """
+
+    def __init__(self):
+        self.paths = []
+
+    def _record(self, kwargs):
+        if kwargs.get("path"):
+            self.paths.append(str(kwargs["path"]))
+
+    def install(self, page):
+        screenshot = page.screenshot
+
+        def recorded(*args, **kwargs):
+            result = screenshot(*args, **kwargs)
+            self._record(kwargs)
+            return result
+        page.screenshot = recorded
+        return self
+
+    def install_async(self, page):
+        screenshot = page.screenshot
+
+        async def recorded(*args, **kwargs):
+            result = await screenshot(*args, **kwargs)
+            self._record(kwargs)
+            return result
+        page.screenshot = recorded
+        return self
+
+    def drain(self):
+        paths, self.paths = self.paths, []
+        return paths
+
+
+class VisualRegressionEngine:
+    """
+    Compare screenshots with their baselines in a process pool.
+
+    Tests keep driving the browser while workers compare what was already
+    captured; results are collected once at the end of the session:
+
+        engine = VisualRegressionEngine(workers=2)
+        engine.submit("reports/screenshots/login_success_20250519-154028.png")
+        ...
+        engine.close()
+        print(engine.summary())
+    """
+
+    def __init__(self, baseline_dir=BASELINE_DIR, masks_file=MASKS_FILE, diff_dir=DIFF_DIR, workers=None):
+        """
+        Args:
+            baseline_dir: Directory with one <page key>.png baseline per page
+            masks_file: JSON file with the masked rectangles per page key
+            diff_dir: Where diff images of failed comparisons are written
+            workers: Pool size (defaults to one less than the CPU count)
+        """
+        self.baseline_dir = baseline_dir
+        self.diff_dir = diff_dir
+        self.masks = load_masks(masks_file)
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self._pool = None
+        self._futures = {}
+        self.results = []
+
+    def submit(self, path):
+        """Queue a screenshot for comparison; each file is compared once"""
+        if path in self._futures:
+            return
+        if self._pool is None:
+            # spawn: the parent holds Playwright threads, which fork does not copy safely
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        self._futures[path] = self._pool.submit(compare_screenshot, path, self.baseline_dir,
+                                                self.masks, self.diff_dir)
+
+    def close(self):
+        """Wait for every comparison and shut the pool down"""
+        for path, future in self._futures.items():
+            try:
+                self.results.append(future.result())
+            except Exception as e:
+                print(f"Visual comparison failed for {path}: {e}")
+                self.results.append({"screenshot": path, "key": screenshot_key(path), "status": "error",
+                                     "error": str(e)})
+        self._futures = {}
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        return self.results
+
+    def regressions(self, statuses=("layout",)):
+        """Results with one of the given statuses"""
+        return [result for result in self.results if result["status"] in statuses]
+
+    def merge(self, results):
+        """Add the results of another engine (an xdist worker's)"""
+        self.results.extend(results)
+
+    def write_report(self, path=REPORT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.results, f, ensure_ascii=False, indent=1)
+        return path
+
+    def summary(self):
+        """Return a short text description of the comparisons for reports"""
+        counts = {}
+        for result in self.results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        lines = [f"Visual regression: {len(self.results)} screenshots "
+                 f"({', '.join(f'{status}: {count}' for status, count in sorted(counts.items()))})"]
+        for result in self.regressions(("layout", "changed")):
+            if result["distance"] is None:
+                detail = "image size changed"
+            else:
+                detail = f"pHash distance {result['distance']}, {result['changed_ratio']:.2%} pixels"
+            lines.append(f"  {result['status'].upper():8} {result['screenshot']} ({detail}) -> {result['diff']}")
+        return "\n".join(lines)
+
+
+def update_baselines(paths, baseline_dir=BASELINE_DIR):
+    """
+    Accept screenshots as baselines, keeping the most recent file of each page key
+
+    Returns:
+        list: Page keys written
+    """
+    latest = {}
+    for path in sorted(paths, key=os.path.getmtime):
+        latest[screenshot_key(path)] = path
+    os.makedirs(baseline_dir, exist_ok=True)
+    for key, path in latest.items():
+        shutil.copyfile(path, os.path.join(baseline_dir, f"{key}.png"))
+    return sorted(latest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare screenshots with their baselines")
+    parser.add_argument("directory", nargs="?", default="reports/screenshots")
+    parser.add_argument("--update", action="store_true", help="Accept the screenshots as new baselines")
+    parser.add_argument("--workers", type=int, help="Comparison processes")
+    args = parser.parse_args()
+
+    if not available():
+        raise SystemExit("Visual regression needs numpy and Pillow: pip install numpy Pillow")
+    paths = sorted(glob.glob(os.path.join(args.directory, "*.png")))
+    if args.update:
+        keys = update_baselines(paths)
+        print(f"{len(keys)} baselines written to {BASELINE_DIR}")
+        return
+
+    engine = VisualRegressionEngine(workers=args.workers)
+    for path in paths:
+        engine.submit(path)
+    engine.close()
+    print(engine.summary())
+    print(f"Report written to {engine.write_report()}")
+    if engine.regressions():
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# utils/watch.py
+"""
+Watch mode: rerun the tests affected by each save.
+
+    python -m utils.watch                       # watch, run nothing until a file changes
+    python -m utils.watch --run-first -- -k sans_famille
+
+pytest runs inside this process, so Python, Playwright and the page objects are
+imported once. Between runs only the changed modules and the modules importing
+them are dropped from sys.modules and imported again. The browser is the
+--browser-daemon one and the login comes from the account pool's cached storage
+state, so a rerun goes straight to the test.
+
+Affected tests come from utils.import_graph: saving
+pages/access/school_card/student_filter_page.py reruns
+tests/acces/test_student_filters.py and the other tests importing it.
+"""
+import argparse
+import os
+import sys
+import time
+
+import pytest
+
+from utils.import_graph import ImportGraph
+
+WATCHED = ("pages", "tests", "utils", "conftest.py")
+POLL_INTERVAL = 0.2
+
+
+def snapshot(root="."):
+    """Modification time of every watched Python file"""
+    mtimes = {}
+    for watched in WATCHED:
+        path = os.path.join(root, watched)
+        if os.path.isfile(path):
+            mtimes[watched] = os.path.getmtime(path)
+            continue
+        for directory, dirnames, filenames in os.walk(path):
+            dirnames[:] = [name for name in dirnames if name != "__pycache__"]
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    file_path = os.path.join(directory, filename)
+                    try:
+                        mtimes[os.path.relpath(file_path, root).replace(os.sep, "/")] = os.path.getmtime(file_path)
+                    except OSError:
+                        continue
+    return mtimes
+
+
+def changed_files(before, after):
+    return sorted(path for path in set(before) | set(after) if before.get(path) != after.get(path))
+
+
+def unload(paths, root="."):
+    """Drop the modules loaded from the given files so the next import reads them again"""
+    targets = {os.path.normcase(os.path.abspath(os.path.join(root, path))) for path in paths}
+    unloaded = []
+    for name, module in list(sys.modules.items()):
+        filename = getattr(module, "__file__", None)
+        if filename and os.path.normcase(os.path.abspath(filename)) in targets:
+            del sys.modules[name]
+            unloaded.append(name)
+    return unloaded
+
+
+def run_tests(tests, pytest_args):
+    start = time.time()
+    exit_code = pytest.main([*tests, "-p", "no:cacheprovider", *pytest_args])
+    print(f"\n[watch] {len(tests)} test files, exit code {int(exit_code)} in {time.time() - start:.1f}s")
+    return exit_code
+
+
+def watch(pytest_args, run_first=False):
+    # Keep the browser between runs (see utils.browser_daemon)
+    os.environ.setdefault("BROWSER_DAEMON", "true")
+    graph = ImportGraph()
+    mtimes = snapshot()
+    if run_first:
+        run_tests(sorted(path for path in graph.imports if path.startswith("tests/")), pytest_args)
+    print(f"[watch] watching {', '.join(WATCHED)} (Ctrl+C to stop)")
+
+    while True:
+        time.sleep(POLL_INTERVAL)
+        current = snapshot()
+        changed = changed_files(mtimes, current)
+        if not changed:
+            continue
+        # Editors write in several steps: wait for the files to settle
+        time.sleep(POLL_INTERVAL)
+        current = snapshot()
+        changed = changed_files(mtimes, current)
+        mtimes = current
+
+        graph.refresh(changed)
+        tests = [path for path in graph.affected_tests(changed) if os.path.exists(path)]
+        unload(graph.dependents(changed))
+        print(f"\n[watch] changed: {', '.join(changed)}")
+        if tests:
+            run_tests(tests, pytest_args)
+        else:
+            print("[watch] no test imports these files")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rerun the tests affected by each saved file",
+                                     usage="python -m utils.watch [--run-first] [-- pytest args]")
+    parser.add_argument("--run-first", action="store_true", help="Run every test once before watching")
+    args, pytest_args = parser.parse_known_args()
+    if pytest_args[:1] == ["--"]:
+        pytest_args = pytest_args[1:]
+    try:
+        watch(pytest_args, run_first=args.run_first)
+    except KeyboardInterrupt:
+        print("\n[watch] stopped")
+
+
+if __name__ == "__main__":
+    main()